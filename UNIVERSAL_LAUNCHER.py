@@ -10,6 +10,7 @@ import os
 import sys
 import json
 import time
+import socket
 import logging
 import platform
 import subprocess
@@ -31,6 +32,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Boot sequencing shared with the platform launchers (optional)
+try:
+    sys.path.insert(0, str(Path(__file__).parent / 'system'))
+    sys.path.insert(0, str(Path(__file__).parent / 'launchers'))
+    from launcher_common import (
+        BootSequence, SupervisedProcess, OLLAMA_READY_PATTERN, OPENWEBUI_READY_PATTERN
+    )
+except ImportError:
+    BootSequence = None
+    SupervisedProcess = None
+    OLLAMA_READY_PATTERN = OPENWEBUI_READY_PATTERN = None
+
+OLLAMA_PORT = 11434
+WEBUI_PORT = 8080
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -76,6 +92,18 @@ def get_usb_path(subpath: str = '') -> Optional[Path]:
     
     return None
 
+def wait_for_port(port: int, timeout: float = 30.0) -> bool:
+    """Wait until a local service accepts connections"""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            with socket.create_connection(('localhost', port), timeout=1.0):
+                return True
+        except OSError:
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.1)
+
 # ============================================================================
 # PROCESS MANAGER
 # ============================================================================
@@ -86,10 +114,16 @@ class ProcessManager:
     def __init__(self):
         self.processes = {}
         self.lock = threading.Lock()
+        self.log_dir = None  # Set once the USB partition is known
         logger.info("ProcessManager initialized")
     
-    def start_process(self, name: str, command: list, **kwargs) -> subprocess.Popen:
-        """Start and track a process"""
+    def start_process(self, name: str, command: list, ready_pattern: Optional[str] = None,
+                      restart: bool = False, cwd: Optional[str] = None):
+        """
+        Start and track a process
+        Output is drained into a rotating log file so the child never blocks
+        on a full pipe; crashed processes can be restarted with backoff
+        """
         with self.lock:
             try:
                 # Ensure no ANSI in subprocess output
@@ -98,14 +132,25 @@ class ProcessManager:
                 env['NO_COLOR'] = '1'  # Disable colors in child processes
                 env['TERM'] = 'dumb'   # Force simple terminal mode
                 
-                process = subprocess.Popen(
-                    command,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    env=env,
-                    **kwargs
-                )
+                if SupervisedProcess is not None:
+                    process = SupervisedProcess(
+                        name,
+                        command,
+                        cwd=cwd,
+                        env=env,
+                        log_dir=self.log_dir,
+                        ready_pattern=ready_pattern,
+                        restart=restart
+                    ).start()
+                else:
+                    # Nothing would read a pipe, so do not create one
+                    process = subprocess.Popen(
+                        command,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        env=env,
+                        cwd=cwd
+                    )
                 
                 self.processes[name] = process
                 logger.info(f"Started process '{name}': PID {process.pid}")
@@ -194,6 +239,9 @@ class SunflowerLauncher:
         # Initialize configuration
         self.config = {}
         
+        # Serializes Ollama startup between warm start and launch
+        self.ollama_lock = threading.Lock()
+        
         # Create GUI elements
         self.create_widgets()
         
@@ -303,7 +351,7 @@ class SunflowerLauncher:
         footer_label.grid(row=4, column=0, columnspan=2, pady=(20, 0))
     
     def add_status(self, message: str, level: str = "INFO"):
-        """Add message to status display"""
+        """Add message to status display (safe to call from worker threads)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         
         # Format message without ANSI codes
@@ -318,10 +366,9 @@ class SunflowerLauncher:
         
         formatted_message = f"{timestamp} {prefix} {message}\n"
         
-        # Add to GUI
-        self.status_text.insert(tk.END, formatted_message)
-        self.status_text.see(tk.END)
-        self.status_text.update()
+        # Tk widgets may only be touched from the main thread, and boot
+        # tasks report from worker threads, so queue the update on the event loop
+        self.root.after(0, self._append_status, formatted_message)
         
         # Also log it
         if level == "ERROR":
@@ -331,6 +378,11 @@ class SunflowerLauncher:
         else:
             logger.info(message)
     
+    def _append_status(self, formatted_message: str):
+        """Append a line to the status display (main thread only)"""
+        self.status_text.insert(tk.END, formatted_message)
+        self.status_text.see(tk.END)
+    
     def detect_partitions(self):
         """Detect CD-ROM and USB partitions"""
         self.add_status("Starting partition detection...")
@@ -358,6 +410,7 @@ class SunflowerLauncher:
             # Set data directory
             self.data_dir = self.usb_path / 'launcher_data'
             self.data_dir.mkdir(parents=True, exist_ok=True)
+            self.process_manager.log_dir = self.usb_path / 'logs'
             
             # Load configuration
             self.load_config()
@@ -398,38 +451,65 @@ class SunflowerLauncher:
             else:
                 self.add_status("System ready to launch", "SUCCESS")
                 self.launch_button.config(state=tk.NORMAL)
+                
+                # Start Ollama now so it is ready by the time Launch is clicked
+                threading.Thread(target=self.ensure_ollama, daemon=True).start()
     
     def launch_application(self):
         """Launch the main Sunflower AI application"""
         self.add_status("Launching Sunflower AI...")
         self.launch_button.config(state=tk.DISABLED)
         
+        thread = threading.Thread(target=self._launch_thread, daemon=True)
+        thread.start()
+    
+    def _launch_thread(self):
+        """Start services concurrently and open the browser once they are ready"""
+        steps = [
+            ('ollama', self.ensure_ollama, []),
+            ('openwebui', self.start_openwebui, []),
+            ('openwebui_ready', self.wait_for_openwebui, ['openwebui']),
+            ('browser', self.open_browser, ['ollama', 'openwebui_ready'])
+        ]
+        
         try:
-            # Check if Ollama is running
-            self.add_status("Checking Ollama service...")
-            if not self.check_ollama():
-                self.add_status("Starting Ollama service...")
-                self.start_ollama()
+            if BootSequence is not None:
+                boot = BootSequence('launch')
+                for name, func, depends_on in steps:
+                    boot.add_task(name, func, depends_on)
+                success = boot.run()
+                if self.usb_path:
+                    boot.write_trace(self.usb_path / 'logs')
             else:
-                self.add_status("Ollama service is running", "SUCCESS")
+                success = all(func() is not False for _, func, _ in steps)
             
-            # Launch Open WebUI
-            self.add_status("Starting Open WebUI...")
-            if self.start_openwebui():
-                self.add_status("Open WebUI started successfully", "SUCCESS")
-                
-                # Open browser
-                time.sleep(3)
-                webbrowser.open('http://localhost:8080')
-                self.add_status("Browser opened to http://localhost:8080", "SUCCESS")
-            else:
-                self.add_status("Failed to start Open WebUI", "ERROR")
+            if not success:
+                self.add_status("Sunflower AI did not start completely", "ERROR")
                 
         except Exception as e:
             self.add_status(f"Launch error: {str(e)}", "ERROR")
             logger.exception("Launch failed")
         finally:
-            self.launch_button.config(state=tk.NORMAL)
+            self.root.after(0, lambda: self.launch_button.config(state=tk.NORMAL))
+    
+    def wait_for_openwebui(self) -> bool:
+        """Wait for Open WebUI to report that it is serving"""
+        process = self.process_manager.processes.get('openwebui')
+        if hasattr(process, 'wait_ready'):
+            ready = process.wait_ready(timeout=60.0)
+        else:
+            ready = wait_for_port(WEBUI_PORT, timeout=60.0)
+        
+        if ready:
+            self.add_status("Open WebUI started successfully", "SUCCESS")
+            return True
+        self.add_status("Open WebUI did not become ready", "ERROR")
+        return False
+    
+    def open_browser(self):
+        """Open the chat interface"""
+        webbrowser.open(f'http://localhost:{WEBUI_PORT}')
+        self.add_status(f"Browser opened to http://localhost:{WEBUI_PORT}", "SUCCESS")
     
     def run_setup(self):
         """Run first-time setup"""
@@ -461,37 +541,50 @@ class SunflowerLauncher:
     
     def check_ollama(self) -> bool:
         """Check if Ollama is running"""
-        try:
-            result = subprocess.run(
-                ['ollama', 'list'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+        return wait_for_port(OLLAMA_PORT, timeout=0)
     
-    def start_ollama(self):
-        """Start Ollama service"""
+    def start_ollama(self) -> bool:
+        """Start Ollama service and wait until it reports it is listening"""
         try:
-            self.process_manager.start_process(
+            process = self.process_manager.start_process(
                 'ollama',
-                ['ollama', 'serve']
+                ['ollama', 'serve'],
+                ready_pattern=OLLAMA_READY_PATTERN,
+                restart=True
             )
-            time.sleep(2)  # Give it time to start
+            if hasattr(process, 'wait_ready'):
+                return process.wait_ready(timeout=60.0)
+            return wait_for_port(OLLAMA_PORT, timeout=60.0)
         except Exception as e:
             self.add_status(f"Failed to start Ollama: {e}", "ERROR")
+            return False
+    
+    def ensure_ollama(self) -> bool:
+        """Start Ollama if needed and wait until it accepts connections"""
+        with self.ollama_lock:
+            if self.check_ollama():
+                self.add_status("Ollama service is running", "SUCCESS")
+                return True
+            
+            self.add_status("Starting Ollama service...")
+            if self.start_ollama():
+                self.add_status("Ollama service is running", "SUCCESS")
+                return True
+            
+            self.add_status("Ollama service did not become ready", "ERROR")
+            return False
     
     def start_openwebui(self) -> bool:
         """Start Open WebUI"""
         try:
-            # Try to start with Python
+            self.add_status("Starting Open WebUI...")
             webui_path = self.cdrom_path / 'open-webui'
             if webui_path.exists():
                 self.process_manager.start_process(
                     'openwebui',
                     [sys.executable, 'backend/main.py'],
+                    ready_pattern=OPENWEBUI_READY_PATTERN,
+                    restart=True,
                     cwd=str(webui_path)
                 )
                 return True
@@ -10,7 +10,6 @@ import sys
 import shutil
 import subprocess
 import platform
-import hashlib
 import json
 import time
 from pathlib import Path
@@ -18,6 +17,10 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import logging
 
+# Shared incremental build cache
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from build_cache import BuildCache, BuildStep, source_date
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,19 +42,29 @@ class SunflowerAIBuilder:
         self.temp_dir = self.project_root / "build" / "temp"
         self.current_platform = platform.system()
         self.version = "6.2.0"
-        self.build_timestamp = datetime.now().isoformat()
+        self.build_timestamp = source_date().isoformat()
+        
+        # Executables are only rebuilt when their inputs change
+        self.cache = BuildCache(self.project_root / ".build_cache", base=self.project_root)
+        
+    def clean_build_environment(self, full: bool = False):
+        """
+        Clean previous build artifacts
         
-    def clean_build_environment(self):
-        """Clean previous build artifacts"""
+        Only the temp directory is removed unless full is set; dist/ is
+        kept so unchanged executables can be reused from the build cache.
+        """
         logger.info("Cleaning build environment...")
         
         # Remove old build directories
-        dirs_to_clean = [
-            self.dist_dir,
-            self.temp_dir,
-            self.project_root / "build" / "__pycache__",
-            self.project_root / "__pycache__"
-        ]
+        dirs_to_clean = [self.temp_dir]
+        if full:
+            dirs_to_clean += [
+                self.dist_dir,
+                self.project_root / "build" / "__pycache__",
+                self.project_root / "__pycache__"
+            ]
+            self.cache.invalidate()
         
         for dir_path in dirs_to_clean:
             if dir_path.exists():
@@ -154,6 +167,27 @@ class SunflowerAIBuilder:
         except Exception as e:
             logger.warning(f"  Could not generate icon: {e}")
     
+    def _executable_step(self, name: str, spec_name: str, output_dir: str,
+                         run) -> BuildStep:
+        """Cache step for a PyInstaller build from a spec template"""
+        return BuildStep(
+            name,
+            run=run,
+            inputs=[
+                self.build_dir / "templates" / spec_name,
+                self.build_dir / "templates" / "Info.plist",
+                self.build_dir / "runtime_hooks",
+                self.project_root / "src",
+                self.project_root / "resources",
+                self.project_root / "docs",
+                self.project_root / "LICENSE",
+                self.project_root / "THIRD_PARTY_LICENSES.txt",
+                self.project_root / "requirements.txt"
+            ],
+            outputs=[self.dist_dir / output_dir],
+            params={"version": self.version, "platform": self.current_platform}
+        )
+    
     def build_windows_executable(self) -> bool:
         """Build Windows executable"""
         if self.current_platform != "Windows":
@@ -426,12 +460,8 @@ class SunflowerAIBuilder:
         return None
     
     def _calculate_checksum(self, file_path: Path) -> str:
-        """Calculate SHA256 checksum of file"""
-        sha256 = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(65536), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        """Calculate SHA256 checksum of file (cached until the file changes)"""
+        return self.cache.hasher.hash_file(file_path)
     
     def create_distribution_package(self):
         """Create final distribution package with both executables"""
@@ -494,13 +524,19 @@ class SunflowerAIBuilder:
                     else:
                         logger.info(f"  {key}: {value}")
     
-    def run_full_build(self, platforms: List[str] = None) -> bool:
-        """Run complete build process"""
+    def run_full_build(self, platforms: List[str] = None, clean: bool = False) -> bool:
+        """
+        Run complete build process
+        
+        Args:
+            platforms: Platforms to build (Windows and macOS if None)
+            clean: Remove previous output and rebuild everything
+        """
         start_time = time.time()
         
         try:
             # Step 1: Clean environment
-            self.clean_build_environment()
+            self.clean_build_environment(full=clean)
             
             # Step 2: Verify dependencies
             if not self.verify_dependencies():
@@ -516,11 +552,15 @@ class SunflowerAIBuilder:
             build_success = True
             
             if "Windows" in platforms and self.current_platform == "Windows":
-                if not self.build_windows_executable():
+                if not self.cache.run(self._executable_step(
+                        "windows_executable", "windows.spec", "Windows",
+                        self.build_windows_executable)):
                     build_success = False
             
             if "macOS" in platforms and self.current_platform == "Darwin":
-                if not self.build_macos_application():
+                if not self.cache.run(self._executable_step(
+                        "macos_application", "macos.spec", "macOS",
+                        self.build_macos_application)):
                     build_success = False
             
             # Step 5: Create distribution package
@@ -528,6 +568,7 @@ class SunflowerAIBuilder:
                 self.create_distribution_package()
             
             elapsed = time.time() - start_time
+            logger.info("Build cache:\n" + self.cache.report())
             logger.info(f"\nTotal build time: {elapsed:.2f} seconds")
             
             return build_success
@@ -557,7 +598,7 @@ def main():
     parser.add_argument(
         "--clean",
         action="store_true",
-        help="Clean build environment before building"
+        help="Clean build environment and rebuild everything"
     )
     parser.add_argument(
         "--version",
@@ -574,7 +615,7 @@ def main():
         builder.version = args.version
     
     # Run build
-    success = builder.run_full_build(platforms=args.platforms)
+    success = builder.run_full_build(platforms=args.platforms, clean=args.clean)
     
     sys.exit(0 if success else 1)
 
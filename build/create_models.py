@@ -8,9 +8,9 @@ Version: 6.2
 import os
 import sys
 import json
-import hashlib
 import logging
 import tempfile
+import time
 import subprocess
 import shutil
 from pathlib import Path
@@ -19,6 +19,11 @@ from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import platform
 
+# Shared cached, parallel file hashing and build step cache
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from file_hashing import get_file_hasher
+from build_cache import BuildCache, BuildStep
+
 # Configure production logging
 logging.basicConfig(
     level=logging.INFO,
@@ -69,6 +74,12 @@ class ModelCompiler:
         }
     }
     
+    # Compilation workers are limited by memory and by output disk bandwidth
+    MAX_COMPILE_WORKERS = 4
+    MEMORY_PER_MODEL_FACTOR = 1.5  # RAM per job, relative to the model size
+    DISK_MBPS_PER_WORKER = 200  # write bandwidth one create/export job can use
+    DISK_PROBE_MB = 32
+    
     def __init__(self, build_dir: Path, output_dir: Path):
         """Initialize model compiler with build and output directories"""
         self.build_dir = Path(build_dir)
@@ -81,6 +92,10 @@ class ModelCompiler:
         for directory in [self.models_dir, self.manifests_dir, self.temp_dir]:
             directory.mkdir(parents=True, exist_ok=True)
         
+        # Variants whose inputs are unchanged are reused from the output directory
+        self.cache = BuildCache(self.output_dir / '.build_cache', base=self.output_dir,
+                                hasher=get_file_hasher())
+        
         # Load modelfile templates
         self.kids_modelfile = self.build_dir / 'modelfiles' / 'Sunflower_AI_Kids.modelfile'
         self.educator_modelfile = self.build_dir / 'modelfiles' / 'Sunflower_AI_Educator.modelfile'
@@ -127,11 +142,28 @@ class ModelCompiler:
         except (subprocess.SubprocessError, FileNotFoundError):
             return False
     
-    def compile_model_variant(
+    def _render_modelfile(
         self,
         variant_name: str,
         modelfile_path: Path,
         model_suffix: str
+    ) -> str:
+        """Modelfile text for one variant"""
+        with open(modelfile_path, 'r', encoding='utf-8') as f:
+            modelfile_content = f.read()
+        
+        return self._customize_modelfile(
+            modelfile_content,
+            self.MODEL_VARIANTS[variant_name],
+            model_suffix
+        )
+    
+    def compile_model_variant(
+        self,
+        variant_name: str,
+        modelfile_path: Path,
+        model_suffix: str,
+        modelfile_content: Optional[str] = None
     ) -> Dict[str, Any]:
         """Compile a single model variant with production error handling"""
         variant = self.MODEL_VARIANTS[variant_name]
@@ -141,15 +173,8 @@ class ModelCompiler:
         
         try:
             # Read and customize modelfile
-            with open(modelfile_path, 'r', encoding='utf-8') as f:
-                modelfile_content = f.read()
-            
-            # Add variant-specific parameters
-            modelfile_content = self._customize_modelfile(
-                modelfile_content,
-                variant,
-                model_suffix
-            )
+            if modelfile_content is None:
+                modelfile_content = self._render_modelfile(variant_name, modelfile_path, model_suffix)
             
             # Write temporary modelfile
             temp_modelfile = self.temp_dir / f"{model_name}.modelfile"
@@ -191,8 +216,8 @@ class ModelCompiler:
             with open(manifest_path, 'w', encoding='utf-8') as f:
                 json.dump(manifest, f, indent=2)
             
-            # Calculate checksums
-            model_checksum = self._calculate_checksum(export_path)
+            # Checksum taken for the manifest
+            model_checksum = manifest['checksum']
             
             logger.info(f"Successfully compiled: {model_name} (checksum: {model_checksum})")
             
@@ -361,14 +386,135 @@ class ModelCompiler:
         if not file_path.exists():
             return ""
         
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(65536), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        # Exported GGUF files are several GB; unchanged ones come from the cache
+        return get_file_hasher().hash_file(file_path)
+    
+    def _base_model_digests(self) -> Dict[str, str]:
+        """Digest (ID) of every locally available Ollama model, by name"""
+        try:
+            result = subprocess.run(
+                ['ollama', 'list'],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except (subprocess.SubprocessError, FileNotFoundError):
+            return {}
+        
+        digests = {}
+        for line in result.stdout.splitlines()[1:]:
+            fields = line.split()
+            if len(fields) >= 2:
+                name = fields[0] if ':' in fields[0] else f"{fields[0]}:latest"
+                digests[name] = fields[1]
+        return digests
+    
+    def _variant_step(
+        self,
+        variant_name: str,
+        modelfile_path: Path,
+        model_suffix: str,
+        base_digest: Optional[str],
+        results: Dict[str, Dict[str, Any]]
+    ) -> BuildStep:
+        """Cache step for one variant, keyed by base model, modelfile and parameters"""
+        variant = self.MODEL_VARIANTS[variant_name]
+        model_name = f"sunflower_{model_suffix}_{variant_name}"
+        modelfile_content = self._render_modelfile(variant_name, modelfile_path, model_suffix)
+        
+        def run() -> bool:
+            result = self.compile_model_variant(
+                variant_name, modelfile_path, model_suffix, modelfile_content
+            )
+            results[model_name] = result
+            return result['success']
+        
+        return BuildStep(
+            model_name,
+            run=run,
+            outputs=[
+                self.models_dir / f"{model_name}.gguf",
+                self.models_dir / model_name,
+                self.manifests_dir / f"{model_name}.json"
+            ],
+            params={
+                'base_model': variant['name'],
+                'base_digest': base_digest,
+                'modelfile': modelfile_content,
+                'performance': self._get_performance_params(variant),
+                'variant': variant
+            }
+        )
+    
+    def _cached_result(self, model_name: str, variant_name: str) -> Dict[str, Any]:
+        """Result for a variant reused from a previous build"""
+        manifest_path = self.manifests_dir / f"{model_name}.json"
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        export_path = self.models_dir / f"{model_name}.gguf"
+        return {
+            'name': model_name,
+            'variant': variant_name,
+            'path': str(export_path),
+            'manifest': str(manifest_path),
+            'checksum': manifest.get('checksum'),
+            'size_mb': export_path.stat().st_size / (1024 * 1024),
+            'success': True,
+            'cached': True
+        }
+    
+    def _probe_disk_mbps(self) -> Optional[float]:
+        """Measured write bandwidth of the output disk"""
+        probe_path = self.models_dir / '.disk_probe'
+        block = os.urandom(1024 * 1024)
+        try:
+            start = time.perf_counter()
+            with open(probe_path, 'wb') as f:
+                for _ in range(self.DISK_PROBE_MB):
+                    f.write(block)
+                f.flush()
+                os.fsync(f.fileno())
+            return self.DISK_PROBE_MB / (time.perf_counter() - start)
+        except OSError:
+            return None
+        finally:
+            probe_path.unlink(missing_ok=True)
+    
+    def _compile_workers(self, variant_names: List[str]) -> int:
+        """Parallel compilations that fit in available memory and disk bandwidth"""
+        if not variant_names:
+            return 1
+        
+        limits = [len(variant_names), self.MAX_COMPILE_WORKERS, os.cpu_count() or 2]
+        
+        try:
+            import psutil
+            available_mb = psutil.virtual_memory().available / (1024 * 1024)
+            largest_mb = max(self.MODEL_VARIANTS[name]['file_size_mb'] for name in variant_names)
+            limits.append(int(available_mb // (largest_mb * self.MEMORY_PER_MODEL_FACTOR)))
+        except ImportError:
+            limits.append(2)
+        
+        disk_mbps = self._probe_disk_mbps()
+        if disk_mbps:
+            limits.append(int(disk_mbps // self.DISK_MBPS_PER_WORKER))
+        
+        workers = max(1, min(limits))
+        logger.info(
+            f"Compiling {len(variant_names)} variants with {workers} workers "
+            f"(disk {disk_mbps or 0:.0f} MB/s)"
+        )
+        return workers
     
     def compile_all_models(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Compile all model variants for both kids and educator profiles"""
+        """
+        Compile all model variants for both kids and educator profiles
+        
+        Variants whose base model digest, rendered modelfile and performance
+        parameters match the previous build are reused from the output
+        directory instead of being created and exported again.
+        """
         results = {
             'kids': [],
             'educator': [],
@@ -376,39 +522,44 @@ class ModelCompiler:
                 'total_models': 0,
                 'successful': 0,
                 'failed': 0,
+                'rebuilt': 0,
+                'reused': 0,
                 'total_size_mb': 0
             }
         }
         
+        # Pull missing base models once, before kids and educator variants share them
+        digests = self._base_model_digests()
+        for variant in self.MODEL_VARIANTS.values():
+            if variant['name'] not in digests and not self._model_exists(variant['name']):
+                logger.info(f"Pulling base model: {variant['name']}")
+                self._pull_model(variant['name'])
+                digests = self._base_model_digests()
+        
+        compiled: Dict[str, Dict[str, Any]] = {}
+        steps = []
+        for variant_name, variant in self.MODEL_VARIANTS.items():
+            for modelfile, suffix in [(self.kids_modelfile, 'kids'), (self.educator_modelfile, 'educator')]:
+                step = self._variant_step(variant_name, modelfile, suffix, digests.get(variant['name']), compiled)
+                steps.append((step, variant_name))
+        
+        pending = [variant_name for step, variant_name in steps if not self.cache.is_current(step)]
+        
         # Use thread pool for parallel compilation
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            futures = []
-            
-            # Queue all model compilations
-            for variant_name in self.MODEL_VARIANTS.keys():
-                # Kids model variant
-                futures.append(
-                    executor.submit(
-                        self.compile_model_variant,
-                        variant_name,
-                        self.kids_modelfile,
-                        'kids'
-                    )
-                )
-                
-                # Educator model variant
-                futures.append(
-                    executor.submit(
-                        self.compile_model_variant,
-                        variant_name,
-                        self.educator_modelfile,
-                        'educator'
-                    )
-                )
+        with ThreadPoolExecutor(max_workers=self._compile_workers(pending)) as executor:
+            futures = {
+                executor.submit(self.cache.run, step): (step.name, variant_name)
+                for step, variant_name in steps
+            }
             
             # Process results as they complete
             for future in as_completed(futures):
-                result = future.result()
+                model_name, variant_name = futures[future]
+                future.result()
+                if model_name in compiled:
+                    result = dict(compiled[model_name], cached=False)
+                else:
+                    result = self._cached_result(model_name, variant_name)
                 
                 # Categorize result
                 if 'kids' in result['name']:
@@ -421,9 +572,13 @@ class ModelCompiler:
                 if result['success']:
                     results['summary']['successful'] += 1
                     results['summary']['total_size_mb'] += result.get('size_mb', 0)
+                    results['summary']['reused' if result['cached'] else 'rebuilt'] += 1
                 else:
                     results['summary']['failed'] += 1
         
+        results['summary']['saved_seconds'] = self.cache.summary()['saved_seconds']
+        logger.info("Model build cache:\n" + self.cache.report())
+        
         # Generate deployment manifest
         self._generate_deployment_manifest(results)
         
@@ -439,6 +594,13 @@ class ModelCompiler:
                 'kids': [r for r in results['kids'] if r['success']],
                 'educator': [r for r in results['educator'] if r['success']]
             },
+            'build_cache': {
+                'rebuilt': sorted(r['name'] for r in results['kids'] + results['educator']
+                                  if r['success'] and not r['cached']),
+                'reused': sorted(r['name'] for r in results['kids'] + results['educator']
+                                 if r['success'] and r['cached']),
+                'saved_seconds': results['summary'].get('saved_seconds', 0.0)
+            },
             'hardware_detection': {
                 'strategy': 'auto_select_best',
                 'fallback_enabled': True,
@@ -495,6 +657,7 @@ def main():
         logger.info(f"Total models compiled: {results['summary']['total_models']}")
         logger.info(f"Successful: {results['summary']['successful']}")
         logger.info(f"Failed: {results['summary']['failed']}")
+        logger.info(f"Rebuilt: {results['summary']['rebuilt']}, reused: {results['summary']['reused']}")
         logger.info(f"Total size: {results['summary']['total_size_mb']:.2f} MB")
         logger.info("=" * 60)
         
@@ -8,7 +8,6 @@ Version: 6.2
 import os
 import sys
 import json
-import hashlib
 import zipfile
 import platform
 import subprocess
@@ -17,6 +16,10 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
 
+# Shared cached, parallel file hashing
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from file_hashing import get_verifying_hasher
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -440,11 +443,18 @@ class BuildValidator:
             mismatches = []
             checked = 0
             
+            present = {
+                file_path: self.dist_dir / file_path
+                for file_path in checksums
+                if (self.dist_dir / file_path).is_file()
+            }
+            actual_checksums = get_verifying_hasher().hash_files(present.values())
+            
             for file_path, expected_checksum in checksums.items():
-                full_path = self.dist_dir / file_path
+                full_path = present.get(file_path)
                 
-                if full_path.exists() and full_path.is_file():
-                    actual_checksum = self._calculate_checksum(full_path)
+                if full_path is not None:
+                    actual_checksum = actual_checksums[full_path]
                     checked += 1
                     
                     if actual_checksum != expected_checksum:
@@ -549,11 +559,7 @@ class BuildValidator:
     
     def _calculate_checksum(self, file_path: Path) -> str:
         """Calculate SHA256 checksum of file"""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(65536), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        return get_verifying_hasher().hash_file(file_path)
     
     def generate_report(self) -> None:
         """Generate validation report"""
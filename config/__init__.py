@@ -495,8 +495,8 @@ class ConfigurationManager:
             hardware.cpu_threads = cpu_info['threads']
             hardware.cpu_freq_mhz = cpu_info['freq_mhz']
             
-            # GPU detection
-            gpu_info = self._detect_gpu()
+            # GPU detection (slow probes are reused from the USB snapshot)
+            gpu_info = self._detect_gpu(hardware.ram_gb)
             hardware.gpu_available = gpu_info['available']
             hardware.gpu_vram_gb = gpu_info['vram_gb']
             
@@ -509,6 +509,41 @@ class ConfigurationManager:
         
         return hardware
     
+    def _detect_gpu(self, ram_gb: float) -> Dict[str, Any]:
+        """
+        GPU and VRAM from the shared hardware snapshot
+        
+        Returns:
+            Dictionary with GPU information
+        """
+        gpu_info = {
+            'available': False,
+            'vram_gb': 0.0,
+            'name': 'None',
+            'driver': 'None'
+        }
+        
+        try:
+            from src.hardware_snapshot import get_snapshot_service
+            gpu = get_snapshot_service(self.usb_partition).get_system()['gpu']
+        except ImportError:
+            logger.warning("Hardware snapshot service not available, assuming no GPU")
+            return gpu_info
+        
+        if gpu and gpu['available']:
+            gpu_info['available'] = True
+            gpu_info['name'] = gpu['name']
+            gpu_info['vram_gb'] = gpu['memory_gb']
+            gpu_info['driver'] = gpu['driver_version'] or 'Unknown'
+            
+            # Apple Silicon shares system RAM; up to 75% can be used by the GPU
+            if gpu['vendor'] == 'apple' and not gpu['memory_gb']:
+                gpu_info['vram_gb'] = ram_gb * 0.75
+                gpu_info['driver'] = 'Metal (Unified Memory)'
+        
+        logger.info(f"GPU detected: {gpu_info['name']}, VRAM: {gpu_info['vram_gb']:.1f}GB")
+        return gpu_info
+    
     def _detect_ram(self) -> float:
         """Detect system RAM with error handling"""
         try:
@@ -647,258 +682,6 @@ class ConfigurationManager:
         
         return cpu_info
     
-    def _detect_gpu(self) -> Dict[str, Any]:
-        """
-        Detect GPU and VRAM with complete error handling
-        FIX BUG-010: Complete implementation for all platforms
-        
-        Returns:
-            Dictionary with GPU information
-        """
-        gpu_info = {
-            'available': False,
-            'vram_gb': 0.0,
-            'name': 'None',
-            'driver': 'None'
-        }
-        
-        try:
-            if self.system == "Windows":
-                gpu_info = self._detect_gpu_windows()
-                
-            elif self.system == "Darwin":
-                gpu_info = self._detect_gpu_macos()
-                
-            elif self.system == "Linux":
-                gpu_info = self._detect_gpu_linux()
-                
-            logger.info(f"GPU detected: {gpu_info['name']}, VRAM: {gpu_info['vram_gb']:.1f}GB")
-            
-        except Exception as e:
-            logger.warning(f"GPU detection failed: {e}")
-        
-        return gpu_info
-    
-    def _detect_gpu_windows(self) -> Dict[str, Any]:
-        """Windows-specific GPU detection"""
-        gpu_info = {
-            'available': False,
-            'vram_gb': 0.0,
-            'name': 'None',
-            'driver': 'None'
-        }
-        
-        try:
-            import wmi
-            c = wmi.WMI()
-            
-            for gpu in c.Win32_VideoController():
-                if gpu.AdapterRAM and gpu.AdapterRAM > 0:
-                    gpu_info['available'] = True
-                    gpu_info['vram_gb'] = gpu.AdapterRAM / (1024**3)
-                    gpu_info['name'] = gpu.Name or 'Unknown GPU'
-                    gpu_info['driver'] = gpu.DriverVersion or 'Unknown'
-                    
-                    # Stop at first discrete GPU
-                    if 'NVIDIA' in gpu.Name or 'AMD' in gpu.Name or 'Radeon' in gpu.Name:
-                        break
-                        
-        except ImportError:
-            logger.debug("WMI not available for Windows GPU detection")
-        except Exception as e:
-            logger.debug(f"Windows GPU detection error: {e}")
-            
-            # Try DirectX fallback
-            try:
-                result = subprocess.run(
-                    ['wmic', 'path', 'win32_VideoController', 'get', 'name,AdapterRAM'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')
-                    for line in lines[1:]:  # Skip header
-                        if line.strip():
-                            parts = line.split()
-                            if len(parts) > 1 and parts[0].isdigit():
-                                gpu_info['available'] = True
-                                gpu_info['vram_gb'] = int(parts[0]) / (1024**3)
-                                gpu_info['name'] = ' '.join(parts[1:])
-                                break
-            except:
-                pass
-        
-        return gpu_info
-    
-    def _detect_gpu_macos(self) -> Dict[str, Any]:
-        """macOS-specific GPU detection"""
-        gpu_info = {
-            'available': False,
-            'vram_gb': 0.0,
-            'name': 'None',
-            'driver': 'Metal'
-        }
-        
-        try:
-            # Use system_profiler for GPU detection
-            result = subprocess.run(
-                ['system_profiler', 'SPDisplaysDataType', '-json'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                
-                for item in data.get('SPDisplaysDataType', []):
-                    # Check for discrete GPU first
-                    if 'spdisplays_discrete' in item:
-                        gpu_info['available'] = True
-                        gpu_info['name'] = item.get('sppci_model', 'Unknown GPU')
-                        
-                        # Parse VRAM
-                        vram_str = item.get('spdisplays_vram', '0')
-                        if 'GB' in vram_str:
-                            gpu_info['vram_gb'] = float(vram_str.replace('GB', '').strip())
-                        elif 'MB' in vram_str:
-                            gpu_info['vram_gb'] = float(vram_str.replace('MB', '').strip()) / 1024
-                        
-                        break
-                    
-                    # Apple Silicon unified memory
-                    elif 'apple_m' in item.get('sppci_model', '').lower():
-                        gpu_info['available'] = True
-                        gpu_info['name'] = item.get('sppci_model', 'Apple Silicon')
-                        
-                        # For Apple Silicon, use a portion of system RAM as "VRAM"
-                        system_ram = self._detect_ram()
-                        # Assume up to 75% can be used for GPU on Apple Silicon
-                        gpu_info['vram_gb'] = system_ram * 0.75
-                        gpu_info['driver'] = 'Metal (Unified Memory)'
-                        break
-                        
-        except subprocess.TimeoutExpired:
-            logger.debug("system_profiler timeout on macOS")
-        except Exception as e:
-            logger.debug(f"macOS GPU detection error: {e}")
-        
-        return gpu_info
-    
-    def _detect_gpu_linux(self) -> Dict[str, Any]:
-        """Linux-specific GPU detection"""
-        gpu_info = {
-            'available': False,
-            'vram_gb': 0.0,
-            'name': 'None',
-            'driver': 'None'
-        }
-        
-        # Try NVIDIA first
-        try:
-            result = subprocess.run(
-                ['nvidia-smi', '--query-gpu=name,memory.total,driver_version', '--format=csv,noheader'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                parts = result.stdout.strip().split(',')
-                if len(parts) >= 2:
-                    gpu_info['available'] = True
-                    gpu_info['name'] = parts[0].strip()
-                    
-                    # Parse VRAM (comes in MB)
-                    vram_str = parts[1].strip()
-                    if 'MiB' in vram_str:
-                        vram_mb = float(vram_str.replace('MiB', '').strip())
-                        gpu_info['vram_gb'] = vram_mb / 1024
-                    
-                    if len(parts) >= 3:
-                        gpu_info['driver'] = parts[2].strip()
-                    
-                    return gpu_info
-                    
-        except FileNotFoundError:
-            logger.debug("nvidia-smi not found")
-        except Exception as e:
-            logger.debug(f"NVIDIA detection error: {e}")
-        
-        # Try AMD ROCm
-        try:
-            result = subprocess.run(
-                ['rocm-smi', '--showmeminfo', 'vram'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                # Parse ROCm output
-                lines = result.stdout.strip().split('\n')
-                for line in lines:
-                    if 'VRAM Total' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            vram_str = parts[1].strip()
-                            if 'MB' in vram_str:
-                                vram_mb = float(vram_str.replace('MB', '').strip())
-                                gpu_info['vram_gb'] = vram_mb / 1024
-                                gpu_info['available'] = True
-                                gpu_info['name'] = 'AMD GPU'
-                                gpu_info['driver'] = 'ROCm'
-                                return gpu_info
-                                
-        except FileNotFoundError:
-            logger.debug("rocm-smi not found")
-        except Exception as e:
-            logger.debug(f"AMD ROCm detection error: {e}")
-        
-        # Try lspci as fallback
-        try:
-            result = subprocess.run(
-                ['lspci', '-v'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                for i, line in enumerate(lines):
-                    if 'VGA compatible controller' in line or 'Display controller' in line:
-                        gpu_info['available'] = True
-                        
-                        # Extract GPU name
-                        parts = line.split(': ')
-                        if len(parts) >= 2:
-                            gpu_info['name'] = parts[1].strip()
-                        
-                        # Look for memory in next few lines
-                        for j in range(i+1, min(i+10, len(lines))):
-                            if 'Memory' in lines[j] and 'prefetchable' in lines[j]:
-                                # Try to parse memory size
-                                import re
-                                match = re.search(r'\[size=(\d+)([MG])\]', lines[j])
-                                if match:
-                                    size = int(match.group(1))
-                                    unit = match.group(2)
-                                    if unit == 'G':
-                                        gpu_info['vram_gb'] = float(size)
-                                    elif unit == 'M':
-                                        gpu_info['vram_gb'] = size / 1024
-                                    break
-                        break
-                        
-        except FileNotFoundError:
-            logger.debug("lspci not found")
-        except Exception as e:
-            logger.debug(f"lspci detection error: {e}")
-        
-        return gpu_info
-    
     def _determine_tier(self, hardware: HardwareInfo) -> HardwareTier:
         """Determine hardware tier based on capabilities"""
         # Check tiers from highest to lowest
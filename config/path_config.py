@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Standardized Path Configuration
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Single source of truth for the partition names, marker files and directory
+layout of the CD-ROM and USB partitions (see config/partition_layout.json),
+and for locating the mounted partitions at runtime. Pipelines, production
+tooling and tests resolve every partition path through get_path_config().
+
+SUNFLOWER_CDROM_PATH and SUNFLOWER_USB_PATH override detection, as set by
+the platform launchers when they already know where the device is mounted.
+"""
+
+import os
+import string
+import logging
+import platform
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PathConfiguration:
+    """Partition layout and detected mount points"""
+
+    CDROM_PARTITION_NAME = "SUNFLOWER_CD"
+    USB_PARTITION_NAME = "SUNFLOWER_DATA"
+
+    CDROM_ID_FILE = "sunflower_cd.id"
+    USB_ID_FILE = "sunflower_data.id"
+
+    # Logical name -> directory on the partition
+    CDROM_STRUCTURE: Dict[str, str] = {
+        'launchers': 'launchers',
+        'models': 'models',
+        'modelfiles': 'modelfiles',
+        'ollama': 'ollama',
+        'open_webui': 'open-webui',
+        'interface': 'interface',
+        'resources': 'resources',
+        'docs': 'docs',
+        'security': 'security',
+        'pipelines': 'pipelines',
+        'src': 'src',
+        'config': 'config',
+    }
+
+    USB_STRUCTURE: Dict[str, str] = {
+        'profiles': 'profiles',
+        'conversations': 'conversations',
+        'sessions': 'sessions',
+        'logs': 'logs',
+        'logs_system': 'logs/system',
+        'safety': 'safety',
+        'progress': 'progress',
+        'backups': 'backups',
+        'backups_auto': 'backups/auto',
+        'backups_manual': 'backups/manual',
+        'cache': 'cache',
+        'cache_models': 'cache/models',
+        'cache_temp': 'cache/temp',
+        'config': '.config',
+        'security': '.security',
+    }
+
+    def __init__(self, auto_detect: bool = True):
+        """
+        Args:
+            auto_detect: Search the mounted volumes for both partitions now
+        """
+        self.system = platform.system()
+        self.cdrom_path: Optional[Path] = None
+        self.usb_path: Optional[Path] = None
+
+        if auto_detect:
+            self.detect()
+
+    def detect(self) -> None:
+        """Locate both partitions by their marker files"""
+        self.cdrom_path = self._find_partition(
+            os.environ.get("SUNFLOWER_CDROM_PATH"), self.CDROM_ID_FILE, writable=False
+        )
+        self.usb_path = self._find_partition(
+            os.environ.get("SUNFLOWER_USB_PATH"), self.USB_ID_FILE, writable=True
+        )
+        logger.info(f"CD-ROM partition: {self.cdrom_path}, USB partition: {self.usb_path}")
+
+    def _candidate_volumes(self) -> List[Path]:
+        """Mounted volume roots for this platform"""
+        if self.system == "Windows":
+            return [Path(f"{letter}:\\") for letter in string.ascii_uppercase]
+
+        if self.system == "Darwin":
+            roots = [Path("/Volumes")]
+        else:
+            user = os.environ.get('USER', '')
+            roots = [Path("/media") / user, Path("/run/media") / user,
+                     Path("/media"), Path("/mnt")]
+
+        volumes = []
+        for root in roots:
+            try:
+                volumes.extend(p for p in root.iterdir() if p.is_dir())
+            except OSError:
+                continue
+        return volumes
+
+    def _find_partition(self, override: Optional[str], marker: str,
+                        writable: bool) -> Optional[Path]:
+        """First volume carrying the marker file (and writable, if required)"""
+        candidates = [Path(override)] if override else self._candidate_volumes()
+
+        for volume in candidates:
+            try:
+                if not (volume / marker).exists():
+                    continue
+                if writable and not os.access(volume, os.W_OK):
+                    logger.warning(f"{volume} carries {marker} but is not writable")
+                    continue
+                return volume
+            except OSError:
+                continue
+        return None
+
+
+def _resolve(root: Optional[Path], structure: Dict[str, str], subpath: str) -> Optional[Path]:
+    """Partition path for a logical directory name or a relative subpath"""
+    if root is None:
+        return None
+    if not subpath:
+        return Path(root)
+    return Path(root) / structure.get(subpath, subpath)
+
+
+_path_config: Optional[PathConfiguration] = None
+_path_config_lock = threading.Lock()
+
+
+def get_path_config() -> PathConfiguration:
+    """Process-wide path configuration, detected on first use"""
+    global _path_config
+    with _path_config_lock:
+        if _path_config is None:
+            _path_config = PathConfiguration()
+        return _path_config
+
+
+def get_cdrom_path(subpath: str = '') -> Optional[Path]:
+    """Path on the read-only CD-ROM partition, or None if it is not mounted"""
+    return _resolve(get_path_config().cdrom_path, PathConfiguration.CDROM_STRUCTURE, subpath)
+
+
+def get_usb_path(subpath: str = '') -> Optional[Path]:
+    """Path on the writable USB partition, or None if it is not mounted"""
+    return _resolve(get_path_config().usb_path, PathConfiguration.USB_STRUCTURE, subpath)
+
+
+def ensure_paths_available() -> bool:
+    """Whether both partitions are mounted, re-detecting if one is missing"""
+    config = get_path_config()
+    if config.cdrom_path is None or config.usb_path is None:
+        config.detect()
+    return config.cdrom_path is not None and config.usb_path is not None
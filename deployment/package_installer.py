@@ -24,6 +24,10 @@ from dataclasses import dataclass, field
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# Shared parallel archive writers
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from parallel_archive import ParallelZipWriter, ParallelTarGzWriter
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -67,6 +71,7 @@ class PackageConfig:
     certificate: Optional[str] = None
     output_dir: Path = Path("dist")
     temp_dir: Path = Path(tempfile.gettempdir()) / "sunflower_build"
+    compression_workers: int = 0  # 0 = one per CPU
     
     def __post_init__(self):
         if not self.platform:
@@ -237,20 +242,23 @@ class ChecksumCalculator:
         files = [f for f in files if f.is_file()]
         total_files = len(files)
         
-        for index, file_path in enumerate(files):
-            if progress_callback:
-                try:
-                    progress_callback(str(file_path), index, total_files)
-                except Exception as e:
-                    logger.warning(f"Directory progress callback error: {e}")
+        # Hash in parallel (hashlib releases the GIL), report in file order
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as executor:
+            futures = [executor.submit(self.calculate_checksum, f) for f in files]
             
-            try:
+            for index, (file_path, future) in enumerate(zip(files, futures)):
+                if progress_callback:
+                    try:
+                        progress_callback(str(file_path), index, total_files)
+                    except Exception as e:
+                        logger.warning(f"Directory progress callback error: {e}")
+                
                 rel_path = file_path.relative_to(directory)
-                checksum = self.calculate_checksum(file_path)
-                checksums[str(rel_path)] = checksum
-            except Exception as e:
-                logger.error(f"Failed to checksum {file_path}: {e}")
-                checksums[str(rel_path)] = "ERROR"
+                try:
+                    checksums[str(rel_path)] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to checksum {file_path}: {e}")
+                    checksums[str(rel_path)] = "ERROR"
         
         return checksums
     
@@ -300,6 +308,7 @@ class PackageInstaller:
         self.errors: List[str] = []
         self.warnings: List[str] = []
         self.file_manifest: Dict[str, str] = {}
+        self.package_stats: Dict[str, Any] = {}
         
         # Paths
         self.source_dir = Path(__file__).parent.parent
@@ -628,22 +637,15 @@ class PackageInstaller:
         self.output_path = self.config.output_dir / output_name
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
         
-        with zipfile.ZipFile(self.output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        with ParallelZipWriter(self.output_path, self.config.compression_workers or None) as zipf:
             for root, dirs, files in os.walk(self.build_dir):
-                for file in files:
+                dirs.sort()
+                for file in sorted(files):
                     file_path = Path(root) / file
                     arc_path = file_path.relative_to(self.build_dir)
-                    zipf.write(file_path, arc_path)
-        
-        # Calculate final package checksum
-        package_checksum = self.checksum_calculator.calculate_checksum(self.output_path)
-        logger.info(f"Package checksum: {package_checksum}")
-        
-        # Create checksum file
-        checksum_file = self.output_path.with_suffix('.sha256')
-        with open(checksum_file, 'w') as f:
-            f.write(f"{package_checksum}  {self.output_path.name}\n")
+                    zipf.add_file(file_path, arc_path.as_posix())
         
+        self._write_package_checksum(zipf.stats)
         return True
     
     def _build_universal_tar(self) -> bool:
@@ -654,19 +656,25 @@ class PackageInstaller:
         self.output_path = self.config.output_dir / output_name
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
         
-        with tarfile.open(self.output_path, 'w:gz') as tarf:
-            tarf.add(self.build_dir, arcname='SunflowerAI')
+        with ParallelTarGzWriter(self.output_path, self.config.compression_workers or None) as tarf:
+            tarf.add(self.build_dir, 'SunflowerAI')
         
-        # Calculate final package checksum
-        package_checksum = self.checksum_calculator.calculate_checksum(self.output_path)
-        logger.info(f"Package checksum: {package_checksum}")
+        self._write_package_checksum(tarf.stats)
+        return True
+    
+    def _write_package_checksum(self, stats: Dict[str, Any]) -> None:
+        """Write the .sha256 file from the checksum taken while the package was written"""
+        self.package_stats = stats
+        logger.info(
+            f"Packaged {stats['files']} files ({stats['bytes_in'] / (1024*1024):.1f} MB, "
+            f"{stats['stored_files']} stored uncompressed) in {stats['seconds']:.1f}s: "
+            f"{stats['throughput_mbps']:.1f} MB/s"
+        )
+        logger.info(f"Package checksum: {stats['sha256']}")
         
-        # Create checksum file
         checksum_file = self.output_path.with_suffix('.sha256')
         with open(checksum_file, 'w') as f:
-            f.write(f"{package_checksum}  {self.output_path.name}\n")
-        
-        return True
+            f.write(f"{stats['sha256']}  {self.output_path.name}\n")
     
     def _build_usb_image(self) -> bool:
         """Build USB device image with partitions"""
@@ -705,9 +713,10 @@ class PackageInstaller:
         output_name = f"SunflowerAI_USB_{self.config.version}_{self.config.build_number}.tar.gz"
         self.output_path = self.config.output_dir / output_name
         
-        with tarfile.open(self.output_path, 'w:gz') as tarf:
-            tarf.add(usb_root, arcname='SunflowerAI_USB')
+        with ParallelTarGzWriter(self.output_path, self.config.compression_workers or None) as tarf:
+            tarf.add(usb_root, 'SunflowerAI_USB')
         
+        self._write_package_checksum(tarf.stats)
         return True
     
     def _sign_package(self) -> bool:
@@ -842,6 +851,11 @@ class PackageInstaller:
             'warnings': self.warnings,
             'output_path': str(self.output_path) if self.output_path else None,
             'file_count': len(self.file_manifest),
+            'packaging': {
+                key: self.package_stats[key]
+                for key in ('bytes_in', 'bytes_out', 'stored_files', 'seconds', 'throughput_mbps')
+                if key in self.package_stats
+            },
             'config': {
                 'version': self.config.version,
                 'build': self.config.build_number,
@@ -867,6 +881,8 @@ def main():
     parser.add_argument('--sign', action='store_true', help='Sign the package')
     parser.add_argument('--cert', help='Certificate for signing')
     parser.add_argument('--output', default='dist', help='Output directory')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Compression threads (default: one per CPU)')
     
     args = parser.parse_args()
     
@@ -889,7 +905,8 @@ def main():
         include_models=args.models,
         sign_package=args.sign,
         certificate=args.cert,
-        output_dir=Path(args.output)
+        output_dir=Path(args.output),
+        compression_workers=args.jobs
     )
     
     # Create and run installer
@@ -917,6 +934,8 @@ def main():
     if status['output_path']:
         print(f"Output: {status['output_path']}")
         print(f"Files: {status['file_count']}")
+        if status['packaging']:
+            print(f"Throughput: {status['packaging']['throughput_mbps']:.1f} MB/s")
     
     if status['errors']:
         print("\nErrors:")
@@ -25,6 +25,11 @@ import sqlite3
 import threading
 import time
 
+# Shared incremental backup store and migration transfer engine
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from backup_store import BackupStore
+from data_transfer import TransferEngine, TransferProgress
+
 # Configure production logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,6 +41,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger('SunflowerUpdateManager')
 
+# Family data included in pre-migration backups (relative to the installation)
+BACKUP_SOURCES = ["profiles", "conversations", "config.json"]
+BACKUP_RETENTION = 30  # most recent backups kept in the store
+
+# Family data copied between devices during migration (relative to the device root)
+MIGRATION_DIRECTORIES = ["family_profiles", "conversation_logs", "learning_progress", "parent_dashboard"]
+
 
 class UpdateType(Enum):
     """Types of updates available"""
@@ -470,6 +482,8 @@ class UpdateManager:
         self.backup_path = Path.home() / ".sunflowerai" / "backups"
         self.temp_path = Path(tempfile.mkdtemp(prefix="sunflower_update_"))
         self.migration_status = MigrationStatus.NOT_STARTED
+        self.migration_progress: Dict[str, Any] = {}
+        self.transfer_engine: Optional[TransferEngine] = None
         self.errors: List[str] = []
         
         # FIX BUG-024: Initialize compatibility checker
@@ -477,6 +491,9 @@ class UpdateManager:
         
         # Create necessary directories
         self.backup_path.mkdir(parents=True, exist_ok=True)
+        
+        # Incremental, deduplicated backups of family data
+        self.backup_store = BackupStore(self.backup_path / "store")
     
     def _detect_installation(self) -> Path:
         """Detect existing Sunflower installation"""
@@ -829,72 +846,80 @@ class UpdateManager:
         # ... model copy logic ...
     
     def _backup_current_data(self) -> Path:
-        """Backup current installation data"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = self.backup_path / f"backup_{timestamp}.zip"
-        
-        logger.info(f"Creating backup: {backup_file}")
-        
-        with zipfile.ZipFile(backup_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-            # Backup profiles
-            profiles_dir = self.install_path / "profiles"
-            if profiles_dir.exists():
-                for file_path in profiles_dir.rglob("*"):
-                    arc_name = file_path.relative_to(self.install_path)
-                    zf.write(file_path, arc_name)
-            
-            # Backup conversations
-            conversations_dir = self.install_path / "conversations"
-            if conversations_dir.exists():
-                for file_path in conversations_dir.rglob("*"):
-                    arc_name = file_path.relative_to(self.install_path)
-                    zf.write(file_path, arc_name)
-            
-            # Backup configuration
-            config_file = self.install_path / "config.json"
-            if config_file.exists():
-                zf.write(config_file, "config.json")
+        """
+        Backup current installation data
+        
+        Only files changed since the previous backup are read, and only
+        chunks the store has not seen before are compressed and written.
         
-        logger.info(f"Backup created: {backup_file}")
-        return backup_file
+        Returns:
+            Path of the backup's manifest
+        """
+        logger.info(f"Creating incremental backup in: {self.backup_store.root}")
+        
+        manifest = self.backup_store.backup(self.install_path, BACKUP_SOURCES)
+        self.backup_store.prune(keep=BACKUP_RETENTION)
+        
+        stats = manifest["stats"]
+        store_stats = self.backup_store.stats()
+        logger.info(
+            f"Backup created: {manifest['id']} "
+            f"({stats['files']} files, {stats['files'] - stats['files_unchanged']} changed, "
+            f"{stats['new_bytes'] / (1024 * 1024):.1f} MB new; "
+            f"store dedup ratio {store_stats['dedup_ratio']:.1f}x)"
+        )
+        return self.backup_store.manifests_dir / f"{manifest['id']}.json"
+    
+    def restore_backup(self, target: Path = None, at: Any = None) -> int:
+        """
+        Restore family data from a backup
+        
+        Args:
+            target: Directory to restore into (the installation if None)
+            at: Backup ID, or a datetime to restore the data as it was then
+                (latest backup if None)
+            
+        Returns:
+            Number of files restored
+        """
+        return self.backup_store.restore(target or self.install_path, at=at)
+    
+    def get_migration_status(self) -> Dict[str, Any]:
+        """Current migration phase with transfer progress, throughput and ETA"""
+        return dict(self.migration_progress, status=self.migration_status.value)
+    
+    def _update_transfer_progress(self, progress: TransferProgress):
+        """Progress callback from the transfer engine"""
+        self.migration_progress = progress.to_dict()
+        logger.debug(
+            f"Migration {progress.percent:.1f}% ({progress.files_done}/{progress.files_total} files), "
+            f"{progress.throughput_mbps:.1f} MB/s, ETA {progress.eta_seconds or 0:.0f}s"
+        )
     
     def _direct_data_copy(self, source: Path, target: Path) -> bool:
-        """Direct copy of data when versions are compatible"""
+        """
+        Direct copy of data when versions are compatible
+        
+        Streams and hashes every file through a journal on the target, so
+        running the migration again after an interruption resumes where it
+        stopped and skips files that already arrived intact.
+        """
         self.migration_status = MigrationStatus.TRANSFERRING
         
         try:
-            # Copy family profiles
-            source_profiles = source / "family_profiles"
-            target_profiles = target / "family_profiles"
-            
-            if source_profiles.exists():
-                logger.info("Copying family profiles")
-                shutil.copytree(source_profiles, target_profiles, dirs_exist_ok=True)
-            
-            # Copy conversation logs
-            source_conversations = source / "conversation_logs"
-            target_conversations = target / "conversation_logs"
-            
-            if source_conversations.exists():
-                logger.info("Copying conversation logs")
-                shutil.copytree(source_conversations, target_conversations, dirs_exist_ok=True)
-            
-            # Copy learning progress
-            source_progress = source / "learning_progress"
-            target_progress = target / "learning_progress"
-            
-            if source_progress.exists():
-                logger.info("Copying learning progress")
-                shutil.copytree(source_progress, target_progress, dirs_exist_ok=True)
-            
-            # Copy parent dashboard data
-            source_dashboard = source / "parent_dashboard"
-            target_dashboard = target / "parent_dashboard"
-            
-            if source_dashboard.exists():
-                logger.info("Copying parent dashboard data")
-                shutil.copytree(source_dashboard, target_dashboard, dirs_exist_ok=True)
+            self.transfer_engine = TransferEngine(
+                source,
+                target,
+                MIGRATION_DIRECTORIES,
+                progress_callback=self._update_transfer_progress
+            )
             
+            logger.info(f"Copying family data from {source} to {target}")
+            stats = self.transfer_engine.run()
+            logger.info(
+                f"Data copy finished: {stats['copied']} copied ({stats['resumed']} resumed), "
+                f"{stats['skipped']} already present"
+            )
             return True
             
         except Exception as e:
@@ -906,15 +931,17 @@ class UpdateManager:
         """Verify that migration was successful"""
         logger.info("Verifying migration")
         
-        # Check that key directories exist
-        required_dirs = [
-            "family_profiles",
-            "conversation_logs",
-            "learning_progress",
-            "parent_dashboard"
-        ]
+        # Compare every transferred file against its source digest
+        if self.transfer_engine is not None:
+            verified, problems = self.transfer_engine.verify()
+            if not verified:
+                for problem in problems:
+                    logger.warning(f"Migration verification: {problem}")
+                self.errors.extend(problems)
+                return False
         
-        for dir_name in required_dirs:
+        # Check that key directories exist
+        for dir_name in MIGRATION_DIRECTORIES:
             dir_path = target_device / dir_name
             if not dir_path.exists():
                 logger.warning(f"Missing directory after migration: {dir_name}")
@@ -1046,7 +1073,16 @@ class UpdateManager:
     
     def _restore_missing_files(self, missing_files: List[str]) -> bool:
         """Attempt to restore missing files from backup"""
-        # Find most recent backup
+        if self.backup_store.list_backups():
+            try:
+                restored = self.backup_store.restore(self.install_path, paths=missing_files)
+                logger.info(f"Restored {restored} files from the backup store")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to restore from backup store: {e}")
+                return False
+        
+        # Backups made before the incremental store
         backups = sorted(self.backup_path.glob("backup_*.zip"))
         
         if not backups:
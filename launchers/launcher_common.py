@@ -7,6 +7,7 @@ FIXED: BUG-008 - Added timeout configuration to all subprocess calls
 """
 
 import os
+import re
 import sys
 import json
 import time
@@ -15,12 +16,16 @@ import hashlib
 import platform
 import subprocess
 import logging
+import logging.handlers
 import psutil
 import threading
+import urllib.error
+import urllib.request
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple, List, Any
+from typing import Dict, Optional, Tuple, List, Any, Callable
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +34,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger('launcher_common')
 
+# Shared hardware snapshot service, shipped next to this module or in src/
+try:
+    sys.path.append(str(Path(__file__).parent.parent / 'src'))
+    from hardware_snapshot import get_snapshot_service
+except ImportError:
+    get_snapshot_service = None
+
+try:
+    from tier_calibration import TierCalibrator, model_size_rank
+except ImportError:
+    TierCalibrator = None
+
 # Timeout configuration constants
 DEFAULT_SUBPROCESS_TIMEOUT = 30.0  # 30 seconds default
 QUICK_COMMAND_TIMEOUT = 5.0        # 5 seconds for quick commands
@@ -36,6 +53,25 @@ LONG_RUNNING_TIMEOUT = 300.0       # 5 minutes for long operations
 INSTALL_TIMEOUT = 600.0             # 10 minutes for installations
 NETWORK_TIMEOUT = 60.0              # 1 minute for network operations
 
+# Ollama API endpoint used by the launcher
+OLLAMA_URL = 'http://localhost:11434'
+
+# Lines child processes print once they accept connections
+OLLAMA_READY_PATTERN = r'Listening on'
+OPENWEBUI_READY_PATTERN = r'Uvicorn running on|Application startup complete'
+
+# Captured child process output
+PROCESS_LOG_MAX_BYTES = 5 * 1024 * 1024  # 5MB per file
+PROCESS_LOG_BACKUPS = 3
+
+# Model variant per hardware tier
+TIER_MODELS = {
+    'high': 'sunflower-kids-7b',
+    'medium': 'sunflower-kids-3b',
+    'low': 'sunflower-kids-1b',
+    'minimum': 'sunflower-kids-1b-q4'
+}
+
 
 @dataclass
 class TimeoutConfig:
@@ -61,15 +97,245 @@ class TimeoutConfig:
         return timeouts.get(operation_type, self.default)
 
 
+class SupervisedProcess:
+    """
+    Background process whose output is always drained
+    
+    stdout and stderr are merged and read by a thread into a size-capped
+    rotating log file, so the child can never block on a full pipe. A
+    readiness regex marks the process ready when it appears in the output,
+    and crashed processes can be restarted with exponential backoff.
+    Exposes the Popen methods used by the launchers (pid, poll, wait,
+    terminate, kill) so it can be tracked like a plain process.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        command: List[str],
+        cwd: Optional[Path] = None,
+        env: Optional[Dict[str, str]] = None,
+        log_dir: Optional[Path] = None,
+        ready_pattern: Optional[str] = None,
+        restart: bool = False,
+        max_restarts: int = 5,
+        backoff_initial: float = 1.0,
+        backoff_max: float = 30.0,
+        stable_seconds: float = 60.0
+    ):
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.ready_pattern = re.compile(ready_pattern) if ready_pattern else None
+        self.restart = restart
+        self.max_restarts = max_restarts
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.stable_seconds = stable_seconds
+        
+        self.process: Optional[subprocess.Popen] = None
+        self.restarts = 0
+        self.lines_captured = 0
+        self.last_lines: List[str] = []
+        
+        self._ready = False
+        self._exited = False
+        self._stopping = threading.Event()
+        self._condition = threading.Condition()
+        self._watcher: Optional[threading.Thread] = None
+        
+        self.log_file = Path(log_dir) / f"{name}.log" if log_dir else None
+        self._output_logger = self._create_output_logger()
+    
+    def _create_output_logger(self) -> logging.Logger:
+        """Logger writing this process's output to its own rotating file"""
+        if self.log_file is None:
+            return logging.getLogger(f'launcher_common.{self.name}')
+        
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            self.log_file,
+            maxBytes=PROCESS_LOG_MAX_BYTES,
+            backupCount=PROCESS_LOG_BACKUPS,
+            encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        
+        # Not registered globally and not propagated to the console
+        output_logger = logging.Logger(f'process.{self.name}', logging.INFO)
+        output_logger.addHandler(handler)
+        return output_logger
+    
+    def start(self) -> 'SupervisedProcess':
+        """Start the process and its output and exit watchers"""
+        self._spawn()
+        self._watcher = threading.Thread(
+            target=self._watch, name=f"supervise-{self.name}", daemon=True
+        )
+        self._watcher.start()
+        return self
+    
+    def _spawn(self) -> None:
+        """Launch the child with merged, drained output"""
+        logger.info(f"Starting background process '{self.name}': {' '.join(self.command)}")
+        
+        with self._condition:
+            self._ready = self.ready_pattern is None
+            self._exited = False
+            self.process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                cwd=str(self.cwd) if self.cwd else None,
+                env=self.env,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                bufsize=1
+            )
+            self._condition.notify_all()
+        
+        self._drainer = threading.Thread(
+            target=self._drain, args=(self.process,), name=f"drain-{self.name}", daemon=True
+        )
+        self._drainer.start()
+    
+    def _drain(self, process: subprocess.Popen) -> None:
+        """Copy child output to the log and watch for the readiness line"""
+        for line in process.stdout:
+            line = line.rstrip()
+            self._output_logger.info(line)
+            self.lines_captured += 1
+            self.last_lines = (self.last_lines + [line])[-20:]
+            
+            if not self._ready and self.ready_pattern and self.ready_pattern.search(line):
+                with self._condition:
+                    self._ready = True
+                    self._condition.notify_all()
+                logger.info(f"Process '{self.name}' is ready")
+        
+        process.stdout.close()
+    
+    def _watch(self) -> None:
+        """Wait for the child to exit and restart it with backoff if allowed"""
+        backoff = self.backoff_initial
+        
+        while True:
+            started = time.monotonic()
+            returncode = self.process.wait()
+            self._drainer.join(timeout=5)
+            
+            if self._stopping.is_set():
+                break
+            
+            logger.error(f"Background process '{self.name}' exited with code {returncode}")
+            
+            if not self.restart or self.restarts >= self.max_restarts:
+                break
+            
+            # A process that stayed up for a while starts over with short backoff
+            if time.monotonic() - started >= self.stable_seconds:
+                backoff = self.backoff_initial
+            
+            logger.info(f"Restarting '{self.name}' in {backoff:.1f}s")
+            if self._stopping.wait(backoff):
+                break
+            
+            self.restarts += 1
+            backoff = min(backoff * 2, self.backoff_max)
+            try:
+                self._spawn()
+            except OSError as e:
+                logger.error(f"Failed to restart '{self.name}': {e}")
+                break
+        
+        with self._condition:
+            self._exited = True
+            self._condition.notify_all()
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the readiness line
+        Returns False on timeout or if the process exited for good first
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._ready or self._exited, timeout)
+            return self._ready and not self._exited
+    
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+    
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.process.returncode if self.process else None
+    
+    def poll(self) -> Optional[int]:
+        """Exit code once stopped for good; None while running or restarting"""
+        if self.process is None:
+            return None
+        
+        returncode = self.process.poll()
+        if (returncode is not None and self.restart
+                and not self._exited and not self._stopping.is_set()):
+            return None
+        return returncode
+    
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Wait for the current child to exit"""
+        return self.process.wait(timeout=timeout)
+    
+    def terminate(self) -> None:
+        """Stop the process without restarting it"""
+        self._stopping.set()
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+    
+    def kill(self) -> None:
+        """Kill the process without restarting it"""
+        self._stopping.set()
+        if self.process and self.process.poll() is None:
+            self.process.kill()
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """Terminate gracefully, killing after timeout"""
+        self.terminate()
+        if self.process:
+            try:
+                self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Force killing process '{self.name}'")
+                self.kill()
+                self.process.wait()
+        if self._watcher:
+            self._watcher.join(timeout=5)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """State for diagnostics"""
+        return {
+            'name': self.name,
+            'pid': self.pid,
+            'running': self.process is not None and self.process.poll() is None,
+            'ready': self._ready,
+            'restarts': self.restarts,
+            'lines_captured': self.lines_captured,
+            'log_file': str(self.log_file) if self.log_file else None
+        }
+
+
 class SubprocessRunner:
     """
     Secure subprocess runner with timeout management
     FIXED: All subprocess calls now have proper timeouts
     """
     
-    def __init__(self, timeout_config: Optional[TimeoutConfig] = None):
+    def __init__(self, timeout_config: Optional[TimeoutConfig] = None,
+                 log_dir: Optional[Path] = None):
         self.timeout_config = timeout_config or TimeoutConfig()
-        self.active_processes: Dict[str, subprocess.Popen] = {}
+        self.log_dir = log_dir
+        self.active_processes: Dict[str, SupervisedProcess] = {}
         self._lock = threading.Lock()
     
     def run_command(
@@ -144,70 +410,39 @@ class SubprocessRunner:
         name: str,
         command: List[str],
         cwd: Optional[Path] = None,
-        env: Optional[Dict[str, str]] = None
-    ) -> subprocess.Popen:
+        env: Optional[Dict[str, str]] = None,
+        ready_pattern: Optional[str] = None,
+        restart: bool = False
+    ) -> SupervisedProcess:
         """
-        Start a background process with monitoring
+        Start a supervised background process
         
         Args:
             name: Identifier for the process
             command: Command to execute
             cwd: Working directory
             env: Environment variables
+            ready_pattern: Regex of the output line that signals readiness
+            restart: Restart with backoff if the process crashes
             
         Returns:
-            Popen object for the started process
+            SupervisedProcess for the started process
         """
-        logger.info(f"Starting background process '{name}': {' '.join(command)}")
-        
-        process = subprocess.Popen(
+        process = SupervisedProcess(
+            name,
             command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
             cwd=cwd,
             env=env,
-            text=True
-        )
+            log_dir=self.log_dir,
+            ready_pattern=ready_pattern,
+            restart=restart
+        ).start()
         
         with self._lock:
             self.active_processes[name] = process
         
-        # Start monitoring thread
-        monitor_thread = threading.Thread(
-            target=self._monitor_process,
-            args=(name, process),
-            daemon=True
-        )
-        monitor_thread.start()
-        
         return process
     
-    def _monitor_process(self, name: str, process: subprocess.Popen):
-        """Monitor a background process for issues"""
-        start_time = time.time()
-        warning_timeout = self.timeout_config.long
-        
-        while process.poll() is None:
-            elapsed = time.time() - start_time
-            
-            # Warn if process runs too long
-            if elapsed > warning_timeout:
-                logger.warning(
-                    f"Background process '{name}' has been running for "
-                    f"{elapsed:.0f}s (PID: {process.pid})"
-                )
-                warning_timeout *= 2  # Double warning interval
-            
-            time.sleep(1)
-        
-        # Process ended
-        with self._lock:
-            if name in self.active_processes:
-                del self.active_processes[name]
-        
-        if process.returncode != 0:
-            logger.error(f"Background process '{name}' exited with code {process.returncode}")
-    
     def stop_all_processes(self, timeout: float = 10.0):
         """Stop all active background processes"""
         with self._lock:
@@ -216,24 +451,35 @@ class SubprocessRunner:
         for name, process in processes:
             try:
                 logger.info(f"Stopping process '{name}'")
-                process.terminate()
-                process.wait(timeout=timeout / len(processes))
-            except subprocess.TimeoutExpired:
-                logger.warning(f"Force killing process '{name}'")
-                process.kill()
-                process.wait()
+                process.stop(timeout=timeout / len(processes))
             except Exception as e:
                 logger.error(f"Error stopping process '{name}': {e}")
+        
+        with self._lock:
+            self.active_processes.clear()
 
 
 class HardwareDetector:
     """Hardware detection and validation with timeouts"""
     
-    def __init__(self):
+    def __init__(self, usb_path: Optional[Path] = None):
+        self.usb_path = Path(usb_path) if usb_path else None
         self.runner = SubprocessRunner()
+        self._hardware: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        
+        # Slow GPU probes are shared with the other detectors and persisted on the USB
+        self.snapshots = get_snapshot_service(self.usb_path) if get_snapshot_service else None
     
-    def detect_hardware(self) -> Dict[str, Any]:
-        """Detect system hardware capabilities"""
+    def detect_hardware(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """Detect system hardware capabilities (probed once per launch)"""
+        with self._lock:
+            if self._hardware is None or force_refresh:
+                self._hardware = self._probe_hardware()
+            return dict(self._hardware)
+    
+    def _probe_hardware(self) -> Dict[str, Any]:
+        """Run the hardware probes"""
         hardware = {
             'platform': platform.system(),
             'architecture': platform.machine(),
@@ -243,82 +489,21 @@ class HardwareDetector:
             'cpu_freq': psutil.cpu_freq().current if psutil.cpu_freq() else 0
         }
         
-        # Platform-specific detection with timeouts
-        if platform.system() == 'Windows':
-            hardware.update(self._detect_windows_gpu())
-        elif platform.system() == 'Darwin':
-            hardware.update(self._detect_macos_gpu())
-        else:
-            hardware.update(self._detect_linux_gpu())
+        hardware.update(self._get_gpu_info())
         
         return hardware
     
-    def _detect_windows_gpu(self) -> Dict[str, Any]:
-        """Detect GPU on Windows with timeout"""
-        gpu_info = {'gpu': 'Unknown', 'gpu_memory_gb': 0}
-        
-        try:
-            # Use WMI to get GPU info with timeout
-            result = self.runner.run_command(
-                ['wmic', 'path', 'win32_videocontroller', 'get', 'name,adapterram'],
-                operation_type='quick',
-                check=False
-            )
-            
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                if len(lines) > 1:
-                    gpu_info['gpu'] = lines[1].split()[0] if lines[1] else 'Unknown'
-                    
-        except (subprocess.TimeoutExpired, Exception) as e:
-            logger.warning(f"GPU detection failed: {e}")
-        
-        return gpu_info
-    
-    def _detect_macos_gpu(self) -> Dict[str, Any]:
-        """Detect GPU on macOS with timeout"""
-        gpu_info = {'gpu': 'Unknown', 'gpu_memory_gb': 0}
-        
-        try:
-            result = self.runner.run_command(
-                ['system_profiler', 'SPDisplaysDataType', '-json'],
-                operation_type='quick',
-                check=False
-            )
-            
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                # Parse GPU info from system_profiler output
-                if 'SPDisplaysDataType' in data:
-                    displays = data['SPDisplaysDataType']
-                    if displays and len(displays) > 0:
-                        gpu_info['gpu'] = displays[0].get('sppci_model', 'Unknown')
-                        
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, Exception) as e:
-            logger.warning(f"GPU detection failed: {e}")
-        
-        return gpu_info
-    
-    def _detect_linux_gpu(self) -> Dict[str, Any]:
-        """Detect GPU on Linux with timeout"""
+    def _get_gpu_info(self) -> Dict[str, Any]:
+        """GPU name and memory from the shared hardware snapshot"""
         gpu_info = {'gpu': 'Unknown', 'gpu_memory_gb': 0}
+        if self.snapshots is None:
+            return gpu_info
         
-        try:
-            result = self.runner.run_command(
-                ['lspci', '-v'],
-                operation_type='quick',
-                check=False
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'VGA' in line or '3D' in line:
-                        gpu_info['gpu'] = line.split(':', 1)[1].strip() if ':' in line else 'Unknown'
-                        break
-                        
-        except (subprocess.TimeoutExpired, Exception) as e:
-            logger.warning(f"GPU detection failed: {e}")
-        
+        gpu = self.snapshots.get_system(
+            timeouts={'gpu': self.runner.timeout_config.quick + 1.0}
+        )['gpu']
+        if gpu and gpu['available']:
+            gpu_info = {'gpu': gpu['name'], 'gpu_memory_gb': gpu['memory_gb']}
         return gpu_info
     
     def determine_hardware_tier(self) -> str:
@@ -334,6 +519,451 @@ class HardwareDetector:
             return 'low'
         else:
             return 'minimum'
+    
+    def get_optimal_model(self) -> str:
+        """Get the Sunflower model variant for this machine's hardware tier"""
+        return TIER_MODELS[self.determine_hardware_tier()]
+    
+    def get_candidate_models(self) -> List[str]:
+        """Variants calibration may choose: the tier model and every smaller one"""
+        tier_model = self.get_optimal_model()
+        if TierCalibrator is None:
+            return [tier_model]
+        
+        ceiling = model_size_rank(tier_model)
+        return sorted((m for m in TIER_MODELS.values() if model_size_rank(m) <= ceiling),
+                      key=model_size_rank, reverse=True)
+    
+    def get_calibrated_model(self, base_url: str = OLLAMA_URL) -> str:
+        """
+        Largest variant up to the tier's model that meets the response budget
+        Measured once per machine against the running Ollama and cached on the
+        USB partition; the static tier model is used when nothing can be measured
+        """
+        tier_model = self.get_optimal_model()
+        if TierCalibrator is None or self.usb_path is None:
+            return tier_model
+        
+        candidates = self.get_candidate_models()
+        
+        try:
+            selected = TierCalibrator(self.usb_path, base_url=base_url).select_model(candidates)
+        except Exception as e:
+            logger.warning(f"Tier calibration failed, using {tier_model}: {e}")
+            return tier_model
+        
+        return selected or tier_model
+
+
+class ModelResidencyManager:
+    """
+    Keeps the hardware tier's model resident in Ollama
+    Preloads it in the background, pings keep-alive on a schedule and
+    unloads it when the machine is under memory pressure
+    """
+    
+    def __init__(
+        self,
+        model: str,
+        base_url: str = OLLAMA_URL,
+        keep_alive: str = '30m',
+        ping_interval: float = 240.0,
+        memory_pressure_percent: float = 90.0,
+        memory_recovery_percent: float = 80.0,
+        request_timeout: float = LONG_RUNNING_TIMEOUT
+    ):
+        self.model = model
+        self.base_url = base_url.rstrip('/')
+        self.keep_alive = keep_alive
+        self.ping_interval = ping_interval
+        self.memory_pressure_percent = memory_pressure_percent
+        self.memory_recovery_percent = memory_recovery_percent
+        self.request_timeout = request_timeout
+        
+        self.resident = False
+        self.model_bytes: Optional[int] = None
+        self.timings: Dict[str, Any] = {
+            'load_seconds': None,
+            'first_token_seconds': None,
+            'keep_alive_pings': 0,
+            'unloads': 0,
+            'reloads': 0,
+            'last_ping': None
+        }
+        
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def _request(self, path: str, payload: Dict[str, Any]) -> Any:
+        """POST a JSON payload to Ollama and return the open response"""
+        request = urllib.request.Request(
+            f"{self.base_url}{path}",
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        return urllib.request.urlopen(request, timeout=self.request_timeout)
+    
+    def warm_up(self) -> bool:
+        """Load the model and measure load and first-token latency"""
+        try:
+            # An empty prompt only loads the model into memory
+            start = time.perf_counter()
+            with self._request('/api/generate', {
+                'model': self.model,
+                'prompt': '',
+                'keep_alive': self.keep_alive,
+                'stream': False
+            }) as response:
+                response.read()
+            load_seconds = time.perf_counter() - start
+            
+            # Time to first streamed token with the model resident
+            start = time.perf_counter()
+            first_token_seconds = None
+            with self._request('/api/generate', {
+                'model': self.model,
+                'prompt': 'Hi',
+                'keep_alive': self.keep_alive,
+                'stream': True,
+                'options': {'num_predict': 1}
+            }) as response:
+                for line in response:
+                    if first_token_seconds is None and line.strip():
+                        first_token_seconds = time.perf_counter() - start
+                    # Drain the rest so the connection is released cleanly
+            
+            with self._lock:
+                self.resident = True
+                self.timings['load_seconds'] = round(load_seconds, 3)
+                self.timings['first_token_seconds'] = (
+                    round(first_token_seconds, 3) if first_token_seconds is not None else None
+                )
+            
+            logger.info(
+                f"Model {self.model} resident: load {load_seconds:.2f}s, "
+                f"first token {self.timings['first_token_seconds']}s"
+            )
+            return True
+            
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            logger.warning(f"Model warm-up failed for {self.model}: {e}")
+            return False
+    
+    def ping(self) -> bool:
+        """Refresh the model's keep-alive timer without generating"""
+        try:
+            with self._request('/api/generate', {
+                'model': self.model,
+                'prompt': '',
+                'keep_alive': self.keep_alive,
+                'stream': False
+            }) as response:
+                response.read()
+            
+            with self._lock:
+                self.timings['keep_alive_pings'] += 1
+                self.timings['last_ping'] = datetime.now().isoformat()
+            return True
+            
+        except (urllib.error.URLError, OSError) as e:
+            logger.warning(f"Keep-alive ping failed for {self.model}: {e}")
+            return False
+    
+    def _resident_size(self) -> Optional[int]:
+        """Memory Ollama reports for the loaded model, or None if unknown"""
+        try:
+            with urllib.request.urlopen(
+                f"{self.base_url}/api/ps", timeout=self.request_timeout
+            ) as response:
+                models = json.loads(response.read()).get('models', [])
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            logger.debug(f"Could not read loaded model sizes: {e}")
+            return None
+        
+        for entry in models:
+            if entry.get('name') in (self.model, f"{self.model}:latest") and entry.get('size'):
+                return int(entry['size'])
+        return None
+    
+    def unload(self) -> bool:
+        """Ask Ollama to release the model's memory immediately"""
+        model_bytes = self._resident_size()
+        available_before = psutil.virtual_memory().available
+        try:
+            with self._request('/api/generate', {
+                'model': self.model,
+                'keep_alive': 0
+            }) as response:
+                response.read()
+            
+            # Fall back to the memory the unload actually freed
+            if model_bytes is None:
+                model_bytes = max(0, psutil.virtual_memory().available - available_before)
+            
+            with self._lock:
+                self.resident = False
+                self.model_bytes = model_bytes or self.model_bytes
+                self.timings['unloads'] += 1
+            
+            logger.info(f"Unloaded model {self.model} to relieve memory pressure")
+            return True
+            
+        except (urllib.error.URLError, OSError) as e:
+            logger.warning(f"Model unload failed for {self.model}: {e}")
+            return False
+    
+    def can_reload(self, memory: Any) -> bool:
+        """
+        Whether reloading keeps usage at or below the recovery threshold
+        Counts the model's own footprint, so a reload cannot push the machine
+        straight back over the pressure threshold and unload again
+        """
+        if memory.percent > self.memory_recovery_percent:
+            return False
+        if not self.model_bytes:
+            return True
+        
+        projected_used = memory.total - memory.available + self.model_bytes
+        return projected_used * 100.0 / memory.total <= self.memory_recovery_percent
+    
+    def check_memory(self) -> None:
+        """Unload under memory pressure and reload once there is room for the model"""
+        memory = psutil.virtual_memory()
+        
+        if self.resident and memory.percent >= self.memory_pressure_percent:
+            self.unload()
+        elif not self.resident and self.can_reload(memory):
+            if self.warm_up():
+                with self._lock:
+                    self.timings['reloads'] += 1
+    
+    def _run(self) -> None:
+        """Background loop: warm up, then keep the model resident"""
+        self.warm_up()
+        
+        while not self._stop_event.wait(self.ping_interval):
+            self.check_memory()
+            if self.resident:
+                self.ping()
+    
+    def start(self) -> None:
+        """Start preloading and keep-alive in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"model-residency-{self.model}",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the keep-alive loop (the model stays loaded until Ollama expires it)"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+    
+    def switch_model(self, model: str) -> bool:
+        """Release the current model and keep another variant resident instead"""
+        with self._lock:
+            previous = self.model
+            if model == previous:
+                return self.resident
+            self.model = model
+            self.resident = False
+            self.model_bytes = None
+        
+        logger.info(f"Switching resident model from {previous} to {model}")
+        try:
+            with self._request('/api/generate', {
+                'model': previous,
+                'keep_alive': 0
+            }) as response:
+                response.read()
+        except (urllib.error.URLError, OSError) as e:
+            logger.warning(f"Could not release model {previous}: {e}")
+        
+        return self.warm_up()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get residency state and timings"""
+        with self._lock:
+            return {'model': self.model, 'resident': self.resident, **self.timings}
+
+
+@dataclass
+class BootTask:
+    """A single step of the launcher boot sequence"""
+    name: str
+    func: Callable[[], Any]
+    depends_on: List[str] = field(default_factory=list)
+    required: bool = True
+    status: str = 'pending'  # pending, running, done, failed, skipped
+    start: Optional[float] = None
+    end: Optional[float] = None
+    error: Optional[str] = None
+    ready: threading.Event = field(default_factory=threading.Event, repr=False)
+
+
+class BootSequence:
+    """
+    Runs launcher startup steps as a dependency graph
+    Independent steps run concurrently; each step waits on the readiness
+    events of the steps it depends on. A step fails if it raises or
+    returns False, and everything depending on it is skipped.
+    """
+    
+    def __init__(self, name: str = 'startup'):
+        self.name = name
+        self.tasks: Dict[str, BootTask] = {}
+        self.started_at: Optional[datetime] = None
+        self._origin = 0.0
+        self.total_seconds: Optional[float] = None
+    
+    def add_task(self, name: str, func: Callable[[], Any],
+                 depends_on: Optional[List[str]] = None, required: bool = True) -> None:
+        """Register a boot step"""
+        self.tasks[name] = BootTask(name, func, list(depends_on or []), required)
+    
+    def _validate(self) -> None:
+        """Reject unknown dependencies and cycles"""
+        visiting, visited = set(), set()
+        
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Boot sequence has a dependency cycle at '{name}'")
+            visiting.add(name)
+            for dependency in self.tasks[name].depends_on:
+                if dependency not in self.tasks:
+                    raise ValueError(f"Boot step '{name}' depends on unknown step '{dependency}'")
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+        
+        for name in self.tasks:
+            visit(name)
+    
+    def _run_task(self, task: BootTask) -> None:
+        """Wait for dependencies, then run one step"""
+        try:
+            for dependency in task.depends_on:
+                self.tasks[dependency].ready.wait()
+            
+            failed = [d for d in task.depends_on if self.tasks[d].status != 'done']
+            if failed:
+                task.status = 'skipped'
+                task.error = f"dependency failed: {', '.join(failed)}"
+                return
+            
+            task.status = 'running'
+            task.start = time.perf_counter() - self._origin
+            try:
+                result = task.func()
+                task.status = 'failed' if result is False else 'done'
+            except Exception as e:
+                task.status = 'failed'
+                task.error = str(e)
+                logger.error(f"Boot step '{task.name}' failed: {e}")
+            task.end = time.perf_counter() - self._origin
+            
+            logger.info(f"Boot step '{task.name}' {task.status} in {task.end - task.start:.2f}s")
+        finally:
+            task.ready.set()
+    
+    def wait_for(self, name: str, timeout: Optional[float] = None) -> bool:
+        """Wait until a step finishes; True if it succeeded"""
+        task = self.tasks[name]
+        return task.ready.wait(timeout) and task.status == 'done'
+    
+    def run(self) -> bool:
+        """
+        Run all steps and block until every step has finished
+        Returns True if all required steps succeeded
+        """
+        self._validate()
+        self.started_at = datetime.now()
+        self._origin = time.perf_counter()
+        
+        # One worker per step: steps block on dependencies, not on the pool
+        with ThreadPoolExecutor(max_workers=max(1, len(self.tasks)),
+                                thread_name_prefix='boot') as executor:
+            for task in self.tasks.values():
+                executor.submit(self._run_task, task)
+        
+        self.total_seconds = time.perf_counter() - self._origin
+        
+        return all(t.status == 'done' for t in self.tasks.values() if t.required)
+    
+    def critical_path(self) -> List[str]:
+        """Chain of steps that determined total boot time"""
+        finished = [t for t in self.tasks.values() if t.end is not None]
+        if not finished:
+            return []
+        
+        path = []
+        task = max(finished, key=lambda t: t.end)
+        while task:
+            path.append(task.name)
+            dependencies = [self.tasks[d] for d in task.depends_on if self.tasks[d].end is not None]
+            task = max(dependencies, key=lambda t: t.end) if dependencies else None
+        
+        return list(reversed(path))
+    
+    def get_trace(self) -> Dict[str, Any]:
+        """Per-step timings and the critical path"""
+        return {
+            'sequence': self.name,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'total_seconds': round(self.total_seconds, 3) if self.total_seconds is not None else None,
+            'critical_path': self.critical_path(),
+            'steps': [
+                {
+                    'name': t.name,
+                    'status': t.status,
+                    'depends_on': t.depends_on,
+                    'start': round(t.start, 3) if t.start is not None else None,
+                    'end': round(t.end, 3) if t.end is not None else None,
+                    'duration': round(t.end - t.start, 3) if t.end is not None else None,
+                    'error': t.error
+                }
+                for t in self.tasks.values()
+            ]
+        }
+    
+    def write_trace(self, log_dir: Path) -> Optional[Path]:
+        """Write the startup trace to the logs directory"""
+        try:
+            log_dir = Path(log_dir)
+            log_dir.mkdir(parents=True, exist_ok=True)
+            trace = self.get_trace()
+            
+            trace_file = log_dir / f"{self.name}_trace.json"
+            with open(trace_file, 'w') as f:
+                json.dump(trace, f, indent=2)
+            
+            # Keep one line per launch to compare boot times over time
+            with open(log_dir / f"{self.name}_history.jsonl", 'a') as f:
+                f.write(json.dumps({
+                    'started_at': trace['started_at'],
+                    'total_seconds': trace['total_seconds'],
+                    'critical_path': trace['critical_path']
+                }) + '\n')
+            
+            logger.info(
+                f"Boot completed in {trace['total_seconds']}s, "
+                f"critical path: {' -> '.join(trace['critical_path'])}"
+            )
+            return trace_file
+            
+        except OSError as e:
+            logger.warning(f"Could not write startup trace: {e}")
+            return None
 
 
 class LauncherBase:
@@ -345,8 +975,11 @@ class LauncherBase:
     def __init__(self, cdrom_path: Path, usb_path: Path):
         self.cdrom_path = Path(cdrom_path)
         self.usb_path = Path(usb_path)
-        self.runner = SubprocessRunner()
-        self.hardware = HardwareDetector()
+        self.runner = SubprocessRunner(log_dir=self.usb_path / 'logs')
+        self.hardware = HardwareDetector(self.usb_path)
+        self.residency: Optional[ModelResidencyManager] = None
+        self.calibration_thread: Optional[threading.Thread] = None
+        self.boot_trace: Optional[Dict[str, Any]] = None
         self.setup_complete = False
         
         logger.info(f"Launcher initialized - CD-ROM: {cdrom_path}, USB: {usb_path}")
@@ -379,10 +1012,10 @@ class LauncherBase:
             if result.returncode != 0:
                 return False
             
-            # Check for required models
-            output = result.stdout.lower()
-            required_models = ['sunflower', 'llama']
-            return any(model in output for model in required_models)
+            # Calibration can only step down to variants that are installed
+            installed = {line.split()[0].split(':')[0]
+                         for line in result.stdout.lower().splitlines()[1:] if line.strip()}
+            return all(model in installed for model in self.hardware.get_candidate_models())
             
         except subprocess.TimeoutExpired:
             logger.error("Model check timed out")
@@ -431,17 +1064,19 @@ class LauncherBase:
             return False
     
     def load_models(self) -> bool:
-        """Load AI models with appropriate timeout"""
-        tier = self.hardware.determine_hardware_tier()
-        
-        model_map = {
-            'high': 'sunflower-kids-7b',
-            'medium': 'sunflower-kids-3b',
-            'low': 'sunflower-kids-1b',
-            'minimum': 'sunflower-kids-1b-q4'
-        }
+        """
+        Load the tier model and the smaller variants calibration may step
+        down to; only the tier model is required
+        """
+        tier_model = self.hardware.get_optimal_model()
         
-        model = model_map[tier]
+        for model in self.hardware.get_candidate_models():
+            if not self._create_model(model) and model == tier_model:
+                return False
+        return True
+    
+    def _create_model(self, model: str) -> bool:
+        """Create one model variant from its GGUF file with appropriate timeout"""
         model_file = self.cdrom_path / 'models' / f'{model}.gguf'
         
         if not model_file.exists():
@@ -472,12 +1107,14 @@ class LauncherBase:
             logger.error(f"Model loading failed: {e}")
             return False
     
-    def start_ollama_serve(self) -> subprocess.Popen:
-        """Start Ollama serve in background"""
+    def start_ollama_serve(self) -> SupervisedProcess:
+        """Start Ollama serve in background, restarting it if it crashes"""
         return self.runner.start_background_process(
             'ollama_serve',
             ['ollama', 'serve'],
-            env=os.environ.copy()
+            env=os.environ.copy(),
+            ready_pattern=OLLAMA_READY_PATTERN,
+            restart=True
         )
     
     def check_port(self, port: int, timeout: float = 5.0) -> bool:
@@ -497,7 +1134,7 @@ class LauncherBase:
             except socket.error:
                 pass
             
-            time.sleep(0.5)
+            time.sleep(0.1)
         
         return False
     
@@ -513,40 +1150,83 @@ class LauncherBase:
             return False
     
     def setup_system(self) -> bool:
-        """Complete system setup with all timeouts"""
+        """
+        Complete system setup with all timeouts
+        Independent steps run concurrently; a trace is written to the USB logs
+        """
+        boot = BootSequence('startup')
+        boot.add_task('ollama_installed', self._ensure_ollama_installed)
+        boot.add_task('hardware', self.hardware.detect_hardware)
+        boot.add_task('webui_config', self.configure_webui)
+        boot.add_task('profiles', self.create_profiles, required=False)
+        boot.add_task('ollama_serve', self._ensure_ollama_running,
+                      depends_on=['ollama_installed'])
+        boot.add_task('models', self._ensure_models,
+                      depends_on=['ollama_serve', 'hardware'])
+        # Calibrate, preload the chosen model and keep it resident
+        boot.add_task('model_residency', self.start_model_residency,
+                      depends_on=['models'], required=False)
+        
         try:
-            # Check/install Ollama
-            if not self.check_ollama():
-                logger.info("Installing Ollama...")
-                if not self.install_ollama():
-                    return False
-            
-            # Start Ollama serve
-            ollama_process = self.start_ollama_serve()
-            
-            # Wait for Ollama to be ready
-            if not self.wait_for_service('Ollama', 11434, timeout=60.0):
-                return False
-            
-            # Load models
-            if not self.check_models():
-                logger.info("Loading AI models...")
-                if not self.load_models():
-                    return False
-            
-            # Configure Open WebUI
-            if not self.configure_webui():
-                return False
-            
-            # Create initial profiles
-            self.create_profiles()
-            
-            self.setup_complete = True
-            return True
-            
+            self.setup_complete = boot.run()
         except Exception as e:
             logger.error(f"Setup failed: {e}")
-            return False
+            self.setup_complete = False
+        
+        boot.write_trace(self.usb_path / 'logs')
+        self.boot_trace = boot.get_trace()
+        return self.setup_complete
+    
+    def _ensure_ollama_installed(self) -> bool:
+        """Check for Ollama and install it if missing"""
+        if self.check_ollama():
+            return True
+        logger.info("Installing Ollama...")
+        return self.install_ollama()
+    
+    def _ensure_ollama_running(self) -> bool:
+        """Start Ollama serve unless it is already listening, then wait for its readiness line"""
+        if self.check_port(11434, timeout=0.5):
+            logger.info("Ollama is already running")
+            return True
+        
+        if self.start_ollama_serve().wait_ready(timeout=60.0):
+            return True
+        
+        logger.error("Ollama failed to start within 60s")
+        return False
+    
+    def _ensure_models(self) -> bool:
+        """Create the AI models if they are not installed yet"""
+        if self.check_models():
+            return True
+        logger.info("Loading AI models...")
+        return self.load_models()
+    
+    def start_model_residency(self) -> ModelResidencyManager:
+        """
+        Start keeping the tier model resident in Ollama right away
+        Calibration runs in the background and switches the resident model
+        if a smaller variant fits the response budget better
+        """
+        if self.residency is None:
+            self.residency = ModelResidencyManager(self.hardware.get_optimal_model())
+        self.residency.start()
+        
+        if self.calibration_thread is None:
+            self.calibration_thread = threading.Thread(
+                target=self._calibrate_resident_model,
+                name="tier-calibration",
+                daemon=True
+            )
+            self.calibration_thread.start()
+        return self.residency
+    
+    def _calibrate_resident_model(self) -> None:
+        """Measure the candidate variants and switch to the calibrated one"""
+        model = self.hardware.get_calibrated_model(self.residency.base_url)
+        if model != self.residency.model:
+            self.residency.switch_model(model)
     
     def configure_webui(self) -> bool:
         """Configure Open WebUI with timeout"""
@@ -592,7 +1272,7 @@ class LauncherBase:
         
         if main_script.exists():
             try:
-                # Start main application
+                # Start main application, restarting it if it crashes
                 process = self.runner.start_background_process(
                     'sunflower_main',
                     [
@@ -600,11 +1280,16 @@ class LauncherBase:
                         str(main_script),
                         "--cdrom-path", str(self.cdrom_path),
                         "--usb-path", str(self.usb_path)
-                    ]
+                    ],
+                    ready_pattern=OPENWEBUI_READY_PATTERN,
+                    restart=True
                 )
                 
-                # Wait for application to start
-                if self.wait_for_service('Sunflower AI', 8080, timeout=30.0):
+                # Wait for the readiness line; fall back to the port for
+                # builds that log differently, unless the process has exited
+                if process.wait_ready(timeout=30.0) or (
+                        process.poll() is None
+                        and self.wait_for_service('Sunflower AI', 8080, timeout=5.0)):
                     logger.info("Sunflower AI application started successfully")
                     return True
                 else:
@@ -621,6 +1306,9 @@ class LauncherBase:
     def cleanup(self):
         """Clean up all processes on exit"""
         logger.info("Cleaning up launcher resources...")
+        if self.residency:
+            logger.info(f"Model residency: {self.residency.get_status()}")
+            self.residency.stop()
         self.runner.stop_all_processes()
         logger.info("Cleanup complete")
 
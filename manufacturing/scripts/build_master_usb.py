@@ -22,6 +22,10 @@ import uuid
 import struct
 import tempfile
 
+# Shared cached, parallel file hashing
+sys.path.append(str(Path(__file__).parent.parent.parent / 'src'))
+from file_hashing import get_file_hasher
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -578,12 +582,15 @@ For support, refer to the documentation on the CD-ROM partition.
             'files': {}
         }
         
-        for file_path in directory.rglob('*'):
+        files = [file_path for file_path in directory.rglob('*') if file_path.is_file()]
+        checksums = get_file_hasher().hash_files(files)
+        
+        for file_path in files:
             if file_path.is_file():
                 relative_path = file_path.relative_to(directory)
                 manifest['files'][str(relative_path)] = {
                     'size': file_path.stat().st_size,
-                    'checksum': self._calculate_checksum(file_path),
+                    'checksum': checksums[file_path],
                     'modified': datetime.fromtimestamp(
                         file_path.stat().st_mtime
                     ).isoformat()
@@ -592,12 +599,8 @@ For support, refer to the documentation on the CD-ROM partition.
         return manifest
     
     def _calculate_checksum(self, file_path: Path) -> str:
-        """Calculate SHA256 checksum of file"""
-        sha256 = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(65536), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        """Calculate SHA256 checksum of file (cached until the file changes)"""
+        return get_file_hasher().hash_file(file_path)
     
     def _generate_checksums(self, device_path: str) -> Dict:
         """Generate checksums for all critical files"""
@@ -20,6 +20,10 @@ from collections import defaultdict, Counter
 import argparse
 import hashlib
 
+# Indexed report store shared with the production monitor
+sys.path.append(str(Path(__file__).parent.parent.parent / 'src'))
+from report_store import ProductionReportStore, DEFAULT_DB_NAME
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,59 +39,32 @@ logger = logging.getLogger(__name__)
 class ProductionAnalyzer:
     """Analyzes production data and generates insights"""
     
-    def __init__(self, reports_dir: Path):
+    def __init__(self, reports_dir: Path, store: Optional[ProductionReportStore] = None):
         self.reports_dir = reports_dir
+        self.store = store or ProductionReportStore(reports_dir / DEFAULT_DB_NAME)
+        self.start_date = None
+        self.end_date = None
         self.build_reports = []
         self.validation_reports = []
         self.production_stats = {}
         
+    def ingest_reports(self) -> Tuple[int, int]:
+        """Add report files written since the last run to the store"""
+        builds = self.store.ingest_build_reports(self.reports_dir / 'manufacturing_reports')
+        validations = self.store.ingest_validation_reports(self.reports_dir / 'validation_reports')
+        return builds, validations
+        
     def load_reports(self, start_date: Optional[datetime] = None, 
                     end_date: Optional[datetime] = None) -> bool:
         """Load production reports within date range"""
         try:
-            # Load build reports
-            build_dir = self.reports_dir / 'manufacturing_reports'
-            if build_dir.exists():
-                for report_file in build_dir.glob('build_*.json'):
-                    try:
-                        with open(report_file, 'r') as f:
-                            report = json.load(f)
-                            
-                        # Parse date
-                        report_date = datetime.fromisoformat(report.get('build_date', ''))
-                        
-                        # Check date range
-                        if start_date and report_date < start_date:
-                            continue
-                        if end_date and report_date > end_date:
-                            continue
-                            
-                        self.build_reports.append(report)
-                        
-                    except Exception as e:
-                        logger.warning(f"Failed to load build report {report_file}: {e}")
-                        
-            # Load validation reports
-            validation_dir = self.reports_dir / 'validation_reports'
-            if validation_dir.exists():
-                for report_file in validation_dir.glob('validation_*.json'):
-                    try:
-                        with open(report_file, 'r') as f:
-                            report = json.load(f)
-                            
-                        # Parse date
-                        report_date = datetime.fromisoformat(report.get('validation_date', ''))
-                        
-                        # Check date range
-                        if start_date and report_date < start_date:
-                            continue
-                        if end_date and report_date > end_date:
-                            continue
-                            
-                        self.validation_reports.append(report)
-                        
-                    except Exception as e:
-                        logger.warning(f"Failed to load validation report {report_file}: {e}")
+            # Only new files are parsed; the date range is an index lookup
+            self.ingest_reports()
+            self.start_date = start_date
+            self.end_date = end_date
+            
+            self.build_reports = self.store.build_reports(start_date, end_date)
+            self.validation_reports = self.store.validation_reports(start_date, end_date)
                         
             logger.info(f"Loaded {len(self.build_reports)} build reports and "
                        f"{len(self.validation_reports)} validation reports")
@@ -101,16 +78,17 @@ class ProductionAnalyzer:
     def calculate_statistics(self):
         """Calculate production statistics"""
         try:
+            build = self.store.build_statistics(self.start_date, self.end_date)
+            validation = self.store.validation_statistics(self.start_date, self.end_date)
+            
             # Build statistics
-            if self.build_reports:
-                build_times = [r.get('build_time', 0) for r in self.build_reports]
+            if build['total']:
+                build_times = [t for _, t in self.store.build_times(self.start_date, self.end_date)]
                 
                 self.production_stats['build'] = {
-                    'total_builds': len(self.build_reports),
-                    'successful_builds': sum(1 for r in self.build_reports 
-                                           if r.get('status') == 'SUCCESS'),
-                    'failed_builds': sum(1 for r in self.build_reports 
-                                       if r.get('status') != 'SUCCESS'),
+                    'total_builds': build['total'],
+                    'successful_builds': build['successful'],
+                    'failed_builds': build['total'] - build['successful'],
                     'average_build_time': statistics.mean(build_times) if build_times else 0,
                     'median_build_time': statistics.median(build_times) if build_times else 0,
                     'min_build_time': min(build_times) if build_times else 0,
@@ -118,51 +96,29 @@ class ProductionAnalyzer:
                 }
                 
                 # Platform distribution
-                platforms = [r.get('platform', 'Unknown') for r in self.build_reports]
-                self.production_stats['build']['platform_distribution'] = dict(Counter(platforms))
+                self.production_stats['build']['platform_distribution'] = build['platforms']
                 
             # Validation statistics
-            if self.validation_reports:
-                validation_times = [r.get('validation_time', 0) for r in self.validation_reports]
-                
+            if validation['total']:
                 self.production_stats['validation'] = {
-                    'total_validations': len(self.validation_reports),
-                    'passed_validations': sum(1 for r in self.validation_reports 
-                                            if r.get('overall_result') == 'PASS'),
-                    'failed_validations': sum(1 for r in self.validation_reports 
-                                            if r.get('overall_result') == 'FAIL'),
-                    'average_validation_time': statistics.mean(validation_times) if validation_times else 0,
-                    'pass_rate': (sum(1 for r in self.validation_reports 
-                                    if r.get('overall_result') == 'PASS') / 
-                                len(self.validation_reports) * 100) if self.validation_reports else 0
+                    'total_validations': validation['total'],
+                    'passed_validations': validation['passed'],
+                    'failed_validations': validation['failed'],
+                    'average_validation_time': validation['average_time'],
+                    'pass_rate': validation['passed'] / validation['total'] * 100
                 }
                 
                 # Common failure reasons
-                failures = []
-                for report in self.validation_reports:
-                    if report.get('overall_result') == 'FAIL':
-                        for test in report.get('test_results', []):
-                            if not test.get('passed'):
-                                failures.append(test.get('name'))
-                                
-                self.production_stats['validation']['common_failures'] = dict(Counter(failures))
+                self.production_stats['validation']['common_failures'] = validation['common_failures']
                 
             # Quality metrics
-            if self.build_reports and self.validation_reports:
+            if build['total'] and validation['total']:
                 # Match builds to validations by device UUID
-                validated_builds = set()
-                for val_report in self.validation_reports:
-                    device_uuid = val_report.get('device_uuid')
-                    if device_uuid and val_report.get('overall_result') == 'PASS':
-                        validated_builds.add(device_uuid)
-                        
-                build_uuids = set(r.get('build_id') for r in self.build_reports)
-                
                 self.production_stats['quality'] = {
-                    'first_pass_yield': (len(validated_builds) / len(build_uuids) * 100) 
-                                       if build_uuids else 0,
-                    'validated_devices': len(validated_builds),
-                    'total_manufactured': len(build_uuids)
+                    'first_pass_yield': (validation['passed_devices'] / build['unique_builds'] * 100) 
+                                       if build['unique_builds'] else 0,
+                    'validated_devices': validation['passed_devices'],
+                    'total_manufactured': build['unique_builds']
                 }
                 
         except Exception as e:
@@ -178,50 +134,31 @@ class ProductionAnalyzer:
         
         try:
             # Daily production trends
-            daily_builds = defaultdict(int)
-            daily_validations = defaultdict(int)
-            
-            for report in self.build_reports:
-                date = datetime.fromisoformat(report.get('build_date', '')).date()
-                daily_builds[date.isoformat()] += 1
-                
-            for report in self.validation_reports:
-                date = datetime.fromisoformat(report.get('validation_date', '')).date()
-                daily_validations[date.isoformat()] += 1
+            daily_builds = self.store.daily_counts('build', self.start_date, self.end_date)
+            daily_validations = self.store.daily_counts('validation', self.start_date, self.end_date)
                 
             trends['daily_production'] = {
-                'builds': dict(daily_builds),
-                'validations': dict(daily_validations)
+                'builds': {day: counts['total'] for day, counts in daily_builds.items()},
+                'validations': {day: counts['total'] for day, counts in daily_validations.items()}
             }
             
             # Failure trends over time
-            daily_failures = defaultdict(lambda: {'total': 0, 'failures': 0})
-            
-            for report in self.validation_reports:
-                date = datetime.fromisoformat(report.get('validation_date', '')).date()
-                daily_failures[date.isoformat()]['total'] += 1
-                if report.get('overall_result') == 'FAIL':
-                    daily_failures[date.isoformat()]['failures'] += 1
-                    
-            trends['failure_trends'] = dict(daily_failures)
+            trends['failure_trends'] = daily_validations
             
             # Performance trends (build times)
-            if self.build_reports:
-                sorted_builds = sorted(self.build_reports, 
-                                     key=lambda x: x.get('build_date', ''))
-                
-                # Calculate moving average
-                window_size = 10
-                if len(sorted_builds) >= window_size:
-                    moving_avg = []
-                    for i in range(window_size, len(sorted_builds) + 1):
-                        window = sorted_builds[i-window_size:i]
-                        avg_time = statistics.mean([r.get('build_time', 0) for r in window])
-                        moving_avg.append({
-                            'date': window[-1].get('build_date'),
-                            'average_build_time': avg_time
-                        })
-                    trends['performance_trends']['build_time_trend'] = moving_avg
+            sorted_builds = self.store.build_times(self.start_date, self.end_date)
+            
+            # Calculate moving average
+            window_size = 10
+            if len(sorted_builds) >= window_size:
+                moving_avg = []
+                for i in range(window_size, len(sorted_builds) + 1):
+                    window = sorted_builds[i-window_size:i]
+                    moving_avg.append({
+                        'date': window[-1][0],
+                        'average_build_time': statistics.mean(t for _, t in window)
+                    })
+                trends['performance_trends']['build_time_trend'] = moving_avg
                     
         except Exception as e:
             logger.error(f"Failed to identify trends: {e}")
@@ -20,6 +20,11 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 import tempfile
 import shutil
+import uuid
+
+# Concurrent test runner shared with the production validators
+sys.path.append(str(Path(__file__).parent.parent.parent / 'src'))
+from validation_runner import ValidationRunner, ValidationTask
 
 # Configure logging
 logging.basicConfig(
@@ -36,9 +41,12 @@ logger = logging.getLogger(__name__)
 class ValidationTest:
     """Base class for validation tests"""
     
-    def __init__(self, name: str, critical: bool = True):
+    def __init__(self, name: str, critical: bool = True,
+                 depends_on: Tuple[str, ...] = (), timeout: Optional[float] = None):
         self.name = name
         self.critical = critical
+        self.depends_on = depends_on  # tests that must pass before this one starts
+        self.timeout = timeout  # seconds
         self.passed = False
         self.message = ""
         self.details = {}
@@ -54,6 +62,7 @@ class ValidationTest:
             'passed': self.passed,
             'critical': self.critical,
             'message': self.message,
+            'duration_seconds': None,
             'details': self.details
         }
 
@@ -62,7 +71,7 @@ class PartitionStructureTest(ValidationTest):
     """Validate partition structure"""
     
     def __init__(self):
-        super().__init__("Partition Structure", critical=True)
+        super().__init__("Partition Structure", critical=True, timeout=60)
         
     def run(self, context: Dict) -> bool:
         """Check if device has correct partition structure"""
@@ -152,7 +161,8 @@ class FileSystemIntegrityTest(ValidationTest):
     """Validate file system integrity"""
     
     def __init__(self):
-        super().__init__("File System Integrity", critical=True)
+        super().__init__("File System Integrity", critical=True,
+                         depends_on=("Partition Structure",), timeout=120)
         
     def run(self, context: Dict) -> bool:
         """Check file system integrity on both partitions"""
@@ -222,7 +232,8 @@ class AuthenticationTokenTest(ValidationTest):
     """Validate device authentication token"""
     
     def __init__(self):
-        super().__init__("Authentication Token", critical=True)
+        super().__init__("Authentication Token", critical=True,
+                         depends_on=("Partition Structure",), timeout=30)
         
     def run(self, context: Dict) -> bool:
         """Validate authentication token on device"""
@@ -296,7 +307,8 @@ class ManifestValidationTest(ValidationTest):
     """Validate manifest and file checksums"""
     
     def __init__(self):
-        super().__init__("Manifest Validation", critical=True)
+        super().__init__("Manifest Validation", critical=True,
+                         depends_on=("Partition Structure",), timeout=600)
         
     def run(self, context: Dict) -> bool:
         """Validate manifest and verify file checksums"""
@@ -378,7 +390,8 @@ class ModelFilesTest(ValidationTest):
     """Validate AI model files"""
     
     def __init__(self):
-        super().__init__("Model Files", critical=True)
+        super().__init__("Model Files", critical=True,
+                         depends_on=("Partition Structure",), timeout=900)
         
     def run(self, context: Dict) -> bool:
         """Validate presence and integrity of AI models"""
@@ -459,7 +472,8 @@ class LauncherExecutableTest(ValidationTest):
     """Validate platform launchers"""
     
     def __init__(self):
-        super().__init__("Launcher Executables", critical=True)
+        super().__init__("Launcher Executables", critical=True,
+                         depends_on=("Partition Structure",), timeout=120)
         
     def run(self, context: Dict) -> bool:
         """Validate launcher executables for platforms"""
@@ -530,7 +544,8 @@ class ConfigurationTest(ValidationTest):
     """Validate device configuration"""
     
     def __init__(self):
-        super().__init__("Device Configuration", critical=False)
+        super().__init__("Device Configuration", critical=False,
+                         depends_on=("Partition Structure",), timeout=30)
         
     def run(self, context: Dict) -> bool:
         """Validate device configuration files"""
@@ -610,6 +625,7 @@ class USBValidator:
         self.platform = platform.system()
         self.test_results = []
         self.device_info = {}
+        self.timing = {}
         self.temp_mount_path = Path(tempfile.mkdtemp(prefix="sunflower_validate_"))
         
     def mount_partitions(self, device_path: str) -> Tuple[Optional[Path], Optional[Path]]:
@@ -684,24 +700,42 @@ class USBValidator:
                 ConfigurationTest()
             ]
             
-            # Run tests
-            all_passed = True
+            # Run independent tests side by side; a critical failure stops the rest
+            runner = ValidationRunner()
+            results = runner.run(
+                ValidationTask(
+                    test.name,
+                    lambda test=test: test.run(context),
+                    depends_on=test.depends_on,
+                    timeout=test.timeout,
+                    critical=test.critical,
+                    check=lambda _, test=test: test.passed
+                )
+                for test in tests
+            )
+            self.timing = runner.timing(results)
+            
             critical_failed = False
             
             for test in tests:
-                logger.info(f"Running test: {test.name}")
-                test.run(context)
-                self.test_results.append(test.get_result())
+                result = results[test.name]
+                if result.status in ('TIMEOUT', 'SKIPPED', 'ERROR'):
+                    test.passed = False
+                    test.message = result.error
+                
+                test_result = test.get_result()
+                test_result['duration_seconds'] = round(result.duration_seconds, 3)
+                test_result['status'] = result.status
+                self.test_results.append(test_result)
                 
-                if not test.passed:
-                    all_passed = False
+                if not result.passed:
                     if test.critical:
                         critical_failed = True
-                        logger.error(f"Critical test failed: {test.name}")
+                        logger.error(f"Critical test failed: {test.name} ({result.status})")
                     else:
-                        logger.warning(f"Non-critical test failed: {test.name}")
+                        logger.warning(f"Non-critical test failed: {test.name} ({result.status})")
                 else:
-                    logger.info(f"Test passed: {test.name}")
+                    logger.info(f"Test passed: {test.name} in {result.duration_seconds:.2f}s")
                     
             # Extract device info from tests
             for result in self.test_results:
@@ -767,6 +801,7 @@ class USBValidator:
             'platform': self.platform,
             'overall_result': 'PASS' if passed else 'FAIL',
             'test_results': self.test_results,
+            'timing': self.timing,
             'summary': {
                 'total_tests': len(self.test_results),
                 'passed_tests': sum(1 for r in self.test_results if r['passed']),
@@ -792,6 +827,9 @@ class USBValidator:
         print(f"Device UUID: {self.device_info.get('device_uuid', 'Unknown')}")
         print(f"Overall Result: {report['overall_result']}")
         print(f"Tests Passed: {report['summary']['passed_tests']}/{report['summary']['total_tests']}")
+        if self.timing:
+            print(f"Test Time: {self.timing['test_seconds']:.1f}s in {self.timing['wall_seconds']:.1f}s "
+                  f"({self.timing['parallel_speedup']:.1f}x)")
         
         if report['summary']['failed_tests'] > 0:
             print("\nFailed Tests:")
@@ -8,11 +8,18 @@ Version: 6.2.0 - Production Ready
 import re
 import logging
 import sys
-from typing import List, Tuple, Optional, Any
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Tuple, Optional, Any, Pattern
 from pathlib import Path
 from datetime import datetime
 import json
 
+# Shared asynchronous logging backend
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from async_logging import async_logging_enabled, setup_async_logging
+
 
 class SensitiveDataFilter(logging.Filter):
     """
@@ -85,6 +92,55 @@ class SensitiveDataFilter(logging.Filter):
         'credit_card', 'card_number', 'cvv', 'cvc', 'expiry'
     }
     
+    # Standard LogRecord attributes that are never treated as extra fields
+    STANDARD_ATTRIBUTES = frozenset((
+        'name', 'msg', 'args', 'created', 'filename',
+        'funcName', 'levelname', 'levelno', 'lineno',
+        'module', 'msecs', 'pathname', 'process',
+        'processName', 'relativeCreated', 'thread',
+        'threadName', 'exc_info', 'exc_text', 'stack_info'
+    ))
+    
+    # Cheap test that a string cannot match any of the default patterns:
+    # each one needs a digit, one of @ $ : / \, a keyword, a 20+ character
+    # token or a hex run followed by '-' (UUID). Only used while
+    # REDACTION_PATTERNS is the default list.
+    PREFILTER = re.compile(
+        r'[\d@$:/\\]|token|bearer|key|password|secret|[A-Za-z0-9+/]{20}|[a-f0-9]{8}-',
+        re.IGNORECASE
+    )
+    
+    # Text that must be present (case-folded) for a pattern to match; a
+    # pattern whose hint is missing from the current text is not run
+    DIGIT = re.compile(r'\d')
+    PATTERN_HINTS = {
+        REDACTION_PATTERNS[0][0]: ('token',),
+        REDACTION_PATTERNS[1][0]: ('bearer',),
+        REDACTION_PATTERNS[2][0]: ('key',),
+        REDACTION_PATTERNS[3][0]: ('token',),
+        REDACTION_PATTERNS[4][0]: ('token',),
+        REDACTION_PATTERNS[5][0]: ('password',),
+        REDACTION_PATTERNS[6][0]: ('secret',),
+        REDACTION_PATTERNS[7][0]: ('key',),
+        REDACTION_PATTERNS[8][0]: ('$argon2',),
+        REDACTION_PATTERNS[9][0]: ('$2',),
+        REDACTION_PATTERNS[10][0]: ('$pbkdf2',),
+        REDACTION_PATTERNS[16][0]: DIGIT,
+        REDACTION_PATTERNS[17][0]: ('-',),
+        REDACTION_PATTERNS[18][0]: ('@',),
+        REDACTION_PATTERNS[19][0]: ('.',),
+        REDACTION_PATTERNS[20][0]: DIGIT,
+        REDACTION_PATTERNS[21][0]: ('akia',),
+        REDACTION_PATTERNS[23][0]: ('://',),
+        REDACTION_PATTERNS[24][0]: ('/home/',),
+        REDACTION_PATTERNS[25][0]: ('c:\\users\\',),
+        REDACTION_PATTERNS[26][0]: ('-',),
+    }
+    
+    # Memoized strings (repeated clean format strings and field names)
+    CACHE_SIZE = 4096
+    CACHE_MAX_LENGTH = 1024
+    
     def filter(self, record: logging.LogRecord) -> bool:
         """
         Filter log record and redact sensitive information
@@ -117,11 +173,7 @@ class SensitiveDataFilter(logging.Filter):
         
         # Redact extra fields
         for key, value in record.__dict__.items():
-            if key not in ('name', 'msg', 'args', 'created', 'filename', 
-                          'funcName', 'levelname', 'levelno', 'lineno', 
-                          'module', 'msecs', 'pathname', 'process', 
-                          'processName', 'relativeCreated', 'thread', 
-                          'threadName', 'exc_info', 'exc_text', 'stack_info'):
+            if key not in self.STANDARD_ATTRIBUTES:
                 if self._is_sensitive_field(key):
                     record.__dict__[key] = '***REDACTED***'
                 elif isinstance(value, str):
@@ -131,20 +183,26 @@ class SensitiveDataFilter(logging.Filter):
         
         return True
     
+    @classmethod
+    def _compiled(cls) -> "_CompiledRedaction":
+        """Compiled redaction for this class's patterns (built once per class)"""
+        compiled = cls.__dict__.get('_compiled_redaction')
+        if compiled is None:
+            prefilter = cls.PREFILTER
+            if cls.REDACTION_PATTERNS is not SensitiveDataFilter.REDACTION_PATTERNS:
+                prefilter = None  # only valid for the default patterns
+            compiled = _CompiledRedaction(
+                cls.REDACTION_PATTERNS, cls.PATTERN_HINTS, cls.SENSITIVE_FIELDS,
+                prefilter, cls.CACHE_SIZE, cls.CACHE_MAX_LENGTH
+            )
+            cls._compiled_redaction = compiled
+        return compiled
+    
     def _redact_string(self, text: str) -> str:
         """Apply all redaction patterns to a string"""
         if not text:
             return text
-        
-        redacted = text
-        for pattern, replacement in self.REDACTION_PATTERNS:
-            try:
-                redacted = re.sub(pattern, replacement, redacted, flags=re.IGNORECASE)
-            except re.error:
-                # Skip invalid patterns
-                continue
-        
-        return redacted
+        return self._compiled().redact(text)
     
     def _redact_dict(self, data: dict) -> dict:
         """Recursively redact sensitive data in dictionaries"""
@@ -178,8 +236,90 @@ class SensitiveDataFilter(logging.Filter):
     
     def _is_sensitive_field(self, field_name: str) -> bool:
         """Check if a field name indicates sensitive data"""
+        return self._compiled().is_sensitive_field(field_name)
+
+
+class _CompiledRedaction:
+    """
+    Precompiled form of SensitiveDataFilter's patterns
+    
+    The patterns are still applied one after another, because each
+    substitution sees the output of the previous ones (a SHA-256 must be
+    replaced before the MD5 pattern sees it), so the result is identical
+    to running every pattern. What is saved is work that cannot change
+    the result: strings the prefilter rules out are returned untouched,
+    and a pattern is skipped while its hint is missing from the text.
+    
+    Only strings that needed no redaction are memoized, so the cache
+    never holds the sensitive text it exists to hide.
+    """
+    
+    def __init__(self, patterns: List[Tuple[str, str]], hints: dict, sensitive_fields,
+                 prefilter: Optional[Pattern], cache_size: int, cache_max_length: int):
+        self.patterns: List[Tuple[Pattern, str, Any]] = []
+        for pattern, replacement in patterns:
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                # Skip invalid patterns
+                continue
+            self.patterns.append((compiled, replacement, hints.get(pattern)))
+        
+        self.prefilter = prefilter
+        self.sensitive_fields = tuple(sensitive_fields)
+        self.cache_size = cache_size
+        self.cache_max_length = cache_max_length
+        
+        self._clean: "OrderedDict[str, None]" = OrderedDict()
+        self._clean_lock = threading.Lock()
+        self.is_sensitive_field = lru_cache(maxsize=cache_size)(self._is_sensitive_field)
+    
+    def _redact(self, text: str) -> str:
+        if self.prefilter is not None and not self.prefilter.search(text):
+            return text
+        
+        # casefold() maps every character IGNORECASE treats as equal
+        # (e.g. the Kelvin sign and 'k') to the same lowercase text
+        folded = text.casefold()
+        for pattern, replacement, hint in self.patterns:
+            if hint is not None:
+                if isinstance(hint, tuple):
+                    if not any(literal in folded for literal in hint):
+                        continue
+                elif not hint.search(text):
+                    continue
+            
+            try:
+                redacted, count = pattern.subn(replacement, text)
+            except re.error:
+                # Skip patterns with an invalid replacement
+                continue
+            if count:
+                text = redacted
+                folded = text.casefold()
+        return text
+    
+    def redact(self, text: str) -> str:
+        """Redacted text (short strings known to be clean are returned directly)"""
+        if len(text) > self.cache_max_length:
+            return self._redact(text)
+        
+        with self._clean_lock:
+            if text in self._clean:
+                self._clean.move_to_end(text)
+                return text
+        
+        redacted = self._redact(text)
+        if redacted == text:
+            with self._clean_lock:
+                self._clean[text] = None
+                if len(self._clean) > self.cache_size:
+                    self._clean.popitem(last=False)
+        return redacted
+    
+    def _is_sensitive_field(self, field_name: str) -> bool:
         field_lower = field_name.lower()
-        return any(sensitive in field_lower for sensitive in self.SENSITIVE_FIELDS)
+        return any(sensitive in field_lower for sensitive in self.sensitive_fields)
 
 
 class SecureFormatter(logging.Formatter):
@@ -188,6 +328,10 @@ class SecureFormatter(logging.Formatter):
     even in formatted output.
     """
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._filter = SensitiveDataFilter()
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format record with additional redaction"""
         # First apply standard formatting
@@ -195,13 +339,13 @@ class SecureFormatter(logging.Formatter):
         
         # Then apply additional redaction to the final output
         # This catches any sensitive data that might have been added during formatting
-        filter = SensitiveDataFilter()
-        return filter._redact_string(result)
+        return self._filter._redact_string(result)
 
 
 def setup_secure_logging(name: str = None, 
                         level: int = logging.INFO,
-                        log_file: Optional[Path] = None) -> logging.Logger:
+                        log_file: Optional[Path] = None,
+                        async_backend: Optional[bool] = None) -> logging.Logger:
     """
     Set up secure logging with automatic sensitive data redaction
     
@@ -209,6 +353,8 @@ def setup_secure_logging(name: str = None,
         name: Logger name
         level: Logging level
         log_file: Optional log file path
+        async_backend: Format, redact and write on a background thread
+            (rotated log file); defaults to SUNFLOWER_ASYNC_LOGGING
         
     Returns:
         Configured logger with security filters
@@ -226,6 +372,21 @@ def setup_secure_logging(name: str = None,
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
+    if async_backend is None:
+        async_backend = async_logging_enabled()
+    
+    if async_backend:
+        # Redaction runs on the listener thread, so log calls only enqueue
+        setup_async_logging(
+            logger,
+            log_file=log_file,
+            console=True,
+            formatter=formatter,
+            filters=[SensitiveDataFilter()]
+        )
+        logger.propagate = False
+        return logger
+    
     # Console handler with redaction
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
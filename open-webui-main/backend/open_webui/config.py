@@ -2412,6 +2412,18 @@ RAG_EMBEDDING_PREFIX_FIELD_NAME = os.environ.get(
     "RAG_EMBEDDING_PREFIX_FIELD_NAME", None
 )
 
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+
+RAG_EMBEDDING_CACHE_DIR = os.environ.get(
+    "RAG_EMBEDDING_CACHE_DIR", f"{CACHE_DIR}/embeddings"
+)
+
+RAG_EMBEDDING_CACHE_MAX_ENTRIES = int(
+    os.environ.get("RAG_EMBEDDING_CACHE_MAX_ENTRIES", "100000")
+)
+
 RAG_RERANKING_ENGINE = PersistentConfig(
     "RAG_RERANKING_ENGINE",
     "rag.reranking_engine",
@@ -0,0 +1,399 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from open_webui.env import SRC_LOG_LEVELS
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+KEY_SIZE = 16  # bytes of BLAKE2b digest per cached text
+DEFAULT_MAX_ENTRIES = 100_000  # per model and prefix
+COMPACT_RATIO = 0.75  # share of max_entries kept when a store is compacted
+
+
+def content_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_SIZE).digest()
+
+
+def namespace_id(namespace: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(namespace, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+
+
+class EmbeddingStore:
+    """
+    Embeddings of one model and prefix, as a float32 memory-mapped array.
+
+    vectors.f32 holds one row per cached text and index.bin holds the
+    matching 16-byte content keys in the same order, so key i is row i.
+    Both files are only appended to; vectors are written before their
+    keys, so a crash leaves at most unindexed rows that the next append
+    truncates away. Appends by other workers are picked up on read.
+
+    Past max_entries the store is compacted into a new generation of
+    files holding the rows this worker used or added most recently;
+    meta.json names the current generation, so replacing it is the
+    commit point and other workers start over from the new files.
+    """
+
+    def __init__(
+        self, directory: Path, namespace: dict, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.meta_path = self.directory / "meta.json"
+        self.lock_path = self.directory / ".lock"
+        self.max_entries = max(1, max_entries)
+
+        self.meta = {
+            "namespace": namespace,
+            "dim": None,
+            "seconds_per_text": None,
+            "generation": 0,
+        }
+        self._read_meta()
+
+        self.index = {}  # content key -> row
+        self.evicted = 0
+        self._indexed_generation = self.generation
+        self._keys_read = 0
+        self._vectors = None
+        self._used = {}  # content key -> tick of its last use by this worker
+        self._ticks = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.meta.get("dim")
+
+    @property
+    def generation(self) -> int:
+        return self.meta.get("generation") or 0
+
+    def _paths(self, generation: int) -> tuple[Path, Path]:
+        suffix = f".{generation}" if generation else ""
+        return (
+            self.directory / f"index{suffix}.bin",
+            self.directory / f"vectors{suffix}.f32",
+        )
+
+    @property
+    def keys_path(self) -> Path:
+        return self._paths(self.generation)[0]
+
+    @property
+    def vectors_path(self) -> Path:
+        return self._paths(self.generation)[1]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _read_meta(self) -> None:
+        """Pick up metadata written by this or another worker"""
+        if not self.meta_path.exists():
+            return
+        try:
+            self.meta.update(json.loads(self.meta_path.read_text()))
+        except (OSError, ValueError):
+            log.warning(f"Ignoring unreadable embedding cache metadata: {self.meta_path}")
+
+    def _save_meta(self) -> None:
+        temp_path = self.meta_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(self.meta))
+        os.replace(temp_path, self.meta_path)
+
+    @contextmanager
+    def _store_lock(self):
+        """Serialise index reads, appends and compaction across threads and uvicorn workers"""
+        with self._lock, open(self.lock_path, "a") as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """
+        Index keys appended since the last read, by this or another worker.
+        Called under the store lock; starts over after another worker compacted.
+        """
+        self._read_meta()
+        if self.generation != self._indexed_generation:
+            self.index = {}
+            self._used = {}
+            self._keys_read = 0
+            self._vectors = None
+            self._indexed_generation = self.generation
+
+        if not self.dim or not self.keys_path.exists():
+            return
+
+        size = self.keys_path.stat().st_size
+        rows = min(
+            size // KEY_SIZE,
+            self.vectors_path.stat().st_size // (self.dim * 4)
+            if self.vectors_path.exists()
+            else 0,
+        )
+        if rows * KEY_SIZE <= self._keys_read:
+            return
+
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_read)
+            data = f.read(rows * KEY_SIZE - self._keys_read)
+
+        first_row = self._keys_read // KEY_SIZE
+        for i in range(len(data) // KEY_SIZE):
+            self.index.setdefault(data[i * KEY_SIZE : (i + 1) * KEY_SIZE], first_row + i)
+        self._keys_read = rows * KEY_SIZE
+        self._vectors = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)
+        )
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, list[float]]:
+        if any(key not in self.index for key in keys):
+            with self._store_lock():
+                self._refresh()
+
+        with self._lock:
+            rows = {key: self.index[key] for key in keys if key in self.index}
+            if not rows:
+                return {}
+            vectors = self._vectors[list(rows.values())]
+            tick = next(self._ticks)
+            for key in rows:
+                self._used[key] = tick
+        return {key: vector.tolist() for key, vector in zip(rows, vectors)}
+
+    def put_many(
+        self, keys: list[bytes], vectors: list[list[float]], seconds: float
+    ) -> None:
+        array = np.asarray(vectors, dtype=np.float32)
+        if array.ndim != 2 or array.shape[0] != len(keys):
+            return
+
+        with self._store_lock():
+            self._refresh()
+            if self.dim is None:
+                self.meta["dim"] = int(array.shape[1])
+                self._save_meta()
+            elif array.shape[1] != self.dim:
+                log.warning(
+                    f"Not caching embeddings of dimension {array.shape[1]}, "
+                    f"cache holds {self.dim}"
+                )
+                return
+
+            new = [i for i, key in enumerate(keys) if key not in self.index]
+            if not new:
+                return
+
+            rows = len(self.index)
+            with open(self.vectors_path, "ab") as f:
+                # Drop rows left without keys by an interrupted append
+                f.truncate(rows * self.dim * 4)
+                f.write(array[new].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.keys_path, "ab") as f:
+                f.truncate(rows * KEY_SIZE)
+                f.write(b"".join(keys[i] for i in new))
+
+            self.meta["seconds_per_text"] = seconds / len(keys)
+            self._save_meta()
+
+            self._refresh()
+            tick = next(self._ticks)
+            for i in new:
+                self._used[keys[i]] = tick
+
+            if len(self.index) > self.max_entries:
+                self._compact()
+
+    def _compact(self) -> None:
+        """
+        Rewrite the store with its most recently used or added rows.
+        Called under the store lock. Rows this worker has not touched rank
+        below those it has, newest first among themselves.
+        """
+        keep = max(1, int(self.max_entries * COMPACT_RATIO))
+        ranked = sorted(
+            self.index.items(),
+            key=lambda item: (self._used.get(item[0], 0), item[1]),
+            reverse=True,
+        )
+        kept = sorted(ranked[:keep], key=lambda item: item[1])
+        kept_keys = [key for key, _ in kept]
+        vectors = np.ascontiguousarray(self._vectors[[row for _, row in kept]])
+
+        generation = self.generation + 1
+        keys_path, vectors_path = self._paths(generation)
+        for path, data in ((vectors_path, vectors.tobytes()), (keys_path, b"".join(kept_keys))):
+            with open(path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.meta["generation"] = generation
+        self._save_meta()
+
+        evicted = len(self.index) - len(kept_keys)
+        self.evicted += evicted
+        self.index = {key: row for row, key in enumerate(kept_keys)}
+        self._used = {key: self._used[key] for key in kept_keys if key in self._used}
+        self._keys_read = len(kept_keys) * KEY_SIZE
+        self._indexed_generation = generation
+        self._vectors = np.memmap(
+            vectors_path, dtype=np.float32, mode="r", shape=(len(kept_keys), self.dim)
+        )
+
+        # Workers still reading an older generation keep their open mapping
+        for path in [*self.directory.glob("index*.bin"), *self.directory.glob("vectors*.f32")]:
+            if path not in (keys_path, vectors_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+        log.info(
+            f"Compacted embedding cache {self.directory.name}: "
+            f"kept {len(kept_keys)}, evicted {evicted}"
+        )
+
+
+class EmbeddingCache:
+    """
+    Content-hash keyed embedding cache, one store per model and prefix.
+
+    Only texts missing from the cache are sent to the backend, in batches
+    of at most batch_size; repeated texts in one request are embedded once.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.stores = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.backend_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def store(self, namespace: dict) -> EmbeddingStore:
+        name = namespace_id(namespace)
+        with self._lock:
+            if name not in self.stores:
+                self.stores[name] = EmbeddingStore(
+                    self.cache_dir / name, namespace, self.max_entries
+                )
+            return self.stores[name]
+
+    def embed(
+        self,
+        namespace: dict,
+        texts: list[str],
+        embed_batch: Callable[[list[str]], Optional[list[list[float]]]],
+        batch_size: Optional[int] = None,
+    ) -> Optional[list[list[float]]]:
+        store = self.store(namespace)
+        keys = [content_key(text) for text in texts]
+        found = store.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        hits = sum(1 for key in keys if key in found)
+        seconds_per_text = store.meta.get("seconds_per_text") or 0.0
+
+        missing_keys = list(missing)
+        if not batch_size or batch_size < 1:
+            batch_size = max(len(missing_keys), 1)
+        for i in range(0, len(missing_keys), batch_size):
+            batch_keys = missing_keys[i : i + batch_size]
+            start = time.perf_counter()
+            vectors = embed_batch([missing[key] for key in batch_keys])
+            elapsed = time.perf_counter() - start
+            if vectors is None:
+                return None
+            if len(vectors) != len(batch_keys):
+                log.warning(
+                    f"Embedding backend returned {len(vectors)} vectors "
+                    f"for {len(batch_keys)} texts"
+                )
+                return None
+
+            found.update(zip(batch_keys, vectors))
+            store.put_many(batch_keys, vectors, elapsed)
+            with self._lock:
+                self.backend_seconds += elapsed
+
+        with self._lock:
+            self.hits += hits
+            self.misses += len(missing_keys)
+            self.saved_seconds += hits * seconds_per_text
+
+        if texts:
+            log.debug(
+                f"embedding cache: {hits}/{len(texts)} hits, "
+                f"{len(missing_keys)} sent to the backend"
+            )
+        return [found[key] for key in keys]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "embedding_seconds": round(self.backend_seconds, 3),
+                "saved_seconds": round(self.saved_seconds, 3),
+                "max_entries": self.max_entries,
+                "stores": {
+                    name: {
+                        "namespace": store.meta.get("namespace"),
+                        "entries": len(store.index),
+                        "evicted": store.evicted,
+                        "dim": store.dim,
+                    }
+                    for name, store in self.stores.items()
+                },
+            }
+
+
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache(
+    cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES
+) -> EmbeddingCache:
+    global _embedding_cache
+    with _embedding_cache_lock:
+        if (
+            _embedding_cache is None
+            or str(_embedding_cache.cache_dir) != str(Path(cache_dir))
+            or _embedding_cache.max_entries != max_entries
+        ):
+            _embedding_cache = EmbeddingCache(cache_dir, max_entries)
+        return _embedding_cache
@@ -3,7 +3,8 @@ import os
 from typing import Optional, Union
 
 import requests
-import hashlib
+from requests.adapters import HTTPAdapter
+import heapq
 from concurrent.futures import ThreadPoolExecutor
 import time
 
@@ -34,11 +35,24 @@ from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_PREFIX_FIELD_NAME,
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_DIR,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
 )
+from open_webui.retrieval.embedding_cache import get_embedding_cache
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+# Keep-alive connections to the embedding backend, shared by all requests
+_embedding_session = requests.Session()
+_embedding_session.mount(
+    "http://", HTTPAdapter(pool_connections=4, pool_maxsize=16)
+)
+_embedding_session.mount(
+    "https://", HTTPAdapter(pool_connections=4, pool_maxsize=16)
+)
+
 
 from typing import Any
 
@@ -216,8 +230,13 @@ def merge_get_results(get_results: list[dict]) -> dict:
 
 
 def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
-    # Initialize lists to store combined data
-    combined = dict()  # To store documents with unique document hashes
+    # Streaming top-k merge: documents are deduplicated by their text (the
+    # str hash is computed once and cached), only the best k candidates are
+    # kept in a heap, and ties keep the order documents were first seen in.
+    limit = k if k and k > 0 else None
+    first_seen = {}  # document -> order it was first seen in
+    best = {}  # document -> (distance, metadata) for current top candidates
+    heap = []  # (distance, -order, document), worst on top; may hold stale entries
 
     for data in query_results:
         distances = data["distances"][0]
@@ -225,33 +244,46 @@ def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
         metadatas = data["metadatas"][0]
 
         for distance, document, metadata in zip(distances, documents, metadatas):
-            if isinstance(document, str):
-                doc_hash = hashlib.sha256(
-                    document.encode()
-                ).hexdigest()  # Compute a hash for uniqueness
-
-                if doc_hash not in combined.keys():
-                    combined[doc_hash] = (distance, document, metadata)
-                    continue  # if doc is new, no further comparison is needed
-
-                # if doc is alredy in, but new distance is better, update
-                if distance > combined[doc_hash][0]:
-                    combined[doc_hash] = (distance, document, metadata)
-
-    combined = list(combined.values())
-    # Sort the list based on distances
-    combined.sort(key=lambda x: x[0], reverse=True)
-
-    # Slice to keep only the top k elements
-    sorted_distances, sorted_documents, sorted_metadatas = (
-        zip(*combined[:k]) if combined else ([], [], [])
-    )
+            if not isinstance(document, str):
+                continue
+
+            order = first_seen.setdefault(document, len(first_seen))
+            current = best.get(document)
+
+            if current is not None:
+                # if doc is already in, but new distance is better, update
+                if distance > current[0]:
+                    best[document] = (distance, metadata)
+                    heapq.heappush(heap, (distance, -order, document))
+                continue
+
+            if limit is None or len(best) < limit:
+                best[document] = (distance, metadata)
+                heapq.heappush(heap, (distance, -order, document))
+                continue
+
+            # Drop entries superseded by a better distance for the same doc
+            while heap[0][2] not in best or best[heap[0][2]][0] != heap[0][0]:
+                heapq.heappop(heap)
+
+            # Evicted and rejected docs can never beat the rising threshold
+            # again unless they return with a better distance
+            if (distance, -order) > heap[0][:2]:
+                _, _, evicted = heapq.heapreplace(heap, (distance, -order, document))
+                del best[evicted]
+                best[document] = (distance, metadata)
+
+    # Sort the survivors based on distances
+    combined = sorted(
+        best.items(),
+        key=lambda item: (item[1][0], -first_seen[item[0]]),
+        reverse=True,
+    )[:k]
 
-    # Create and return the output dictionary
     return {
-        "distances": [list(sorted_distances)],
-        "documents": [list(sorted_documents)],
-        "metadatas": [list(sorted_metadatas)],
+        "distances": [[distance for _, (distance, _) in combined]],
+        "documents": [[document for document, _ in combined]],
+        "metadatas": [[metadata for _, (_, metadata) in combined]],
     }
 
 
@@ -418,7 +450,7 @@ def get_embedding_function(
             query, **({"prompt": prefix} if prefix else {})
         ).tolist()
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
-        func = lambda query, prefix=None, user=None: generate_embeddings(
+        return lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
             model=embedding_model,
             text=query,
@@ -427,25 +459,7 @@ def get_embedding_function(
             key=key,
             user=user,
             azure_api_version=azure_api_version,
-        )
-
-        def generate_multiple(query, prefix, user, func):
-            if isinstance(query, list):
-                embeddings = []
-                for i in range(0, len(query), embedding_batch_size):
-                    embeddings.extend(
-                        func(
-                            query[i : i + embedding_batch_size],
-                            prefix=prefix,
-                            user=user,
-                        )
-                    )
-                return embeddings
-            else:
-                return func(query, prefix, user)
-
-        return lambda query, prefix=None, user=None: generate_multiple(
-            query, prefix, user, func
+            batch_size=embedding_batch_size,
         )
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
@@ -750,7 +764,7 @@ def generate_openai_batch_embeddings(
         if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
             json_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
 
-        r = requests.post(
+        r = _embedding_session.post(
             f"{url}/embeddings",
             headers={
                 "Content-Type": "application/json",
@@ -799,7 +813,7 @@ def generate_azure_openai_batch_embeddings(
         url = f"{url}/openai/deployments/{model}/embeddings?api-version={version}"
 
         for _ in range(5):
-            r = requests.post(
+            r = _embedding_session.post(
                 url,
                 headers={
                     "Content-Type": "application/json",
@@ -849,7 +863,7 @@ def generate_ollama_batch_embeddings(
         if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
             json_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
 
-        r = requests.post(
+        r = _embedding_session.post(
             f"{url}/api/embed",
             headers={
                 "Content-Type": "application/json",
@@ -879,6 +893,38 @@ def generate_ollama_batch_embeddings(
         return None
 
 
+_ollama_digests = {}  # (url, model) -> (digest, checked_at)
+OLLAMA_DIGEST_TTL = 300  # seconds
+
+
+def get_ollama_model_digest(model: str, url: str, key: str = "") -> Optional[str]:
+    # Re-pulling a model changes its digest, so embeddings cached for the
+    # old weights are not reused; checked at most every OLLAMA_DIGEST_TTL
+    now = time.monotonic()
+    cached = _ollama_digests.get((url, model))
+    if cached is not None and now - cached[1] < OLLAMA_DIGEST_TTL:
+        return cached[0]
+
+    digest = None
+    try:
+        r = _embedding_session.get(
+            f"{url}/api/tags",
+            headers={"Authorization": f"Bearer {key}"},
+            timeout=5,
+        )
+        r.raise_for_status()
+        names = {model, f"{model}:latest"}
+        for entry in r.json().get("models", []):
+            if entry.get("name") in names or entry.get("model") in names:
+                digest = entry.get("digest")
+                break
+    except Exception as e:
+        log.debug(f"Could not read the digest of ollama model {model}: {e}")
+
+    _ollama_digests[(url, model)] = (digest, now)
+    return digest
+
+
 def generate_embeddings(
     engine: str,
     model: str,
@@ -889,6 +935,7 @@ def generate_embeddings(
     url = kwargs.get("url", "")
     key = kwargs.get("key", "")
     user = kwargs.get("user")
+    batch_size = kwargs.get("batch_size")
 
     if prefix is not None and RAG_EMBEDDING_PREFIX_FIELD_NAME is None:
         if isinstance(text, list):
@@ -896,35 +943,73 @@ def generate_embeddings(
         else:
             text = f"{prefix}{text}"
 
+    texts = text if isinstance(text, list) else [text]
     if engine == "ollama":
-        embeddings = generate_ollama_batch_embeddings(
+        embed_batch = lambda batch: generate_ollama_batch_embeddings(
             **{
                 "model": model,
-                "texts": text if isinstance(text, list) else [text],
+                "texts": batch,
                 "url": url,
                 "key": key,
                 "prefix": prefix,
                 "user": user,
             }
         )
-        return embeddings[0] if isinstance(text, str) else embeddings
     elif engine == "openai":
-        embeddings = generate_openai_batch_embeddings(
-            model, text if isinstance(text, list) else [text], url, key, prefix, user
+        embed_batch = lambda batch: generate_openai_batch_embeddings(
+            model, batch, url, key, prefix, user
         )
-        return embeddings[0] if isinstance(text, str) else embeddings
     elif engine == "azure_openai":
         azure_api_version = kwargs.get("azure_api_version", "")
-        embeddings = generate_azure_openai_batch_embeddings(
+        embed_batch = lambda batch: generate_azure_openai_batch_embeddings(
             model,
-            text if isinstance(text, list) else [text],
+            batch,
             url,
             key,
             azure_api_version,
             prefix,
             user,
         )
-        return embeddings[0] if isinstance(text, str) else embeddings
+    else:
+        return None
+
+    if ENABLE_RAG_EMBEDDING_CACHE:
+        # Only texts not embedded before by this model (same endpoint and
+        # weights) and prefix reach the backend
+        cache = get_embedding_cache(
+            RAG_EMBEDDING_CACHE_DIR, RAG_EMBEDDING_CACHE_MAX_ENTRIES
+        )
+        namespace = {
+            "engine": engine,
+            "model": model,
+            "url": url,
+            "prefix": prefix,
+            "prefix_field": RAG_EMBEDDING_PREFIX_FIELD_NAME,
+        }
+        if engine == "ollama":
+            namespace["digest"] = get_ollama_model_digest(model, url, key)
+        elif engine == "azure_openai":
+            namespace["api_version"] = kwargs.get("azure_api_version", "")
+
+        embeddings = cache.embed(namespace, texts, embed_batch, batch_size)
+        if log.isEnabledFor(logging.DEBUG):
+            stats = cache.stats()
+            log.debug(
+                f"embedding cache hit rate {stats['hit_rate']:.1%} "
+                f"({stats['hits']} hits, {stats['misses']} misses), "
+                f"{stats['saved_seconds']:.1f}s of embedding saved"
+            )
+    else:
+        batch_size = batch_size or max(len(texts), 1)
+        embeddings = []
+        for i in range(0, len(texts), batch_size):
+            batch = embed_batch(texts[i : i + batch_size])
+            if batch is None:
+                embeddings = None
+                break
+            embeddings.extend(batch)
+
+    return embeddings[0] if isinstance(text, str) else embeddings
 
 
 import operator
@@ -76,6 +76,7 @@ from open_webui.retrieval.utils import (
     query_doc,
     query_doc_with_hybrid_search,
 )
+from open_webui.retrieval.embedding_cache import get_embedding_cache
 from open_webui.utils.misc import (
     calculate_sha256_string,
 )
@@ -91,6 +92,9 @@ from open_webui.config import (
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_DIR,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
 )
 from open_webui.env import (
     SRC_LOG_LEVELS,
@@ -248,6 +252,17 @@ async def get_embedding_config(request: Request, user=Depends(get_admin_user)):
     }
 
 
+@router.get("/embedding/cache")
+async def get_embedding_cache_stats(user=Depends(get_admin_user)):
+    return {
+        "status": True,
+        "enabled": ENABLE_RAG_EMBEDDING_CACHE,
+        **get_embedding_cache(
+            RAG_EMBEDDING_CACHE_DIR, RAG_EMBEDDING_CACHE_MAX_ENTRIES
+        ).stats(),
+    }
+
+
 class OpenAIConfigForm(BaseModel):
     url: str
     key: str
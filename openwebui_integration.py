@@ -28,6 +28,15 @@ import secrets
 
 logger = logging.getLogger(__name__)
 
+# Output-draining process supervisor shared with the launchers (optional)
+try:
+    sys.path.insert(0, str(Path(__file__).parent / 'system'))
+    sys.path.insert(0, str(Path(__file__).parent / 'launchers'))
+    from launcher_common import SupervisedProcess, OPENWEBUI_READY_PATTERN
+except ImportError:
+    SupervisedProcess = None
+    OPENWEBUI_READY_PATTERN = None
+
 # Constants for validation
 MIN_CHILD_AGE = 2
 MAX_CHILD_AGE = 18
@@ -830,40 +839,62 @@ class OpenWebUIIntegration:
             env['DATA_DIR'] = str(self.base_path / 'openwebui_data')
             env['WEBUI_PORT'] = str(self.config['openwebui']['port'])
             
-            # Launch Open WebUI process
-            self.openwebui_process = subprocess.Popen(
-                [str(openwebui_exe)],
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            # Wait for Open WebUI to start
-            start_time = time.time()
             timeout = self.config['openwebui']['timeout']
             
-            while time.time() - start_time < timeout:
-                try:
-                    # Check if process is still running
-                    if self.openwebui_process.poll() is not None:
-                        logger.error("Open WebUI process terminated unexpectedly")
-                        return False
-                    
-                    # Try to connect
-                    import socket
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(1)
-                    result = sock.connect_ex(('localhost', self.config['openwebui']['port']))
-                    sock.close()
-                    
-                    if result == 0:
-                        logger.info("Open WebUI launched successfully")
-                        return True
-                        
-                except Exception:
-                    pass
+            # Launch Open WebUI process
+            if SupervisedProcess is not None:
+                # Output is drained to a rotating log; readiness comes from the log line
+                self.openwebui_process = SupervisedProcess(
+                    'openwebui',
+                    [str(openwebui_exe)],
+                    env=env,
+                    log_dir=self.base_path / 'logs',
+                    ready_pattern=OPENWEBUI_READY_PATTERN,
+                    restart=True
+                ).start()
+                
+                if self.openwebui_process.wait_ready(timeout=timeout):
+                    logger.info("Open WebUI launched successfully")
+                    return True
+                
+                if self.openwebui_process.poll() is not None:
+                    logger.error("Open WebUI process terminated unexpectedly: "
+                                 + " | ".join(self.openwebui_process.last_lines[-3:]))
+                    return False
+            else:
+                # Nothing reads the output, so do not give it a pipe to fill
+                self.openwebui_process = subprocess.Popen(
+                    [str(openwebui_exe)],
+                    env=env,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                
+                # Wait for Open WebUI to start
+                start_time = time.time()
                 
-                time.sleep(1)
+                while time.time() - start_time < timeout:
+                    try:
+                        # Check if process is still running
+                        if self.openwebui_process.poll() is not None:
+                            logger.error("Open WebUI process terminated unexpectedly")
+                            return False
+                        
+                        # Try to connect
+                        import socket
+                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                        sock.settimeout(1)
+                        result = sock.connect_ex(('localhost', self.config['openwebui']['port']))
+                        sock.close()
+                        
+                        if result == 0:
+                            logger.info("Open WebUI launched successfully")
+                            return True
+                            
+                    except Exception:
+                        pass
+                    
+                    time.sleep(1)
             
             logger.error("Open WebUI failed to start within timeout")
             return False
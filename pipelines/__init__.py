@@ -7,8 +7,9 @@ Version: 6.2 | Platform: Windows + macOS | Architecture: Partitioned CD-ROM + US
 import os
 import json
 import hashlib
+import time
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -16,6 +17,8 @@ import threading
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+import requests
+
 # Import standardized path configuration
 from config.path_config import get_usb_path, ensure_paths_available
 
@@ -26,6 +29,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_OLLAMA_URL = 'http://localhost:11434'
+
 class PipelineStatus(Enum):
     """Pipeline execution status states"""
     IDLE = "idle"
@@ -79,15 +84,17 @@ class PipelineOrchestrator:
             log_dir.mkdir(parents=True, exist_ok=True)
             log_file = log_dir / 'pipeline.log'
             
-            # Add file handler to logger
-            file_handler = logging.FileHandler(log_file, mode='a')
-            file_handler.setFormatter(
-                logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            )
-            logger.addHandler(file_handler)
+            if not self._setup_async_logging(log_file):
+                # Add file handler to logger
+                file_handler = logging.FileHandler(log_file, mode='a')
+                file_handler.setFormatter(
+                    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+                )
+                logger.addHandler(file_handler)
         
         self.pipelines = {}
         self.active_sessions = {}
+        self._tier_model = None
         self.lock = threading.RLock()
         self.executor = ThreadPoolExecutor(max_workers=4)
         
@@ -97,8 +104,31 @@ class PipelineOrchestrator:
         # Load pipeline configuration
         self.config = self._load_configuration()
         
+        # Semantic (paraphrase) caching is opt-in
+        if self.config.get('semantic_cache_enabled'):
+            self._initialize_semantic_cache()
+        
+        # Per-prompt routing between installed model variants
+        if self.config.get('model_routing_enabled'):
+            self._initialize_model_router()
+        
         logger.info("Pipeline orchestrator initialized successfully")
     
+    def _setup_async_logging(self, log_file: Path) -> bool:
+        """Write pipeline.log from a background thread if SUNFLOWER_ASYNC_LOGGING is set"""
+        try:
+            from src.async_logging import async_logging_enabled, setup_async_logging
+            
+            if not async_logging_enabled():
+                return False
+            
+            self.log_backend = setup_async_logging(logger, log_file=log_file)
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Asynchronous logging unavailable: {e}")
+            return False
+    
     def _initialize_pipelines(self) -> None:
         """Initialize all pipeline components"""
         try:
@@ -109,6 +139,7 @@ class PipelineOrchestrator:
             from pipelines.education.stem_tutor import STEMTutorPipeline
             from pipelines.education.progress_tracker import ProgressTrackerPipeline
             from pipelines.education.achievement_system import AchievementSystemPipeline
+            from pipelines.response_cache import ResponseCachePipeline
             
             # Initialize safety pipelines (critical priority)
             self.pipelines['content_filter'] = ContentFilterPipeline(self.usb_path)
@@ -120,6 +151,9 @@ class PipelineOrchestrator:
             self.pipelines['progress_tracker'] = ProgressTrackerPipeline(self.usb_path)
             self.pipelines['achievement_system'] = AchievementSystemPipeline(self.usb_path)
             
+            # Initialize response cache (stores final, safety-approved answers)
+            self.pipelines['response_cache'] = ResponseCachePipeline(self.usb_path)
+            
             logger.info(f"Initialized {len(self.pipelines)} pipeline components")
             
         except ImportError as e:
@@ -128,6 +162,49 @@ class PipelineOrchestrator:
                 "System initialization failed. Please restart the Sunflower application."
             )
     
+    def _initialize_semantic_cache(self) -> None:
+        """Add the semantic cache layer behind the exact-match response cache"""
+        try:
+            from pipelines.semantic_cache import SemanticCachePipeline
+            
+            semantic_cache = SemanticCachePipeline(
+                self.usb_path,
+                threshold=self.config.get('semantic_cache_threshold'),
+                response_cache=self.pipelines.get('response_cache')
+            )
+            if not semantic_cache.available:
+                return
+            
+            self.pipelines['semantic_cache'] = semantic_cache
+            
+            order = self.config['pipeline_order']
+            if 'semantic_cache' not in order:
+                position = order.index('response_cache') + 1 if 'response_cache' in order else len(order)
+                order.insert(position, 'semantic_cache')
+                
+        except Exception as e:
+            logger.warning(f"Semantic cache unavailable: {e}")
+    
+    def _initialize_model_router(self) -> None:
+        """Add the model router, bounded by the hardware tier's best model"""
+        try:
+            from pipelines.model_router import ModelRouterPipeline
+            
+            self.pipelines['model_router'] = ModelRouterPipeline(
+                self.usb_path,
+                tier_model=self.get_tier_model(),
+                stem_tutor=self.pipelines.get('stem_tutor'),
+                latency_budget=self.config.get('model_latency_budget'),
+                base_url=self.config.get('ollama_url') or DEFAULT_OLLAMA_URL
+            )
+            
+            order = self.config['pipeline_order']
+            if 'model_router' not in order:
+                order.insert(0, 'model_router')
+                
+        except Exception as e:
+            logger.warning(f"Model routing unavailable: {e}")
+    
     def _load_configuration(self) -> Dict[str, Any]:
         """Load pipeline configuration from USB partition"""
         config_path = get_usb_path('config') / "pipeline_config.json"
@@ -138,8 +215,15 @@ class PipelineOrchestrator:
             "max_conversation_length": 100,
             "enable_achievements": True,
             "log_conversations": True,
+            "semantic_cache_enabled": False,
+            "semantic_cache_threshold": None,  # None uses the embedder's default
+            "model_routing_enabled": False,
+            "tier_model": None,  # None uses the hardware detector's choice
+            "ollama_url": DEFAULT_OLLAMA_URL,
+            "model_latency_budget": None,  # None uses config/performance.json
             "pipeline_order": [
                 "content_filter",
+                "response_cache",
                 "age_adapter", 
                 "stem_tutor",
                 "progress_tracker",
@@ -156,8 +240,23 @@ class PipelineOrchestrator:
         except Exception as e:
             logger.warning(f"Using default configuration: {e}")
         
+        default_config['pipeline_order'] = self._cache_before_personalization(
+            default_config['pipeline_order']
+        )
         return default_config
     
+    @staticmethod
+    def _cache_before_personalization(order: List[str]) -> List[str]:
+        """
+        Move the response caches directly behind the content filter
+        Later stages add the child's name, celebrations and follow-up
+        questions, which must never be stored or shared between children
+        """
+        caches = [name for name in ('response_cache', 'semantic_cache') if name in order]
+        order = [name for name in order if name not in caches]
+        position = order.index('content_filter') + 1 if 'content_filter' in order else 0
+        return order[:position] + caches + order[position:]
+    
     def process_interaction(self, context: PipelineContext) -> Tuple[str, Dict[str, Any]]:
         """
         Process user interaction through all pipeline stages
@@ -185,10 +284,20 @@ class PipelineOrchestrator:
                     if not is_safe:
                         self.active_sessions[context.session_id] = PipelineStatus.SAFETY_BLOCKED
                         return context.model_response, pipeline_results
-                else:
-                    # Process through pipeline
+                elif pipeline_name == 'model_router':
                     context = pipeline.process(context)
-                    pipeline_results[pipeline_name] = {"processed": True}
+                    pipeline_results[pipeline_name] = dict(
+                        context.metadata.get('model_routing', {}), processed=True
+                    )
+                else:
+                    # Process through pipeline; education stages also return metadata
+                    result = pipeline.process(context)
+                    if isinstance(result, tuple):
+                        context, stage_metadata = result
+                        pipeline_results[pipeline_name] = dict(stage_metadata or {}, processed=True)
+                    else:
+                        context = result
+                        pipeline_results[pipeline_name] = {"processed": True}
             
             # Update session status
             with self.lock:
@@ -202,6 +311,97 @@ class PipelineOrchestrator:
                 self.active_sessions[context.session_id] = PipelineStatus.ERROR
             raise
     
+    def respond(self, context: PipelineContext,
+                generate: Optional[Callable[[PipelineContext], str]] = None
+                ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Answer a child's question end to end
+        Blocked input never reaches the model; a cached answer skips
+        inference. On a miss generate(context) produces the raw model
+        output (default: the local Ollama server) and its time is recorded
+        for the model router. Returns: (processed_response, pipeline_metadata)
+        """
+        content_filter = self.pipelines.get('content_filter')
+        if content_filter is not None:
+            is_safe, context = content_filter.process(context)
+            if not is_safe:
+                with self.lock:
+                    self.active_sessions[context.session_id] = PipelineStatus.SAFETY_BLOCKED
+                return context.model_response, {'content_filter': {'safe': False}}
+        
+        if 'model' not in context.metadata:
+            self.route_model(context)
+        
+        if self.get_cached_response(context) is None:
+            start_time = time.perf_counter()
+            context.model_response = (generate or self._generate_with_ollama)(context)
+            context.metadata['inference_seconds'] = time.perf_counter() - start_time
+        
+        return self.process_interaction(context)
+    
+    def _generate_with_ollama(self, context: PipelineContext) -> str:
+        """Run the routed model on the local Ollama server"""
+        response = requests.post(
+            f"{self.config.get('ollama_url') or DEFAULT_OLLAMA_URL}/api/generate",
+            json={
+                'model': context.metadata['model'],
+                'prompt': context.input_text,
+                'stream': False
+            },
+            timeout=self.config.get('response_timeout', 30)
+        )
+        response.raise_for_status()
+        return response.json().get('response', '')
+    
+    def get_tier_model(self) -> str:
+        """Best model for this hardware tier (config 'tier_model' overrides)"""
+        if self._tier_model is None:
+            tier_model = self.config.get('tier_model')
+            if not tier_model:
+                from src.hardware_detector import HardwareDetector
+                tier_model = HardwareDetector(self.usb_path).get_optimal_model()
+            self._tier_model = tier_model
+        return self._tier_model
+    
+    def get_cached_response(self, context: PipelineContext) -> Optional[str]:
+        """
+        Look up a cached, safety-approved answer before calling the model
+        On a hit the context holds the unpersonalized model output, so the
+        caller skips inference and runs process_interaction as usual; the
+        per-child stages then adapt it for this child
+        """
+        response_cache = self.pipelines.get('response_cache')
+        if response_cache is None:
+            return None
+        
+        # Cache keys include the model, so routing must happen first
+        if 'model' not in context.metadata:
+            self.route_model(context)
+        
+        cached_response = response_cache.lookup(context)
+        
+        semantic_cache = self.pipelines.get('semantic_cache')
+        if cached_response is None and semantic_cache is not None:
+            cached_response = semantic_cache.lookup(context)
+        
+        if cached_response is not None:
+            context.model_response = cached_response
+        
+        return cached_response
+    
+    def route_model(self, context: PipelineContext) -> Optional[str]:
+        """
+        Choose the model variant for this prompt before calling the model
+        The caller should store the measured inference time in
+        context.metadata['inference_seconds'] before process_interaction
+        """
+        model_router = self.pipelines.get('model_router')
+        if model_router is None:
+            context.metadata.setdefault('model', self.get_tier_model())
+            return context.metadata['model']
+        
+        return model_router.route(context)
+    
     def get_session_status(self, session_id: str) -> Optional[PipelineStatus]:
         """Get current status of a session"""
         with self.lock:
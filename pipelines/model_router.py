@@ -0,0 +1,230 @@
+"""
+Sunflower AI Professional System - Model Router Pipeline
+Routes each prompt to the smallest installed model variant that can answer it
+Version: 6.2 | Platform: Windows + macOS | Architecture: Partitioned CD-ROM + USB
+"""
+
+import re
+import json
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Any
+from pathlib import Path
+from collections import defaultdict
+
+import requests
+
+from src.tier_calibration import model_size_rank
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OLLAMA_URL = 'http://localhost:11434'
+DEFAULT_LATENCY_BUDGET = 3.0  # seconds, matches config/performance.json
+PERFORMANCE_CONFIG = Path(__file__).parent.parent / 'config' / 'performance.json'
+
+# Intent types from STEMTutorPipeline._identify_learning_intent
+EASY_INTENTS = {'definition', 'computation', 'temporal', 'spatial'}
+HARD_INTENTS = {'reasoning', 'problem_solving'}
+
+_SIZE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)b\b')
+
+
+def canonical_model_name(model: str) -> str:
+    """Model name without the implicit ':latest' tag Ollama reports"""
+    return model[:-len(':latest')] if model.endswith(':latest') else model
+
+
+def model_family(model: str) -> str:
+    """Family name shared by all size variants of a model"""
+    name = model.lower()
+    match = _SIZE_PATTERN.search(name)
+    return name[:match.start()].rstrip(':-_') if match else name.split(':')[0]
+
+
+class ModelRouterPipeline:
+    """
+    Per-prompt model routing between installed tier variants
+    Easy prompts go to the smallest variant, hard prompts to the tier's
+    best model, with a step-down when a model exceeds the latency budget
+    """
+
+    # Weight of the newest sample in per-model latency estimates
+    LATENCY_SMOOTHING = 0.3
+    SKIPPED_LATENCY_DECAY = 0.95
+    INSTALLED_MODELS_TTL = 60.0
+
+    def __init__(self, usb_path: Path, tier_model: Optional[str] = None,
+                 stem_tutor: Any = None, latency_budget: Optional[float] = None,
+                 base_url: str = DEFAULT_OLLAMA_URL):
+        """Initialize router for the hardware tier's best model"""
+        self.usb_path = Path(usb_path)
+        self.tier_model = tier_model
+        self.stem_tutor = stem_tutor
+        self.latency_budget = latency_budget or self._load_latency_budget()
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+        self._lock = threading.RLock()
+        self._installed: List[str] = []
+        self._installed_at = 0.0
+        self.latency_estimates: Dict[str, float] = {}
+
+        self.stats = {
+            'decisions': defaultdict(lambda: defaultdict(int)),
+            'budget_fallbacks': 0,
+            'latency_saved_seconds': defaultdict(float),
+            'inferences': 0
+        }
+
+        logger.info(f"Model router initialized (tier model: {tier_model}, "
+                    f"budget: {self.latency_budget}s)")
+
+    def _load_latency_budget(self) -> float:
+        """Read max_response_time from the performance configuration"""
+        try:
+            with open(PERFORMANCE_CONFIG, 'r') as f:
+                return float(json.load(f).get('max_response_time', DEFAULT_LATENCY_BUDGET))
+        except Exception:
+            return DEFAULT_LATENCY_BUDGET
+
+    def get_installed_models(self) -> List[str]:
+        """
+        Installed variants of the tier model's family, smallest first
+        Never includes variants larger than the tier model; names are
+        reported without the ':latest' tag so each variant appears once
+        """
+        with self._lock:
+            if time.time() - self._installed_at < self.INSTALLED_MODELS_TTL:
+                return self._installed
+
+            try:
+                response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+                response.raise_for_status()
+                names = [canonical_model_name(m.get('name', ''))
+                         for m in response.json().get('models', [])]
+            except Exception as e:
+                logger.warning(f"Could not list installed models: {e}")
+                names = []
+
+            if self.tier_model:
+                tier_model = canonical_model_name(self.tier_model)
+                family = model_family(tier_model)
+                ceiling = model_size_rank(tier_model)
+                names = [n for n in names
+                         if model_family(n) == family and model_size_rank(n) <= ceiling]
+                if tier_model not in names:
+                    names.append(tier_model)
+
+            self._installed = sorted(set(names), key=model_size_rank)
+            self._installed_at = time.time()
+            return self._installed
+
+    def classify(self, context: Any) -> str:
+        """Classify a prompt as easy, moderate or hard"""
+        if self.stem_tutor is None:
+            return 'hard'
+
+        intent = self.stem_tutor._identify_learning_intent(context)
+        complexity = intent['complexity']
+
+        if complexity == 'complex' or intent['type'] in HARD_INTENTS:
+            return 'hard'
+        if complexity == 'simple' or intent['type'] in EASY_INTENTS:
+            return 'easy'
+        return 'moderate'
+
+    def route(self, context: Any) -> Optional[str]:
+        """
+        Choose the model for this prompt and record it in context.metadata['model']
+        Returns the chosen model, or None when no model is known
+        """
+        candidates = self.get_installed_models()
+        if not candidates:
+            return self.tier_model
+
+        difficulty = self.classify(context)
+        if difficulty == 'easy':
+            index = 0
+        elif difficulty == 'moderate':
+            index = len(candidates) // 2
+        else:
+            index = len(candidates) - 1
+
+        chosen = candidates[index]
+
+        # Step down while the chosen model's observed latency exceeds the budget
+        fallback = False
+        while index > 0 and self.latency_estimates.get(chosen, 0.0) > self.latency_budget:
+            with self._lock:
+                # Skipped models get no new samples, so let their estimate
+                # decay until they are tried again
+                self.latency_estimates[chosen] *= self.SKIPPED_LATENCY_DECAY
+            index -= 1
+            chosen = candidates[index]
+            fallback = True
+
+        with self._lock:
+            self.stats['decisions'][difficulty][chosen] += 1
+            if fallback:
+                self.stats['budget_fallbacks'] += 1
+
+        context.metadata['model'] = chosen
+        context.metadata['model_routing'] = {
+            'difficulty': difficulty,
+            'model': chosen,
+            'tier_model': candidates[-1],
+            'budget_fallback': fallback
+        }
+        return chosen
+
+    def record_latency(self, model: str, seconds: float) -> None:
+        """Update the smoothed latency estimate for a model"""
+        with self._lock:
+            previous = self.latency_estimates.get(model)
+            if previous is None:
+                self.latency_estimates[model] = seconds
+            else:
+                self.latency_estimates[model] = (
+                    self.LATENCY_SMOOTHING * seconds + (1 - self.LATENCY_SMOOTHING) * previous
+                )
+
+    def process(self, context: Any) -> Any:
+        """
+        Record the measured inference latency of a routed interaction
+        Expects context.metadata['inference_seconds'] set by the caller
+        Returns: context unchanged
+        """
+        routing = context.metadata.get('model_routing')
+        seconds = context.metadata.get('inference_seconds')
+        if not routing or seconds is None or context.metadata.get('response_cache') == 'hit':
+            return context
+
+        model = routing['model']
+        self.record_latency(model, seconds)
+
+        # Savings are measured against what the tier model typically takes
+        tier_estimate = self.latency_estimates.get(routing['tier_model'])
+        saved = max(0.0, tier_estimate - seconds) if tier_estimate and model != routing['tier_model'] else 0.0
+        routing['latency_saved_seconds'] = round(saved, 3)
+
+        with self._lock:
+            self.stats['inferences'] += 1
+            self.stats['latency_saved_seconds'][routing['difficulty']] += saved
+
+        return context
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get routing decisions and latency saved per difficulty"""
+        with self._lock:
+            return {
+                'tier_model': self.tier_model,
+                'latency_budget': self.latency_budget,
+                'decisions': {d: dict(models) for d, models in self.stats['decisions'].items()},
+                'budget_fallbacks': self.stats['budget_fallbacks'],
+                'inferences': self.stats['inferences'],
+                'latency_saved_seconds': {
+                    d: round(s, 3) for d, s in self.stats['latency_saved_seconds'].items()
+                },
+                'latency_estimates': {m: round(s, 3) for m, s in self.latency_estimates.items()}
+            }
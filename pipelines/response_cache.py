@@ -0,0 +1,339 @@
+"""
+Sunflower AI Professional System - Response Cache Pipeline
+Persistent cache of safety-approved answers for repeated child questions
+Version: 6.2 | Platform: Windows + macOS | Architecture: Partitioned CD-ROM + USB
+"""
+
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict, Optional, Any, Tuple
+from pathlib import Path
+from datetime import datetime, timezone
+from collections import defaultdict
+from contextlib import contextmanager
+
+from pipelines.safety.text_normalizer import normalize_text, extract_math_tokens
+
+logger = logging.getLogger(__name__)
+
+# Age bands match the grade levels used by AgeAdapterPipeline so that a
+# cached answer is only reused for children receiving the same adaptation
+AGE_BANDS = (
+    ((0, 7), 'K-2'),
+    ((8, 10), '3-5'),
+    ((11, 13), '6-8'),
+    ((14, 99), '9-12'),
+)
+
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50MB on the USB partition
+SCHEMA_VERSION = 1  # 1: responses are stored before personalization
+
+
+def get_age_band(age: int) -> str:
+    """Map a child's age to the grade band used for cache keys"""
+    for (low, high), band in AGE_BANDS:
+        if low <= age <= high:
+            return band
+    return AGE_BANDS[-1][1]
+
+
+def get_modelfile_hash(context: Any, memo: Dict[str, Tuple]) -> str:
+    """
+    Hash of the modelfile that produced the context's answers, or ''
+    Uses metadata['modelfile_hash'] when given, otherwise hashes
+    metadata['modelfile_path'], re-reading it only when size or mtime change
+    """
+    modelfile_hash = context.metadata.get('modelfile_hash')
+    if modelfile_hash:
+        return modelfile_hash
+
+    modelfile_path = context.metadata.get('modelfile_path')
+    if not modelfile_path:
+        return ''
+
+    path = Path(modelfile_path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return ''
+
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = memo.get(str(path))
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    memo[str(path)] = (signature, digest)
+    return digest
+
+
+class ResponseCachePipeline:
+    """
+    Persistent LRU cache of already safety-filtered model responses
+    Keyed by normalized prompt (plus its numbers and operators), age band,
+    model variant and modelfile hash
+
+    Runs directly behind the content filter, so it stores the model output
+    before the per-child stages (greeting, celebrations, follow-up
+    questions) and those stages run again for whichever child gets a hit
+    """
+
+    def __init__(self, usb_path: Path,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize response cache on the USB partition"""
+        self.usb_path = Path(usb_path)
+        self.cache_dir = self.usb_path / 'cache'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / 'response_cache.db'
+        self.preferences_file = self.usb_path / 'parent_dashboard' / 'parent_preferences.json'
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        self._modelfile_hashes: Dict[str, Tuple] = {}
+        self._preferences_mtime = None
+        self._enabled = True
+
+        self.stats = defaultdict(int)
+
+        self._init_database()
+        self._refresh_family_preference()
+
+        logger.info(f"Response cache initialized at {self.db_path}")
+
+    @contextmanager
+    def _get_db_connection(self):
+        """Open a short-lived connection to the cache database"""
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_database(self) -> None:
+        """Create cache schema"""
+        with self._lock, self._get_db_connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    cache_key TEXT PRIMARY KEY,
+                    age_band TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0
+                )
+            ''')
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses(last_accessed)'
+            )
+
+            # Version 0 stored personalized replies; they must not be served
+            if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                conn.execute('DELETE FROM responses')
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.commit()
+
+    def _refresh_family_preference(self) -> bool:
+        """Re-read the family opt-out setting when the preferences file changes"""
+        try:
+            mtime = self.preferences_file.stat().st_mtime if self.preferences_file.exists() else None
+            if mtime == self._preferences_mtime:
+                return self._enabled
+
+            self._preferences_mtime = mtime
+            enabled = True
+            if mtime is not None:
+                with open(self.preferences_file, 'r') as f:
+                    enabled = bool(json.load(f).get('response_cache_enabled', True))
+
+            if self._enabled and not enabled:
+                # Family opted out: do not keep previously cached answers around
+                self.clear()
+                logger.info("Response cache disabled by family preference")
+
+            self._enabled = enabled
+        except Exception as e:
+            logger.warning(f"Could not read response cache preference: {e}")
+
+        return self._enabled
+
+    def is_enabled(self) -> bool:
+        """Whether the family currently allows response caching"""
+        return self._refresh_family_preference()
+
+    def _build_key(self, context: Any) -> Optional[str]:
+        """Build the cache key for an interaction, or None if it cannot be cached"""
+        model = context.metadata.get('model')
+        normalized_prompt = normalize_text(context.input_text or '')
+        if not model or not normalized_prompt:
+            return None
+
+        key_material = '\x1f'.join([
+            normalized_prompt,
+            extract_math_tokens(context.input_text),
+            get_age_band(context.child_age),
+            model,
+            get_modelfile_hash(context, self._modelfile_hashes)
+        ])
+        return hashlib.sha256(key_material.encode('utf-8')).hexdigest()
+
+    def lookup(self, context: Any) -> Optional[str]:
+        """
+        Look up a cached response for this interaction
+        Returns the cached response, or None on a miss
+        """
+        if not self._refresh_family_preference():
+            return None
+
+        try:
+            cache_key = self._build_key(context)
+            if cache_key is None:
+                return None
+
+            with self._lock, self._get_db_connection() as conn:
+                row = conn.execute(
+                    'SELECT response FROM responses WHERE cache_key = ?',
+                    (cache_key,)
+                ).fetchone()
+
+                if row is None:
+                    self.stats['misses'] += 1
+                    context.metadata['response_cache'] = 'miss'
+                    return None
+
+                conn.execute(
+                    'UPDATE responses SET last_accessed = ?, hit_count = hit_count + 1 '
+                    'WHERE cache_key = ?',
+                    (time.time(), cache_key)
+                )
+                conn.commit()
+
+            self.stats['hits'] += 1
+            context.metadata['response_cache'] = 'hit'
+            return row[0]
+
+        except sqlite3.Error as e:
+            logger.error(f"Response cache lookup failed: {e}")
+            return None
+
+    def process(self, context: Any) -> Any:
+        """
+        Store the safety-filtered, not yet personalized response
+        Returns: context unchanged
+        """
+        if context.metadata.get('response_cache') == 'hit':
+            return context
+
+        # Personalized text names the child; never share it with another child
+        if context.metadata.get('adaptation_applied'):
+            logger.warning("Response cache runs after personalization; not storing")
+            return context
+
+        # Only cache answers that passed every safety layer on-topic
+        if (not context.model_response or context.safety_flags
+                or context.metadata.get('content_type') == 'off_topic'):
+            return context
+
+        if not self._refresh_family_preference():
+            return context
+
+        try:
+            cache_key = self._build_key(context)
+            if cache_key is None:
+                return context
+
+            response = context.model_response
+
+            with self._lock, self._get_db_connection() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO responses (
+                        cache_key, age_band, model, response, size_bytes,
+                        created_at, last_accessed, hit_count
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                ''', (
+                    cache_key,
+                    get_age_band(context.child_age),
+                    context.metadata['model'],
+                    response,
+                    len(response.encode('utf-8')),
+                    datetime.now(timezone.utc).isoformat(),
+                    time.time()
+                ))
+                self._evict(conn)
+                conn.commit()
+
+            self.stats['stores'] += 1
+
+        except sqlite3.Error as e:
+            logger.error(f"Response cache store failed: {e}")
+
+        return context
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Evict least recently used entries until within entry and size bounds"""
+        count, total_bytes = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM responses'
+        ).fetchone()
+
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = conn.execute(
+            'SELECT cache_key, size_bytes FROM responses ORDER BY last_accessed ASC'
+        )
+        doomed = []
+        for cache_key, size_bytes in rows:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            doomed.append((cache_key,))
+            count -= 1
+            total_bytes -= size_bytes
+            evicted += 1
+
+        conn.executemany('DELETE FROM responses WHERE cache_key = ?', doomed)
+        self.stats['evictions'] += evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for the parent dashboard"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        stats = {
+            'enabled': self._enabled,
+            'hits': self.stats['hits'],
+            'misses': self.stats['misses'],
+            'stores': self.stats['stores'],
+            'evictions': self.stats['evictions'],
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'entries': 0,
+            'size_bytes': 0
+        }
+
+        try:
+            with self._lock, self._get_db_connection() as conn:
+                stats['entries'], stats['size_bytes'] = conn.execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM responses'
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read response cache statistics: {e}")
+
+        return stats
+
+    def clear(self) -> None:
+        """Remove all cached responses (e.g. after a model update)"""
+        try:
+            with self._lock, self._get_db_connection() as conn:
+                conn.execute('DELETE FROM responses')
+                conn.commit()
+            logger.info("Response cache cleared")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to clear response cache: {e}")
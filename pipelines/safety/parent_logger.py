@@ -58,7 +58,8 @@ class ParentLoggerPipeline:
             'email_notifications': False,
             'alert_keywords': [],
             'monitoring_level': 'comprehensive',  # minimal, standard, comprehensive
-            'data_retention_days': 90
+            'data_retention_days': 90,
+            'response_cache_enabled': True  # Reuse approved answers to repeated questions
         }
         
         try:
@@ -310,6 +311,15 @@ class ParentLoggerPipeline:
             if log_entry['safety']['content_blocked']:
                 dashboard['safety_incidents'] += 1
             
+            # Track response cache effectiveness
+            cache_status = context.metadata.get('response_cache')
+            if cache_status:
+                cache_stats = dashboard.setdefault('response_cache', {'lookups': 0, 'hits': 0, 'hit_rate': 0.0})
+                cache_stats['lookups'] += 1
+                if cache_status == 'hit':
+                    cache_stats['hits'] += 1
+                cache_stats['hit_rate'] = round(cache_stats['hits'] / cache_stats['lookups'], 3)
+            
             # Calculate learning streak
             dashboard['learning_streak'] = self._calculate_learning_streak(context.profile_id)
             
@@ -335,7 +345,8 @@ class ParentLoggerPipeline:
             'safety_incidents': 0,
             'learning_streak': 0,
             'achievements_earned': [],
-            'progress_summary': {}
+            'progress_summary': {},
+            'response_cache': {'lookups': 0, 'hits': 0, 'hit_rate': 0.0}
         }
     
     def _detect_unusual_activity(self, context: Any) -> bool:
@@ -0,0 +1,51 @@
+"""
+Sunflower AI Professional System - Text Normalization
+Shared prompt normalization used by the content filter and response cache
+Version: 6.2 | Safety Level: Maximum
+"""
+
+import re
+import unicodedata
+
+# Leetspeak and common character substitutions used to evade filters
+LEET_SUBSTITUTIONS = {
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's',
+    '7': 't', '8': 'b', '@': 'a', '$': 's', '!': 'i'
+}
+
+_NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_MATH_TOKEN_PATTERN = re.compile(r'\d+(?:\.\d+)?|[+\-*/×÷=<>^%]')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for consistent filtering and cache lookups
+
+    Removes unicode tricks, undoes leetspeak substitutions, strips
+    punctuation and collapses whitespace so that trivially different
+    spellings of the same question map to the same string.
+    """
+    # Remove unicode tricks
+    text = unicodedata.normalize('NFKD', text)
+
+    # Handle leetspeak and common substitutions
+    for old, new in LEET_SUBSTITUTIONS.items():
+        text = text.replace(old, new)
+
+    # Remove excessive spaces and special characters
+    text = _NON_WORD_PATTERN.sub(' ', text)
+    text = _WHITESPACE_PATTERN.sub(' ', text)
+
+    return text.lower().strip()
+
+
+def extract_math_tokens(text: str) -> str:
+    """
+    Extract numbers and arithmetic operators in their original order
+
+    normalize_text folds digits into letters and drops operators, so
+    "7+8" and "7-8" normalize identically. Anything that reuses answers
+    across prompts must also compare this signature.
+    """
+    return ' '.join(_MATH_TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text)))
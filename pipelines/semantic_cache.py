@@ -0,0 +1,462 @@
+"""
+Sunflower AI Professional System - Semantic Response Cache
+Near-duplicate prompt matching for paraphrased child questions
+Version: 6.2 | Platform: Windows + macOS | Architecture: Partitioned CD-ROM + USB
+"""
+
+import json
+import time
+import zlib
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from pathlib import Path
+from datetime import datetime, timezone
+
+from pipelines.safety.text_normalizer import normalize_text, extract_math_tokens
+from pipelines.response_cache import get_age_band, get_modelfile_hash
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OLLAMA_URL = 'http://localhost:11434'
+DEFAULT_EMBEDDING_MODEL = 'nomic-embed-text'
+HASHED_VECTOR_DIM = 256
+INDEX_VERSION = 2  # 2: responses are stored before personalization
+
+
+# Question words and fillers that say nothing about what is being asked
+STOP_WORDS = frozenset(
+    'a an the is are was were be do does did how what whats why when where which who '
+    'can could would should will of in on at to for from with about there their this '
+    'that these those it its me my i you your tell please explain s'.split()
+)
+
+
+def _stem(word: str) -> str:
+    """Strip common plural and verb suffixes"""
+    for suffix in ('ing', 'es', 'ed', 's'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+class HashedNgramVectorizer:
+    """
+    Dependency-free prompt embedder used when no embedding model is available
+    Hashes stemmed content words, word bigrams and character trigrams into a
+    fixed number of buckets and L2-normalizes the result
+    """
+
+    name = 'hashed-ngram'
+    default_threshold = 0.72
+
+    def __init__(self, dim: int = HASHED_VECTOR_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[Tuple[str, float]]:
+        """Extract weighted n-gram features from normalized text"""
+        words = [_stem(word) for word in text.split() if word not in STOP_WORDS]
+        features = [(f"w:{word}", 1.0) for word in words]
+        features += [(f"b:{a} {b}", 0.5) for a, b in zip(words, words[1:])]
+
+        # Character trigrams tolerate misspellings such as "volcanos"
+        for word in words:
+            padded = f" {word} "
+            features += [(f"c:{padded[i:i + 3]}", 0.3) for i in range(len(padded) - 2)]
+
+        return features
+
+    def embed(self, texts: List[str]) -> 'np.ndarray':
+        """Embed a batch of texts into unit-length float32 vectors"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(normalize_text(text)):
+                bucket = zlib.crc32(feature.encode('utf-8'))
+                # Use one hash bit as the sign to reduce collision bias
+                sign = 1.0 if bucket & 0x80000000 else -1.0
+                vectors[row, bucket % self.dim] += sign * weight
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class OllamaEmbedder:
+    """Prompt embedder backed by a small local embedding model served by Ollama"""
+
+    default_threshold = 0.88
+
+    def __init__(self, model: str = DEFAULT_EMBEDDING_MODEL,
+                 base_url: str = DEFAULT_OLLAMA_URL, timeout: float = 5.0):
+        self.model = model
+        self.name = f"ollama:{model}"
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def is_available(self) -> bool:
+        """Check whether the embedding model is installed locally"""
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self.timeout)
+            response.raise_for_status()
+            installed = [m.get('name', '') for m in response.json().get('models', [])]
+            return any(name.split(':')[0] == self.model.split(':')[0] for name in installed)
+        except Exception:
+            return False
+
+    def embed(self, texts: List[str]) -> 'np.ndarray':
+        """Embed a batch of texts into unit-length float32 vectors"""
+        response = self.session.post(
+            f"{self.base_url}/api/embed",
+            json={'model': self.model, 'input': [normalize_text(t) for t in texts]},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+        vectors = np.asarray(response.json()['embeddings'], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class SemanticIndex:
+    """Growable NumPy-backed cosine similarity index for one age band and model"""
+
+    def __init__(self, dim: int, initial_capacity: int = 256):
+        self.dim = dim
+        self.size = 0
+        self.vectors = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self.last_used = np.zeros(initial_capacity, dtype=np.float64)
+        self.entries: List[Dict[str, Any]] = []
+        self._clock = 0.0
+
+    def _now(self) -> float:
+        """Use time, strictly increasing so coarse clocks still order entries"""
+        self._clock = max(time.time(), self._clock + 1e-6)
+        return self._clock
+
+    def add(self, vector: 'np.ndarray', entry: Dict[str, Any],
+            max_entries: Optional[int] = None) -> bool:
+        """
+        Append a vector and its cached entry
+        When max_entries are stored the least recently used entry is replaced;
+        returns True if an entry was evicted
+        """
+        now = self._now()
+        entry['last_used'] = now
+
+        if max_entries is not None and self.size >= max_entries:
+            slot = int(np.argmin(self.last_used[:self.size]))
+            self.vectors[slot] = vector
+            self.last_used[slot] = now
+            self.entries[slot] = entry
+            return True
+
+        if self.size == len(self.vectors):
+            capacity = len(self.vectors) * 2
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+            used = np.zeros(capacity, dtype=np.float64)
+            used[:self.size] = self.last_used[:self.size]
+            self.last_used = used
+
+        self.vectors[self.size] = vector
+        self.last_used[self.size] = now
+        self.entries.append(entry)
+        self.size += 1
+        return False
+
+    def touch(self, index: int) -> None:
+        """Mark an entry as just used"""
+        now = self._now()
+        self.last_used[index] = now
+        self.entries[index]['last_used'] = now
+
+    def search(self, vector: 'np.ndarray') -> Tuple[int, float]:
+        """Return (index, cosine similarity) of the nearest stored vector"""
+        if self.size == 0:
+            return -1, 0.0
+
+        scores = self.vectors[:self.size] @ vector
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+
+    def save(self, path: Path) -> None:
+        """Persist vectors and entries next to each other"""
+        np.save(path.parent / f"{path.name}.npy", self.vectors[:self.size])
+        with open(path.parent / f"{path.name}.json", 'w') as f:
+            json.dump(self.entries, f)
+
+    @classmethod
+    def load(cls, path: Path, dim: int) -> 'SemanticIndex':
+        """Load a persisted index, or return an empty one"""
+        index = cls(dim)
+        vectors_file = path.parent / f"{path.name}.npy"
+        entries_file = path.parent / f"{path.name}.json"
+
+        if vectors_file.exists() and entries_file.exists():
+            vectors = np.load(vectors_file)
+            with open(entries_file, 'r') as f:
+                entries = json.load(f)
+
+            if vectors.ndim == 2 and vectors.shape[1] == dim and len(entries) == len(vectors):
+                capacity = max(len(vectors), 256)
+                index.vectors = np.zeros((capacity, dim), dtype=np.float32)
+                index.vectors[:len(vectors)] = vectors
+                index.last_used = np.zeros(capacity, dtype=np.float64)
+                index.last_used[:len(entries)] = [e.get('last_used', 0.0) for e in entries]
+                index._clock = float(index.last_used[:len(entries)].max(initial=0.0))
+                index.entries = entries
+                index.size = len(vectors)
+
+        return index
+
+
+class SemanticCachePipeline:
+    """
+    Optional semantic layer behind the exact-match response cache
+    Returns a cached, safety-approved answer for paraphrased questions
+
+    Like the response cache it stores model output before the per-child
+    stages, with one index per age band, model, modelfile and embedder;
+    full indexes replace their least recently used entry
+    """
+
+    FLUSH_INTERVAL = 25
+
+    def __init__(self, usb_path: Path,
+                 threshold: Optional[float] = None,
+                 max_entries_per_index: int = 20000,
+                 embedder: Optional[Any] = None,
+                 response_cache: Optional[Any] = None):
+        """Initialize semantic cache, choosing the best available embedder"""
+        self.usb_path = Path(usb_path)
+        self.response_cache = response_cache
+        self.index_dir = self.usb_path / 'cache' / 'semantic'
+        self.threshold = threshold
+        self.max_entries_per_index = max_entries_per_index
+
+        self._lock = threading.RLock()
+        self.indexes: Dict[str, SemanticIndex] = {}
+        self._dirty: set = set()
+        self._modelfile_hashes: Dict[str, Tuple] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        self.available = np is not None
+        if not self.available:
+            logger.warning("NumPy not installed - semantic cache disabled")
+            self.embedder = None
+            return
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._discard_old_indexes()
+        self.embedder = embedder or self._select_embedder()
+        self.dim = self.embedder.embed(['sunflower']).shape[1]
+        if self.threshold is None:
+            self.threshold = self.embedder.default_threshold
+
+        logger.info(f"Semantic cache initialized with {self.embedder.name} embeddings")
+
+    def _discard_old_indexes(self) -> None:
+        """Delete indexes written by an older format (which held personalized replies)"""
+        version_file = self.index_dir / 'VERSION'
+        try:
+            if version_file.read_text().strip() == str(INDEX_VERSION):
+                return
+        except OSError:
+            pass
+
+        for index_file in self._index_files():
+            index_file.unlink()
+        version_file.write_text(str(INDEX_VERSION))
+
+    def _index_files(self, pattern: str = '*') -> List[Path]:
+        """Persisted index files matching a glob pattern"""
+        return [p for p in self.index_dir.glob(pattern) if p.suffix in ('.npy', '.json')]
+
+    def _select_embedder(self) -> Any:
+        """Prefer a local embedding model, fall back to hashed n-grams"""
+        if requests is not None:
+            embedder = OllamaEmbedder()
+            if embedder.is_available():
+                return embedder
+        return HashedNgramVectorizer()
+
+    def _is_enabled(self) -> bool:
+        """Honor the family opt-out managed by the exact-match response cache"""
+        if not self.available:
+            return False
+
+        if self.response_cache is not None and not self.response_cache.is_enabled():
+            if self.indexes or any(self._index_files()):
+                self.clear()
+            return False
+
+        return True
+
+    def _index_name(self, context: Any) -> Optional[str]:
+        """Name of the index for this context's age band, model, modelfile and embedder"""
+        model = context.metadata.get('model')
+        if not model:
+            return None
+
+        safe_model = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in model)
+        embedder_tag = ''.join(c if c.isalnum() else '_' for c in self.embedder.name)
+        modelfile_tag = get_modelfile_hash(context, self._modelfile_hashes)[:16] or 'default'
+        return (f"{get_age_band(context.child_age)}__{safe_model}__{embedder_tag}"
+                f"__{modelfile_tag}")
+
+    def _get_index(self, name: str) -> SemanticIndex:
+        """Get an index, loading it from the USB partition on first use"""
+        if name not in self.indexes:
+            self._discard_superseded(name)
+            self.indexes[name] = SemanticIndex.load(self.index_dir / name, self.dim)
+        return self.indexes[name]
+
+    def _discard_superseded(self, name: str) -> None:
+        """Drop indexes of the same band, model and embedder built from another modelfile"""
+        prefix = name.rsplit('__', 1)[0] + '__'
+        for other in [n for n in self.indexes if n.startswith(prefix) and n != name]:
+            del self.indexes[other]
+            self._dirty.discard(other)
+        for index_file in self._index_files(f"{prefix}*"):
+            if index_file.stem != name:
+                index_file.unlink()
+
+    def lookup(self, context: Any) -> Optional[str]:
+        """
+        Look up a cached answer for a paraphrase of this prompt
+        Returns the cached response, or None if nothing is similar enough
+        """
+        if not context.input_text or not self._is_enabled():
+            return None
+
+        try:
+            name = self._index_name(context)
+            if name is None:
+                return None
+
+            vector = self.embedder.embed([context.input_text])[0]
+
+            with self._lock:
+                index = self._get_index(name)
+                best, score = index.search(vector)
+
+                entry = index.entries[best] if best >= 0 else None
+
+                # Paraphrases must still ask about exactly the same numbers
+                if (entry is None or score < self.threshold
+                        or entry.get('math', '') != extract_math_tokens(context.input_text)):
+                    self.stats['misses'] += 1
+                    return None
+
+                index.touch(best)
+                self._dirty.add(name)
+
+            self.stats['hits'] += 1
+            context.metadata['response_cache'] = 'hit'
+            context.metadata['semantic_cache_score'] = round(score, 4)
+            return entry['response']
+
+        except Exception as e:
+            logger.error(f"Semantic cache lookup failed: {e}")
+            return None
+
+    def process(self, context: Any) -> Any:
+        """
+        Add the safety-filtered, not yet personalized response to the index
+        Returns: context unchanged
+        """
+        if context.metadata.get('response_cache') == 'hit' or not self._is_enabled():
+            return context
+
+        # Personalized text names the child; never share it with another child
+        if context.metadata.get('adaptation_applied'):
+            logger.warning("Semantic cache runs after personalization; not storing")
+            return context
+
+        if (not context.model_response or context.safety_flags
+                or context.metadata.get('content_type') == 'off_topic'):
+            return context
+
+        try:
+            name = self._index_name(context)
+            if name is None:
+                return context
+
+            vector = self.embedder.embed([context.input_text])[0]
+
+            with self._lock:
+                index = self._get_index(name)
+                evicted = index.add(vector, {
+                    'prompt': normalize_text(context.input_text),
+                    'math': extract_math_tokens(context.input_text),
+                    'response': context.model_response,
+                    'created_at': datetime.now(timezone.utc).isoformat()
+                }, max_entries=self.max_entries_per_index)
+                self._dirty.add(name)
+
+            if evicted:
+                self.stats['evictions'] += 1
+
+            self.stats['stores'] += 1
+
+            # Persist in batches rather than rewriting the index on every store
+            if self.stats['stores'] % self.FLUSH_INTERVAL == 0:
+                self.flush()
+
+        except Exception as e:
+            logger.error(f"Semantic cache store failed: {e}")
+
+        return context
+
+    def flush(self) -> None:
+        """Write modified indexes to the USB partition"""
+        with self._lock:
+            for name in list(self._dirty):
+                try:
+                    self.indexes[name].save(self.index_dir / name)
+                    self._dirty.discard(name)
+                except Exception as e:
+                    logger.error(f"Failed to persist semantic index {name}: {e}")
+
+    def clear(self) -> None:
+        """Remove all indexed prompts from memory and the USB partition"""
+        with self._lock:
+            self.indexes.clear()
+            self._dirty.clear()
+            for index_file in self._index_files():
+                index_file.unlink()
+        logger.info("Semantic cache cleared")
+
+    def shutdown(self) -> None:
+        """Persist pending index changes on orchestrator shutdown"""
+        if self.available:
+            self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get semantic cache statistics"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'available': self.available,
+            'embedder': self.embedder.name if self.embedder else None,
+            'threshold': self.threshold,
+            'hits': self.stats['hits'],
+            'misses': self.stats['misses'],
+            'stores': self.stats['stores'],
+            'evictions': self.stats['evictions'],
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'indexed_prompts': sum(index.size for index in self.indexes.values())
+        }
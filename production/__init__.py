@@ -90,7 +90,7 @@ REQUIRED_USB_FILES = [
     "sunflower_data.id",
     ".initialized",
     "profiles/README.txt",
-    ".security/device_token.json"
+    ".security/security_policy.json"
 ]
 
 if __name__ == "__main__":
@@ -15,20 +15,27 @@ import subprocess
 import argparse
 from pathlib import Path
 from datetime import datetime
-import hashlib
 import secrets
 import csv
 import zipfile
 import time
+import random
+import threading
 import traceback
 from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from enum import Enum
 
 # Import our production modules
 sys.path.append(str(Path(__file__).parent.parent))
-from production.create_iso import ISOCreator
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from production.create_iso import (
+    ISOCreator, build_identity_block, decode_identity_block, read_identity_block,
+    write_device_image, IDENTITY_OFFSET, IDENTITY_REGION_SIZE, USB_IDENTITY_OFFSET
+)
 from production.prepare_usb_partition import USBPartitionPreparer
+from file_hashing import get_file_hasher
 
 
 class DeviceStatus(Enum):
@@ -50,16 +57,26 @@ class DeviceResult:
     errors: List[str] = field(default_factory=list)
     iso_path: Optional[Path] = None
     usb_path: Optional[Path] = None
+    identity_path: Optional[Path] = None
     completion_time: Optional[datetime] = None
     duration_seconds: float = 0
 
 
+# Device scheduling defaults
+DEFAULT_IO_SLOTS = 2  # concurrent image writes per output disk
+RETRY_BACKOFF_INITIAL = 2.0  # seconds
+RETRY_BACKOFF_MAX = 60.0  # seconds
+
+
 class BatchManufacturingGenerator:
-    def __init__(self, batch_size=100, version="1.0.0", max_retries=3, continue_on_error=True):
+    def __init__(self, batch_size=100, version="1.0.0", max_retries=3, continue_on_error=True,
+                 workers=None, io_slots=DEFAULT_IO_SLOTS, batch_id=None):
         self.root_dir = Path(__file__).parent.parent
+        self.manufacturing_dir = self.root_dir / "manufacturing"
         self.batch_size = batch_size
         self.version = version
-        self.batch_id = self.generate_batch_id()
+        # Passing an existing batch ID resumes that batch from its recovery checkpoint
+        self.batch_id = batch_id or self.generate_batch_id()
         self.start_time = datetime.now()
         
         # FIX BUG-015: Add error recovery configuration
@@ -69,8 +86,15 @@ class BatchManufacturingGenerator:
         self.failed_devices = []  # Track failed devices for retry
         self.successful_devices = []  # Track successful devices
         
+        # Concurrent production: workers bound CPU use, io_slots bound disk writes
+        self.workers = max(1, workers or min(4, os.cpu_count() or 1))
+        self.io_slots = threading.BoundedSemaphore(max(1, io_slots))
+        self.retry_backoff_initial = RETRY_BACKOFF_INITIAL
+        self.retry_backoff_max = RETRY_BACKOFF_MAX
+        self._state_lock = threading.RLock()
+        self._abort = threading.Event()
+        
         # Paths
-        self.manufacturing_dir = self.root_dir / "manufacturing"
         self.batch_dir = self.manufacturing_dir / "batches" / self.batch_id
         self.master_dir = self.batch_dir / "master_files"
         self.docs_dir = self.batch_dir / "documentation"
@@ -94,7 +118,8 @@ class BatchManufacturingGenerator:
                 "successful": 0,
                 "failed": 0,
                 "retried": 0,
-                "skipped": 0
+                "skipped": 0,
+                "units_per_hour": 0.0
             }
         }
     
@@ -117,6 +142,15 @@ class BatchManufacturingGenerator:
         sequence_file.write_text(str(sequence))
         return sequence
     
+    def _init_device_results(self):
+        """Track every device of the batch as pending"""
+        for i in range(self.batch_size):
+            device_id = f"{self.batch_id}-{i+1:04d}"
+            self.device_results[device_id] = DeviceResult(
+                device_id=device_id,
+                status=DeviceStatus.PENDING
+            )
+    
     def generate(self):
         """Main batch generation process with error recovery"""
         print(f"🏭 Sunflower AI Batch Manufacturing Generator")
@@ -128,12 +162,10 @@ class BatchManufacturingGenerator:
         print("=" * 60)
         
         # FIX BUG-015: Initialize device tracking
-        for i in range(self.batch_size):
-            device_id = f"{self.batch_id}-{i+1:04d}"
-            self.device_results[device_id] = DeviceResult(
-                device_id=device_id,
-                status=DeviceStatus.PENDING
-            )
+        self._init_device_results()
+        
+        # Resume a crashed batch with only its unfinished devices
+        self._load_recovery_state()
         
         try:
             # Create batch directory structure
@@ -147,7 +179,12 @@ class BatchManufacturingGenerator:
                     return False
                 print("⚠️  Warning: Prerequisites check failed, continuing anyway...")
             
+            # Phase one: build the batch's master images once
+            print("\n💿 Building master images...")
+            self.prepare_master_images()
+            
             # FIX BUG-015: Process devices with error recovery
+            # Phase two: stamp each device's identity onto the shared masters
             print("\n🏭 Starting device production...")
             self._process_devices_with_recovery()
             
@@ -210,64 +247,117 @@ class BatchManufacturingGenerator:
     def _process_devices_with_recovery(self):
         """
         FIX BUG-015: Process devices with individual error recovery
+        Devices are produced concurrently by a pool of worker threads; the
+        disk-heavy steps also share a small number of I/O slots.
         """
         pending_devices = [d for d in self.device_results.values() 
                           if d.status == DeviceStatus.PENDING]
         
-        for device in pending_devices:
-            success = False
-            
-            for attempt in range(1, self.max_retries + 1):
+        if not pending_devices:
+            print("✅ No pending devices")
+            return
+        
+        print(f"⚙️  Producing {len(pending_devices)} devices with {self.workers} workers")
+        production_start = time.time()
+        completed_before = len(self.successful_devices)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="device") as executor:
+                futures = [executor.submit(self._produce_device, device) for device in pending_devices]
+                
                 try:
-                    print(f"\n🔧 Processing device {device.device_id} (Attempt {attempt}/{self.max_retries})")
-                    device.status = DeviceStatus.IN_PROGRESS
-                    device.attempts = attempt
-                    
-                    # Process individual device with error handling
-                    success = self._process_single_device(device)
-                    
-                    if success:
-                        device.status = DeviceStatus.SUCCESS
-                        device.completion_time = datetime.now()
-                        self.successful_devices.append(device.device_id)
-                        self.batch_manifest["statistics"]["successful"] += 1
-                        print(f"✅ Device {device.device_id} completed successfully")
-                        break
-                    
-                except Exception as e:
-                    error_msg = f"Attempt {attempt} failed: {str(e)}"
-                    device.errors.append(error_msg)
-                    print(f"❌ {error_msg}")
-                    
-                    if attempt < self.max_retries:
-                        print(f"🔄 Retrying device {device.device_id}...")
-                        time.sleep(2)  # Brief pause before retry
+                    for future in as_completed(futures):
+                        future.result()
+                except Exception:
+                    # Stop starting new devices; unfinished ones stay pending for resume
+                    self._abort.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            elapsed = time.time() - production_start
+            produced = len(self.successful_devices) - completed_before
+            
+            with self._state_lock:
+                self.batch_manifest["statistics"]["production_seconds"] = round(elapsed, 1)
+                self.batch_manifest["statistics"]["units_per_hour"] = (
+                    round(produced / (elapsed / 3600), 1) if elapsed > 0 else 0.0
+                )
+            self._save_recovery_state(quiet=True)
+    
+    def _produce_device(self, device: DeviceResult):
+        """Produce one device, retrying failed attempts with exponential backoff"""
+        for attempt in range(1, self.max_retries + 1):
+            if self._abort.is_set():
+                return
+            
+            try:
+                print(f"\n🔧 Processing device {device.device_id} (Attempt {attempt}/{self.max_retries})")
+                device.status = DeviceStatus.IN_PROGRESS
+                device.attempts = attempt
+                
+                # Process individual device with error handling; a False
+                # result is a failed attempt like any exception
+                if not self._process_single_device(device):
+                    raise RuntimeError("Device production did not complete")
+                
+                device.status = DeviceStatus.SUCCESS
+                device.completion_time = datetime.now()
+                with self._state_lock:
+                    self.successful_devices.append(device.device_id)
+                    self.batch_manifest["statistics"]["successful"] += 1
+                print(f"✅ Device {device.device_id} completed successfully")
+                break
+                
+            except Exception as e:
+                error_msg = f"Attempt {attempt} failed: {str(e)}"
+                device.errors.append(error_msg)
+                print(f"❌ {device.device_id}: {error_msg}")
+                
+                if attempt < self.max_retries:
+                    # Back off so transient disk or tool failures can clear
+                    delay = min(self.retry_backoff_initial * 2 ** (attempt - 1), self.retry_backoff_max)
+                    delay += random.uniform(0, delay / 4)
+                    print(f"🔄 Retrying device {device.device_id} in {delay:.1f}s...")
+                    with self._state_lock:
                         self.batch_manifest["statistics"]["retried"] += 1
-                    else:
-                        # Final attempt failed
-                        device.status = DeviceStatus.FAILED
+                    if self._abort.wait(delay):
+                        device.status = DeviceStatus.PENDING
+                        return
+                else:
+                    # Final attempt failed
+                    device.status = DeviceStatus.FAILED
+                    with self._state_lock:
                         self.failed_devices.append(device.device_id)
                         self.batch_manifest["statistics"]["failed"] += 1
-                        print(f"❌ Device {device.device_id} failed after {self.max_retries} attempts")
-                        
-                        # Save device failure details for recovery
-                        self._save_device_failure(device)
-                        
-                        if not self.continue_on_error:
-                            raise RuntimeError(f"Device {device.device_id} failed and continue_on_error is False")
-            
-            # Update manifest with device result
+                    print(f"❌ Device {device.device_id} failed after {self.max_retries} attempts")
+                    
+                    # Save device failure details for recovery
+                    self._save_device_failure(device)
+        
+        # Update manifest with device result and checkpoint the batch
+        with self._state_lock:
             self.batch_manifest["device_results"][device.device_id] = {
                 "status": device.status.value,
                 "attempts": device.attempts,
                 "errors": device.errors,
-                "completion_time": device.completion_time.isoformat() if device.completion_time else None
+                "completion_time": device.completion_time.isoformat() if device.completion_time else None,
+                "duration_seconds": round(device.duration_seconds, 1)
             }
+        self._save_recovery_state(quiet=True)
+        
+        if device.status == DeviceStatus.FAILED and not self.continue_on_error:
+            raise RuntimeError(f"Device {device.device_id} failed and continue_on_error is False")
     
     def _process_single_device(self, device: DeviceResult) -> bool:
         """
         FIX BUG-015: Process a single device with error handling
         
+        Devices share the batch's master ISO and USB images; only small
+        identity blocks are produced per device, to be stamped into the
+        reserved regions of both images when the device is written. The
+        USB block also carries the device's security token.
+        
         Args:
             device: Device result object to update
             
@@ -277,42 +367,44 @@ class BatchManufacturingGenerator:
         try:
             device_start = time.time()
             
-            # Build device-specific ISO
-            iso_creator = ISOCreator(
-                version=self.version,
-                batch_id=self.batch_id,
-                device_id=device.device_id
-            )
-            
-            # Create ISO with timeout protection
-            iso_path = self._create_with_timeout(
-                iso_creator.create,
-                timeout=300,  # 5 minutes timeout
-                error_msg="ISO creation timeout"
-            )
-            
-            if not iso_path or not Path(iso_path).exists():
-                raise RuntimeError("ISO creation failed - file not found")
+            if not self.iso_path or not Path(self.iso_path).exists():
+                raise RuntimeError("Master ISO not available")
+            if not self.usb_image_path or not Path(self.usb_image_path).exists():
+                raise RuntimeError("Master USB image not available")
             
-            device.iso_path = Path(iso_path)
+            device_dir = self.batch_dir / "devices" / device.device_id
+            device_dir.mkdir(parents=True, exist_ok=True)
             
-            # Prepare USB partition
-            usb_preparer = USBPartitionPreparer(
-                batch_id=self.batch_id,
-                partition_size_mb=1024
-            )
+            identity = {
+                "device_id": device.device_id,
+                "serial": self._device_serial(device.device_id),
+                "batch_id": self.batch_id,
+                "version": self.version,
+                "master_iso_checksum": self.batch_manifest["components"]["master_iso"]["checksum"],
+                "created": datetime.now().isoformat()
+            }
             
-            # Create USB with timeout protection
-            usb_path = self._create_with_timeout(
-                lambda: usb_preparer.prepare(output_format="zip"),
-                timeout=180,  # 3 minutes timeout
-                error_msg="USB preparation timeout"
+            usb_identity = dict(
+                identity,
+                partition="usb",
+                device_token=secrets.token_hex(32),
+                security_version="2.0"
             )
             
-            if not usb_path or not Path(usb_path).exists():
-                raise RuntimeError("USB preparation failed - file not found")
+            # Write every file atomically so a crash never leaves half an identity
+            identity_path = device_dir / "identity.bin"
+            for path, data in [
+                (device_dir / "identity.json", json.dumps(identity, indent=2).encode("utf-8")),
+                (identity_path, build_identity_block(identity)),
+                (self._usb_identity_path(identity_path), build_identity_block(usb_identity))
+            ]:
+                temp_path = path.with_name(path.name + ".tmp")
+                temp_path.write_bytes(data)
+                os.replace(temp_path, path)
             
-            device.usb_path = Path(usb_path)
+            device.identity_path = identity_path
+            device.iso_path = Path(self.iso_path)
+            device.usb_path = Path(self.usb_image_path)
             
             # Quick validation
             if not self._validate_device_output(device):
@@ -326,6 +418,47 @@ class BatchManufacturingGenerator:
             self._cleanup_device_files(device)
             raise e
     
+    @staticmethod
+    def _usb_identity_path(identity_path: Path) -> Path:
+        """USB partition identity block stored next to the CD-ROM one"""
+        return identity_path.with_name("identity.usb.bin")
+    
+    def write_device(self, device_id: str, cdrom_target, usb_target) -> int:
+        """
+        Write a produced device: the master ISO and master USB image, each
+        stamped with the device's identity block and read back to confirm it
+        
+        Args:
+            device_id: A successfully produced device of this batch
+            cdrom_target: CD-ROM partition device node or image file
+            usb_target: USB data partition device node or image file
+            
+        Returns:
+            Number of bytes written
+        """
+        device = self.device_results.get(device_id)
+        if device is None or device.status != DeviceStatus.SUCCESS or not device.identity_path:
+            raise ValueError(f"Device {device_id} has not been produced in batch {self.batch_id}")
+        
+        written = 0
+        for master, block_path, target, offset in [
+            (device.iso_path, device.identity_path, cdrom_target, IDENTITY_OFFSET),
+            (device.usb_path, self._usb_identity_path(device.identity_path), usb_target, USB_IDENTITY_OFFSET)
+        ]:
+            expected = decode_identity_block(block_path.read_bytes())
+            with self.io_slots:
+                written += write_device_image(master, block_path.read_bytes(), target, offset)
+            
+            if read_identity_block(target, offset) != expected:
+                raise RuntimeError(f"Identity verification failed on {target}")
+        
+        print(f"✅ Wrote {device_id} to {cdrom_target} and {usb_target} ({written / (1024**2):.1f} MB)")
+        return written
+    
+    def _device_serial(self, device_id: str) -> str:
+        """Serial number printed on the device label"""
+        return f"SAI{self.batch_id[-6:]}{device_id[-4:]}"
+    
     def _create_with_timeout(self, func, timeout: int, error_msg: str):
         """
         FIX BUG-015: Execute function with timeout protection
@@ -375,6 +508,15 @@ class BatchManufacturingGenerator:
             else:
                 return False
             
+            # Check both identity blocks decode back to this device
+            if not device.identity_path:
+                return False
+            for block_path in [device.identity_path, self._usb_identity_path(device.identity_path)]:
+                if not block_path.exists():
+                    return False
+                identity = decode_identity_block(block_path.read_bytes())
+                if not identity or identity.get("device_id") != device.device_id:
+                    return False
             return True
             
         except Exception:
@@ -385,10 +527,11 @@ class BatchManufacturingGenerator:
         FIX BUG-015: Clean up partial device files after failure
         """
         try:
-            if device.iso_path and device.iso_path.exists():
-                device.iso_path.unlink()
-            if device.usb_path and device.usb_path.exists():
-                device.usb_path.unlink()
+            # Master images are shared by the batch; only remove this device's identity
+            if device.identity_path:
+                for path in device.identity_path.parent.glob("identity.*"):
+                    path.unlink()
+                device.identity_path = None
         except Exception as e:
             print(f"⚠️  Warning: Failed to cleanup device files: {e}")
     
@@ -414,33 +557,105 @@ class BatchManufacturingGenerator:
         
         print(f"💾 Saved failure info: {failure_file}")
     
-    def _save_recovery_state(self):
+    def _save_recovery_state(self, quiet: bool = False):
         """
         FIX BUG-015: Save entire batch state for recovery
+        Written atomically so a crash mid-write never leaves a corrupt checkpoint
         """
         recovery_file = self.recovery_dir / "batch_recovery.json"
         self.recovery_dir.mkdir(parents=True, exist_ok=True)
         
-        recovery_state = {
-            "batch_id": self.batch_id,
-            "timestamp": datetime.now().isoformat(),
-            "device_results": {
-                device_id: {
-                    "status": result.status.value,
-                    "attempts": result.attempts,
-                    "errors": result.errors
-                }
-                for device_id, result in self.device_results.items()
-            },
-            "successful_devices": self.successful_devices,
-            "failed_devices": self.failed_devices,
-            "batch_manifest": self.batch_manifest
-        }
+        with self._state_lock:
+            recovery_state = {
+                "batch_id": self.batch_id,
+                "version": self.version,
+                "timestamp": datetime.now().isoformat(),
+                "device_results": {
+                    device_id: {
+                        "status": result.status.value,
+                        "attempts": result.attempts,
+                        "errors": result.errors,
+                        "iso_path": str(result.iso_path) if result.iso_path else None,
+                        "usb_path": str(result.usb_path) if result.usb_path else None,
+                        "identity_path": str(result.identity_path) if result.identity_path else None,
+                        "completion_time": result.completion_time.isoformat() if result.completion_time else None,
+                        "duration_seconds": result.duration_seconds
+                    }
+                    for device_id, result in self.device_results.items()
+                },
+                "successful_devices": list(self.successful_devices),
+                "failed_devices": list(self.failed_devices),
+                "batch_manifest": self.batch_manifest
+            }
+            
+            temp_file = recovery_file.with_suffix(".json.tmp")
+            with open(temp_file, 'w') as f:
+                json.dump(recovery_state, f, indent=2, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, recovery_file)
+        
+        if not quiet:
+            print(f"💾 Saved recovery state: {recovery_file}")
+    
+    def _load_recovery_state(self) -> int:
+        """
+        Restore completed devices from a previous run of this batch
         
-        with open(recovery_file, 'w') as f:
-            json.dump(recovery_state, f, indent=2)
+        Returns:
+            Number of devices that do not need to be produced again
+        """
+        recovery_file = self.recovery_dir / "batch_recovery.json"
+        if not recovery_file.exists():
+            return 0
+        
+        try:
+            with open(recovery_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Ignoring unreadable recovery state: {e}")
+            return 0
+        
+        restored = 0
+        for device_id, saved in state.get("device_results", {}).items():
+            device = self.device_results.get(device_id)
+            if device is None:
+                continue
+            
+            device.attempts = saved.get("attempts", 0)
+            device.errors = saved.get("errors", [])
+            
+            iso_path = Path(saved["iso_path"]) if saved.get("iso_path") else None
+            usb_path = Path(saved["usb_path"]) if saved.get("usb_path") else None
+            identity_path = Path(saved["identity_path"]) if saved.get("identity_path") else None
+            
+            # Only trust a finished device whose outputs are still on disk
+            if (saved.get("status") == DeviceStatus.SUCCESS.value
+                    and iso_path and iso_path.exists() and usb_path and usb_path.exists()
+                    and identity_path and identity_path.exists()
+                    and self._usb_identity_path(identity_path).exists()):
+                device.status = DeviceStatus.SUCCESS
+                device.iso_path = iso_path
+                device.usb_path = usb_path
+                device.identity_path = identity_path
+                device.duration_seconds = saved.get("duration_seconds", 0)
+                if saved.get("completion_time"):
+                    device.completion_time = datetime.fromisoformat(saved["completion_time"])
+                self.successful_devices.append(device_id)
+                self.batch_manifest["statistics"]["successful"] += 1
+                self.batch_manifest["device_results"][device_id] = {
+                    "status": device.status.value,
+                    "attempts": device.attempts,
+                    "errors": device.errors,
+                    "completion_time": saved.get("completion_time"),
+                    "duration_seconds": device.duration_seconds
+                }
+                restored += 1
         
-        print(f"💾 Saved recovery state: {recovery_file}")
+        if restored:
+            print(f"♻️  Resuming batch {self.batch_id}: {restored} of {len(self.device_results)} "
+                  f"devices already complete")
+        return restored
     
     def _attempt_recovery(self) -> bool:
         """
@@ -476,12 +691,7 @@ class BatchManufacturingGenerator:
             if self.successful_devices:
                 partial_package = self.batch_dir / f"partial_batch_{len(self.successful_devices)}_devices.zip"
                 with zipfile.ZipFile(partial_package, 'w') as zf:
-                    for device_id in self.successful_devices:
-                        device = self.device_results[device_id]
-                        if device.iso_path and device.iso_path.exists():
-                            zf.write(device.iso_path, f"{device_id}/iso/{device.iso_path.name}")
-                        if device.usb_path and device.usb_path.exists():
-                            zf.write(device.usb_path, f"{device_id}/usb/{device.usb_path.name}")
+                    self._write_device_files(zf, "")
                 
                 print(f"📦 Partial batch package: {partial_package}")
                 return True
@@ -535,6 +745,7 @@ class BatchManufacturingGenerator:
         print(f"❌ Failed: {stats['failed']} ({stats['failed']/stats['total']*100:.1f}%)")
         print(f"🔄 Retried: {stats['retried']}")
         print(f"⏭️  Skipped: {stats['skipped']}")
+        print(f"⚙️  Throughput: {stats['units_per_hour']:.1f} units/hour ({self.workers} workers)")
         print(f"Duration: {(datetime.now() - self.start_time).total_seconds():.1f} seconds")
         print("=" * 60)
     
@@ -581,29 +792,51 @@ class BatchManufacturingGenerator:
         print("✅ All prerequisites validated")
         return True
     
+    def prepare_master_images(self):
+        """
+        Phase one: build the master ISO and USB image once for the batch
+        Devices only differ by the identity stamped at write time
+        """
+        self.iso_path = self.create_master_iso()
+        self.usb_image_path = self.create_master_usb()
+        
+        if not self.iso_path or not self.usb_image_path:
+            raise RuntimeError("Master image build failed; no devices can be produced")
+    
     def create_master_iso(self):
-        """Create the master ISO image"""
+        """Create the master ISO image, reusing one built from identical inputs"""
         try:
             iso_creator = ISOCreator(version=self.version, batch_id=self.batch_id)
-            iso_path = iso_creator.create()
+            input_digest = iso_creator.input_digest()
+            master_iso = self.master_dir / f"sunflower_master_{self.version}_{input_digest[:16]}.iso"
             
-            if iso_path and Path(iso_path).exists():
-                # Copy to master directory
-                master_iso = self.master_dir / f"sunflower_master_{self.version}.iso"
-                shutil.copy2(iso_path, master_iso)
+            if master_iso.exists():
+                # Resumed batch with unchanged inputs
+                iso_creator.cleanup()
+                print(f"♻️  Reusing master ISO: {master_iso}")
+            else:
+                with self.io_slots:
+                    iso_path = iso_creator.create()
                 
-                # Calculate checksum
-                checksum = self.calculate_checksum(master_iso)
-                self.batch_manifest["components"]["master_iso"] = {
-                    "path": str(master_iso),
-                    "checksum": checksum,
-                    "size_mb": master_iso.stat().st_size / (1024**2)
-                }
+                if not iso_path or not Path(iso_path).exists():
+                    raise RuntimeError("ISO creation returned no path")
                 
+                # Move rather than copy the multi-GB image into the batch
+                shutil.move(str(iso_path), str(master_iso))
                 print(f"✅ Master ISO created: {master_iso}")
-                return master_iso
-            else:
-                raise RuntimeError("ISO creation returned no path")
+            
+            # Calculate checksum
+            checksum = self.calculate_checksum(master_iso)
+            self.batch_manifest["components"]["master_iso"] = {
+                "path": str(master_iso),
+                "checksum": checksum,
+                "input_digest": input_digest,
+                "size_mb": master_iso.stat().st_size / (1024**2),
+                "identity_offset": IDENTITY_OFFSET,
+                "identity_size": IDENTITY_REGION_SIZE
+            }
+            
+            return master_iso
                 
         except Exception as e:
             print(f"❌ ISO creation failed: {e}")
@@ -612,25 +845,37 @@ class BatchManufacturingGenerator:
             return None
     
     def create_master_usb(self):
-        """Create the master USB image"""
+        """Create the master USB image, reusing one built from identical inputs"""
         try:
             usb_preparer = USBPartitionPreparer(batch_id=self.batch_id, partition_size_mb=1024)
-            usb_path = usb_preparer.prepare(output_format="image")
+            input_digest = usb_preparer.input_digest()
+            master_usb = self.master_dir / f"sunflower_usb_master_{self.version}_{input_digest[:16]}.img"
+            
+            if master_usb.exists():
+                # Resumed batch with unchanged inputs
+                print(f"♻️  Reusing master USB image: {master_usb}")
+                usb_path = master_usb
+            else:
+                with self.io_slots:
+                    usb_path = usb_preparer.prepare(output_format="image")
             
             if usb_path and Path(usb_path).exists():
-                # Copy to master directory
-                master_usb = self.master_dir / f"sunflower_usb_master_{self.version}.img"
-                shutil.copy2(usb_path, master_usb)
+                # Move to master directory
+                if Path(usb_path) != master_usb:
+                    shutil.move(str(usb_path), str(master_usb))
+                    print(f"✅ Master USB image created: {master_usb}")
                 
                 # Calculate checksum
                 checksum = self.calculate_checksum(master_usb)
                 self.batch_manifest["components"]["master_usb"] = {
                     "path": str(master_usb),
                     "checksum": checksum,
-                    "size_mb": master_usb.stat().st_size / (1024**2)
+                    "input_digest": input_digest,
+                    "size_mb": master_usb.stat().st_size / (1024**2),
+                    "identity_offset": USB_IDENTITY_OFFSET,
+                    "identity_size": IDENTITY_REGION_SIZE
                 }
                 
-                print(f"✅ Master USB image created: {master_usb}")
                 return master_usb
             else:
                 raise RuntimeError("USB preparation returned no path")
@@ -642,12 +887,8 @@ class BatchManufacturingGenerator:
             return None
     
     def calculate_checksum(self, file_path: Path) -> str:
-        """Calculate SHA256 checksum of a file"""
-        sha256 = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        """Calculate SHA256 checksum of a file (cached until the file changes)"""
+        return get_file_hasher().hash_file(file_path)
     
     def generate_production_files(self):
         """Generate production-specific files"""
@@ -659,7 +900,7 @@ class BatchManufacturingGenerator:
             writer.writerow(["Device_ID", "Serial_Number", "MAC_Address", "Status"])
             
             for device_id in self.successful_devices:
-                serial = f"SAI{self.batch_id[-6:]}{device_id[-4:]}"
+                serial = self._device_serial(device_id)
                 mac = f"02:42:{secrets.token_hex(1)}:{secrets.token_hex(1)}:{secrets.token_hex(1)}:{secrets.token_hex(1)}"
                 writer.writerow([device_id, serial, mac, "READY"])
         
@@ -757,8 +998,13 @@ Approved by: _______________ Date: _____________
    - USB: 1GB (writable)
 
 3. **Data Deployment**
-   - Write ISO to CD-ROM partition
-   - Deploy USB image to writable partition
+   - Write the master ISO to the CD-ROM partition, stamping the device's
+     `devices/<device_id>/identity.bin` at byte offset {IDENTITY_OFFSET}
+   - Write the master USB image to the writable partition, stamping the
+     device's `devices/<device_id>/identity.usb.bin` (identity and security
+     token) at byte offset {USB_IDENTITY_OFFSET}
+   - `batch_generator.py --resume {self.batch_id} --write-device <device_id> <cdrom> <usb>`
+     does all of this and verifies both stamps
    - Verify checksums match
 
 4. **Quality Control**
@@ -807,6 +1053,29 @@ Approved by: _______________ Date: _____________
         
         return "\n".join(report)
     
+    def _write_device_files(self, zf: zipfile.ZipFile, prefix: str) -> int:
+        """
+        Add the shared master images and per-device identities to an archive
+        
+        Returns:
+            Number of devices added
+        """
+        for master in {self.device_results[d].iso_path for d in self.successful_devices} | \
+                {self.device_results[d].usb_path for d in self.successful_devices}:
+            if master and master.exists():
+                # Already compressed images; deflating them only costs time
+                zf.write(master, f"{prefix}master/{master.name}", compress_type=zipfile.ZIP_STORED)
+        
+        devices_added = 0
+        for device_id in self.successful_devices:
+            device = self.device_results[device_id]
+            if device.identity_path and device.identity_path.exists():
+                for path in device.identity_path.parent.glob("identity.*"):
+                    zf.write(path, f"{prefix}devices/{device_id}/{path.name}")
+                devices_added += 1
+        
+        return devices_added
+    
     def create_production_package(self):
         """Create final package for manufacturer"""
         package_name = f"sunflower_production_{self.batch_id}.zip"
@@ -815,18 +1084,8 @@ Approved by: _______________ Date: _____________
         print(f"📦 Creating production package: {package_name}")
         
         with zipfile.ZipFile(package_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            # Add successful device files
-            devices_added = 0
-            for device_id in self.successful_devices:
-                device = self.device_results[device_id]
-                
-                if device.iso_path and device.iso_path.exists():
-                    zf.write(device.iso_path, f"{self.batch_id}/devices/{device_id}/iso/{device.iso_path.name}")
-                    
-                if device.usb_path and device.usb_path.exists():
-                    zf.write(device.usb_path, f"{self.batch_id}/devices/{device_id}/usb/{device.usb_path.name}")
-                
-                devices_added += 1
+            # Add master images once and each successful device's identity
+            devices_added = self._write_device_files(zf, f"{self.batch_id}/")
             
             # Add documentation
             for doc_file in self.docs_dir.rglob("*"):
@@ -1001,16 +1260,59 @@ def main():
     
     parser.set_defaults(continue_on_error=True)
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Devices produced concurrently (default: CPU count, max 4)"
+    )
+    
+    parser.add_argument(
+        "--io-slots",
+        type=int,
+        default=DEFAULT_IO_SLOTS,
+        help=f"Concurrent image writes (default: {DEFAULT_IO_SLOTS})"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        metavar="BATCH_ID",
+        help="Resume an interrupted batch, producing only unfinished devices"
+    )
+    
+    parser.add_argument(
+        "--write-device",
+        nargs=3,
+        metavar=("DEVICE_ID", "CDROM_TARGET", "USB_TARGET"),
+        help="Write a produced device's stamped ISO and USB images (requires --resume)"
+    )
+    
     args = parser.parse_args()
     
+    if args.write_device and not args.resume:
+        parser.error("--write-device requires --resume BATCH_ID")
+    
     # Create generator
     generator = BatchManufacturingGenerator(
         batch_size=args.batch_size,
         version=args.version,
         max_retries=args.max_retries,
-        continue_on_error=args.continue_on_error
+        continue_on_error=args.continue_on_error,
+        workers=args.workers,
+        io_slots=args.io_slots,
+        batch_id=args.resume
     )
     
+    if args.write_device:
+        generator._init_device_results()
+        generator._load_recovery_state()
+        try:
+            generator.write_device(*args.write_device)
+        except (ValueError, RuntimeError, OSError) as e:
+            print(f"❌ Device write failed: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    
     # Run generation
     success = generator.generate()
     
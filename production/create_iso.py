@@ -16,25 +16,124 @@ import json
 import shutil
 import subprocess
 import hashlib
-import tempfile
 import platform
 import argparse
 from pathlib import Path
 from datetime import datetime
 import secrets
 
+# Shared cached, parallel file hashing
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from file_hashing import get_file_hasher
+
+# Incremental reflink/hardlink staging
+sys.path.append(str(Path(__file__).parent))
+from file_staging import StagingArea
+
+# Per-device identity is stamped into the ISO 9660 system area (the first
+# 32 KB, unused by the filesystem) after any MBR/GPT a hybrid image may carry,
+# so every device is written from the same master image
+IDENTITY_OFFSET = 28 * 1024
+IDENTITY_REGION_SIZE = 4 * 1024
+# The USB data image carries its own block in the FAT32 reserved sectors
+# (16-23, clear of the boot sector, FSInfo and their backups at 0, 1, 6, 7),
+# which is also the unused gap after the MBR of a partitioned image
+USB_IDENTITY_OFFSET = 8 * 1024
+IDENTITY_MAGIC = b"SUNFLOWER-IDENTITY\x00\x01"
+DEVICE_WRITE_CHUNK = 4 * 1024 * 1024
+
+
+def build_identity_block(identity):
+    """Encode device identity as a fixed-size block for the reserved region"""
+    payload = json.dumps(identity, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    block = IDENTITY_MAGIC + len(payload).to_bytes(4, "big") + payload
+    
+    if len(block) > IDENTITY_REGION_SIZE:
+        raise ValueError(f"Device identity too large ({len(block)} bytes)")
+    return block.ljust(IDENTITY_REGION_SIZE, b"\x00")
+
+
+def decode_identity_block(block):
+    """Decode an identity block, or None if it is not one"""
+    if not block.startswith(IDENTITY_MAGIC):
+        return None
+    
+    start = len(IDENTITY_MAGIC) + 4
+    length = int.from_bytes(block[len(IDENTITY_MAGIC):start], "big")
+    return json.loads(block[start:start + length].decode("utf-8"))
+
+
+def read_identity_block(image_path, offset=IDENTITY_OFFSET):
+    """Read the stamped identity from an image or device, or None if unstamped"""
+    with open(image_path, "rb") as f:
+        f.seek(offset)
+        return decode_identity_block(f.read(IDENTITY_REGION_SIZE))
+
+
+def write_device_image(master_iso, identity_block, target, offset=IDENTITY_OFFSET):
+    """
+    Write a master image to a device (or image file) and stamp its identity
+    
+    The master is streamed unchanged; only IDENTITY_REGION_SIZE bytes at
+    offset differ between devices, so throughput is bounded by the target's
+    write speed. An image file is truncated to the master's size; a device
+    must be at least that large.
+    
+    Returns:
+        Number of bytes written
+    """
+    if len(identity_block) != IDENTITY_REGION_SIZE:
+        raise ValueError("Identity block has the wrong size")
+    
+    target = Path(target)
+    is_device = target.exists() and not target.is_file()
+    master_size = Path(master_iso).stat().st_size
+    
+    written = 0
+    with open(master_iso, "rb") as src, open(target, "r+b" if is_device else "wb") as dst:
+        if is_device:
+            capacity = dst.seek(0, os.SEEK_END)
+            dst.seek(0)
+            if capacity < master_size:
+                raise RuntimeError(f"Target holds {capacity} bytes; master image needs {master_size}")
+        
+        while True:
+            chunk = src.read(DEVICE_WRITE_CHUNK)
+            if not chunk:
+                break
+            
+            # Splice the identity into the chunk that covers the reserved region
+            if written <= offset < written + len(chunk):
+                start = offset - written
+                reserved = chunk[start:start + IDENTITY_REGION_SIZE]
+                if reserved.strip(b"\x00") and not reserved.startswith(IDENTITY_MAGIC):
+                    raise RuntimeError("Master image uses the identity region; cannot stamp")
+                chunk = chunk[:start] + identity_block + chunk[start + IDENTITY_REGION_SIZE:]
+            
+            dst.write(chunk)
+            written += len(chunk)
+        
+        dst.flush()
+        os.fsync(dst.fileno())
+    
+    return written
+
 
 class ISOCreator:
-    def __init__(self, version="1.0.0", batch_id=None):
+    def __init__(self, version="1.0.0", batch_id=None, device_id=None):
         self.root_dir = Path(__file__).parent.parent
         self.version = version
         self.batch_id = batch_id or self.generate_batch_id()
+        self.device_id = device_id
         self.build_date = datetime.now().strftime("%Y-%m-%d")
         
         # Paths
         self.cdrom_staging = self.root_dir / "cdrom_staging"
         self.iso_output_dir = self.root_dir / "manufacturing" / "iso_images"
-        self.temp_iso_root = Path(tempfile.mkdtemp(prefix="sunflower_iso_"))
+        # Persistent staging tree on the same filesystem as the sources so
+        # files can be reflinked or hardlinked and skipped when unchanged
+        self.temp_iso_root = self.root_dir / "manufacturing" / "iso_staging" / self.version
+        self.staging = None
         
         # ISO configuration
         self.iso_filename = f"sunflower_cdrom_{self.version}_{self.batch_id}.iso"
@@ -67,6 +166,23 @@ class ISOCreator:
         random_id = secrets.token_hex(4).upper()
         return f"{timestamp}-{random_id}"
     
+    def input_digest(self):
+        """
+        Content address of everything the ISO is built from
+        Same staged files and version give the same digest, so a master
+        image can be reused instead of rebuilt
+        """
+        hasher = get_file_hasher()
+        digest = hashlib.sha256(f"{self.version}|{self.batch_id}".encode("utf-8"))
+        
+        for source in [self.cdrom_staging, self.root_dir / "resources"]:
+            if not source.exists():
+                continue
+            for relative, checksum in sorted(hasher.hash_tree(source).items()):
+                digest.update(f"{source.name}/{relative}|{checksum}\n".encode("utf-8"))
+        
+        return digest.hexdigest()
+    
     def create(self):
         """Main ISO creation process"""
         print(f"💿 Sunflower AI ISO Creator")
@@ -141,13 +257,12 @@ class ISOCreator:
                 pass  # Handle already closed or invalid
         self._open_handles.clear()
         
-        # Remove temp directory
-        if self.temp_iso_root.exists():
+        # The staging tree is kept so the next build only stages what changed
+        if self.staging is not None:
             try:
-                shutil.rmtree(self.temp_iso_root)
-                print(f"🧹 Cleaned up temporary files")
-            except Exception as e:
-                print(f"⚠️ Warning: Could not remove temp directory: {e}")
+                self.staging.save_manifest()
+            except OSError as e:
+                print(f"⚠️ Warning: Could not save staging manifest: {e}")
     
     def validate_prerequisites(self):
         """Validate all required files are present"""
@@ -184,6 +299,7 @@ class ISOCreator:
             "autorun"
         ]
         
+        self.staging = StagingArea(self.temp_iso_root)
         for dir_name in directories:
             (self.temp_iso_root / dir_name).mkdir(parents=True, exist_ok=True)
         
@@ -193,28 +309,21 @@ class ISOCreator:
         """Add platform-specific executables"""
         # Windows files
         windows_src = self.cdrom_staging / "Windows"
-        windows_dst = self.temp_iso_root / "Windows"
         
         if windows_src.exists():
-            for file in windows_src.rglob("*"):
-                if file.is_file():
-                    relative = file.relative_to(windows_src)
-                    dst_file = windows_dst / relative
-                    dst_file.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(file, dst_file)
+            self.staging.stage_tree(windows_src, "Windows", symlinks=False)
             
             self.manifest["components"]["windows"] = True
             print(f"✅ Added Windows executables")
         
         # macOS files
         macos_src = self.cdrom_staging / "macOS"
-        macos_dst = self.temp_iso_root / "macOS"
         
         if macos_src.exists():
             if (macos_src / "SunflowerAI.app").exists():
-                shutil.copytree(
+                self.staging.stage_tree(
                     macos_src / "SunflowerAI.app",
-                    macos_dst / "SunflowerAI.app",
+                    "macOS/SunflowerAI.app",
                     symlinks=True
                 )
             
@@ -224,7 +333,6 @@ class ISOCreator:
     def add_ai_models(self):
         """Add AI models based on hardware requirements"""
         models_src = self.cdrom_staging / "models"
-        models_dst = self.temp_iso_root / "models"
         
         if not models_src.exists():
             print("⚠️ No models directory found, skipping...")
@@ -244,8 +352,7 @@ class ISOCreator:
         for model_file in model_variants:
             src_path = models_src / model_file
             if src_path.exists():
-                dst_path = models_dst / model_file
-                shutil.copy2(src_path, dst_path)
+                self.staging.stage_file(src_path, f"models/{model_file}")
                 
                 file_size = src_path.stat().st_size
                 total_size += file_size
@@ -256,7 +363,7 @@ class ISOCreator:
         # Copy model selection script
         model_selector = self.root_dir / "src" / "model_selector.py"
         if model_selector.exists():
-            shutil.copy2(model_selector, models_dst / "model_selector.py")
+            self.staging.stage_file(model_selector, "models/model_selector.py")
         
         self.manifest["components"]["models"] = models_added
         self.manifest["models_size_gb"] = total_size / (1024**3)
@@ -266,7 +373,6 @@ class ISOCreator:
     def add_resources(self):
         """Add documentation and resources"""
         resources_src = self.root_dir / "resources"
-        resources_dst = self.temp_iso_root / "resources"
         
         if resources_src.exists():
             # Copy select resources (not everything)
@@ -280,9 +386,7 @@ class ISOCreator:
             for resource in resource_files:
                 src_file = resources_src / resource
                 if src_file.exists():
-                    dst_file = resources_dst / resource
-                    dst_file.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src_file, dst_file)
+                    self.staging.stage_file(src_file, f"resources/{resource}")
         
         # Add autorun files for Windows
         self.create_autorun_files()
@@ -302,20 +406,16 @@ PictureFiles=false
 VideoFiles=false
 """
         
-        # FIX BUG-016: Use context manager for file operations
         autorun_file = self.temp_iso_root / "autorun.inf"
-        with open(autorun_file, "w", encoding='utf-8') as f:
-            f.write(autorun_content)
+        self.staging.write_text(autorun_file, autorun_content)
         
         # Create desktop.ini for nice folder appearance
         desktop_ini_content = """[.ShellClassInfo]
 IconResource=Windows\\SunflowerAI.exe,0
 """
         
-        # FIX BUG-016: Use context manager for file operations
         desktop_file = self.temp_iso_root / "desktop.ini"
-        with open(desktop_file, "w", encoding='utf-8') as f:
-            f.write(desktop_ini_content)
+        self.staging.write_text(desktop_file, desktop_ini_content)
         
         # Set files as hidden/system on Windows
         if platform.system() == "Windows":
@@ -332,25 +432,23 @@ IconResource=Windows\\SunflowerAI.exe,0
     def create_identifiers(self):
         """Create partition identification files"""
         # CD-ROM identifier (matches partition_manager.py check)
-        # FIX BUG-016: Use context manager for file operations
-        id_file = self.temp_iso_root / "sunflower_cd.id"
-        with open(id_file, "w", encoding='utf-8') as f:
-            f.write(f"SUNFLOWER_CDROM_{self.batch_id}")
+        self.staging.write_text("sunflower_cd.id", f"SUNFLOWER_CDROM_{self.batch_id}")
         
-        # Partition info
+        # Partition info (per-device identity is stamped separately, see
+        # write_device_image, so the same image serves the whole batch)
         partition_info = {
             "type": "CD-ROM",
             "version": self.version,
             "batch_id": self.batch_id,
+            "device_id": self.device_id,
+            "identity_offset": IDENTITY_OFFSET,
+            "identity_size": IDENTITY_REGION_SIZE,
             "build_date": self.build_date,
             "read_only": True,
             "partition_size_gb": self.iso_max_size_gb
         }
         
-        # FIX BUG-016: Use context manager for file operations
-        info_file = self.temp_iso_root / ".partition_info"
-        with open(info_file, "w", encoding='utf-8') as f:
-            json.dump(partition_info, f, indent=2)
+        self.staging.write_text(".partition_info", json.dumps(partition_info, indent=2))
         
         print(f"✅ Created partition identifiers")
     
@@ -358,53 +456,46 @@ IconResource=Windows\\SunflowerAI.exe,0
         """Generate checksums for all files"""
         checksums = {}
         total_size = 0
+        file_paths = []
+        
+        # Drop anything left over from a previous build that was not staged now
+        removed = self.staging.prune()
+        if removed:
+            print(f"🧹 Removed {removed} stale staged files")
         
         for root, dirs, files in os.walk(self.temp_iso_root):
             for file in files:
                 file_path = Path(root) / file
-                relative_path = file_path.relative_to(self.temp_iso_root)
-                
-                # Calculate checksum
-                checksum = self.calculate_checksum(file_path)
-                checksums[str(relative_path)] = checksum
+                file_paths.append(file_path)
                 
                 # Track size
                 total_size += file_path.stat().st_size
         
+        # Hash all files in parallel (unchanged files come from the digest cache)
+        for file_path, checksum in get_file_hasher().hash_files(file_paths).items():
+            checksums[str(file_path.relative_to(self.temp_iso_root))] = checksum
+        
         # Save checksums
-        # FIX BUG-016: Use context manager for file operations
-        checksum_file = self.temp_iso_root / "checksums.sha256"
-        with open(checksum_file, "w", encoding='utf-8') as f:
-            for path, checksum in sorted(checksums.items()):
-                f.write(f"{checksum}  {path}\n")
+        self.staging.write_text(
+            "checksums.sha256",
+            "".join(f"{checksum}  {path}\n" for path, checksum in sorted(checksums.items()))
+        )
         
         self.manifest["checksums"] = checksums
         self.manifest["size_mb"] = total_size / (1024**2)
+        self.manifest["staging"] = dict(self.staging.stats)
         
         # Save manifest
-        # FIX BUG-016: Use context manager for file operations
-        manifest_file = self.temp_iso_root / "manifest.json"
-        with open(manifest_file, "w", encoding='utf-8') as f:
-            json.dump(self.manifest, f, indent=2)
+        self.staging.write_text("manifest.json", json.dumps(self.manifest, indent=2))
+        self.staging.save_manifest()
         
         print(f"✅ Generated checksums for {len(checksums)} files")
         print(f"📊 Total size: {total_size / (1024**3):.2f} GB")
+        print(f"📊 {self.staging.report()}")
     
     def calculate_checksum(self, file_path):
-        """Calculate SHA256 checksum of a file with proper resource management"""
-        sha256 = hashlib.sha256()
-        
-        # FIX BUG-016: Use context manager and chunked reading
-        with open(file_path, "rb") as f:
-            # Read in chunks to avoid memory issues with large files
-            chunk_size = 8192  # 8KB chunks
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                sha256.update(chunk)
-        
-        return sha256.hexdigest()
+        """Calculate SHA256 checksum of a file (cached until the file changes)"""
+        return get_file_hasher().hash_file(file_path)
     
     def build_iso(self):
         """Build the final ISO image"""
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Staging area for Sunflower AI manufacturing images
+
+Stages files into a persistent directory tree using reflinks (FICLONE on
+Linux, clonefile on macOS) or hardlinks where the filesystem supports them,
+falling back to a normal copy. A manifest of source size, mtime and digest
+lets later runs skip files that have not changed, and anything not staged
+in the current run is pruned instead of rebuilding the tree from scratch.
+"""
+
+import os
+import sys
+import json
+import errno
+import shutil
+import ctypes
+from pathlib import Path
+from typing import Dict, Set, Union
+
+# Shared cached file hashing
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from file_hashing import get_file_hasher
+
+FICLONE = 0x40049409  # Linux ioctl: share extents with another file
+MANIFEST_SUFFIX = ".staging.json"
+
+# Errors meaning "this filesystem cannot do that", not "this file failed"
+UNSUPPORTED_ERRORS = {errno.EXDEV, errno.EPERM, errno.EINVAL, errno.ENOTTY, errno.EOPNOTSUPP,
+                      getattr(errno, "ENOTSUP", errno.EOPNOTSUPP), errno.ENOSYS}
+
+
+def reflink(src: Path, dst: Path) -> bool:
+    """Clone src to dst sharing storage; False if the filesystem cannot"""
+    if sys.platform.startswith("linux"):
+        import fcntl
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            shutil.copystat(src, dst)
+        except OSError as e:
+            # Never leave an empty or partial dst behind
+            dst.unlink(missing_ok=True)
+            if e.errno in UNSUPPORTED_ERRORS:
+                return False
+            raise
+        return True
+
+    if sys.platform == "darwin":
+        libc = ctypes.CDLL(None, use_errno=True)
+        clonefile = getattr(libc, "clonefile", None)
+        if clonefile is not None:
+            return clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+
+    return False
+
+
+class StagingArea:
+    """
+    Incremental staging directory
+
+    Usage:
+        staging = StagingArea(root)
+        staging.stage_file(model, "models/llama3.2-1b.gguf")
+        staging.write_text("sunflower_cd.id", "...")
+        staging.prune()
+        staging.save_manifest()
+        print(staging.report())
+    """
+
+    def __init__(self, root: Path, allow_hardlinks: bool = True):
+        """
+        Args:
+            root: Staging directory, kept between runs
+            allow_hardlinks: Hardlink sources when reflinks are unavailable
+                (sources must then never be modified in place)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Kept next to the tree so it never ends up inside the image
+        self.manifest_path = self.root.with_name(self.root.name + MANIFEST_SUFFIX)
+        self.hasher = get_file_hasher()
+
+        self.manifest: Dict[str, Dict] = self._load_manifest()
+        self.staged: Set[str] = set()
+
+        # Turned off after the first "not supported" from this filesystem
+        self._reflink_supported = True
+        self._hardlink_supported = allow_hardlinks
+
+        self.stats = {
+            "files": 0,
+            "files_skipped": 0,
+            "bytes_staged": 0,
+            "bytes_copied": 0,
+            "bytes_linked": 0,
+            "bytes_skipped": 0,
+            "methods": {"reflink": 0, "hardlink": 0, "copy": 0, "write": 0, "unchanged": 0}
+        }
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        """Read the previous run's manifest"""
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _relative(self, dst: Union[str, Path]) -> str:
+        """Manifest key for a destination inside the staging root"""
+        dst = Path(dst)
+        if dst.is_absolute():
+            dst = dst.relative_to(self.root)
+        return dst.as_posix()
+
+    def _record(self, rel: str, size: int, method: str, **entry) -> None:
+        """Account for one staged file"""
+        self.staged.add(rel)
+        self.stats["files"] += 1
+        self.stats["bytes_staged"] += size
+        self.stats["methods"][method] += 1
+
+        if method == "unchanged":
+            self.stats["files_skipped"] += 1
+            self.stats["bytes_skipped"] += size
+        elif method in ("reflink", "hardlink"):
+            self.stats["bytes_linked"] += size
+        else:
+            self.stats["bytes_copied"] += size
+
+        self.manifest[rel] = dict(entry, size=size, method=method)
+
+    def _link_or_copy(self, src: Path, dst: Path) -> str:
+        """Place src at dst as cheaply as the filesystem allows"""
+        if self._reflink_supported:
+            try:
+                if reflink(src, dst):
+                    return "reflink"
+            except OSError:
+                dst.unlink(missing_ok=True)
+            self._reflink_supported = False
+
+        if self._hardlink_supported:
+            try:
+                os.link(src, dst)
+                return "hardlink"
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRORS:
+                    raise
+                self._hardlink_supported = False
+
+        shutil.copy2(src, dst)
+        return "copy"
+
+    def stage_file(self, src: Path, dst: Union[str, Path]) -> str:
+        """
+        Stage one file, skipping it if the staged copy is still current
+
+        Returns:
+            How the file was staged: unchanged, reflink, hardlink or copy
+        """
+        src = Path(src)
+        rel = self._relative(dst)
+        target = self.root / rel
+        stat = src.stat()
+        previous = self.manifest.get(rel, {})
+
+        current = (
+            target.exists()
+            and previous.get("source") == str(src)
+            and previous.get("size") == stat.st_size
+            and target.stat().st_size == stat.st_size
+        )
+
+        if current and previous.get("mtime_ns") == stat.st_mtime_ns:
+            self._record(rel, stat.st_size, "unchanged", source=str(src),
+                         mtime_ns=stat.st_mtime_ns, digest=previous.get("digest"))
+            return "unchanged"
+
+        # Same size, new mtime: only the digest can tell (cached per source file)
+        digest = self.hasher.hash_file(src)
+        if current and previous.get("digest") == digest:
+            self._record(rel, stat.st_size, "unchanged", source=str(src),
+                         mtime_ns=stat.st_mtime_ns, digest=digest)
+            return "unchanged"
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() or target.is_symlink():
+            # Never write through an old hardlink into a source file
+            target.unlink()
+
+        method = self._link_or_copy(src, target)
+        self.hasher.record(target, digest)
+        self._record(rel, stat.st_size, method, source=str(src),
+                     mtime_ns=stat.st_mtime_ns, digest=digest)
+        return method
+
+    def stage_tree(self, src_dir: Path, dst_dir: Union[str, Path], symlinks: bool = True) -> None:
+        """Stage a directory tree (symlinks are recreated, not followed)"""
+        src_dir = Path(src_dir)
+        dst_rel = self._relative(dst_dir)
+
+        for src in sorted(src_dir.rglob("*")):
+            rel = f"{dst_rel}/{src.relative_to(src_dir).as_posix()}"
+
+            if symlinks and src.is_symlink():
+                target = self.root / rel
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if target.exists() or target.is_symlink():
+                    target.unlink()
+                os.symlink(os.readlink(src), target)
+                self.staged.add(rel)
+            elif src.is_dir():
+                (self.root / rel).mkdir(parents=True, exist_ok=True)
+            elif src.is_file():
+                self.stage_file(src, rel)
+
+    def write_bytes(self, dst: Union[str, Path], data: bytes) -> str:
+        """Stage generated content, leaving the file alone if it is identical"""
+        rel = self._relative(dst)
+        target = self.root / rel
+
+        if target.exists() and not target.is_symlink() and target.stat().st_size == len(data):
+            if target.read_bytes() == data:
+                self._record(rel, len(data), "unchanged")
+                return "unchanged"
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() or target.is_symlink():
+            target.unlink()
+        target.write_bytes(data)
+        self._record(rel, len(data), "write")
+        return "write"
+
+    def write_text(self, dst: Union[str, Path], text: str) -> str:
+        """Stage generated text (UTF-8)"""
+        return self.write_bytes(dst, text.encode("utf-8"))
+
+    def prune(self) -> int:
+        """
+        Remove files that were not staged in this run
+
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        for path in sorted(self.root.rglob("*"), reverse=True):
+            rel = path.relative_to(self.root).as_posix()
+            if path.is_dir() and not path.is_symlink():
+                if not any(path.iterdir()):
+                    path.rmdir()
+            elif rel not in self.staged:
+                path.unlink()
+                self.manifest.pop(rel, None)
+                removed += 1
+
+        for rel in list(self.manifest):
+            if rel not in self.staged:
+                del self.manifest[rel]
+
+        return removed
+
+    def save_manifest(self) -> None:
+        """Atomically write the manifest for the next run"""
+        temp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def report(self) -> str:
+        """One-line summary of bytes copied against bytes staged"""
+        mb = 1024 ** 2
+        stats = self.stats
+        return (
+            f"Staged {stats['files']} files ({stats['bytes_staged'] / mb:.1f} MB): "
+            f"copied {stats['bytes_copied'] / mb:.1f} MB, "
+            f"linked {stats['bytes_linked'] / mb:.1f} MB, "
+            f"unchanged {stats['bytes_skipped'] / mb:.1f} MB"
+        )
@@ -18,7 +18,6 @@ import argparse
 from pathlib import Path
 from datetime import datetime
 import hashlib
-import uuid
 import zipfile
 import psutil
 
@@ -28,6 +27,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Import standardized path configuration
 from config.path_config import PathConfiguration
 
+# Incremental staging (unchanged files are left in place between runs)
+sys.path.append(str(Path(__file__).parent))
+from file_staging import StagingArea
+
 # FIX BUG-010: Define and enforce USB size validation constants
 MINIMUM_USB_SIZE_MB = 512  # Absolute minimum for USB partition
 RECOMMENDED_USB_SIZE_MB = 1024  # Recommended size for optimal performance
@@ -48,6 +51,7 @@ class USBPartitionPreparer:
         self.staging_dir = self.root_dir / "usb_staging" / self.path_config.USB_PARTITION_NAME
         self.output_dir = self.root_dir / "manufacturing" / "usb_images"
         self.temp_mount = Path("/tmp/sunflower_usb_mount") if platform.system() != "Windows" else None
+        self.staging = None
         
         # USB configuration using standardized names
         self.volume_label = self.path_config.USB_PARTITION_NAME
@@ -193,6 +197,20 @@ class USBPartitionPreparer:
         random_id = secrets.token_hex(4).upper()
         return f"{timestamp}-{random_id}"
     
+    def input_digest(self):
+        """
+        Content address of what the USB image is built from
+        The partition contents are generated by this code, so the digest
+        covers it, the path configuration, the batch and the layout
+        """
+        digest = hashlib.sha256(
+            f"{self.batch_id}|{self.partition_size_mb}|{self.filesystem}|{self.volume_label}".encode("utf-8")
+        )
+        for source in [Path(__file__), self.root_dir / "config" / "path_config.py"]:
+            digest.update(f"{source.name}|".encode("utf-8"))
+            digest.update(source.read_bytes())
+        return digest.hexdigest()
+    
     def prepare(self, output_format="directory", target_device=None):
         """Main USB partition preparation process"""
         print(f"🌻 Sunflower AI USB Partition Preparer")
@@ -235,6 +253,13 @@ class USBPartitionPreparer:
             print("\n📝 Generating documentation...")
             self.generate_documentation()
             
+            # Drop files left over from a previous run
+            removed = self.staging.prune()
+            self.staging.save_manifest()
+            if removed:
+                print(f"🧹 Removed {removed} stale staged files")
+            print(f"📊 {self.staging.report()}")
+            
             # Package output
             if output_format == "zip":
                 print("\n📦 Creating ZIP archive...")
@@ -252,10 +277,8 @@ class USBPartitionPreparer:
     
     def create_partition_structure(self):
         """Create the base USB partition directory structure"""
-        # Clean and recreate staging directory
-        if self.staging_dir.exists():
-            shutil.rmtree(self.staging_dir)
-        self.staging_dir.mkdir(parents=True)
+        # Reuse the previous staging tree; stale files are pruned at the end
+        self.staging = StagingArea(self.staging_dir)
         
         # Create standardized directory structure
         for dir_key, dir_name in self.path_config.USB_STRUCTURE.items():
@@ -263,15 +286,14 @@ class USBPartitionPreparer:
             dir_path.mkdir(parents=True, exist_ok=True)
             
             # Add .gitkeep to preserve empty directories
-            gitkeep = dir_path / ".gitkeep"
-            gitkeep.touch()
+            self.staging.write_bytes(dir_path / ".gitkeep", b"")
     
     def initialize_user_directories(self):
         """Initialize user data storage directories"""
         # Profiles directory
         profiles_dir = self.staging_dir / self.path_config.USB_STRUCTURE['profiles']
         readme = profiles_dir / "README.txt"
-        readme.write_text("""
+        self.staging.write_text(readme, """
 Family Profiles Directory
 ========================
 This directory stores individual profiles for each family member.
@@ -284,7 +306,7 @@ Use the Sunflower AI Parent Dashboard to manage profiles.
         # Conversations directory
         conv_dir = self.staging_dir / self.path_config.USB_STRUCTURE['conversations']
         readme = conv_dir / "README.txt"
-        readme.write_text("""
+        self.staging.write_text(readme, """
 Conversation History
 ===================
 Encrypted conversation logs for each child profile.
@@ -296,7 +318,7 @@ Files are retained for parent review and learning progress tracking.
         # Safety reports directory
         safety_dir = self.staging_dir / self.path_config.USB_STRUCTURE['safety']
         readme = safety_dir / "README.txt"
-        readme.write_text("""
+        self.staging.write_text(readme, """
 Safety Reports
 =============
 This directory contains safety incident reports and filtered content logs.
@@ -306,14 +328,13 @@ All incidents are timestamped and linked to specific profiles.
 """)
     
     def setup_security(self):
-        """Setup security tokens and encryption keys"""
+        """Setup security policy and encryption key placeholder"""
         security_dir = self.staging_dir / self.path_config.USB_STRUCTURE['security']
         
-        # Generate device-specific security token
-        device_token = {
-            "device_id": str(uuid.uuid4()),
+        # The image is shared by every device of a batch; each device's own
+        # token is stamped into its identity block when the device is written
+        security_policy = {
             "batch_id": self.batch_id,
-            "created": datetime.now().isoformat(),
             "partition_size_mb": self.partition_size_mb,
             "security_version": "2.0",
             "encryption": {
@@ -323,13 +344,12 @@ All incidents are timestamped and linked to specific profiles.
             }
         }
         
-        token_file = security_dir / "device_token.json"
-        with open(token_file, 'w') as f:
-            json.dump(device_token, f, indent=2)
+        policy_file = security_dir / "security_policy.json"
+        self.staging.write_text(policy_file, json.dumps(security_policy, indent=2))
         
         # Create encryption key placeholder
         key_file = security_dir / "keys.encrypted"
-        key_file.write_text("Encryption keys will be generated on first parent setup")
+        self.staging.write_text(key_file, "Encryption keys will be generated on first parent setup")
         
         # Platform compatibility file
         compat_file = security_dir / "platform_compatibility.json"
@@ -338,14 +358,13 @@ All incidents are timestamped and linked to specific profiles.
             "macos": {"min_version": "11.0", "tested": True},
             "verified_date": datetime.now().isoformat()
         }
-        with open(compat_file, 'w') as f:
-            json.dump(compat, f, indent=2)
+        self.staging.write_text(compat_file, json.dumps(compat, indent=2))
     
     def create_device_identifiers(self):
         """Create unique device identification files"""
         # Main identifier matching CD-ROM check
         id_file = self.staging_dir / self.path_config.USB_ID_FILE
-        id_file.write_text(f"SUNFLOWER_DATA_{self.batch_id}")
+        self.staging.write_text(id_file, f"SUNFLOWER_DATA_{self.batch_id}")
         
         # Partition info file
         info_file = self.staging_dir / ".partition_info"
@@ -358,12 +377,11 @@ All incidents are timestamped and linked to specific profiles.
             "filesystem": self.filesystem,
             "volume_label": self.volume_label
         }
-        with open(info_file, 'w') as f:
-            json.dump(info, f, indent=2)
+        self.staging.write_text(info_file, json.dumps(info, indent=2))
         
         # Initialization marker
         init_file = self.staging_dir / ".initialized"
-        init_file.write_text(datetime.now().isoformat())
+        self.staging.write_text(init_file, datetime.now().isoformat())
     
     def generate_documentation(self):
         """Generate user documentation files"""
@@ -372,7 +390,7 @@ All incidents are timestamped and linked to specific profiles.
         
         # Quick start guide
         quickstart = docs_dir / "QUICKSTART.txt"
-        quickstart.write_text(f"""
+        self.staging.write_text(quickstart, f"""
 Sunflower AI Professional System - Quick Start
 ==============================================
 Version: 6.2
@@ -403,7 +421,7 @@ For support, visit: sunflowerai.example.com/support
         
         # Directory structure documentation
         structure_doc = docs_dir / "USB_STRUCTURE.txt"
-        structure_doc.write_text(f"""
+        self.staging.write_text(structure_doc, f"""
 USB Partition Structure
 ======================
 
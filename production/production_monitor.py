@@ -14,10 +14,12 @@ import time
 import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
-from collections import defaultdict
-import csv
 from typing import Dict, List, Optional
 
+# Indexed report store shared with the manufacturing reports
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from report_store import ProductionReportStore, DEFAULT_DB_NAME
+
 try:
     from rich.console import Console
     from rich.table import Table
@@ -39,7 +41,7 @@ class ProductionMonitor:
         
         # Data storage
         self.batches = {}
-        self.validation_results = defaultdict(list)
+        self.validation_counts = {}
         self.production_stats = {
             "total_units_planned": 0,
             "total_units_validated": 0,
@@ -52,46 +54,37 @@ class ProductionMonitor:
         # Paths
         self.batch_records_dir = self.manufacturing_dir / "batch_records"
         self.validation_reports_dir = Path("validation_reports")
+        
+        # Records are ingested once; each refresh only reads what changed
+        self.store = ProductionReportStore(self.manufacturing_dir / DEFAULT_DB_NAME)
+    
+    def refresh(self):
+        """Pick up new validations and batch records, then recompute statistics"""
+        self.scan_validations()
+        self.scan_batches()
+        self.update_stats()
     
     def scan_batches(self):
         """Scan for all batch records"""
         self.batches.clear()
         
-        if not self.batch_records_dir.exists():
-            return
+        # Only new or rewritten batch files are parsed
+        self.store.ingest_batch_records(self.batch_records_dir)
         
-        # Scan batch record files
-        for batch_file in self.batch_records_dir.glob("batch_*.json"):
-            try:
-                with open(batch_file) as f:
-                    batch_data = json.load(f)
-                
-                batch_id = batch_data.get("batch_id", "unknown")
-                self.batches[batch_id] = {
-                    "file": batch_file,
-                    "data": batch_data,
-                    "status": self.determine_batch_status(batch_data),
-                    "progress": self.calculate_batch_progress(batch_id, batch_data)
-                }
-            except Exception as e:
-                if self.console:
-                    self.console.print(f"[red]Error reading {batch_file}: {e}[/red]")
+        for batch_id, record in self.store.batch_records().items():
+            batch_data = record["data"]
+            self.batches[batch_id] = {
+                "file": record["file"],
+                "data": batch_data,
+                "status": self.determine_batch_status(batch_data),
+                "progress": self.calculate_batch_progress(batch_id, batch_data)
+            }
     
     def scan_validations(self):
         """Scan validation reports"""
-        self.validation_results.clear()
-        
-        if not self.validation_reports_dir.exists():
-            return
-        
-        # Read summary CSV if exists
-        summary_file = self.validation_reports_dir / "validation_summary.csv"
-        if summary_file.exists():
-            with open(summary_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    batch_id = row.get("Batch", "unknown")
-                    self.validation_results[batch_id].append(row)
+        # Rows appended to the summary CSV since the last refresh
+        self.store.ingest_validation_summary(self.validation_reports_dir / "validation_summary.csv")
+        self.validation_counts = self.store.batch_validation_counts()
     
     def determine_batch_status(self, batch_data):
         """Determine batch production status"""
@@ -107,11 +100,10 @@ class ProductionMonitor:
         batch_size = batch_data.get("size", 100)
         
         # Count validated units for this batch
-        validated = len(self.validation_results.get(batch_id, []))
-        passed = sum(1 for v in self.validation_results.get(batch_id, []) 
-                    if v.get("Status") == "PASS")
-        failed = sum(1 for v in self.validation_results.get(batch_id, [])
-                    if v.get("Status") == "FAIL")
+        counts = self.validation_counts.get(batch_id, {})
+        validated = counts.get("validated", 0)
+        passed = counts.get("passed", 0)
+        failed = counts.get("failed", 0)
         
         return {
             "total": batch_size,
@@ -291,7 +283,7 @@ class ProductionMonitor:
                 "progress": batch_info["progress"],
                 "created": batch_info["data"].get("created"),
                 "version": batch_info["data"].get("version"),
-                "validation_details": self.validation_results.get(batch_id, [])
+                "validation_details": self.store.validation_runs(batch_id)
             }
         
         with open(output_file, 'w') as f:
@@ -309,9 +301,7 @@ class ProductionMonitor:
         try:
             while True:
                 # Scan for updates
-                self.scan_batches()
-                self.scan_validations()
-                self.update_stats()
+                self.refresh()
                 
                 # Clear screen
                 os.system('cls' if os.name == 'nt' else 'clear')
@@ -411,9 +401,7 @@ def main():
     monitor = ProductionMonitor(manufacturing_dir=args.dir)
     
     # Scan data
-    monitor.scan_batches()
-    monitor.scan_validations()
-    monitor.update_stats()
+    monitor.refresh()
     
     if args.report:
         # Generate report mode
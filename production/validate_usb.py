@@ -13,7 +13,6 @@ import json
 import time
 import platform
 import subprocess
-import hashlib
 import tempfile
 import argparse
 from pathlib import Path
@@ -21,9 +20,20 @@ from datetime import datetime
 import psutil
 import shutil
 
+# Shared cached, parallel file hashing and concurrent test runner
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from file_hashing import get_verifying_hasher
+from validation_runner import ValidationRunner, ValidationTask
+from storage_benchmark import StorageBenchmark, grade
+
+# Identity blocks stamped by the batch generator
+sys.path.append(str(Path(__file__).parent))
+from create_iso import read_identity_block, USB_IDENTITY_OFFSET
+
 
 class USBValidator:
-    def __init__(self, serial_number, batch_id=None):
+    def __init__(self, serial_number, batch_id=None,
+                 min_random_read_iops=None, max_fsync_p95_ms=None):
         self.serial_number = serial_number
         self.batch_id = batch_id or self.extract_batch_from_serial(serial_number)
         self.start_time = time.time()
@@ -37,7 +47,8 @@ class USBValidator:
             "tests": {},
             "performance_metrics": {},
             "errors": [],
-            "warnings": []
+            "warnings": [],
+            "timing": {}
         }
         
         # Test requirements
@@ -46,14 +57,42 @@ class USBValidator:
             "min_read_speed_mbps": 80,
             "min_write_speed_mbps": 40,
             "max_response_time_ms": 20,
+            "min_storage_tier": "minimum",
+            # Random-read and fsync gates for the minimum tier; None records
+            # the measurement without failing the device on it
+            "min_random_read_iops": min_random_read_iops,
+            "max_fsync_p95_ms": max_fsync_p95_ms,
             "required_files": {
                 "cdrom": ["sunflower_cd.id", "manifest.json", "Windows/SunflowerAI.exe"],
-                "usb": ["sunflower_data.id", ".initialized", ".security/device_token.json"]
+                "usb": ["sunflower_data.id", ".initialized", ".security/security_policy.json"]
+            }
+        }
+        
+        # Storage grades, best first; *_ms limits are maximums
+        self.storage_tiers = {
+            "premium": {
+                "cdrom_read_mbps": 150, "usb_read_mbps": 150, "usb_write_mbps": 80,
+                "usb_random_read_iops": 2000, "usb_fsync_p95_ms": 20
+            },
+            "standard": {
+                "cdrom_read_mbps": 100, "usb_read_mbps": 100, "usb_write_mbps": 50,
+                "usb_random_read_iops": 800, "usb_fsync_p95_ms": 50
+            },
+            "minimum": {
+                "cdrom_read_mbps": self.requirements["min_read_speed_mbps"],
+                "usb_read_mbps": self.requirements["min_read_speed_mbps"],
+                "usb_write_mbps": self.requirements["min_write_speed_mbps"]
             }
         }
+        if self.requirements["min_random_read_iops"] is not None:
+            self.storage_tiers["minimum"]["usb_random_read_iops"] = self.requirements["min_random_read_iops"]
+        if self.requirements["max_fsync_p95_ms"] is not None:
+            self.storage_tiers["minimum"]["usb_fsync_p95_ms"] = self.requirements["max_fsync_p95_ms"]
         
+        self.benchmark = StorageBenchmark()
         self.cdrom_mount = None
         self.usb_mount = None
+        self.usb_device = None
     
     def extract_batch_from_serial(self, serial):
         """Extract batch ID from serial number format: SF100-YYYYMMDD-XXXX"""
@@ -65,7 +104,48 @@ class USBValidator:
             pass
         return "BATCH-UNKNOWN"
     
-    def validate(self):
+    def _stage(self, label, method, test_name):
+        """Runner task body: run one stage and report whether its test passed"""
+        def run():
+            print(f"\n[{label}]")
+            method()
+            return self.test_results["tests"].get(test_name, {}).get("status") == "PASS"
+        return run
+    
+    def validation_tasks(self, quick=False):
+        """
+        Validation stages and the order they depend on
+        
+        Partition detection gates everything. The checks after it only
+        read the partitions and run side by side; the performance test is
+        exclusive so nothing else competes for the device while it is timed.
+        """
+        tasks = [
+            ValidationTask("partition_detection", self.detect_partitions, critical=True, timeout=60),
+            ValidationTask("partition_validation",
+                           self._stage("Partition Validation", self.validate_partitions, "partition_validation"),
+                           depends_on=["partition_detection"], critical=True, timeout=60),
+            ValidationTask("filesystem_validation",
+                           self._stage("File System Validation", self.validate_filesystems, "filesystem_validation"),
+                           depends_on=["partition_detection"], timeout=60),
+            ValidationTask("content_verification",
+                           self._stage("Content Verification", self.verify_content, "content_verification"),
+                           depends_on=["partition_detection"], critical=True, timeout=900),
+            ValidationTask("application",
+                           self._stage("Application Testing", self.test_application, "application"),
+                           depends_on=["partition_detection"], timeout=120)
+        ]
+        
+        if not quick:
+            tasks.append(ValidationTask(
+                "performance",
+                self._stage("Performance Testing", self.test_performance, "performance"),
+                depends_on=["partition_detection"], timeout=300, exclusive=True
+            ))
+        
+        return tasks
+    
+    def validate(self, quick=False):
         """Run complete validation suite"""
         print(f"\n🔍 Sunflower AI USB Validator")
         print(f"📦 Serial: {self.serial_number}")
@@ -73,37 +153,28 @@ class USBValidator:
         print("=" * 60)
         
         try:
-            # Stage 1: Device Detection
-            print("\n[Stage 1/6] Device Detection")
-            if not self.detect_partitions():
-                return self.finalize_results(False, "Partition detection failed")
-            
-            # Stage 2: Partition Validation
-            print("\n[Stage 2/6] Partition Validation")
-            self.validate_partitions()
-            
-            # Stage 3: File System Checks
-            print("\n[Stage 3/6] File System Validation")
-            self.validate_filesystems()
+            print("\n[Device Detection]")
+            runner = ValidationRunner()
+            results = runner.run(self.validation_tasks(quick))
+            self.test_results["timing"] = runner.timing(results)
             
-            # Stage 4: Content Verification
-            print("\n[Stage 4/6] Content Verification")
-            self.verify_content()
+            if not results["partition_detection"].passed:
+                return self.finalize_results(True, "Partition detection failed")
             
-            # Stage 5: Performance Testing
-            print("\n[Stage 5/6] Performance Testing")
-            self.test_performance()
-            
-            # Stage 6: Application Testing
-            print("\n[Stage 6/6] Application Testing")
-            self.test_application()
+            # Tests that crashed, timed out or were skipped have no entry of their own
+            fail_reason = None
+            for name, result in results.items():
+                if result.status in ("ERROR", "TIMEOUT", "SKIPPED"):
+                    self.test_results["tests"][name] = {"status": "FAIL", "runner_status": result.status,
+                                                        "reason": result.error}
+                    fail_reason = fail_reason or f"{name}: {result.error}"
             
             # Calculate final result
-            return self.finalize_results()
+            return self.finalize_results(fail_reason is not None, fail_reason)
             
         except Exception as e:
             self.test_results["errors"].append(f"Fatal error: {str(e)}")
-            return self.finalize_results(False, str(e))
+            return self.finalize_results(True, str(e))
     
     def detect_partitions(self):
         """Detect and identify both partitions"""
@@ -130,6 +201,7 @@ class USBValidator:
                 # Check for USB data partition
                 elif (mount_point / "sunflower_data.id").exists():
                     self.usb_mount = mount_point
+                    self.usb_device = partition.device
                     usb_found = True
                     print(f"  ✓ USB partition found: {mount_point}")
                     
@@ -308,28 +380,44 @@ class USBValidator:
                 else:
                     print(f"  ✓ Found: {req_file}")
             
-            # Verify device token
-            token_path = self.usb_mount / ".security" / "device_token.json"
-            if token_path.exists():
-                try:
-                    with open(token_path) as f:
-                        token = json.load(f)
-                    if token.get("batch_id") != self.batch_id:
+            # Verify the device identity and token stamped into the partition
+            try:
+                identity = self.read_usb_identity()
+            except (OSError, ValueError) as e:
+                self.test_results["warnings"].append(f"Could not read USB identity block: {e}")
+            else:
+                if not identity or not identity.get("device_token"):
+                    results["usb_files_ok"] = False
+                    results["missing_files"].append("usb/identity block")
+                    print("  ✗ Missing: device identity block")
+                else:
+                    print(f"  ✓ Found: identity of {identity.get('device_id')}")
+                    if identity.get("batch_id") != self.batch_id:
                         self.test_results["warnings"].append(
-                            f"Batch ID mismatch: {token.get('batch_id')} vs {self.batch_id}"
+                            f"Batch ID mismatch: {identity.get('batch_id')} vs {self.batch_id}"
                         )
-                except:
-                    self.test_results["warnings"].append("Invalid device token")
         
         self.test_results["tests"]["content_verification"] = {
             "status": "PASS" if (results["cdrom_files_ok"] and results["usb_files_ok"]) else "FAIL",
             **results
         }
     
+    def read_usb_identity(self):
+        """Identity block stamped into the USB partition when the device was written"""
+        if not self.usb_device:
+            raise OSError("USB partition device not known")
+        
+        device = self.usb_device
+        if platform.system() == "Windows":
+            # Raw volume access: E:\ -> \\.\E:
+            device = "\\\\.\\" + device.rstrip("\\")
+        return read_identity_block(device, USB_IDENTITY_OFFSET)
+    
     def verify_checksums(self, checksum_file):
         """Verify file checksums"""
         verified = 0
         base_dir = checksum_file.parent
+        expected = []
         
         with open(checksum_file) as f:
             for line in f:
@@ -340,69 +428,87 @@ class USBValidator:
                         full_path = base_dir / file_path
                         
                         if full_path.exists():
-                            actual_hash = self.calculate_file_hash(full_path)
-                            if actual_hash == expected_hash:
-                                verified += 1
-                            else:
-                                self.test_results["errors"].append(
-                                    f"Checksum mismatch: {file_path}"
-                                )
+                            expected.append((file_path, full_path, expected_hash))
+        
+        # Hash all listed files in parallel
+        actual_hashes = get_verifying_hasher().hash_files(full_path for _, full_path, _ in expected)
+        
+        for file_path, full_path, expected_hash in expected:
+            if actual_hashes[full_path] == expected_hash:
+                verified += 1
+            else:
+                self.test_results["errors"].append(
+                    f"Checksum mismatch: {file_path}"
+                )
         
         return verified
     
     def calculate_file_hash(self, file_path):
         """Calculate SHA256 hash of a file"""
-        sha256 = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        return get_verifying_hasher().hash_file(file_path)
+    
+    def find_read_target(self, mount, min_size=10 * 1024 * 1024):
+        """
+        Large file to benchmark reads against
+        
+        Checks the files every image ships with before falling back to a
+        bounded scan, instead of walking the whole partition.
+        """
+        candidates = sorted((mount / "models").glob("*.gguf"), key=lambda p: p.stat().st_size, reverse=True)
+        candidates += [
+            mount / "Windows" / "SunflowerAI.exe",
+            mount / "macOS" / "SunflowerAI.app" / "Contents" / "MacOS" / "SunflowerAI"
+        ]
+        for path in candidates:
+            if path.is_file() and path.stat().st_size >= min_size:
+                return path
+        
+        largest, largest_size = None, 0
+        for scanned, path in enumerate(mount.rglob("*")):
+            if scanned >= 5000:
+                break
+            if path.is_file() and path.stat().st_size > largest_size:
+                largest, largest_size = path, path.stat().st_size
+                if largest_size >= min_size:
+                    break
+        return largest
     
     def test_performance(self):
-        """Test read/write performance"""
+        """Benchmark the device with the page cache bypassed"""
         print("  → Testing performance...")
         
         results = {
             "cdrom_read_speed_mbps": 0,
             "usb_read_speed_mbps": 0,
             "usb_write_speed_mbps": 0,
-            "response_time_ms": 0
+            "usb_random_read_iops": 0,
+            "usb_fsync_p95_ms": None,
+            "response_time_ms": 0,
+            "storage_tier": None
         }
+        benchmark = {}
         
         # Test CD-ROM read speed
         if self.cdrom_mount:
-            test_file = None
-            # Find a large file to test with
-            for root, dirs, files in os.walk(self.cdrom_mount):
-                for file in files:
-                    file_path = Path(root) / file
-                    if file_path.stat().st_size > 10 * 1024 * 1024:  # 10MB+
-                        test_file = file_path
-                        break
-                if test_file:
-                    break
-            
+            test_file = self.find_read_target(self.cdrom_mount)
             if test_file:
-                speed = self.measure_read_speed(test_file)
-                results["cdrom_read_speed_mbps"] = round(speed, 1)
-                print(f"  ✓ CD-ROM read speed: {results['cdrom_read_speed_mbps']} MB/s")
+                benchmark["cdrom"] = self.benchmark.run_read_only(test_file)
+                results["cdrom_read_speed_mbps"] = max(benchmark["cdrom"]["sequential_read_mbps"].values())
+                print(f"  ✓ CD-ROM read speed: {results['cdrom_read_speed_mbps']} MB/s "
+                      f"({benchmark['cdrom']['cache_mode']})")
         
-        # Test USB read/write speed
+        # Test USB read/write speed, random reads and fsync latency
         if self.usb_mount:
-            # Write test
-            test_file = self.usb_mount / f"perf_test_{self.serial_number}.dat"
-            write_speed = self.measure_write_speed(test_file, size_mb=50)
-            results["usb_write_speed_mbps"] = round(write_speed, 1)
+            benchmark["usb"] = self.benchmark.run_writable(self.usb_mount, f"perf_test_{self.serial_number}")
+            usb = benchmark["usb"]
+            results["usb_write_speed_mbps"] = usb["write_mbps"]
+            results["usb_read_speed_mbps"] = max(usb["sequential_read_mbps"].values())
+            results["usb_random_read_iops"] = usb["random_read"]["iops"]
+            results["usb_fsync_p95_ms"] = usb["fsync_latency_ms"]["p95"]
             print(f"  ✓ USB write speed: {results['usb_write_speed_mbps']} MB/s")
-            
-            # Read test
-            if test_file.exists():
-                read_speed = self.measure_read_speed(test_file)
-                results["usb_read_speed_mbps"] = round(read_speed, 1)
-                print(f"  ✓ USB read speed: {results['usb_read_speed_mbps']} MB/s")
-                
-                # Cleanup
-                test_file.unlink()
+            print(f"  ✓ USB read speed: {results['usb_read_speed_mbps']} MB/s ({usb['cache_mode']})")
+            print(f"  ✓ USB random 4K reads: {results['usb_random_read_iops']} IOPS")
+            print(f"  ✓ USB fsync latency p95: {results['usb_fsync_p95_ms']} ms")
         
         # Response time test
         start = time.time()
@@ -413,57 +519,37 @@ class USBValidator:
         results["response_time_ms"] = round((time.time() - start) * 1000, 1)
         print(f"  ✓ Response time: {results['response_time_ms']} ms")
         
-        # Check against requirements
-        speed_ok = (
-            results["cdrom_read_speed_mbps"] >= self.requirements["min_read_speed_mbps"] and
-            results["usb_read_speed_mbps"] >= self.requirements["min_read_speed_mbps"] and
-            results["usb_write_speed_mbps"] >= self.requirements["min_write_speed_mbps"]
-        )
+        # Grade against the storage tiers
+        tier, shortfalls = grade({
+            "cdrom_read_mbps": results["cdrom_read_speed_mbps"],
+            "usb_read_mbps": results["usb_read_speed_mbps"],
+            "usb_write_mbps": results["usb_write_speed_mbps"],
+            "usb_random_read_iops": results["usb_random_read_iops"],
+            "usb_fsync_p95_ms": results["usb_fsync_p95_ms"]
+        }, self.storage_tiers)
+        results["storage_tier"] = tier
+        
+        tier_names = list(self.storage_tiers)
+        required = self.requirements["min_storage_tier"]
+        speed_ok = tier is not None and tier_names.index(tier) <= tier_names.index(required)
+        print(f"  {'✓' if speed_ok else '✗'} Storage tier: {tier or 'below ' + tier_names[-1]}")
         
         self.test_results["tests"]["performance"] = {
             "status": "PASS" if speed_ok else "FAIL",
-            **results
+            **results,
+            "tier_shortfalls": {name: misses for name, misses in shortfalls.items() if misses},
+            "benchmark": benchmark
         }
         self.test_results["performance_metrics"] = results
     
     def measure_read_speed(self, file_path, chunk_size=1024*1024):
-        """Measure file read speed in MB/s"""
-        file_size = file_path.stat().st_size
-        start_time = time.time()
-        
-        with open(file_path, 'rb') as f:
-            bytes_read = 0
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                bytes_read += len(chunk)
-        
-        duration = time.time() - start_time
-        speed_mbps = (bytes_read / (1024 * 1024)) / duration
+        """Measure uncached file read speed in MB/s"""
+        speed_mbps, _ = self.benchmark.sequential_read(file_path, chunk_size)
         return speed_mbps
     
     def measure_write_speed(self, file_path, size_mb=50):
-        """Measure file write speed in MB/s"""
-        chunk_size = 1024 * 1024  # 1MB chunks
-        total_bytes = size_mb * 1024 * 1024
-        
-        start_time = time.time()
-        
-        with open(file_path, 'wb') as f:
-            bytes_written = 0
-            chunk = os.urandom(chunk_size)
-            
-            while bytes_written < total_bytes:
-                f.write(chunk)
-                bytes_written += chunk_size
-            
-            f.flush()
-            os.fsync(f.fileno())
-        
-        duration = time.time() - start_time
-        speed_mbps = (bytes_written / (1024 * 1024)) / duration
-        return speed_mbps
+        """Measure file write speed in MB/s (including the final fsync)"""
+        return self.benchmark.sequential_write(file_path, size_mb)
     
     def test_application(self):
         """Test application launch and basic functionality"""
@@ -528,9 +614,17 @@ class USBValidator:
         
         # Show test summary
         print("\nTest Summary:")
+        durations = self.test_results.get("timing", {}).get("tests", {})
         for test_name, test_result in self.test_results["tests"].items():
             status_icon = "✓" if test_result["status"] == "PASS" else "✗"
-            print(f"  {status_icon} {test_name}: {test_result['status']}")
+            duration = durations.get(test_name, {}).get("duration_seconds")
+            timing = f" ({duration:.2f}s)" if duration is not None else ""
+            print(f"  {status_icon} {test_name}: {test_result['status']}{timing}")
+        
+        if self.test_results.get("timing"):
+            timing = self.test_results["timing"]
+            print(f"\nTests took {timing['test_seconds']:.1f}s in {timing['wall_seconds']:.1f}s "
+                  f"({timing['parallel_speedup']:.1f}x)")
         
         # Show performance summary
         if self.test_results.get("performance_metrics"):
@@ -539,6 +633,9 @@ class USBValidator:
             print(f"  CD-ROM Read: {metrics.get('cdrom_read_speed_mbps', 0)} MB/s")
             print(f"  USB Read: {metrics.get('usb_read_speed_mbps', 0)} MB/s")
             print(f"  USB Write: {metrics.get('usb_write_speed_mbps', 0)} MB/s")
+            print(f"  USB Random 4K: {metrics.get('usb_random_read_iops', 0)} IOPS")
+            print(f"  USB fsync p95: {metrics.get('usb_fsync_p95_ms')} ms")
+            print(f"  Storage Tier: {metrics.get('storage_tier')}")
             print(f"  Response Time: {metrics.get('response_time_ms', 0)} ms")
         
         # Show errors and warnings
@@ -570,6 +667,20 @@ class USBValidator:
         
         print(f"\n📄 Report saved: {report_file}")
         
+        # Storage results over time, one row per device
+        metrics = self.test_results.get("performance_metrics")
+        if metrics:
+            trend_file = report_dir / "storage_trend.csv"
+            if not trend_file.exists():
+                with open(trend_file, 'w') as f:
+                    f.write("Serial,Batch,Date,Tier,CdromReadMBps,UsbReadMBps,UsbWriteMBps,"
+                            "UsbRandomReadIOPS,UsbFsyncP95ms\n")
+            with open(trend_file, 'a') as f:
+                f.write(f"{self.serial_number},{self.batch_id},{self.test_results['test_date']},"
+                        f"{metrics['storage_tier']},{metrics['cdrom_read_speed_mbps']},"
+                        f"{metrics['usb_read_speed_mbps']},{metrics['usb_write_speed_mbps']},"
+                        f"{metrics['usb_random_read_iops']},{metrics['usb_fsync_p95_ms']}\n")
+        
         # Also save a summary CSV for batch tracking
         summary_file = report_dir / "validation_summary.csv"
         
@@ -602,15 +713,27 @@ def main():
         action="store_true",
         help="Quick validation (skip performance tests)"
     )
+    parser.add_argument(
+        "--min-iops",
+        type=int,
+        help="Fail devices below this many random 4K read IOPS (default: record only)"
+    )
+    parser.add_argument(
+        "--max-fsync-ms",
+        type=float,
+        help="Fail devices whose fsync p95 latency exceeds this (default: record only)"
+    )
     
     args = parser.parse_args()
     
     validator = USBValidator(
         serial_number=args.serial,
-        batch_id=args.batch
+        batch_id=args.batch,
+        min_random_read_iops=args.min_iops,
+        max_fsync_p95_ms=args.max_fsync_ms
     )
     
-    passed = validator.validate()
+    passed = validator.validate(quick=args.quick)
     
     sys.exit(0 if passed else 1)
 
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Embedding Cache Benchmark
+Compares re-embedding every chunk of a re-ingested knowledge base with the
+persistent embedding cache in open_webui.retrieval.embedding_cache
+Version: 6.2
+"""
+
+import sys
+import time
+import random
+import tempfile
+import argparse
+from pathlib import Path
+from typing import Callable, List
+
+# Constants
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / "open-webui-main" / "backend"))
+
+from open_webui.retrieval.embedding_cache import EmbeddingCache
+
+NAMESPACE = {"engine": "ollama", "model": "nomic-embed-text", "prefix": None, "prefix_field": None}
+
+
+class SimulatedBackend:
+    """Stands in for the embedding server: fixed cost per request plus per text"""
+
+    def __init__(self, dim: int, request_ms: float, text_ms: float):
+        self.dim = dim
+        self.request_ms = request_ms
+        self.text_ms = text_ms
+        self.texts = 0
+
+    def __call__(self, batch: List[str]) -> List[List[float]]:
+        time.sleep((self.request_ms + self.text_ms * len(batch)) / 1000)
+        self.texts += len(batch)
+        return [[random.Random(text).random() for _ in range(self.dim)] for text in batch]
+
+
+def create_corpus(chunks: int, chunk_chars: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    words = ("photosynthesis", "gravity", "fraction", "volcano", "electron", "habitat",
+             "algorithm", "molecule", "equation", "ecosystem", "energy", "orbit")
+    return [f"[{i}] " + " ".join(rng.choice(words) for _ in range(chunk_chars // 9))
+            for i in range(chunks)]
+
+
+def edit_corpus(corpus: List[str], changed: float, seed: int = 7) -> List[str]:
+    """The same knowledge base after a fraction of its chunks were edited"""
+    rng = random.Random(seed)
+    return [f"{chunk} (revised)" if rng.random() < changed else chunk for chunk in corpus]
+
+
+def legacy_embed(backend: SimulatedBackend, texts: List[str], batch_size: int) -> List[List[float]]:
+    """The previous behaviour: every chunk goes to the backend"""
+    embeddings = []
+    for i in range(0, len(texts), batch_size):
+        embeddings.extend(backend(texts[i:i + batch_size]))
+    return embeddings
+
+
+def measure(label: str, embed: Callable[[List[str]], List[List[float]]], texts: List[str],
+            backend: SimulatedBackend) -> float:
+    """Seconds to embed the corpus"""
+    backend.texts = 0
+    start = time.perf_counter()
+    embed(texts)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {elapsed:8.3f} s  ({backend.texts} texts embedded)")
+    return elapsed
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark re-ingesting a knowledge base with the embedding cache"
+    )
+    parser.add_argument('--chunks', type=int, default=2000, help='Chunks in the knowledge base')
+    parser.add_argument('--chunk-chars', type=int, default=1000, help='Characters per chunk')
+    parser.add_argument('--changed', type=float, nargs='+', default=[0.0, 0.1, 0.5],
+                        help='Fractions of chunks edited before re-ingestion')
+    parser.add_argument('--dim', type=int, default=768, help='Embedding dimension')
+    parser.add_argument('--batch-size', type=int, default=32, help='Texts per backend request')
+    parser.add_argument('--request-ms', type=float, default=20.0, help='Simulated cost per request')
+    parser.add_argument('--text-ms', type=float, default=2.0, help='Simulated cost per text')
+
+    args = parser.parse_args()
+    backend = SimulatedBackend(args.dim, args.request_ms, args.text_ms)
+    corpus = create_corpus(args.chunks, args.chunk_chars)
+
+    print("=" * 60)
+    print(f"RE-INGESTING {args.chunks} CHUNKS ({args.dim} dimensions, batches of {args.batch_size})")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = EmbeddingCache(cache_dir)
+        cached_embed = lambda texts: cache.embed(NAMESPACE, texts, backend, args.batch_size)
+        cached_embed(corpus)  # first ingestion fills the cache
+
+        for changed in args.changed:
+            texts = edit_corpus(corpus, changed, seed=int(changed * 100))
+
+            print(f"\n{changed:.0%} of chunks edited:")
+            fresh = measure("embedding cache", cached_embed, texts, backend)
+            legacy = measure("embed every chunk", lambda t: legacy_embed(backend, t, args.batch_size),
+                             texts, backend)
+            print(f"  speedup: {legacy / max(fresh, 1e-9):.1f}x")
+
+            expected = legacy_embed(backend, texts, args.batch_size)
+            cached = cached_embed(texts)
+            if any(abs(a - b) > 1e-6 for row, ref in zip(cached, expected) for a, b in zip(row, ref)):
+                print(f"ERROR: cached embeddings differ with {changed:.0%} of chunks edited")
+                return 1
+
+        stats = cache.stats()
+        print(f"\nCache hit rate {stats['hit_rate']:.1%}, "
+              f"{stats['saved_seconds']:.1f}s of embedding saved")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
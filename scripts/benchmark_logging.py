@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Logging Backend Benchmark
+Compares caller-side cost of synchronous and queue-based secure logging
+Version: 6.2
+"""
+
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Constants
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / "manufacturing"))
+
+from secure_logging import SensitiveDataFilter, SecureFormatter
+from async_logging import AsyncLogBackend, create_rotating_handler
+
+
+def file_handler(log_file: Path) -> logging.Handler:
+    """Rotated log file with the manufacturing formatter and redaction"""
+    handler = create_rotating_handler(log_file, SecureFormatter(
+        '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+    ))
+    handler.addFilter(SensitiveDataFilter())
+    return handler
+
+
+def run(label: str, target: logging.Logger, lines: int) -> float:
+    """Time the log calls as seen by the caller"""
+    start = time.perf_counter()
+    for i in range(lines):
+        target.info("Device %d of %d produced, serial SF-%06d", i, lines, i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  {elapsed / lines * 1e6:8.2f} us/call")
+    return elapsed
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark Sunflower AI logging backends"
+    )
+    parser.add_argument('--lines', type=int, default=20000, help='Number of log calls')
+
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="sunflower_log_bench_"))
+    try:
+        print("=" * 60)
+        print(f"LOGGING {args.lines} LINES")
+        print("=" * 60)
+
+        sync_logger = logging.getLogger("benchmark.sync")
+        sync_logger.propagate = False
+        sync_logger.setLevel(logging.INFO)
+        sync_logger.addHandler(file_handler(work_dir / "sync.log"))
+        sync_seconds = run("synchronous", sync_logger, args.lines)
+
+        async_logger = logging.getLogger("benchmark.async")
+        async_logger.propagate = False
+        async_logger.setLevel(logging.INFO)
+        backend = AsyncLogBackend([file_handler(work_dir / "async.log")],
+                                  queue_size=args.lines)
+        backend.attach(async_logger)
+        async_seconds = run("queued (caller side)", async_logger, args.lines)
+
+        start = time.perf_counter()
+        backend.stop()
+        print(f"{'queued (drain on stop)':<28} {time.perf_counter() - start:8.3f}s")
+
+        print(f"\nCaller speedup: {sync_seconds / async_seconds:.2f}x, "
+              f"dropped: {backend.stats['dropped']}")
+        return 0
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
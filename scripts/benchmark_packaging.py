@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Packaging Benchmark
+Compares single-threaded zipfile/tarfile packaging plus a checksum pass
+with the parallel archive writers that hash while writing
+Version: 6.2
+"""
+
+import os
+import sys
+import time
+import shutil
+import hashlib
+import tarfile
+import zipfile
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+# Constants
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.parallel_archive import ParallelZipWriter, ParallelTarGzWriter
+
+
+def create_build_tree(directory: Path, model_mb: int, text_files: int) -> None:
+    """A build directory with one model and many compressible files"""
+    models = directory / "models"
+    docs = directory / "documentation"
+    models.mkdir(parents=True)
+    docs.mkdir(parents=True)
+
+    block = os.urandom(1024 * 1024)
+    with open(models / "llama3.2-1b-q4_0.gguf", 'wb') as f:
+        for _ in range(model_mb):
+            f.write(block)
+
+    paragraph = ("Sunflower AI keeps every conversation safe for children. " * 40 + "\n").encode()
+    for i in range(text_files):
+        (docs / f"guide_{i:04d}.md").write_bytes(paragraph * (50 + i % 200))
+
+
+def sha256_file(path: Path) -> str:
+    """The separate checksum pass the legacy packaging did"""
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def legacy_zip(build_dir: Path, output: Path) -> str:
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for root, dirs, files in os.walk(build_dir):
+            for file in files:
+                file_path = Path(root) / file
+                zipf.write(file_path, file_path.relative_to(build_dir))
+    return sha256_file(output)
+
+
+def legacy_tar(build_dir: Path, output: Path) -> str:
+    with tarfile.open(output, 'w:gz') as tarf:
+        tarf.add(build_dir, arcname='SunflowerAI')
+    return sha256_file(output)
+
+
+def parallel_zip(build_dir: Path, output: Path, workers) -> str:
+    with ParallelZipWriter(output, workers) as zipf:
+        for file_path in sorted(build_dir.rglob("*")):
+            if file_path.is_file():
+                zipf.add_file(file_path, file_path.relative_to(build_dir).as_posix())
+    return zipf.stats['sha256']
+
+
+def parallel_tar(build_dir: Path, output: Path, workers) -> str:
+    with ParallelTarGzWriter(output, workers) as tarf:
+        tarf.add(build_dir, 'SunflowerAI')
+    return tarf.stats['sha256']
+
+
+def measure(label: str, total_mb: float, output: Path, run: Callable[[], str]) -> float:
+    """Time one strategy and report throughput and output size"""
+    start = time.perf_counter()
+    digest = run()
+    elapsed = time.perf_counter() - start
+    assert digest == sha256_file(output), f"{label}: checksum does not match the archive"
+    print(f"{label:<28} {elapsed:8.3f}s  {total_mb / elapsed:8.1f} MB/s  "
+          f"{output.stat().st_size / (1024 * 1024):8.1f} MB")
+    return elapsed
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark Sunflower AI package compression"
+    )
+    parser.add_argument('--model-mb', type=int, default=512, help='Size of the model file in MB')
+    parser.add_argument('--text-files', type=int, default=500, help='Number of documentation files')
+    parser.add_argument('--workers', type=int, default=None, help='Compression threads')
+
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="sunflower_package_bench_"))
+    try:
+        build_dir = work_dir / "build"
+        create_build_tree(build_dir, args.model_mb, args.text_files)
+        total_mb = sum(f.stat().st_size for f in build_dir.rglob("*") if f.is_file()) / (1024 * 1024)
+
+        print("=" * 60)
+        print(f"PACKAGING {total_mb:.0f} MB ({args.model_mb} MB model, {args.text_files} documents)")
+        print("=" * 60)
+
+        legacy_zip_seconds = measure("zipfile + checksum pass", total_mb, work_dir / "legacy.zip",
+                                     lambda: legacy_zip(build_dir, work_dir / "legacy.zip"))
+        parallel_zip_seconds = measure("parallel zip", total_mb, work_dir / "parallel.zip",
+                                       lambda: parallel_zip(build_dir, work_dir / "parallel.zip", args.workers))
+        legacy_tar_seconds = measure("tarfile w:gz + checksum", total_mb, work_dir / "legacy.tar.gz",
+                                     lambda: legacy_tar(build_dir, work_dir / "legacy.tar.gz"))
+        parallel_tar_seconds = measure("parallel tar.gz", total_mb, work_dir / "parallel.tar.gz",
+                                       lambda: parallel_tar(build_dir, work_dir / "parallel.tar.gz", args.workers))
+
+        with zipfile.ZipFile(work_dir / "parallel.zip") as zipf:
+            if zipf.testzip() is not None:
+                print("ERROR: parallel zip failed its CRC check")
+                return 1
+
+        print(f"\nZIP speedup: {legacy_zip_seconds / parallel_zip_seconds:.2f}x, "
+              f"tar.gz speedup: {legacy_tar_seconds / parallel_tar_seconds:.2f}x "
+              f"({os.cpu_count()} CPUs)")
+        return 0
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Retrieval Merge Benchmark
+Compares the sort-everything merge of RAG query results with the
+streaming top-k heap merge in open_webui.retrieval.utils
+Version: 6.2
+"""
+
+import sys
+import time
+import random
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Callable, List
+
+# Constants
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / "open-webui-main" / "backend"))
+
+from open_webui.retrieval.utils import merge_and_sort_query_results
+
+
+def legacy_merge(query_results: list, k: int) -> dict:
+    """The previous implementation: hash every document, sort every candidate"""
+    combined = dict()
+
+    for data in query_results:
+        distances = data["distances"][0]
+        documents = data["documents"][0]
+        metadatas = data["metadatas"][0]
+
+        for distance, document, metadata in zip(distances, documents, metadatas):
+            if isinstance(document, str):
+                doc_hash = hashlib.sha256(document.encode()).hexdigest()
+
+                if doc_hash not in combined.keys():
+                    combined[doc_hash] = (distance, document, metadata)
+                    continue
+
+                if distance > combined[doc_hash][0]:
+                    combined[doc_hash] = (distance, document, metadata)
+
+    combined = list(combined.values())
+    combined.sort(key=lambda x: x[0], reverse=True)
+
+    sorted_distances, sorted_documents, sorted_metadatas = (
+        zip(*combined[:k]) if combined else ([], [], [])
+    )
+
+    return {
+        "distances": [list(sorted_distances)],
+        "documents": [list(sorted_documents)],
+        "metadatas": [list(sorted_metadatas)],
+    }
+
+
+def create_query_results(collections: int, queries: int, per_query: int, chunk_chars: int,
+                         overlap: float, seed: int = 42) -> List[dict]:
+    """Results for every (collection, query) pair, some chunks shared across queries"""
+    rng = random.Random(seed)
+    words = ("photosynthesis", "gravity", "fraction", "volcano", "electron", "habitat",
+             "algorithm", "molecule", "equation", "ecosystem", "energy", "orbit")
+
+    results = []
+    for collection in range(collections):
+        chunks = []
+        for i in range(per_query * queries):
+            text = " ".join(rng.choice(words) for _ in range(chunk_chars // 9))
+            chunks.append(f"[{collection}:{i}] {text}"[:chunk_chars])
+
+        for query in range(queries):
+            # Each query has its own best chunks, plus some another query also found
+            picked = [rng.choice(chunks) if rng.random() < overlap else chunks[query * per_query + i]
+                      for i in range(per_query)]
+            results.append({
+                "distances": [[round(rng.random(), 4) for _ in picked]],
+                "documents": [picked],
+                "metadatas": [[{"collection": f"kb_{collection}", "source": f"doc_{collection}.pdf"}
+                               for _ in picked]],
+            })
+    return results
+
+
+def measure(label: str, merge: Callable[[list, int], dict], query_results: list,
+            k: int, rounds: int) -> float:
+    """Average milliseconds per merge"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        merge(query_results, k)
+    elapsed = (time.perf_counter() - start) / rounds * 1000
+    print(f"  {label:<22} {elapsed:9.3f} ms")
+    return elapsed
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark merging RAG query results across collections"
+    )
+    parser.add_argument('--collections', type=int, nargs='+', default=[10, 25, 50, 100],
+                        help='Collection counts to test')
+    parser.add_argument('--queries', type=int, default=3, help='Queries per request')
+    parser.add_argument('--per-query', type=int, default=10, help='Results per collection and query')
+    parser.add_argument('--chunk-chars', type=int, default=1500, help='Characters per chunk')
+    parser.add_argument('--k', type=int, default=10, help='Results kept after merging')
+    parser.add_argument('--rounds', type=int, default=50, help='Merges timed per size')
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"MERGING TOP {args.k} OF {args.queries} QUERIES x {args.per_query} RESULTS "
+          f"({args.chunk_chars} character chunks)")
+    print("=" * 60)
+
+    for collections in args.collections:
+        query_results = create_query_results(collections, args.queries, args.per_query,
+                                             args.chunk_chars, overlap=0.3)
+
+        if merge_and_sort_query_results(query_results, args.k) != legacy_merge(query_results, args.k):
+            print(f"ERROR: merged results differ for {collections} collections")
+            return 1
+
+        candidates = sum(len(r["documents"][0]) for r in query_results)
+        print(f"\n{collections} collections, {candidates} candidates:")
+        legacy = measure("sha256 + full sort", legacy_merge, query_results, args.k, args.rounds)
+        streaming = measure("streaming top-k heap", merge_and_sort_query_results,
+                            query_results, args.k, args.rounds)
+        print(f"  speedup: {legacy / streaming:.2f}x")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
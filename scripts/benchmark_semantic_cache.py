@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Semantic Cache Benchmark
+Measures lookup latency at scale and paraphrase precision/recall
+Version: 6.2
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Constants
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from pipelines.semantic_cache import HashedNgramVectorizer, SemanticIndex
+from pipelines.safety.text_normalizer import extract_math_tokens
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# Labelled (cached prompt, new prompt, is_paraphrase) pairs
+PARAPHRASE_SET: List[Tuple[str, str, bool]] = [
+    ("how do volcanoes erupt", "why do volcanos explode", True),
+    ("why is the sky blue", "why is the sky blue?", True),
+    ("why is the sky blue", "what makes the sky blue", True),
+    ("how do plants make food", "how do plants make their food", True),
+    ("what is photosynthesis", "what's photosynthesis", True),
+    ("how many planets are in the solar system", "how many planets are there in the solar system", True),
+    ("what are clouds made of", "what are clouds made from", True),
+    ("how do magnets work", "how does a magnet work", True),
+    ("what is 7 times 8", "what is 7 x 8", True),
+    ("how do computers work", "how does a computer work", True),
+    ("what is gravity", "what is gravity?", True),
+    ("why do leaves change color in fall", "why do leaves change colour in the fall", True),
+    ("how do rainbows form", "how are rainbows formed", True),
+    ("what is a fraction", "what's a fraction", True),
+    ("how far away is the moon", "how far is the moon away", True),
+    ("how do volcanoes erupt", "how do earthquakes happen", False),
+    ("why is the sky blue", "why is the ocean salty", False),
+    ("how do plants make food", "how do animals find food", False),
+    ("what is photosynthesis", "what is respiration", False),
+    ("how many planets are in the solar system", "how many moons does jupiter have", False),
+    ("what are clouds made of", "what are stars made of", False),
+    ("how do magnets work", "how do batteries work", False),
+    ("what is 7 times 8", "what is 7 plus 8", False),
+    ("how do computers work", "how do robots work", False),
+    ("what is gravity", "what is friction", False),
+    ("why do leaves change color in fall", "why do birds fly south in fall", False),
+    ("how do rainbows form", "how do tornadoes form", False),
+    ("what is a fraction", "what is a decimal", False),
+    ("how far away is the moon", "how far away is the sun", False),
+    ("what is an atom", "what is a molecule", False),
+]
+
+
+def benchmark_lookup(sizes: List[int], dim: int, queries: int) -> Dict[int, Dict[str, float]]:
+    """Measure nearest-neighbour lookup latency for growing index sizes"""
+    rng = np.random.default_rng(42)
+    results = {}
+
+    for size in sizes:
+        index = SemanticIndex(dim, initial_capacity=size)
+        vectors = rng.standard_normal((size, dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index.vectors[:size] = vectors
+        index.entries = [{}] * size
+        index.size = size
+
+        probes = rng.standard_normal((queries, dim), dtype=np.float32)
+        probes /= np.linalg.norm(probes, axis=1, keepdims=True)
+
+        timings = []
+        for probe in probes:
+            start = time.perf_counter()
+            index.search(probe)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        results[size] = {
+            'mean_ms': statistics.mean(timings),
+            'p50_ms': timings[len(timings) // 2],
+            'p95_ms': timings[int(len(timings) * 0.95) - 1],
+            'index_mb': vectors.nbytes / (1024 * 1024)
+        }
+        del index, vectors
+
+    return results
+
+
+def evaluate_paraphrases(threshold: float) -> Dict[str, float]:
+    """Compute precision/recall of the hashed n-gram embedder on the labelled set"""
+    vectorizer = HashedNgramVectorizer()
+    true_pos = false_pos = false_neg = true_neg = 0
+
+    for cached, query, is_paraphrase in PARAPHRASE_SET:
+        cached_vec, query_vec = vectorizer.embed([cached, query])
+        predicted = (float(cached_vec @ query_vec) >= threshold
+                     and extract_math_tokens(cached) == extract_math_tokens(query))
+
+        if predicted and is_paraphrase:
+            true_pos += 1
+        elif predicted:
+            false_pos += 1
+        elif is_paraphrase:
+            false_neg += 1
+        else:
+            true_neg += 1
+
+    precision = true_pos / (true_pos + false_pos) if true_pos + false_pos else 1.0
+    recall = true_pos / (true_pos + false_neg) if true_pos + false_neg else 0.0
+
+    return {
+        'threshold': threshold,
+        'precision': precision,
+        'recall': recall,
+        'true_positives': true_pos,
+        'false_positives': false_pos,
+        'false_negatives': false_neg,
+        'true_negatives': true_neg
+    }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Sunflower AI semantic response cache"
+    )
+    parser.add_argument(
+        '--sizes',
+        nargs='+',
+        type=int,
+        default=DEFAULT_SIZES,
+        help='Numbers of cached prompts to benchmark'
+    )
+    parser.add_argument(
+        '--dim',
+        type=int,
+        default=HashedNgramVectorizer().dim,
+        help='Embedding dimension'
+    )
+    parser.add_argument(
+        '--queries',
+        type=int,
+        default=200,
+        help='Lookups per index size'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=HashedNgramVectorizer.default_threshold,
+        help='Similarity threshold for paraphrase evaluation'
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SEMANTIC CACHE LOOKUP LATENCY")
+    print("=" * 60)
+    for size, result in benchmark_lookup(args.sizes, args.dim, args.queries).items():
+        print(f"{size:>10,} prompts: mean {result['mean_ms']:.3f}ms  "
+              f"p50 {result['p50_ms']:.3f}ms  p95 {result['p95_ms']:.3f}ms  "
+              f"({result['index_mb']:.0f}MB)")
+
+    print("\n" + "=" * 60)
+    print("PARAPHRASE DETECTION (hashed n-gram embedder)")
+    print("=" * 60)
+    quality = evaluate_paraphrases(args.threshold)
+    print(f"Threshold: {quality['threshold']:.2f}")
+    print(f"Precision: {quality['precision']:.2%}")
+    print(f"Recall:    {quality['recall']:.2%}")
+    print(f"TP={quality['true_positives']} FP={quality['false_positives']} "
+          f"FN={quality['false_negatives']} TN={quality['true_negatives']}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
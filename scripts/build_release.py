@@ -27,6 +27,11 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 BUILD_DIR = PROJECT_ROOT / "build_output"
 DIST_DIR = PROJECT_ROOT / "dist"
 TEMP_DIR = PROJECT_ROOT / "temp_build"
+CACHE_DIR = PROJECT_ROOT / ".build_cache"
+
+# Shared incremental build cache
+sys.path.append(str(PROJECT_ROOT / 'src'))
+from build_cache import BuildCache, BuildStep, source_date
 
 # Version information
 VERSION_FILE = PROJECT_ROOT / "version.json"
@@ -57,6 +62,10 @@ PLATFORM_CONFIG = {
     }
 }
 
+# Sources bundled by PyInstaller and copied to the CD-ROM partition
+BUNDLE_INPUTS = ["interface", "modelfiles", "safety_filters", "assets", "requirements.txt"]
+CDROM_SOURCES = ["modelfiles", "interface", "safety_filters", "assets", "documentation"]
+
 # Model variants for hardware detection
 MODEL_VARIANTS = [
     "llama3.2:7b",     # High-end systems
@@ -66,17 +75,28 @@ MODEL_VARIANTS = [
 ]
 
 class ProductionBuilder:
-    def __init__(self, platform: str = "universal", version: str = None):
+    def __init__(self, platform: str = "universal", version: str = None, clean: bool = False):
         self.platform = platform
         self.version = version or self._load_version()
-        self.build_timestamp = datetime.now().isoformat()
+        self.clean = clean
+        self.build_timestamp = source_date().isoformat()
+        
+        # Steps are skipped when their inputs and outputs are unchanged
+        self.cache = BuildCache(CACHE_DIR, base=PROJECT_ROOT)
+        
+        # Same sources and version give the same build ID
         self.build_id = hashlib.sha256(
-            f"{self.version}-{self.build_timestamp}".encode()
+            f"{self.version}-{self.platform}-{self.cache.step_key(self._sources_step())}".encode()
         ).hexdigest()[:12]
         
         self.errors = []
         self.warnings = []
         self.build_manifest = {}
+    
+    def _sources_step(self) -> BuildStep:
+        """Every release input, used to derive the build ID"""
+        inputs = sorted({PROJECT_ROOT / name for name in BUNDLE_INPUTS + CDROM_SOURCES})
+        return BuildStep("sources", run=lambda: True, inputs=inputs)
         
     def _load_version(self) -> str:
         """Load version from version.json"""
@@ -128,24 +148,45 @@ class ProductionBuilder:
         return True
     
     def clean_build_directories(self):
-        """Clean previous build artifacts"""
-        print("🧹 Cleaning build directories...")
-        
-        for directory in [BUILD_DIR, TEMP_DIR]:
-            if directory.exists():
-                shutil.rmtree(directory, ignore_errors=True)
+        """
+        Prepare build directories
+        
+        Build output is kept between runs so cached steps can reuse it;
+        with clean=True it is removed and the build cache is cleared.
+        """
+        if self.clean:
+            print("🧹 Cleaning build directories...")
+            if BUILD_DIR.exists():
+                shutil.rmtree(BUILD_DIR, ignore_errors=True)
+            self.cache.invalidate()
+        
+        if TEMP_DIR.exists():
+            shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        
+        for directory in [BUILD_DIR, TEMP_DIR, DIST_DIR]:
             directory.mkdir(parents=True, exist_ok=True)
         
-        DIST_DIR.mkdir(parents=True, exist_ok=True)
-        print("✅ Build directories cleaned")
+        if self.clean:
+            print("✅ Build directories cleaned")
     
     def compile_executables(self, target_platform: str) -> bool:
-        """Compile platform-specific executables"""
+        """Compile platform-specific executables (skipped when the bundle inputs are unchanged)"""
+        spec_content = self._generate_pyinstaller_spec(target_platform)
+        
+        return self.cache.run(BuildStep(
+            f"pyinstaller_{target_platform}",
+            run=lambda: self._compile_executables(target_platform, spec_content),
+            inputs=[PROJECT_ROOT / name for name in BUNDLE_INPUTS],
+            outputs=[BUILD_DIR / target_platform],
+            params={"spec": spec_content}
+        ))
+    
+    def _compile_executables(self, target_platform: str, spec_content: str) -> bool:
+        """Run PyInstaller for one platform"""
         print(f"🔨 Compiling executables for {target_platform}...")
         
         try:
             # Prepare PyInstaller spec
-            spec_content = self._generate_pyinstaller_spec(target_platform)
             spec_file = TEMP_DIR / f"sunflower_{target_platform}.spec"
             spec_file.write_text(spec_content)
             
@@ -242,7 +283,17 @@ if '{target_platform}' == 'macos':
         return spec_template
     
     def prepare_models(self) -> bool:
-        """Prepare AI models for distribution"""
+        """Prepare AI models for distribution (skipped when the modelfiles are unchanged)"""
+        return self.cache.run(BuildStep(
+            "models",
+            run=self._prepare_models,
+            inputs=[PROJECT_ROOT / "modelfiles"],
+            outputs=[BUILD_DIR / "models", BUILD_DIR / "modelfiles"],
+            params={"variants": MODEL_VARIANTS}
+        ))
+    
+    def _prepare_models(self) -> bool:
+        """Write model manifests and copy the modelfiles"""
         print("🤖 Preparing AI models...")
         
         models_output = BUILD_DIR / "models"
@@ -267,8 +318,10 @@ if '{target_platform}' == 'macos':
         modelfiles_src = PROJECT_ROOT / "modelfiles"
         modelfiles_dst = BUILD_DIR / "modelfiles"
         
+        if modelfiles_dst.exists():
+            shutil.rmtree(modelfiles_dst)
         if modelfiles_src.exists():
-            shutil.copytree(modelfiles_src, modelfiles_dst, dirs_exist_ok=True)
+            shutil.copytree(modelfiles_src, modelfiles_dst)
         
         print("✅ Models prepared for distribution")
         return True
@@ -294,26 +347,31 @@ if '{target_platform}' == 'macos':
         return requirements.get(variant, {})
     
     def create_cdrom_image(self) -> bool:
-        """Create CD-ROM partition image"""
+        """Create CD-ROM partition image (skipped when its sources are unchanged)"""
+        iso_path = BUILD_DIR / "sunflower_cdrom.iso"
+        
+        return self.cache.run(BuildStep(
+            "cdrom_image",
+            run=self._create_cdrom_image,
+            inputs=[PROJECT_ROOT / name for name in CDROM_SOURCES],
+            outputs=[BUILD_DIR / "cdrom_partition", iso_path, iso_path.with_suffix('.tar.gz')],
+            params={"version": self.version, "build_id": self.build_id, "system": platform.system()}
+        ))
+    
+    def _create_cdrom_image(self) -> bool:
+        """Stage the CD-ROM partition and build its image"""
         print("💿 Creating CD-ROM partition image...")
         
         cdrom_dir = BUILD_DIR / "cdrom_partition"
-        cdrom_dir.mkdir(parents=True, exist_ok=True)
+        if cdrom_dir.exists():
+            shutil.rmtree(cdrom_dir)
+        cdrom_dir.mkdir(parents=True)
         
         # Copy system files
-        system_dirs = [
-            ("modelfiles", "modelfiles"),
-            ("interface", "interface"),
-            ("safety_filters", "safety_filters"),
-            ("assets", "assets"),
-            ("documentation", "documentation")
-        ]
-        
-        for src_name, dst_name in system_dirs:
-            src_path = PROJECT_ROOT / src_name
+        for name in CDROM_SOURCES:
+            src_path = PROJECT_ROOT / name
             if src_path.exists():
-                dst_path = cdrom_dir / dst_name
-                shutil.copytree(src_path, dst_path, dirs_exist_ok=True)
+                shutil.copytree(src_path, cdrom_dir / name)
         
         # Create marker file
         marker_file = cdrom_dir / "sunflower_cd.id"
@@ -327,6 +385,8 @@ if '{target_platform}' == 'macos':
         
         # Create ISO image (platform-specific)
         iso_path = BUILD_DIR / "sunflower_cdrom.iso"
+        iso_path.unlink(missing_ok=True)
+        iso_path.with_suffix('.tar.gz').unlink(missing_ok=True)
         
         if platform.system() == "Darwin":  # macOS
             cmd = ["hdiutil", "makehybrid", "-iso", "-joliet", 
@@ -357,7 +417,17 @@ if '{target_platform}' == 'macos':
         return True
     
     def create_usb_template(self) -> bool:
-        """Create USB partition template"""
+        """Create USB partition template (skipped when the version is unchanged)"""
+        return self.cache.run(BuildStep(
+            "usb_template",
+            run=self._create_usb_template,
+            inputs=[Path(__file__)],
+            outputs=[BUILD_DIR / "usb_partition"],
+            params={"version": self.version}
+        ))
+    
+    def _create_usb_template(self) -> bool:
+        """Write the USB partition directories, marker and default configuration"""
         print("💾 Creating USB partition template...")
         
         usb_dir = BUILD_DIR / "usb_partition"
@@ -402,28 +472,42 @@ if '{target_platform}' == 'macos':
         return True
     
     def generate_checksums(self) -> Dict[str, str]:
-        """Generate checksums for all build artifacts"""
+        """
+        Generate checksums for all build artifacts
+        
+        Digests come from the build cache's digest cache, so only files
+        rebuilt since the last run are read.
+        """
         print("🔐 Generating checksums...")
         
+        checksum_file = BUILD_DIR / "checksums.sha256"
+        artifacts = [p for p in BUILD_DIR.iterdir() if p != checksum_file]
         checksums = {}
         
-        for file_path in BUILD_DIR.rglob("*"):
-            if file_path.is_file():
-                relative_path = file_path.relative_to(BUILD_DIR)
-                
-                # Calculate SHA-256
-                sha256_hash = hashlib.sha256()
-                with open(file_path, "rb") as f:
-                    for chunk in iter(lambda: f.read(4096), b""):
-                        sha256_hash.update(chunk)
-                
-                checksums[str(relative_path)] = sha256_hash.hexdigest()
+        def write_checksums() -> bool:
+            for file_path in sorted(BUILD_DIR.rglob("*")):
+                if file_path.is_file() and file_path != checksum_file:
+                    relative_path = file_path.relative_to(BUILD_DIR)
+                    checksums[str(relative_path)] = self.cache.hasher.hash_file(file_path)
+            
+            with open(checksum_file, 'w') as f:
+                for path, checksum in sorted(checksums.items()):
+                    f.write(f"{checksum}  {path}\n")
+            return True
         
-        # Save checksums
-        checksum_file = BUILD_DIR / "checksums.sha256"
-        with open(checksum_file, 'w') as f:
-            for path, checksum in sorted(checksums.items()):
-                f.write(f"{checksum}  {path}\n")
+        self.cache.run(BuildStep(
+            "checksums",
+            run=write_checksums,
+            inputs=artifacts,
+            outputs=[checksum_file],
+            excludes=()
+        ))
+        
+        if not checksums:
+            # Cached: read back the unchanged checksum file
+            for line in checksum_file.read_text().splitlines():
+                checksum, path = line.split("  ", 1)
+                checksums[path] = checksum
         
         print(f"✅ Generated {len(checksums)} checksums")
         return checksums
@@ -457,7 +541,8 @@ if '{target_platform}' == 'macos':
             "timestamp": self.build_timestamp,
             "package": package_path.name,
             "size_mb": package_path.stat().st_size / (1024 * 1024),
-            "checksums": self.generate_checksums()
+            "checksums": self.generate_checksums(),
+            "build_cache": self.cache.summary()
         }
         
         manifest_path = DIST_DIR / f"{package_name}_manifest.json"
@@ -481,7 +566,7 @@ if '{target_platform}' == 'macos':
                 self._print_errors()
                 return False
             
-            # Step 2: Clean build directories
+            # Step 2: Prepare build directories (cleaned only with --clean)
             self.clean_build_directories()
             
             # Step 3: Build for each platform
@@ -552,6 +637,10 @@ if '{target_platform}' == 'macos':
 ⚠️  Warnings: {len(self.warnings)}
 """)
         
+        print("⚡ Build cache:")
+        print(self.cache.report())
+        print()
+        
         if self.warnings:
             print("Warnings:")
             for warning in self.warnings:
@@ -575,6 +664,11 @@ def main():
         '--version',
         help='Override version number'
     )
+    parser.add_argument(
+        '--clean',
+        action='store_true',
+        help='Remove previous build output and rebuild every step'
+    )
     parser.add_argument(
         '--skip-validation',
         action='store_true',
@@ -586,7 +680,8 @@ def main():
     # Create builder
     builder = ProductionBuilder(
         platform=args.platform,
-        version=args.version
+        version=args.version,
+        clean=args.clean
     )
     
     # Execute build
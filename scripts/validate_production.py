@@ -24,6 +24,10 @@ import importlib.util
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 
+# Concurrent test runner shared with the USB validators
+sys.path.append(str(PROJECT_ROOT / 'src'))
+from validation_runner import ValidationRunner, ValidationTask, TaskResult
+
 # Validation categories
 VALIDATION_CATEGORIES = {
     "CRITICAL": "Must pass for production release",
@@ -72,12 +76,16 @@ UNSAFE_PATTERNS = [
 class ValidationTest:
     """Base class for validation tests"""
     
-    def __init__(self, name: str, category: str = "MEDIUM"):
+    def __init__(self, name: str, category: str = "MEDIUM",
+                 depends_on: Tuple[str, ...] = (), timeout: Optional[float] = 300):
         self.name = name
         self.category = category
+        self.depends_on = depends_on  # tests that must pass before this one starts
+        self.timeout = timeout  # seconds
         self.passed = False
         self.message = ""
         self.details = {}
+        self.duration_seconds = 0.0
         
     def run(self) -> bool:
         """Override in subclasses"""
@@ -90,7 +98,8 @@ class ValidationTest:
             "category": self.category,
             "passed": self.passed,
             "message": self.message,
-            "details": self.details
+            "details": self.details,
+            "duration_seconds": round(self.duration_seconds, 3)
         }
 
 
@@ -249,7 +258,7 @@ class ModelFileValidation(ValidationTest):
     """Validate AI model files"""
     
     def __init__(self):
-        super().__init__("Model Files", "CRITICAL")
+        super().__init__("Model Files", "CRITICAL", depends_on=("File Structure",))
         
     def run(self) -> bool:
         modelfiles_dir = PROJECT_ROOT / "modelfiles"
@@ -497,6 +506,7 @@ class ProductionValidator:
         self.test_results = []
         self.start_time = None
         self.end_time = None
+        self.timing = {}
         
     def run_validation(self, categories: List[str] = None) -> bool:
         """Run all validation tests"""
@@ -523,35 +533,30 @@ class ProductionValidator:
         if categories:
             tests = [t for t in tests if t.category in categories]
         
-        # Run tests
-        critical_failed = False
-        high_failed = False
-        
+        # Dependencies are only dropped when filtering by category
+        names = {t.name for t in tests}
         for test in tests:
-            print(f"\n🔍 Running: {test.name} [{test.category}]")
-            
-            try:
-                test.run()
-                self.test_results.append(test.get_result())
-                
-                if test.passed:
-                    print(f"  ✅ PASSED: {test.message}")
-                else:
-                    print(f"  ❌ FAILED: {test.message}")
-                    
-                    if test.category == "CRITICAL":
-                        critical_failed = True
-                    elif test.category == "HIGH":
-                        high_failed = True
-                
-                if self.verbose and test.details:
-                    print(f"  📊 Details: {json.dumps(test.details, indent=4)}")
-                    
-            except Exception as e:
-                print(f"  ⚠️  ERROR: {str(e)}")
-                test.passed = False
-                test.message = f"Test crashed: {str(e)}"
-                self.test_results.append(test.get_result())
+            test.depends_on = tuple(dep for dep in test.depends_on if dep in names)
+        
+        # Run independent tests side by side, reporting each as it finishes
+        by_name = {test.name: test for test in tests}
+        runner = ValidationRunner(callback=lambda task, result: self._report_test(by_name[task.name], result))
+        results = runner.run(
+            ValidationTask(
+                test.name,
+                test.run,
+                depends_on=test.depends_on,
+                timeout=test.timeout,
+                critical=test.category == "CRITICAL",
+                check=lambda _, test=test: test.passed
+            )
+            for test in tests
+        )
+        self.timing = runner.timing(results)
+        
+        # Results in suite order rather than completion order
+        self.test_results = [test.get_result() for test in tests]
+        critical_failed = any(not r["passed"] for r in self.test_results if r["category"] == "CRITICAL")
         
         self.end_time = datetime.now()
         
@@ -564,6 +569,27 @@ class ProductionValidator:
         # Return overall result
         return not critical_failed
     
+    def _report_test(self, test: ValidationTest, result: TaskResult):
+        """Record and print one finished test"""
+        test.duration_seconds = result.duration_seconds
+        if result.status == "ERROR":
+            test.passed = False
+            test.message = f"Test crashed: {result.error}"
+        elif result.status in ("TIMEOUT", "SKIPPED"):
+            test.passed = False
+            test.message = result.error
+        
+        print(f"\n🔍 {test.name} [{test.category}] ({result.duration_seconds:.2f}s)")
+        if result.status == "ERROR":
+            print(f"  ⚠️  ERROR: {result.error}")
+        elif test.passed:
+            print(f"  ✅ PASSED: {test.message}")
+        else:
+            print(f"  ❌ FAILED: {test.message}")
+        
+        if self.verbose and test.details:
+            print(f"  📊 Details: {json.dumps(test.details, indent=4)}")
+    
     def _print_summary(self):
         """Print validation summary"""
         duration = (self.end_time - self.start_time).total_seconds()
@@ -616,7 +642,7 @@ class ProductionValidator:
   • Tests Run: {total_tests}
   • Tests Passed: {passed_tests}
   • Success Rate: {overall_rate:.1f}%
-  • Duration: {duration:.2f} seconds
+  • Duration: {duration:.2f} seconds ({self.timing.get('test_seconds', 0):.2f}s of tests, run concurrently)
 
 🚀 Production Readiness: {"✅ READY" if critical_passed else "❌ NOT READY"}
 """)
@@ -636,6 +662,7 @@ class ProductionValidator:
             "timestamp": self.start_time.isoformat(),
             "duration_seconds": (self.end_time - self.start_time).total_seconds(),
             "results": self.test_results,
+            "timing": self.timing,
             "summary": {
                 "total_tests": len(self.test_results),
                 "passed": sum(1 for r in self.test_results if r["passed"]),
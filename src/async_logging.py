@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Asynchronous Logging
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Opt-in logging backend that moves formatting, redaction and disk writes
+off the calling thread. Log calls only put the record on a bounded queue;
+a QueueListener thread runs the real handlers (size-rotated log files,
+console). When the queue is full, records below WARNING are dropped and
+counted instead of blocking the caller, and everything still queued is
+written out when the process exits.
+
+Enable with SUNFLOWER_ASYNC_LOGGING=1 or by calling setup_async_logging.
+Uses only the standard library so standalone scripts can load it without
+the rest of the package.
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ASYNC_LOGGING_ENV = "SUNFLOWER_ASYNC_LOGGING"
+DEFAULT_QUEUE_SIZE = 10000  # records
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024  # rotate log files at 10 MB
+DEFAULT_BACKUP_COUNT = 5
+BLOCKING_LEVEL = logging.WARNING  # these wait briefly for room instead of being dropped
+BLOCKING_TIMEOUT = 1.0  # seconds
+BLOCKING_POLL_INTERVAL = 0.005  # seconds
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def async_logging_enabled() -> bool:
+    """Whether the asynchronous backend was requested through the environment"""
+    return os.environ.get(ASYNC_LOGGING_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks on a full queue for routine records
+
+    Records are queued as they are; the listener thread does the message
+    formatting and redaction, so the caller only pays for the enqueue.
+    The queue is a lock-free queue.SimpleQueue bounded by checking its
+    length, which is much cheaper than queue.Queue's condition variable
+    (the bound can be overshot by one record per concurrent thread).
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, max_size: int = DEFAULT_QUEUE_SIZE):
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self._drop_lock = threading.Lock()
+        self.dropped = 0
+        self.dropped_by_level: Dict[str, int] = {}
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Queue the record untouched (it never leaves this process)"""
+        return record
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Filter and enqueue without taking the handler lock (the queue is thread-safe)"""
+        result = self.filter(record)
+        if isinstance(result, logging.LogRecord):
+            record = result
+        if result:
+            self.emit(record)
+        return bool(result)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record on the queue, dropping it if the queue stays full"""
+        if self.queue.qsize() < self.max_size:
+            self.queue.put_nowait(record)
+            return
+
+        if record.levelno >= BLOCKING_LEVEL:
+            deadline = time.monotonic() + BLOCKING_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(BLOCKING_POLL_INTERVAL)
+                if self.queue.qsize() < self.max_size:
+                    self.queue.put_nowait(record)
+                    return
+
+        with self._drop_lock:
+            self.dropped += 1
+            self.dropped_by_level[record.levelname] = self.dropped_by_level.get(record.levelname, 0) + 1
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener for a bounded queue
+
+    Reports dropped records through its own handlers; stopping queues the
+    sentinel behind everything already queued, so the queue is drained.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, queue_handler: BoundedQueueHandler,
+                 *handlers: logging.Handler):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self._reported_drops = 0
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        self.report_drops()
+
+    def report_drops(self) -> None:
+        """Log how many records were dropped since the last report"""
+        dropped = self.queue_handler.dropped
+        if dropped > self._reported_drops:
+            summary = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                "Dropped %d log records because the log queue was full",
+                (dropped - self._reported_drops,), None
+            )
+            self._reported_drops = dropped
+            super().handle(summary)
+
+
+class AsyncLogBackend:
+    """
+    Bounded queue plus listener thread feeding a set of handlers
+
+    Usage:
+        backend = AsyncLogBackend([create_rotating_handler(log_file)])
+        backend.attach(logging.getLogger("manufacturing"))
+        ...
+        backend.stop()  # also runs automatically at exit
+    """
+
+    def __init__(self, handlers: Iterable[logging.Handler], queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Args:
+            handlers: Handlers run on the listener thread
+            queue_size: Maximum number of records waiting to be written
+        """
+        self.handlers: List[logging.Handler] = list(handlers)
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = BoundedQueueHandler(self.queue, max_size=queue_size)
+        self.listener = DrainingQueueListener(self.queue, self.handler, *self.handlers)
+        self._loggers: List[logging.Logger] = []
+        self._stopped = False
+
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def attach(self, target: logging.Logger) -> None:
+        """Send a logger's records through this backend"""
+        target.addHandler(self.handler)
+        self._loggers.append(target)
+
+    def stop(self) -> None:
+        """Write out everything queued, then flush and close the handlers"""
+        if self._stopped:
+            return
+        self._stopped = True
+
+        for target in self._loggers:
+            target.removeHandler(self.handler)
+
+        self.listener.stop()
+        self.listener.report_drops()
+
+        for handler in self.handlers:
+            try:
+                handler.flush()
+                handler.close()
+            except Exception:
+                pass
+
+        atexit.unregister(self.stop)
+
+    @property
+    def stats(self) -> Dict[str, object]:
+        """Queue depth and drop counters"""
+        return {
+            "queued": self.queue.qsize(),
+            "queue_size": self.handler.max_size,
+            "dropped": self.handler.dropped,
+            "dropped_by_level": dict(self.handler.dropped_by_level),
+        }
+
+
+def create_rotating_handler(log_file: Union[str, Path],
+                            formatter: Optional[logging.Formatter] = None,
+                            max_bytes: int = DEFAULT_MAX_BYTES,
+                            backup_count: int = DEFAULT_BACKUP_COUNT) -> logging.Handler:
+    """Size-rotated UTF-8 log file handler"""
+    log_file = Path(log_file)
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+
+    handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+    handler.setFormatter(formatter or logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+_backends: Dict[str, AsyncLogBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def setup_async_logging(target: logging.Logger,
+                        log_file: Optional[Union[str, Path]] = None,
+                        console: bool = False,
+                        formatter: Optional[logging.Formatter] = None,
+                        filters: Iterable[logging.Filter] = (),
+                        queue_size: int = DEFAULT_QUEUE_SIZE,
+                        max_bytes: int = DEFAULT_MAX_BYTES,
+                        backup_count: int = DEFAULT_BACKUP_COUNT) -> AsyncLogBackend:
+    """
+    Route a logger through an asynchronous backend
+
+    Calling this again for the same logger replaces (and drains) the
+    previous backend.
+
+    Args:
+        target: Logger to attach to
+        log_file: Rotated log file, if any
+        console: Also write to stdout
+        formatter: Formatter for every handler (LOG_FORMAT if None)
+        filters: Filters (e.g. redaction) run on the listener thread
+        queue_size: Maximum queued records before routine records are dropped
+        max_bytes: Log file size that triggers rotation
+        backup_count: Rotated files to keep
+
+    Returns:
+        The backend, for stats and explicit stop()
+    """
+    formatter = formatter or logging.Formatter(LOG_FORMAT)
+    filters = list(filters)
+    handlers: List[logging.Handler] = []
+
+    if log_file:
+        handlers.append(create_rotating_handler(log_file, formatter, max_bytes, backup_count))
+
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    for handler in handlers:
+        for log_filter in filters:
+            handler.addFilter(log_filter)
+
+    backend = AsyncLogBackend(handlers, queue_size=queue_size)
+
+    with _backends_lock:
+        previous = _backends.pop(target.name, None)
+        _backends[target.name] = backend
+
+    if previous is not None:
+        previous.stop()
+
+    backend.attach(target)
+    return backend
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Incremental Backup Store
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Content-addressed store for family data backups. Files are split into
+fixed-size chunks named by their SHA-256, each chunk is compressed and
+stored once, and every backup is a small JSON manifest listing the chunks
+of each file. Files whose size and mtime match the previous backup are
+not read again, and only chunks the store has never seen are compressed
+(in parallel), so a backup costs time proportional to what changed.
+Conversation logs only grow at the end, so fixed-size chunks of an
+appended log are almost all shared with the previous backup.
+
+Uses only the standard library so the deployment tools can load it
+without the rest of the package.
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Any, Union
+from concurrent.futures import ThreadPoolExecutor, Future
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB chunks
+COMPRESSION_LEVEL = 6  # same as ZIP_DEFLATED's default
+MANIFEST_VERSION = 1
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+PathLike = Union[str, Path]
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write a file so readers never see it half-written"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class BackupStore:
+    """
+    Deduplicating, point-in-time backup store
+
+    Usage:
+        store = BackupStore(backup_path / "store")
+        manifest = store.backup(install_path, ["profiles", "conversations", "config.json"])
+        store.restore(target_dir, at=datetime(2025, 3, 1))
+        print(store.stats()["dedup_ratio"])
+    """
+
+    def __init__(self, root: PathLike, max_workers: Optional[int] = None,
+                 chunk_size: int = CHUNK_SIZE):
+        """
+        Args:
+            root: Store directory (objects/ and manifests/ live below it)
+            max_workers: Compression threads (CPU count, max 8, if None)
+            chunk_size: Bytes per chunk for new backups
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+        self.max_workers = max_workers or min(8, os.cpu_count() or 2)
+        self.chunk_size = chunk_size
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+
+    # Objects
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _iter_objects(self) -> Iterable[Path]:
+        """Stored chunk files (skipping writes in progress)"""
+        for object_path in self.objects_dir.glob("*/*"):
+            if not object_path.name.endswith(".tmp"):
+                yield object_path
+
+    def has_chunk(self, digest: str) -> bool:
+        """Whether a chunk is already stored"""
+        return self._object_path(digest).exists()
+
+    def _store_chunk(self, digest: str, data: bytes) -> int:
+        """Compress and store one chunk; returns the stored size"""
+        compressed = zlib.compress(data, COMPRESSION_LEVEL)
+        _atomic_write(self._object_path(digest), compressed)
+        return len(compressed)
+
+    def read_chunk(self, digest: str) -> bytes:
+        """Decompress a chunk and check it against its name"""
+        data = zlib.decompress(self._object_path(digest).read_bytes())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise IOError(f"Backup chunk {digest} is corrupt")
+        return data
+
+    # Manifests
+
+    def list_backups(self) -> List[str]:
+        """Backup IDs, oldest first"""
+        return sorted(path.stem for path in self.manifests_dir.glob("backup_*.json"))
+
+    def load_manifest(self, backup_id: str) -> Dict[str, Any]:
+        """Manifest of one backup"""
+        with open(self.manifests_dir / f"{backup_id}.json", "r") as f:
+            return json.load(f)
+
+    def _latest_manifest(self) -> Optional[Dict[str, Any]]:
+        backups = self.list_backups()
+        return self.load_manifest(backups[-1]) if backups else None
+
+    def _resolve_backup(self, at: Optional[Union[str, datetime]]) -> str:
+        """Backup ID for an ID, a point in time (latest at or before it) or None (latest)"""
+        backups = self.list_backups()
+        if not backups:
+            raise FileNotFoundError(f"No backups in {self.root}")
+
+        if at is None:
+            return backups[-1]
+        if isinstance(at, str):
+            if at not in backups:
+                raise FileNotFoundError(f"Backup {at} not found")
+            return at
+
+        cutoff = f"backup_{at.strftime(TIMESTAMP_FORMAT)}"
+        candidates = [backup_id for backup_id in backups if backup_id <= cutoff]
+        if not candidates:
+            raise FileNotFoundError(f"No backup at or before {at.isoformat()}")
+        return candidates[-1]
+
+    # Backup and restore
+
+    def _iter_files(self, base: Path, sources: Iterable[str]) -> Iterable[Path]:
+        for source in sources:
+            path = base / source
+            if path.is_file():
+                yield path
+            elif path.is_dir():
+                for file_path in sorted(path.rglob("*")):
+                    if file_path.is_file():
+                        yield file_path
+
+    def backup(self, base: PathLike, sources: Iterable[str]) -> Dict[str, Any]:
+        """
+        Back up files and directories (relative to base)
+
+        Returns:
+            The new backup's manifest, including its stats
+        """
+        base = Path(base)
+        previous_files = (self._latest_manifest() or {}).get("files", {})
+        files: Dict[str, Dict[str, Any]] = {}
+        stats = {"files": 0, "files_unchanged": 0, "bytes": 0, "bytes_read": 0,
+                 "new_chunks": 0, "new_bytes": 0, "stored_bytes": 0}
+
+        pending: Dict[str, Future] = {}
+        in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+
+        def store(digest: str, data: bytes) -> int:
+            try:
+                return self._store_chunk(digest, data)
+            finally:
+                in_flight.release()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="backup") as executor:
+            for file_path in self._iter_files(base, sources):
+                relative = file_path.relative_to(base).as_posix()
+                stat = file_path.stat()
+                previous = previous_files.get(relative)
+
+                stats["files"] += 1
+                stats["bytes"] += stat.st_size
+
+                # Unchanged since the last backup: reuse its chunk list unread
+                if (previous and previous["size"] == stat.st_size
+                        and previous["mtime_ns"] == stat.st_mtime_ns
+                        and all(self.has_chunk(digest) for digest in previous["chunks"])):
+                    files[relative] = previous
+                    stats["files_unchanged"] += 1
+                    continue
+
+                chunks = []
+                with open(file_path, "rb") as f:
+                    while True:
+                        data = f.read(self.chunk_size)
+                        if not data:
+                            break
+                        stats["bytes_read"] += len(data)
+                        digest = hashlib.sha256(data).hexdigest()
+                        chunks.append(digest)
+
+                        if digest not in pending and not self.has_chunk(digest):
+                            # Bound the chunks held in memory while compressing
+                            in_flight.acquire()
+                            pending[digest] = executor.submit(store, digest, data)
+                            stats["new_chunks"] += 1
+                            stats["new_bytes"] += len(data)
+
+                files[relative] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "mode": stat.st_mode & 0o777,
+                    "chunks": chunks
+                }
+
+            for future in pending.values():
+                stats["stored_bytes"] += future.result()
+
+        created = datetime.now()
+        backup_id = f"backup_{created.strftime(TIMESTAMP_FORMAT)}"
+        existing = set(self.list_backups())
+        suffix = 1
+        while backup_id in existing:
+            # Two backups in the same second keep their order
+            backup_id = f"backup_{created.strftime(TIMESTAMP_FORMAT)}_{suffix:02d}"
+            suffix += 1
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "id": backup_id,
+            "created": created.isoformat(),
+            "chunk_size": self.chunk_size,
+            "files": files,
+            "stats": stats
+        }
+        _atomic_write(self.manifests_dir / f"{backup_id}.json",
+                      json.dumps(manifest, indent=2).encode("utf-8"))
+
+        logger.info(
+            f"Backup {backup_id}: {stats['files']} files, "
+            f"{stats['files'] - stats['files_unchanged']} changed, "
+            f"{stats['new_chunks']} new chunks ({stats['new_bytes'] / 1024**2:.1f} MB)"
+        )
+        return manifest
+
+    def restore(self, target: PathLike, at: Optional[Union[str, datetime]] = None,
+                paths: Optional[Iterable[str]] = None) -> int:
+        """
+        Restore a backup into target
+
+        Args:
+            target: Directory to restore into
+            at: Backup ID, a point in time (latest backup at or before it),
+                or None for the latest backup
+            paths: Only restore these files or directories (relative paths)
+
+        Returns:
+            Number of files restored
+        """
+        target = Path(target)
+        manifest = self.load_manifest(self._resolve_backup(at))
+        prefixes = [p.strip("/") for p in paths] if paths else None
+        restored = 0
+
+        for relative, entry in manifest["files"].items():
+            if prefixes and not any(relative == p or relative.startswith(p + "/") for p in prefixes):
+                continue
+
+            destination = target / relative
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = destination.with_name(destination.name + ".restore")
+            with open(temp_path, "wb") as f:
+                for digest in entry["chunks"]:
+                    f.write(self.read_chunk(digest))
+            os.chmod(temp_path, entry.get("mode", 0o644))
+            os.replace(temp_path, destination)
+            os.utime(destination, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+            restored += 1
+
+        logger.info(f"Restored {restored} files from {manifest['id']} to {target}")
+        return restored
+
+    def prune(self, keep: int) -> int:
+        """
+        Keep only the newest backups and delete chunks none of them use
+
+        Returns:
+            Number of chunks deleted
+        """
+        backups = self.list_backups()
+        for backup_id in backups[:-keep] if keep > 0 else backups:
+            (self.manifests_dir / f"{backup_id}.json").unlink()
+
+        referenced = set()
+        for backup_id in self.list_backups():
+            for entry in self.load_manifest(backup_id)["files"].values():
+                referenced.update(entry["chunks"])
+
+        removed = 0
+        for object_path in self._iter_objects():
+            if object_path.name not in referenced:
+                object_path.unlink()
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Size of the store against the data it holds
+
+        dedup_ratio is the logical size of all backups divided by the
+        bytes actually stored (higher is better).
+        """
+        backups = self.list_backups()
+        logical_bytes = 0
+        for backup_id in backups:
+            logical_bytes += sum(entry["size"] for entry in self.load_manifest(backup_id)["files"].values())
+
+        chunk_count = 0
+        stored_bytes = 0
+        for object_path in self._iter_objects():
+            chunk_count += 1
+            stored_bytes += object_path.stat().st_size
+
+        return {
+            "backups": len(backups),
+            "chunks": chunk_count,
+            "logical_bytes": logical_bytes,
+            "stored_bytes": stored_bytes,
+            "dedup_ratio": logical_bytes / stored_bytes if stored_bytes else 0.0
+        }
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Incremental Build Cache
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Content-addressed skipping of release build steps. Each step declares
+its input files and directories, the settings that affect its output,
+and the outputs it produces. The step's key is a SHA-256 over the
+settings and the digests of every input file (taken from the shared
+digest cache, so unchanged files are not read again). When the key and
+the recorded digests of the outputs still match, the step is skipped and
+the time it took last is reported as saved.
+
+Uses only the standard library so the build scripts can load it without
+the rest of the package.
+"""
+
+import os
+import json
+import time
+import shutil
+import fnmatch
+import hashlib
+import logging
+from pathlib import Path
+from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+try:
+    from src.file_hashing import FileHasher
+except ImportError:
+    from file_hashing import FileHasher
+
+logger = logging.getLogger(__name__)
+
+RECORD_VERSION = 1
+DEFAULT_EXCLUDES = ("__pycache__", "*.pyc", ".DS_Store", "Thumbs.db")
+
+PathLike = Union[str, Path]
+
+
+def source_date() -> datetime:
+    """Build timestamp, pinned by SOURCE_DATE_EPOCH for reproducible builds"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch and epoch.isdigit():
+        return datetime.fromtimestamp(int(epoch), timezone.utc)
+    return datetime.now()
+
+
+@dataclass
+class BuildStep:
+    """One cacheable build step"""
+    name: str
+    run: Callable[[], bool]
+    inputs: List[Path] = field(default_factory=list)  # files or directories
+    outputs: List[Path] = field(default_factory=list)  # files or directories
+    params: Dict[str, Any] = field(default_factory=dict)  # settings that change the output
+    excludes: Iterable[str] = DEFAULT_EXCLUDES
+
+
+class BuildCache:
+    """
+    Records and checks step keys under a cache directory
+
+    Usage:
+        cache = BuildCache(PROJECT_ROOT / ".build_cache", base=PROJECT_ROOT)
+        cache.run(BuildStep("models", prepare_models,
+                            inputs=[PROJECT_ROOT / "modelfiles"],
+                            outputs=[BUILD_DIR / "models"]))
+        print(cache.report())
+    """
+
+    def __init__(self, cache_dir: PathLike, base: Optional[PathLike] = None,
+                 hasher: Optional[FileHasher] = None):
+        """
+        Args:
+            cache_dir: Directory for step records and the digest cache
+            base: Paths are recorded relative to this directory when possible
+            hasher: File hasher (one with a digest cache in cache_dir if None)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.steps_dir = self.cache_dir / "steps"
+        self.steps_dir.mkdir(parents=True, exist_ok=True)
+        self.base = Path(base) if base else None
+        self.hasher = hasher or FileHasher(self.cache_dir / "digest_cache.json")
+        self.results: List[Dict[str, Any]] = []
+
+    # Hashing
+
+    def _label(self, path: Path) -> str:
+        if self.base:
+            try:
+                return path.relative_to(self.base).as_posix()
+            except ValueError:
+                pass
+        return path.as_posix()
+
+    @staticmethod
+    def _excluded(path: Path, root: Path, excludes: Iterable[str]) -> bool:
+        parts = path.relative_to(root).parts
+        return any(fnmatch.fnmatch(part, pattern) for part in parts for pattern in excludes)
+
+    def tree_digests(self, paths: Iterable[Path],
+                     excludes: Iterable[str] = DEFAULT_EXCLUDES) -> Dict[str, Optional[str]]:
+        """Digest of every file under the given files and directories, by label"""
+        excludes = tuple(excludes)
+        files = []
+        for path in paths:
+            path = Path(path)
+            if path.is_file():
+                files.append(path)
+            elif path.is_dir():
+                files.extend(
+                    p for p in sorted(path.rglob("*"))
+                    if p.is_file() and not self._excluded(p, path, excludes)
+                )
+        return {self._label(p): digest for p, digest in self.hasher.hash_files(files).items()}
+
+    def step_key(self, step: BuildStep) -> str:
+        """SHA-256 over the step's settings and input contents"""
+        key = hashlib.sha256()
+        key.update(step.name.encode("utf-8"))
+        key.update(json.dumps(step.params, sort_keys=True, default=str).encode("utf-8"))
+
+        for path in step.inputs:
+            if not Path(path).exists():
+                key.update(f"\0missing:{self._label(Path(path))}".encode("utf-8"))
+
+        for label, digest in sorted(self.tree_digests(step.inputs, step.excludes).items()):
+            key.update(f"\0{label}\0{digest}".encode("utf-8"))
+        return key.hexdigest()
+
+    # Records
+
+    def _record_path(self, name: str) -> Path:
+        return self.steps_dir / f"{name.replace('/', '_')}.json"
+
+    def _load_record(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._record_path(name), "r") as f:
+                record = json.load(f)
+            return record if record.get("version") == RECORD_VERSION else None
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _save_record(self, name: str, record: Dict[str, Any]) -> None:
+        path = self._record_path(name)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(record, f, indent=2)
+        os.replace(temp_path, path)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Forget one step's record, or every record"""
+        if name:
+            self._record_path(name).unlink(missing_ok=True)
+        else:
+            shutil.rmtree(self.steps_dir, ignore_errors=True)
+            self.steps_dir.mkdir(parents=True, exist_ok=True)
+
+    # Running
+
+    def _matching_record(self, step: BuildStep, key: str) -> Optional[Dict[str, Any]]:
+        record = self._load_record(step.name)
+        if record and record["key"] == key:
+            if self.tree_digests(step.outputs) == record["outputs"]:
+                return record
+            logger.info(f"Build step {step.name}: outputs changed since last build")
+        return None
+
+    def is_current(self, step: BuildStep) -> bool:
+        """Whether run() would skip the step"""
+        return self._matching_record(step, self.step_key(step)) is not None
+
+    def run(self, step: BuildStep) -> bool:
+        """
+        Run a step unless its inputs and outputs match the cached record
+
+        Returns:
+            Whether the step succeeded (a cache hit counts as success)
+        """
+        key = self.step_key(step)
+        record = self._matching_record(step, key)
+
+        if record:
+            saved = record.get("seconds", 0.0)
+            self.results.append({"step": step.name, "status": "cached", "seconds": 0.0, "saved": saved})
+            logger.info(f"Build step {step.name}: cached (saves {saved:.1f}s)")
+            return True
+
+        start = time.perf_counter()
+        success = step.run()
+        seconds = time.perf_counter() - start
+
+        if success:
+            self._save_record(step.name, {
+                "version": RECORD_VERSION,
+                "key": key,
+                "outputs": self.tree_digests(step.outputs),
+                "seconds": seconds,
+                "built": datetime.now().isoformat()
+            })
+        else:
+            self.invalidate(step.name)
+
+        self.results.append({"step": step.name, "status": "built" if success else "failed",
+                             "seconds": seconds, "saved": 0.0})
+        logger.info(f"Build step {step.name}: {'built' if success else 'failed'} in {seconds:.1f}s")
+        return success
+
+    def summary(self) -> Dict[str, Any]:
+        """Cache hits, steps run and time saved in this build"""
+        return {
+            "steps": list(self.results),
+            "cache_hits": sum(1 for r in self.results if r["status"] == "cached"),
+            "steps_run": sum(1 for r in self.results if r["status"] != "cached"),
+            "seconds": sum(r["seconds"] for r in self.results),
+            "saved_seconds": sum(r["saved"] for r in self.results)
+        }
+
+    def report(self) -> str:
+        """Human readable table of step results"""
+        summary = self.summary()
+        lines = [f"  {r['step']:<28} {r['status']:<7} "
+                 + (f"saved {r['saved']:.1f}s" if r["status"] == "cached" else f"{r['seconds']:.1f}s")
+                 for r in summary["steps"]]
+        lines.append(
+            f"  {summary['cache_hits']} of {len(summary['steps'])} steps cached, "
+            f"{summary['saved_seconds']:.1f}s saved"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Family Data Transfer
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Resumable, verified copy of family data between devices. Files are
+streamed with large buffers and hashed while they are read. A journal on
+the target device records finished files and checkpoints the offset of
+the file in progress, so a migration interrupted by a removed USB device
+resumes at that file and offset. Files already on the target with a
+matching digest are skipped, and a final pass re-reads the target and
+compares it against the digests taken from the source.
+
+Uses only the standard library so the deployment tools can load it
+without the rest of the package.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterable, List, Optional, Any, Tuple
+
+try:
+    from src.file_hashing import hash_file, get_verifying_hasher
+except ImportError:
+    from file_hashing import hash_file, get_verifying_hasher
+
+logger = logging.getLogger(__name__)
+
+COPY_BUFFER_SIZE = 4 * 1024 * 1024  # 4 MB reads and writes
+CHECKPOINT_BYTES = 32 * 1024 * 1024  # journal the offset every 32 MB
+PROGRESS_INTERVAL = 0.5  # seconds between progress callbacks
+JOURNAL_NAME = ".sunflower_migration_journal.json"
+PARTIAL_SUFFIX = ".partial"
+
+
+@dataclass
+class TransferProgress:
+    """Progress of a transfer, for status displays"""
+    files_total: int = 0
+    files_done: int = 0
+    bytes_total: int = 0
+    bytes_done: int = 0  # copied, resumed or skipped
+    bytes_copied: int = 0  # actually written in this run
+    current_file: str = ""
+    throughput_mbps: float = 0.0
+    eta_seconds: Optional[float] = None
+
+    @property
+    def percent(self) -> float:
+        return 100.0 * self.bytes_done / self.bytes_total if self.bytes_total else 100.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(asdict(self), percent=round(self.percent, 1))
+
+
+class TransferEngine:
+    """
+    Journaled, verified directory transfer
+
+    Usage:
+        engine = TransferEngine(old_usb, new_usb, ["family_profiles", "conversation_logs"])
+        engine.run()
+        ok, problems = engine.verify()
+    """
+
+    def __init__(
+        self,
+        source: Path,
+        target: Path,
+        directories: Iterable[str],
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+        buffer_size: int = COPY_BUFFER_SIZE
+    ):
+        """
+        Args:
+            source: Source device root
+            target: Target device root (holds the journal)
+            directories: Directories to transfer, relative to both roots
+            progress_callback: Called with TransferProgress while copying
+            buffer_size: Streaming buffer size
+        """
+        self.source = Path(source)
+        self.target = Path(target)
+        self.directories = list(directories)
+        self.progress_callback = progress_callback
+        self.buffer_size = buffer_size
+
+        self.journal_path = self.target / JOURNAL_NAME
+        self.journal = self._load_journal()
+        self.progress = TransferProgress()
+        self.stats = {"copied": 0, "resumed": 0, "skipped": 0}
+
+        self._started = 0.0
+        self._last_progress = 0.0
+
+    # Journal
+
+    def _load_journal(self) -> Dict[str, Any]:
+        try:
+            with open(self.journal_path, "r") as f:
+                journal = json.load(f)
+            if journal.get("version") == 1:
+                return journal
+        except (OSError, json.JSONDecodeError):
+            pass
+        return {"version": 1, "files": {}}
+
+    def _save_journal(self) -> None:
+        """Atomically write the journal to the target device"""
+        self.journal["updated"] = time.time()
+        temp_path = self.journal_path.with_name(JOURNAL_NAME + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(self.journal, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_path)
+
+    # Planning
+
+    def plan(self) -> List[Tuple[str, os.stat_result]]:
+        """Files to transfer as (relative path, source stat)"""
+        files = []
+        for directory in self.directories:
+            root = self.source / directory
+            if not root.exists():
+                continue
+            for path in sorted(root.rglob("*")):
+                if path.is_file():
+                    files.append((path.relative_to(self.source).as_posix(), path.stat()))
+        return files
+
+    # Progress
+
+    def _report(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+
+        progress = self.progress
+        elapsed = now - self._started
+        if elapsed > 0 and progress.bytes_copied:
+            rate = progress.bytes_copied / elapsed
+            progress.throughput_mbps = rate / (1024 * 1024)
+            progress.eta_seconds = (progress.bytes_total - progress.bytes_done) / rate
+
+        if self.progress_callback:
+            self.progress_callback(progress)
+
+    # Copying
+
+    def _source_digest_prefix(self, source: Path, length: int):
+        """Hash state after the first length bytes of the source"""
+        digest = hashlib.sha256()
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        remaining = length
+        with open(source, "rb") as f:
+            while remaining:
+                read = f.readinto(view[:min(len(buffer), remaining)])
+                if not read:
+                    break
+                digest.update(view[:read])
+                remaining -= read
+        return digest
+
+    def _copy_file(self, relative: str, stat: os.stat_result, entry: Dict[str, Any]) -> None:
+        """Stream one file to the target, resuming a checkpointed partial copy"""
+        source = self.source / relative
+        destination = self.target / relative
+        partial = destination.with_name(destination.name + PARTIAL_SUFFIX)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        offset = entry.get("offset", 0)
+        if not partial.exists() or partial.stat().st_size < offset:
+            offset = 0
+
+        if offset:
+            # Re-derive the digest from the source so it stays a check on the target
+            digest = self._source_digest_prefix(source, offset)
+            self.stats["resumed"] += 1
+            self.progress.bytes_done += offset
+            logger.info(f"Resuming {relative} at {offset / (1024 * 1024):.1f} MB")
+        else:
+            digest = hashlib.sha256()
+
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        since_checkpoint = 0
+
+        with open(source, "rb") as src, open(partial, "r+b" if offset else "wb") as dst:
+            src.seek(offset)
+            dst.seek(offset)
+            dst.truncate()
+
+            while True:
+                read = src.readinto(buffer)
+                if not read:
+                    break
+                chunk = view[:read]
+                dst.write(chunk)
+                digest.update(chunk)
+
+                offset += read
+                since_checkpoint += read
+                self.progress.bytes_done += read
+                self.progress.bytes_copied += read
+
+                if since_checkpoint >= CHECKPOINT_BYTES:
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                    entry["offset"] = offset
+                    self._save_journal()
+                    since_checkpoint = 0
+
+                self._report()
+
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        os.replace(partial, destination)
+        shutil.copystat(source, destination)
+
+        entry.pop("offset", None)
+        entry["digest"] = digest.hexdigest()
+        self.stats["copied"] += 1
+
+    def _already_present(self, relative: str, stat: os.stat_result, entry: Dict[str, Any]) -> bool:
+        """Whether the target already holds this exact file"""
+        destination = self.target / relative
+        if not destination.is_file() or destination.stat().st_size != stat.st_size:
+            return False
+
+        # Finished earlier in this migration
+        if entry.get("digest") and "offset" not in entry:
+            return True
+
+        # Present from some other copy: compare contents
+        source_digest = get_verifying_hasher().hash_file(self.source / relative)
+        if hash_file(destination) == source_digest:
+            entry["digest"] = source_digest
+            return True
+        return False
+
+    def run(self) -> Dict[str, int]:
+        """
+        Transfer every planned file
+
+        Returns:
+            Counts of files copied, resumed and skipped
+        """
+        files = self.plan()
+        journal_files = self.journal["files"]
+
+        for directory in self.directories:
+            if (self.source / directory).is_dir():
+                (self.target / directory).mkdir(parents=True, exist_ok=True)
+
+        self.progress = TransferProgress(
+            files_total=len(files),
+            bytes_total=sum(stat.st_size for _, stat in files)
+        )
+        self._started = time.monotonic()
+
+        for relative, stat in files:
+            self.progress.current_file = relative
+            entry = journal_files.get(relative)
+
+            # A changed source file invalidates anything journaled for it
+            if not entry or entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+                entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                journal_files[relative] = entry
+
+            if self._already_present(relative, stat, entry):
+                self.stats["skipped"] += 1
+                self.progress.bytes_done += stat.st_size
+            else:
+                self._copy_file(relative, stat, entry)
+
+            self.progress.files_done += 1
+            self._save_journal()
+            self._report()
+
+        self.progress.current_file = ""
+        self._report(force=True)
+
+        logger.info(
+            f"Transferred {self.progress.files_total} files: {self.stats['copied']} copied "
+            f"({self.stats['resumed']} resumed), {self.stats['skipped']} already present, "
+            f"{self.progress.throughput_mbps:.1f} MB/s"
+        )
+        return dict(self.stats)
+
+    def verify(self) -> Tuple[bool, List[str]]:
+        """
+        Compare the target against the digests taken from the source
+
+        Returns:
+            (all files match, list of problems)
+        """
+        problems = []
+        expected = {
+            relative: entry for relative, entry in self.journal["files"].items()
+            if (self.source / relative).exists() or (self.target / relative).exists()
+        }
+
+        paths = [self.target / relative for relative in expected]
+        digests = get_verifying_hasher().hash_files(paths)
+
+        for relative, entry in expected.items():
+            actual = digests.get(self.target / relative)
+            if not entry.get("digest") or "offset" in entry:
+                problems.append(f"Not transferred: {relative}")
+            elif actual is None:
+                problems.append(f"Missing on target: {relative}")
+            elif actual != entry["digest"]:
+                problems.append(f"Checksum mismatch: {relative}")
+
+        self.journal["verified"] = not problems
+        self._save_journal()
+        return not problems, problems
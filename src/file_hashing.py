@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - File Hashing
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Shared SHA-256 file hashing for the build, manufacturing and validation
+tools. Files are read in large blocks (memory-mapped when big), several
+files are hashed in parallel, and digests are kept in a persistent cache
+keyed by (path, size, mtime_ns, inode) so unchanged multi-GB model files
+are never hashed twice.
+
+That key cannot see bytes rewritten in place with the mtime restored, and
+FAT volumes reuse inode numbers from one stick to the next, so the cache is
+only for build inputs on the build machine. Integrity checks of devices and
+images (validators, partition verification, transfers) hash with
+get_verifying_hasher(), which never consults or writes a digest cache.
+
+Uses only the standard library so standalone scripts can load it without
+the rest of the package.
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import atexit
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Any, Iterable, Union
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALGORITHM = "sha256"
+READ_CHUNK_SIZE = 1024 * 1024  # 1 MB reads
+MMAP_THRESHOLD = 64 * 1024 * 1024  # memory-map files of 64 MB and up
+SAVE_THRESHOLD_BYTES = 64 * 1024 * 1024  # persist right away after hashing this much
+DEFAULT_CACHE_PATH = Path.home() / ".sunflower" / "cache" / "digest_cache.json"
+
+PathLike = Union[str, Path]
+
+
+def hash_file(file_path: PathLike, algorithm: str = DEFAULT_ALGORITHM,
+              chunk_size: int = READ_CHUNK_SIZE) -> str:
+    """
+    Hash a file without consulting the cache
+
+    hashlib releases the GIL for large updates, so calls from several
+    threads hash in parallel.
+    """
+    digest = hashlib.new(algorithm)
+
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, chunk_size * 16):
+                        digest.update(view[offset:offset + chunk_size * 16])
+                finally:
+                    view.release()
+        else:
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                digest.update(view[:read])
+
+    return digest.hexdigest()
+
+
+class DigestCache:
+    """
+    Persistent digest cache stored as JSON
+
+    An entry is only valid while the file's size, mtime_ns and inode are
+    unchanged, so any rewrite or replacement of the file invalidates it.
+    """
+
+    def __init__(self, cache_path: PathLike = DEFAULT_CACHE_PATH):
+        self.cache_path = Path(cache_path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read cached digests"""
+        try:
+            if self.cache_path.exists():
+                with open(self.cache_path, "r") as f:
+                    return json.load(f).get("files", {})
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable digest cache: {e}")
+        return {}
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Dict[str, int]:
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino}
+
+    def get(self, key: str, stat: os.stat_result, algorithm: str) -> Optional[str]:
+        """Cached digest if the file is unchanged"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if any(entry.get(name) != value for name, value in self._signature(stat).items()):
+                return None
+            return entry.get("digests", {}).get(algorithm)
+
+    def put(self, key: str, stat: os.stat_result, algorithm: str, digest: str) -> None:
+        """Remember a digest for the file as it is now"""
+        signature = self._signature(stat)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry or any(entry.get(name) != value for name, value in signature.items()):
+                entry = dict(signature, digests={})
+                self._entries[key] = entry
+            entry["digests"][algorithm] = digest
+            self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the cache if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = self.cache_path.with_name(
+                    f"{self.cache_path.name}.{os.getpid()}.tmp"
+                )
+                with open(temp_file, "w") as f:
+                    json.dump({"version": 1, "files": self._entries}, f)
+                os.replace(temp_file, self.cache_path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not save digest cache: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileHasher:
+    """
+    Parallel, cached file hasher
+
+    Usage:
+        hasher = FileHasher()
+        digest = hasher.hash_file(model_path)
+        digests = hasher.hash_files(paths)
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[PathLike] = DEFAULT_CACHE_PATH,
+        max_workers: Optional[int] = None,
+        algorithm: str = DEFAULT_ALGORITHM
+    ):
+        """
+        Args:
+            cache_path: Digest cache file, or None to disable caching
+            max_workers: Threads used by hash_files (CPU count, max 8, if None)
+            algorithm: hashlib algorithm name
+        """
+        self.cache = DigestCache(cache_path) if cache_path else None
+        self.max_workers = max_workers or min(8, os.cpu_count() or 2)
+        self.algorithm = algorithm
+
+        self._stats_lock = threading.Lock()
+        self.stats = {"hashed_files": 0, "cached_files": 0, "bytes_hashed": 0, "hash_seconds": 0.0}
+
+        if self.cache is not None:
+            atexit.register(self.cache.save)
+
+    def hash_file(self, file_path: PathLike) -> str:
+        """SHA-256 (or configured algorithm) hex digest of a file"""
+        path = Path(file_path)
+        stat = path.stat()
+        key = str(path.resolve())
+
+        if self.cache is not None:
+            cached = self.cache.get(key, stat, self.algorithm)
+            if cached:
+                with self._stats_lock:
+                    self.stats["cached_files"] += 1
+                return cached
+
+        start = time.perf_counter()
+        digest = hash_file(path, self.algorithm)
+        elapsed = time.perf_counter() - start
+
+        with self._stats_lock:
+            self.stats["hashed_files"] += 1
+            self.stats["bytes_hashed"] += stat.st_size
+            self.stats["hash_seconds"] += elapsed
+
+        if self.cache is not None:
+            self.cache.put(key, stat, self.algorithm, digest)
+            # Do not risk rehashing big files if the process dies before exit
+            if stat.st_size >= SAVE_THRESHOLD_BYTES:
+                self.cache.save()
+
+        return digest
+
+    def record(self, file_path: PathLike, digest: str) -> None:
+        """
+        Remember the digest of a file known to have that content, e.g. a
+        copy, reflink or hardlink of a file that was just hashed
+        """
+        if self.cache is not None:
+            path = Path(file_path)
+            self.cache.put(str(path.resolve()), path.stat(), self.algorithm, digest)
+
+    def hash_files(self, file_paths: Iterable[PathLike]) -> Dict[Path, Optional[str]]:
+        """
+        Hash many files in parallel
+
+        Returns:
+            Digest by path; None for files that could not be read
+        """
+        paths = [Path(p) for p in file_paths]
+
+        def safe_hash(path: Path) -> Optional[str]:
+            try:
+                return self.hash_file(path)
+            except OSError as e:
+                logger.error(f"Failed to hash {path}: {e}")
+                return None
+
+        if len(paths) <= 1:
+            results = {path: safe_hash(path) for path in paths}
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix="hash") as executor:
+                results = dict(zip(paths, executor.map(safe_hash, paths)))
+
+        if self.cache is not None:
+            self.cache.save()
+        return results
+
+    def hash_tree(self, root: PathLike, pattern: str = "*") -> Dict[str, Optional[str]]:
+        """Hash every file under root; keys are POSIX paths relative to root"""
+        root = Path(root)
+        files = sorted(p for p in root.rglob(pattern) if p.is_file())
+        return {
+            path.relative_to(root).as_posix(): digest
+            for path, digest in self.hash_files(files).items()
+        }
+
+    @property
+    def throughput_mbps(self) -> float:
+        """Hashing throughput of files actually read, in MB/s"""
+        if not self.stats["hash_seconds"]:
+            return 0.0
+        return self.stats["bytes_hashed"] / (1024 * 1024) / self.stats["hash_seconds"]
+
+
+_file_hasher: Optional[FileHasher] = None
+_file_hasher_lock = threading.Lock()
+
+
+def get_file_hasher() -> FileHasher:
+    """Get the process-wide file hasher (cache at SUNFLOWER_DIGEST_CACHE or home)"""
+    global _file_hasher
+
+    with _file_hasher_lock:
+        if _file_hasher is None:
+            cache_path = os.environ.get("SUNFLOWER_DIGEST_CACHE") or DEFAULT_CACHE_PATH
+            _file_hasher = FileHasher(cache_path)
+        return _file_hasher
+
+
+_verifying_hasher: Optional[FileHasher] = None
+
+
+def get_verifying_hasher() -> FileHasher:
+    """Get the process-wide uncached hasher for integrity verification"""
+    global _verifying_hasher
+
+    with _file_hasher_lock:
+        if _verifying_hasher is None:
+            _verifying_hasher = FileHasher(cache_path=None)
+        return _verifying_hasher
+
+
+def calculate_checksum(file_path: PathLike) -> str:
+    """SHA-256 of a file using the shared cached hasher"""
+    return get_file_hasher().hash_file(file_path)
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:]:
+        print(f"{calculate_checksum(name)}  {name}")
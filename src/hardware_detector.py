@@ -26,6 +26,19 @@ import shutil
 import threading
 import time
 
+try:
+    from src.hardware_snapshot import get_snapshot_service
+    from src.tier_calibration import TierCalibrator
+except ImportError:
+    from hardware_snapshot import get_snapshot_service
+    from tier_calibration import TierCalibrator
+
+try:
+    from config.path_config import get_usb_path
+except ImportError:
+    def get_usb_path(subpath: str = '') -> Optional[Path]:
+        return None
+
 logger = logging.getLogger(__name__)
 
 
@@ -133,8 +146,15 @@ class HardwareDetector:
         "llama3.2:1b-q4_0": {"min_ram": 2, "recommended_ram": 4, "min_cores": 1}
     }
     
-    def __init__(self):
-        """Initialize hardware detector"""
+    def __init__(self, usb_path: Optional[Path] = None):
+        """
+        Initialize hardware detector
+        
+        Args:
+            usb_path: USB partition root for the hardware snapshot
+                (the detected SUNFLOWER_DATA partition if None)
+        """
+        self.usb_path = Path(usb_path) if usb_path else get_usb_path()
         self.platform_name = platform.system()
         self.platform_version = platform.version()
         self.architecture = platform.machine()
@@ -146,6 +166,9 @@ class HardwareDetector:
         self._cache_timestamp: Optional[float] = None
         self._cache_duration = 300  # 5 minutes
         
+        # Slow subprocess probes persisted across launches
+        self._static_info: Optional[Dict[str, Any]] = None
+        
         # Thread safety
         self._cache_lock = threading.Lock()
         
@@ -170,6 +193,11 @@ class HardwareDetector:
             # Gather system information
             logger.info("Detecting hardware capabilities...")
             
+            if force_refresh:
+                self._static_info = None
+                self._cpu_info_cache = None
+                self._gpu_info_cache = None
+            
             cpu_info = self._detect_cpu()
             memory_info = self._detect_memory()
             gpu_info = self._detect_gpu()
@@ -209,6 +237,15 @@ class HardwareDetector:
             
             return asdict(self._system_info_cache)
     
+    def _get_static_info(self) -> Dict[str, Any]:
+        """
+        Results of the slow probes (wmic, sysctl, system_profiler, lspci,
+        nvidia-smi), reused from the USB snapshot when the machine matches
+        """
+        if self._static_info is None:
+            self._static_info = get_snapshot_service(self.usb_path).get_system()
+        return self._static_info
+    
     def _detect_cpu(self) -> CPUInfo:
         """Detect CPU information"""
         if self._cpu_info_cache:
@@ -223,11 +260,13 @@ class HardwareDetector:
             freq = psutil.cpu_freq()
             frequency_mhz = int(freq.current) if freq else 0
             
-            # Get CPU name and vendor
-            name, vendor = self._get_cpu_name_vendor()
+            static_info = self._get_static_info()
             
-            # Detect CPU features
-            features = self._detect_cpu_features()
+            # CPU name, vendor and features
+            cpu = static_info['cpu'] or {}
+            name = cpu.get('name', "Unknown CPU")
+            vendor = cpu.get('vendor', "Unknown")
+            features = cpu.get('features', [])
             
             # Get CPU usage
             usage_percent = psutil.cpu_percent(interval=0.1)
@@ -264,131 +303,6 @@ class HardwareDetector:
         
         return self._cpu_info_cache
     
-    def _get_cpu_name_vendor(self) -> Tuple[str, str]:
-        """Get CPU name and vendor"""
-        name = "Unknown CPU"
-        vendor = "Unknown"
-        
-        try:
-            if self.platform_name == "Windows":
-                # Use WMI on Windows
-                result = subprocess.run(
-                    ["wmic", "cpu", "get", "Name", "/value"],
-                    capture_output=True, text=True, timeout=5
-                )
-                
-                for line in result.stdout.split('\n'):
-                    if line.startswith("Name="):
-                        name = line.split('=', 1)[1].strip()
-                        break
-                
-                # Detect vendor from name
-                if "Intel" in name:
-                    vendor = "Intel"
-                elif "AMD" in name:
-                    vendor = "AMD"
-                elif "Apple" in name:
-                    vendor = "Apple"
-                    
-            elif self.platform_name == "Darwin":
-                # Use sysctl on macOS
-                result = subprocess.run(
-                    ["sysctl", "-n", "machdep.cpu.brand_string"],
-                    capture_output=True, text=True, timeout=5
-                )
-                
-                name = result.stdout.strip()
-                
-                if "Intel" in name:
-                    vendor = "Intel"
-                elif "Apple" in name:
-                    vendor = "Apple"
-                    
-            else:
-                # Linux
-                cpuinfo_path = Path("/proc/cpuinfo")
-                if cpuinfo_path.exists():
-                    with open(cpuinfo_path) as f:
-                        for line in f:
-                            if line.startswith("model name"):
-                                name = line.split(':', 1)[1].strip()
-                                break
-                            elif line.startswith("vendor_id"):
-                                vendor_id = line.split(':', 1)[1].strip()
-                                if "GenuineIntel" in vendor_id:
-                                    vendor = "Intel"
-                                elif "AuthenticAMD" in vendor_id:
-                                    vendor = "AMD"
-                                    
-        except Exception as e:
-            logger.debug(f"Failed to get CPU name/vendor: {e}")
-        
-        return name, vendor
-    
-    def _detect_cpu_features(self) -> List[str]:
-        """Detect CPU features"""
-        features = []
-        
-        try:
-            if self.platform_name == "Windows":
-                # Check for AVX support
-                result = subprocess.run(
-                    ["wmic", "cpu", "get", "Characteristics"],
-                    capture_output=True, text=True, timeout=5
-                )
-                
-                if "AVX" in result.stdout:
-                    features.append("avx")
-                if "AVX2" in result.stdout:
-                    features.append("avx2")
-                    
-            elif self.platform_name == "Darwin":
-                # Check for Apple Silicon
-                result = subprocess.run(
-                    ["sysctl", "-n", "hw.optional.arm64"],
-                    capture_output=True, text=True, timeout=5
-                )
-                
-                if result.stdout.strip() == "1":
-                    features.append("apple_silicon")
-                    features.append("neon")
-                else:
-                    # Intel Mac - check for AVX
-                    result = subprocess.run(
-                        ["sysctl", "-n", "hw.optional.avx1_0"],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    if result.stdout.strip() == "1":
-                        features.append("avx")
-                        
-                    result = subprocess.run(
-                        ["sysctl", "-n", "hw.optional.avx2_0"],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    if result.stdout.strip() == "1":
-                        features.append("avx2")
-                        
-            else:
-                # Linux
-                cpuinfo_path = Path("/proc/cpuinfo")
-                if cpuinfo_path.exists():
-                    with open(cpuinfo_path) as f:
-                        for line in f:
-                            if line.startswith("flags"):
-                                flags = line.split(':', 1)[1].strip().split()
-                                if "avx" in flags:
-                                    features.append("avx")
-                                if "avx2" in flags:
-                                    features.append("avx2")
-                                if "sse4_2" in flags:
-                                    features.append("sse4.2")
-                                break
-                                
-        except Exception as e:
-            logger.debug(f"Failed to detect CPU features: {e}")
-        
-        return features
-    
     def _get_cpu_temperature(self) -> Optional[float]:
         """Get CPU temperature if available"""
         try:
@@ -443,227 +357,20 @@ class HardwareDetector:
         if self._gpu_info_cache:
             return self._gpu_info_cache
         
-        gpu_info = GPUInfo(
-            available=False,
-            vendor=GPUVendor.UNKNOWN.value,
-            name="No GPU detected",
-            memory_gb=0,
-            cuda_available=False,
-            metal_available=False
-        )
-        
-        try:
-            if self.platform_name == "Windows":
-                gpu_info = self._detect_gpu_windows()
-            elif self.platform_name == "Darwin":
-                gpu_info = self._detect_gpu_macos()
-            else:
-                gpu_info = self._detect_gpu_linux()
-                
-        except Exception as e:
-            logger.debug(f"GPU detection failed: {e}")
-        
-        self._gpu_info_cache = gpu_info
-        return gpu_info
-    
-    def _detect_gpu_windows(self) -> GPUInfo:
-        """Detect GPU on Windows"""
-        try:
-            result = subprocess.run(
-                ["wmic", "path", "win32_VideoController", "get", "Name,AdapterRAM,DriverVersion", "/value"],
-                capture_output=True, text=True, timeout=5
+        gpu = self._get_static_info()['gpu']
+        if gpu:
+            self._gpu_info_cache = GPUInfo(**gpu)
+        else:
+            # Probe failed or timed out
+            self._gpu_info_cache = GPUInfo(
+                available=False,
+                vendor=GPUVendor.UNKNOWN.value,
+                name="No GPU detected",
+                memory_gb=0,
+                cuda_available=False,
+                metal_available=False
             )
-            
-            name = ""
-            memory_bytes = 0
-            driver_version = ""
-            
-            for line in result.stdout.split('\n'):
-                if line.startswith("Name="):
-                    name = line.split('=', 1)[1].strip()
-                elif line.startswith("AdapterRAM="):
-                    try:
-                        memory_bytes = int(line.split('=', 1)[1].strip())
-                    except:
-                        pass
-                elif line.startswith("DriverVersion="):
-                    driver_version = line.split('=', 1)[1].strip()
-            
-            if name:
-                # Determine vendor
-                vendor = GPUVendor.UNKNOWN.value
-                if "NVIDIA" in name.upper():
-                    vendor = GPUVendor.NVIDIA.value
-                elif "AMD" in name.upper() or "RADEON" in name.upper():
-                    vendor = GPUVendor.AMD.value
-                elif "INTEL" in name.upper():
-                    vendor = GPUVendor.INTEL.value
-                
-                # Check CUDA availability
-                cuda_available = False
-                if vendor == GPUVendor.NVIDIA.value:
-                    cuda_available = self._check_cuda_windows()
-                
-                return GPUInfo(
-                    available=True,
-                    vendor=vendor,
-                    name=name,
-                    memory_gb=round(memory_bytes / (1024**3), 2) if memory_bytes > 0 else 0,
-                    cuda_available=cuda_available,
-                    metal_available=False,
-                    driver_version=driver_version
-                )
-                
-        except Exception as e:
-            logger.debug(f"Windows GPU detection failed: {e}")
-        
-        return GPUInfo(
-            available=False,
-            vendor=GPUVendor.UNKNOWN.value,
-            name="No GPU detected",
-            memory_gb=0,
-            cuda_available=False,
-            metal_available=False
-        )
-    
-    def _check_cuda_windows(self) -> bool:
-        """Check if CUDA is available on Windows"""
-        try:
-            # Check for nvidia-smi
-            result = subprocess.run(
-                ["nvidia-smi", "--query-gpu=cuda_version", "--format=csv,noheader"],
-                capture_output=True, text=True, timeout=5
-            )
-            
-            if result.returncode == 0 and result.stdout.strip():
-                return True
-                
-        except:
-            pass
-        
-        return False
-    
-    def _detect_gpu_macos(self) -> GPUInfo:
-        """Detect GPU on macOS"""
-        try:
-            result = subprocess.run(
-                ["system_profiler", "SPDisplaysDataType", "-json"],
-                capture_output=True, text=True, timeout=5
-            )
-            
-            if result.returncode == 0:
-                import json
-                data = json.loads(result.stdout)
-                
-                displays = data.get("SPDisplaysDataType", [])
-                for display in displays:
-                    if "sppci_model" in display:
-                        name = display["sppci_model"]
-                        
-                        # Check for Metal support (all modern Macs)
-                        metal_available = True
-                        
-                        # Determine vendor
-                        vendor = GPUVendor.UNKNOWN.value
-                        if "Apple" in name:
-                            vendor = GPUVendor.APPLE.value
-                        elif "Intel" in name:
-                            vendor = GPUVendor.INTEL.value
-                        elif "AMD" in name or "Radeon" in name:
-                            vendor = GPUVendor.AMD.value
-                        
-                        # Get VRAM if available
-                        memory_gb = 0
-                        if "sppci_vram" in display:
-                            vram_str = display["sppci_vram"]
-                            # Parse VRAM string (e.g., "8 GB")
-                            match = re.match(r"(\d+(?:\.\d+)?)\s*GB", vram_str)
-                            if match:
-                                memory_gb = float(match.group(1))
-                        
-                        return GPUInfo(
-                            available=True,
-                            vendor=vendor,
-                            name=name,
-                            memory_gb=memory_gb,
-                            cuda_available=False,
-                            metal_available=metal_available
-                        )
-                        
-        except Exception as e:
-            logger.debug(f"macOS GPU detection failed: {e}")
-        
-        return GPUInfo(
-            available=False,
-            vendor=GPUVendor.UNKNOWN.value,
-            name="No GPU detected",
-            memory_gb=0,
-            cuda_available=False,
-            metal_available=False
-        )
-    
-    def _detect_gpu_linux(self) -> GPUInfo:
-        """Detect GPU on Linux"""
-        try:
-            # Try lspci first
-            result = subprocess.run(
-                ["lspci", "-v"],
-                capture_output=True, text=True, timeout=5
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if "VGA compatible controller" in line or "3D controller" in line:
-                        # Extract GPU name
-                        parts = line.split(':', 2)
-                        if len(parts) > 2:
-                            name = parts[2].strip()
-                            
-                            # Determine vendor
-                            vendor = GPUVendor.UNKNOWN.value
-                            if "NVIDIA" in name.upper():
-                                vendor = GPUVendor.NVIDIA.value
-                            elif "AMD" in name.upper() or "RADEON" in name.upper():
-                                vendor = GPUVendor.AMD.value
-                            elif "INTEL" in name.upper():
-                                vendor = GPUVendor.INTEL.value
-                            
-                            # Check CUDA for NVIDIA
-                            cuda_available = False
-                            if vendor == GPUVendor.NVIDIA.value:
-                                cuda_available = self._check_cuda_linux()
-                            
-                            return GPUInfo(
-                                available=True,
-                                vendor=vendor,
-                                name=name,
-                                memory_gb=0,  # Would need nvidia-smi for memory
-                                cuda_available=cuda_available,
-                                metal_available=False
-                            )
-                            
-        except Exception as e:
-            logger.debug(f"Linux GPU detection failed: {e}")
-        
-        return GPUInfo(
-            available=False,
-            vendor=GPUVendor.UNKNOWN.value,
-            name="No GPU detected",
-            memory_gb=0,
-            cuda_available=False,
-            metal_available=False
-        )
-    
-    def _check_cuda_linux(self) -> bool:
-        """Check if CUDA is available on Linux"""
-        try:
-            result = subprocess.run(
-                ["nvidia-smi"],
-                capture_output=True, text=True, timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+        return self._gpu_info_cache
     
     def _detect_storage(self) -> StorageInfo:
         """Detect storage information"""
@@ -672,7 +379,7 @@ class HardwareDetector:
             usage = psutil.disk_usage('/')
             
             # Try to detect SSD vs HDD
-            is_ssd = self._detect_ssd()
+            is_ssd = bool(self._get_static_info()['is_ssd'])
             
             return StorageInfo(
                 total_gb=round(usage.total / (1024**3), 2),
@@ -696,33 +403,6 @@ class HardwareDetector:
                 is_ssd=False
             )
     
-    def _detect_ssd(self) -> bool:
-        """Detect if system drive is SSD"""
-        try:
-            if self.platform_name == "Windows":
-                # Check for SSD on Windows
-                result = subprocess.run(
-                    ["wmic", "diskdrive", "get", "MediaType"],
-                    capture_output=True, text=True, timeout=5
-                )
-                return "SSD" in result.stdout
-                
-            elif self.platform_name == "Darwin":
-                # macOS - most modern Macs have SSDs
-                return True
-                
-            else:
-                # Linux - check rotational flag
-                rotational_path = Path("/sys/block/sda/queue/rotational")
-                if rotational_path.exists():
-                    with open(rotational_path) as f:
-                        return f.read().strip() == "0"
-                        
-        except Exception as e:
-            logger.debug(f"SSD detection failed: {e}")
-        
-        return False
-    
     def _determine_tier(self, cpu: CPUInfo, memory: MemoryInfo, gpu: GPUInfo) -> HardwareTier:
         """Determine hardware tier based on specifications"""
         # Ultra tier
@@ -815,6 +495,24 @@ class HardwareDetector:
         info = self.get_system_info()
         return info.get("optimal_model", "llama3.2:1b")
     
+    def get_calibrated_model(self, usb_path: Path, base_url: str = "http://localhost:11434",
+                             force: bool = False) -> str:
+        """
+        Get the largest model that meets the response time budget on this machine.
+        
+        Benchmarks installed-size candidates against the local Ollama once and
+        caches the results on the USB partition. Falls back to the spec-based
+        choice when Ollama cannot be reached.
+        """
+        memory = self._detect_memory()
+        candidates = [
+            model for model, requirements in self.MODEL_REQUIREMENTS.items()
+            if memory.total_gb >= requirements["min_ram"]
+        ] or ["llama3.2:1b-q4_0"]
+        
+        calibrator = TierCalibrator(usb_path, base_url=base_url)
+        return calibrator.select_model(candidates, force=force) or self.get_optimal_model()
+    
     def get_optimal_threads(self) -> int:
         """Get optimal thread count for inference"""
         cpu = self._detect_cpu()
@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Hardware Snapshot Service
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Shared persistence for slow hardware probes (nvidia-smi, lspci, sysctl,
+system_profiler, wmic). Probe results are stored as a JSON snapshot on the
+USB partition, keyed by a cheap machine fingerprint (boot ID, CPU model,
+total RAM). Later launches reuse the snapshot immediately and refresh it in
+the background. Probes run in parallel, each with its own timeout.
+
+The platform CPU, GPU and disk probes themselves live here too (see
+SYSTEM_PROBES), so every detector reads the same "system" namespace and
+only maps it to its own format.
+
+Uses only the standard library and psutil so the launchers can load it
+without the rest of the package.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import platform
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Callable
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILENAME = "hardware_snapshot.json"
+DEFAULT_PROBE_TIMEOUT = 10.0  # seconds per probe
+DEFAULT_REFRESH_AFTER = 3600.0  # refresh a same-boot snapshot after 1 hour
+SYSTEM_NAMESPACE = "system"
+COMMAND_TIMEOUT = 5.0  # seconds for each probe command
+
+
+def get_boot_id() -> str:
+    """Identifier that changes on every reboot"""
+    try:
+        with open("/proc/sys/kernel/random/boot_id", "r") as f:
+            return f.read().strip()
+    except OSError:
+        # macOS and Windows: the boot timestamp is just as good
+        return str(int(psutil.boot_time()))
+
+
+def get_hardware_fingerprint() -> Dict[str, Any]:
+    """Cheap machine fingerprint that needs no subprocess calls"""
+    return {
+        "boot_id": get_boot_id(),
+        "cpu_model": platform.processor() or platform.machine(),
+        "ram_bytes": psutil.virtual_memory().total
+    }
+
+
+def _fingerprint_key(fingerprint: Dict[str, Any], include_boot: bool = True) -> str:
+    """Stable hash of a fingerprint, optionally ignoring the boot ID"""
+    fields = ["boot_id", "cpu_model", "ram_bytes"] if include_boot else ["cpu_model", "ram_bytes"]
+    material = "|".join(str(fingerprint.get(name)) for name in fields)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+def _resolve_usb_path(usb_path: Optional[Path]) -> Optional[Path]:
+    """Given USB partition root, else SUNFLOWER_USB_PATH, else None"""
+    if usb_path:
+        return Path(usb_path)
+    env_path = os.environ.get("SUNFLOWER_USB_PATH")
+    return Path(env_path) if env_path else None
+
+
+def _run(command: List[str], timeout: float = COMMAND_TIMEOUT) -> Optional[str]:
+    """stdout of a probe command, or None if it is missing, fails or hangs"""
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Probe command {command[0]} failed: {e}")
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _gpu_vendor(name: str) -> str:
+    """GPU vendor from an adapter name"""
+    upper = name.upper()
+    if "NVIDIA" in upper:
+        return "nvidia"
+    if "AMD" in upper or "RADEON" in upper:
+        return "amd"
+    if "INTEL" in upper:
+        return "intel"
+    if "APPLE" in upper:
+        return "apple"
+    return "unknown"
+
+
+def _no_gpu() -> Dict[str, Any]:
+    return {
+        "available": False, "vendor": "unknown", "name": "No GPU detected",
+        "memory_gb": 0.0, "cuda_available": False, "metal_available": False,
+        "driver_version": None
+    }
+
+
+def _probe_nvidia() -> Optional[Dict[str, Any]]:
+    """Name, VRAM and driver of the first NVIDIA GPU from nvidia-smi"""
+    output = _run(["nvidia-smi", "--query-gpu=name,memory.total,driver_version",
+                   "--format=csv,noheader,nounits"])
+    if not output or not output.strip():
+        return None
+
+    parts = [part.strip() for part in output.strip().splitlines()[0].split(",")]
+    try:
+        memory_gb = round(float(parts[1]) / 1024, 2)
+    except (IndexError, ValueError):
+        memory_gb = 0.0
+
+    return {
+        "available": True, "vendor": "nvidia", "name": parts[0],
+        "memory_gb": memory_gb, "cuda_available": True, "metal_available": False,
+        "driver_version": parts[2] if len(parts) > 2 else None
+    }
+
+
+def _probe_gpu_windows() -> Dict[str, Any]:
+    output = _run(["wmic", "path", "win32_VideoController", "get",
+                   "Name,AdapterRAM,DriverVersion", "/value"])
+    # /value output lists each adapter as a block of Key=Value lines
+    adapters: List[Dict[str, str]] = [{}]
+    for line in (output or "").splitlines():
+        key, _, value = line.strip().partition("=")
+        if not key:
+            if adapters[-1]:
+                adapters.append({})
+            continue
+        adapters[-1][key] = value.strip()
+
+    adapters = [a for a in adapters if a.get("Name")]
+    if not adapters:
+        return _probe_nvidia() or _no_gpu()
+
+    # Prefer a discrete adapter over integrated graphics
+    adapter = next((a for a in adapters if _gpu_vendor(a["Name"]) in ("nvidia", "amd")),
+                   adapters[0])
+    vendor = _gpu_vendor(adapter["Name"])
+    if vendor == "nvidia":
+        nvidia = _probe_nvidia()
+        if nvidia:
+            return nvidia
+
+    try:
+        memory_gb = round(int(adapter.get("AdapterRAM") or 0) / (1024 ** 3), 2)
+    except ValueError:
+        memory_gb = 0.0
+
+    return {
+        "available": True, "vendor": vendor, "name": adapter["Name"],
+        "memory_gb": memory_gb, "cuda_available": False, "metal_available": False,
+        "driver_version": adapter.get("DriverVersion") or None
+    }
+
+
+def _probe_gpu_macos() -> Dict[str, Any]:
+    output = _run(["system_profiler", "SPDisplaysDataType", "-json"], timeout=10.0)
+    try:
+        displays = json.loads(output).get("SPDisplaysDataType", []) if output else []
+    except ValueError:
+        displays = []
+
+    for display in displays:
+        name = display.get("sppci_model")
+        if not name:
+            continue
+
+        memory_gb = 0.0
+        vram = display.get("sppci_vram") or display.get("spdisplays_vram") or ""
+        match = re.match(r"(\d+(?:\.\d+)?)\s*(GB|MB)", vram)
+        if match:
+            memory_gb = float(match.group(1)) / (1024 if match.group(2) == "MB" else 1)
+
+        # Every supported Mac has Metal; Apple Silicon shares system RAM
+        return {
+            "available": True, "vendor": _gpu_vendor(name), "name": name,
+            "memory_gb": memory_gb, "cuda_available": False, "metal_available": True,
+            "driver_version": "Metal"
+        }
+    return _no_gpu()
+
+
+def _probe_gpu_linux() -> Dict[str, Any]:
+    nvidia = _probe_nvidia()
+    if nvidia:
+        return nvidia
+
+    output = _run(["rocm-smi", "--showmeminfo", "vram"])
+    for line in (output or "").splitlines():
+        if "VRAM Total" in line:
+            match = re.search(r"(\d+)", line.split(":")[-1])
+            memory_gb = round(int(match.group(1)) / (1024 ** 3), 2) if match else 0.0
+            return {
+                "available": True, "vendor": "amd", "name": "AMD GPU",
+                "memory_gb": memory_gb, "cuda_available": False, "metal_available": False,
+                "driver_version": "ROCm"
+            }
+
+    for line in (_run(["lspci"]) or "").splitlines():
+        if "VGA compatible controller" in line or "3D controller" in line \
+                or "Display controller" in line:
+            name = line.split(":", 2)[-1].strip()
+            return {
+                "available": True, "vendor": _gpu_vendor(name), "name": name,
+                "memory_gb": 0.0, "cuda_available": False, "metal_available": False,
+                "driver_version": None
+            }
+    return _no_gpu()
+
+
+def probe_gpu() -> Dict[str, Any]:
+    """
+    Primary GPU: available, vendor, name, memory_gb, cuda_available,
+    metal_available and driver_version
+    """
+    system = platform.system()
+    if system == "Windows":
+        return _probe_gpu_windows()
+    if system == "Darwin":
+        return _probe_gpu_macos()
+    return _probe_gpu_linux()
+
+
+def probe_cpu() -> Dict[str, Any]:
+    """CPU name, vendor and the instruction set features inference cares about"""
+    system = platform.system()
+    name, vendor, features = "Unknown CPU", "Unknown", []
+
+    if system == "Windows":
+        for line in (_run(["wmic", "cpu", "get", "Name", "/value"]) or "").splitlines():
+            if line.startswith("Name="):
+                name = line.split("=", 1)[1].strip()
+        characteristics = _run(["wmic", "cpu", "get", "Characteristics"]) or ""
+        features = [flag.lower() for flag in ("AVX", "AVX2") if flag in characteristics.split()]
+
+    elif system == "Darwin":
+        name = (_run(["sysctl", "-n", "machdep.cpu.brand_string"]) or name).strip()
+        if (_run(["sysctl", "-n", "hw.optional.arm64"]) or "").strip() == "1":
+            features.extend(["apple_silicon", "neon"])
+        else:
+            for flag, feature in (("hw.optional.avx1_0", "avx"), ("hw.optional.avx2_0", "avx2")):
+                if (_run(["sysctl", "-n", flag]) or "").strip() == "1":
+                    features.append(feature)
+
+    else:
+        try:
+            with open("/proc/cpuinfo", "r") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    key, value = key.strip(), value.strip()
+                    if key == "model name" and name == "Unknown CPU":
+                        name = value
+                    elif key == "vendor_id" and vendor == "Unknown":
+                        vendor = {"GenuineIntel": "Intel", "AuthenticAMD": "AMD"}.get(value, value)
+                    elif key == "flags" and not features:
+                        flags = value.split()
+                        features = [feature for flag, feature in (
+                            ("avx", "avx"), ("avx2", "avx2"), ("sse4_2", "sse4.2")
+                        ) if flag in flags]
+        except OSError as e:
+            logger.debug(f"Could not read /proc/cpuinfo: {e}")
+
+    if vendor == "Unknown":
+        for brand in ("Intel", "AMD", "Apple"):
+            if brand in name:
+                vendor = brand
+                break
+
+    return {"name": name, "vendor": vendor, "features": features}
+
+
+def probe_is_ssd() -> bool:
+    """Whether the system drive is solid state"""
+    system = platform.system()
+    if system == "Windows":
+        return "SSD" in (_run(["wmic", "diskdrive", "get", "MediaType"]) or "")
+    if system == "Darwin":
+        # Every Mac that runs a supported macOS boots from flash storage
+        return True
+
+    rotational = Path("/sys/block/sda/queue/rotational")
+    try:
+        return rotational.read_text().strip() == "0"
+    except OSError:
+        return False
+
+
+# Slow probes shared by every hardware detector, stored under SYSTEM_NAMESPACE
+SYSTEM_PROBES: Dict[str, Callable[[], Any]] = {
+    "cpu": probe_cpu,
+    "gpu": probe_gpu,
+    "is_ssd": probe_is_ssd,
+}
+
+
+def get_machine_key() -> str:
+    """Fingerprint hash of this machine that survives reboots"""
+    return _fingerprint_key(get_hardware_fingerprint(), include_boot=False)
+
+
+class HardwareSnapshotService:
+    """
+    Persistent, fingerprint-keyed cache of hardware probe results.
+
+    Each detector stores its probes under its own namespace. A snapshot from
+    the current boot is returned as is (and refreshed in the background once
+    it is older than refresh_after). A snapshot from an earlier boot of the
+    same machine is returned immediately and refreshed in the background.
+    Anything else is probed synchronously.
+    """
+
+    def __init__(
+        self,
+        usb_path: Optional[Path] = None,
+        probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+        refresh_after: float = DEFAULT_REFRESH_AFTER
+    ):
+        """
+        Args:
+            usb_path: USB partition root (SUNFLOWER_USB_PATH if None; without
+                either the snapshot is kept in memory, never on the host disk)
+            probe_timeout: Default per-probe timeout in seconds
+            refresh_after: Age in seconds after which a snapshot is refreshed
+        """
+        usb_path = _resolve_usb_path(usb_path)
+        self.snapshot_file = usb_path / "cache" / SNAPSHOT_FILENAME if usb_path else None
+        self._memory_snapshot: Dict[str, Any] = {}
+        self.probe_timeout = probe_timeout
+        self.refresh_after = refresh_after
+        self.fingerprint = get_hardware_fingerprint()
+
+        self._lock = threading.RLock()
+        self._refreshing: Dict[str, threading.Thread] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "probe_timeouts": 0}
+
+    def run_probes(
+        self,
+        probes: Dict[str, Callable[[], Any]],
+        timeouts: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run probes in parallel with per-probe timeouts.
+
+        Returns:
+            Probe results by name; None for probes that failed or timed out
+        """
+        timeouts = timeouts or {}
+        results: Dict[str, Any] = {}
+        if not probes:
+            return results
+
+        executor = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="hw-probe")
+        try:
+            start = time.monotonic()
+            futures = {name: executor.submit(probe) for name, probe in probes.items()}
+
+            for name, future in futures.items():
+                deadline = start + timeouts.get(name, self.probe_timeout)
+                try:
+                    results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    logger.warning(f"Hardware probe '{name}' timed out")
+                    self.stats["probe_timeouts"] += 1
+                    results[name] = None
+                except Exception as e:
+                    logger.warning(f"Hardware probe '{name}' failed: {e}")
+                    results[name] = None
+        finally:
+            # Do not wait for hung probes; their threads finish on their own
+            executor.shutdown(wait=False)
+
+        return results
+
+    def _load(self) -> Dict[str, Any]:
+        """Read the snapshot file"""
+        if self.snapshot_file is None:
+            return json.loads(json.dumps(self._memory_snapshot, default=str))
+        try:
+            if self.snapshot_file.exists():
+                with open(self.snapshot_file, "r") as f:
+                    return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable hardware snapshot: {e}")
+        return {}
+
+    def _store(self, namespace: str, data: Dict[str, Any]) -> None:
+        """Merge one namespace into the snapshot file atomically"""
+        with self._lock:
+            snapshot = self._load()
+            snapshot["fingerprint"] = self.fingerprint
+            snapshot.setdefault("namespaces", {})[namespace] = {
+                "key": _fingerprint_key(self.fingerprint),
+                "machine_key": _fingerprint_key(self.fingerprint, include_boot=False),
+                "captured_at": time.time(),
+                "captured_at_iso": datetime.now().isoformat(),
+                "data": data
+            }
+
+            if self.snapshot_file is None:
+                self._memory_snapshot = snapshot
+                return
+
+            try:
+                self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = self.snapshot_file.with_name(
+                    f"{self.snapshot_file.name}.{os.getpid()}.tmp"
+                )
+                with open(temp_file, "w") as f:
+                    json.dump(snapshot, f, indent=2, default=str)
+                os.replace(temp_file, self.snapshot_file)
+            except OSError as e:
+                logger.warning(f"Could not save hardware snapshot: {e}")
+
+    def _probe_and_store(self, namespace: str, probes: Dict[str, Callable[[], Any]],
+                         timeouts: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        """Run probes and persist the results"""
+        data = self.run_probes(probes, timeouts)
+        self._store(namespace, data)
+        return data
+
+    def _refresh_in_background(self, namespace: str, probes: Dict[str, Callable[[], Any]],
+                               timeouts: Optional[Dict[str, float]]) -> None:
+        """Re-run probes without blocking the caller"""
+        with self._lock:
+            running = self._refreshing.get(namespace)
+            if running and running.is_alive():
+                return
+
+            def refresh():
+                self._probe_and_store(namespace, probes, timeouts)
+                self.stats["refreshes"] += 1
+
+            thread = threading.Thread(target=refresh, name=f"hw-refresh-{namespace}", daemon=True)
+            self._refreshing[namespace] = thread
+            thread.start()
+
+    def get(
+        self,
+        namespace: str,
+        probes: Dict[str, Callable[[], Any]],
+        timeouts: Optional[Dict[str, float]] = None,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get probe results for a detector, from the snapshot when possible.
+
+        Args:
+            namespace: Detector name the results are stored under
+            probes: Probe callables by name; results must be JSON-serializable
+            timeouts: Optional per-probe timeouts overriding probe_timeout
+            force_refresh: Probe synchronously even when a snapshot exists
+
+        Returns:
+            Probe results by name (None for probes that failed or timed out)
+        """
+        if not force_refresh:
+            snapshot = self._load()
+            entry = snapshot.get("namespaces", {}).get(namespace)
+
+            if entry and set(probes) <= set(entry.get("data", {})):
+                data = {name: entry["data"][name] for name in probes}
+
+                if entry.get("key") == _fingerprint_key(self.fingerprint):
+                    self.stats["hits"] += 1
+                    stale = time.time() - entry.get("captured_at", 0) > self.refresh_after
+                    # Retry probes that failed or timed out last time
+                    if stale or any(value is None for value in data.values()):
+                        self._refresh_in_background(namespace, probes, timeouts)
+                    return data
+
+                if entry.get("machine_key") == _fingerprint_key(self.fingerprint, include_boot=False):
+                    # Same machine after a reboot: use it now, re-check in the background
+                    self.stats["stale_hits"] += 1
+                    self._refresh_in_background(namespace, probes, timeouts)
+                    return data
+
+        self.stats["misses"] += 1
+        return self._probe_and_store(namespace, probes, timeouts)
+
+    def get_system(self, timeouts: Optional[Dict[str, float]] = None,
+                   force_refresh: bool = False) -> Dict[str, Any]:
+        """Shared CPU, GPU and disk probe results (see SYSTEM_PROBES)"""
+        return self.get(SYSTEM_NAMESPACE, SYSTEM_PROBES, timeouts, force_refresh)
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        """Wait for background refreshes to finish (used at shutdown and in tests)"""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+
+_snapshot_services: Dict[Optional[str], HardwareSnapshotService] = {}
+_snapshot_service_lock = threading.Lock()
+
+
+def get_snapshot_service(usb_path: Optional[Path] = None) -> HardwareSnapshotService:
+    """
+    Get the process-wide hardware snapshot service for a USB partition
+    One service per resolved path, so a detector given a different device
+    never reads or writes another device's snapshot
+    """
+    resolved = _resolve_usb_path(usb_path)
+    key = str(resolved.resolve()) if resolved else None
+
+    with _snapshot_service_lock:
+        service = _snapshot_services.get(key)
+        if service is None:
+            service = _snapshot_services[key] = HardwareSnapshotService(resolved)
+        return service
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Parallel Package Archives
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+ZIP and tar.gz writers that compress on every core. Input is read in
+1 MB chunks, the chunks are compressed by a thread pool (zlib releases
+the GIL), and the results are written out in their original order while
+the output is hashed. The package checksum is therefore known when the
+archive is closed, without reading the archive again. Files that are
+already compressed (GGUF models, images, archives) are stored instead of
+deflated, which is where most of the time went for model packages.
+
+ZIP entries are one deflate stream per file made of independently
+compressed, sync-flushed chunks (the pigz technique), with sizes in data
+descriptors and ZIP64 records for large models. tar.gz archives are a
+series of gzip members, which gzip and tarfile read as one stream.
+
+Uses only the standard library so the deployment tools can load it
+without the rest of the package.
+"""
+
+import os
+import time
+import gzip
+import zlib
+import struct
+import hashlib
+import logging
+import tarfile
+import zipfile
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB compression jobs
+COMPRESSION_LEVEL = 6  # same as ZIP_DEFLATED's and gzip's usual default
+SAMPLE_SIZE = 64 * 1024  # bytes test-compressed to spot incompressible files
+INCOMPRESSIBLE_RATIO = 0.97  # store files whose sample shrinks less than 3%
+ZIP64_LIMIT = 0xFFFFFFFF
+
+# Formats that are already compressed; deflating them only costs time
+STORED_EXTENSIONS = frozenset({
+    ".gguf", ".safetensors", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".zst", ".dmg", ".iso",
+    ".mp3", ".mp4", ".woff", ".woff2"
+})
+
+PathLike = Union[str, Path]
+
+
+def should_compress(path: PathLike) -> bool:
+    """Whether deflating a file is worth it (by extension, then by a sample)"""
+    path = Path(path)
+    if path.suffix.lower() in STORED_EXTENSIONS:
+        return False
+
+    with open(path, "rb") as f:
+        sample = f.read(SAMPLE_SIZE)
+    if len(sample) < 512:
+        return True
+    return len(zlib.compress(sample, 1)) < len(sample) * INCOMPRESSIBLE_RATIO
+
+
+def _deflate_chunk(data: bytes, level: int, last: bool) -> bytes:
+    """Raw deflate one chunk; non-final chunks end byte-aligned so they concatenate"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _gzip_member(data: bytes, level: int) -> bytes:
+    """One complete gzip member (mtime 0 keeps builds reproducible)"""
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class _OrderedWriter:
+    """
+    Output file fed with raw bytes, compression jobs and deferred records
+
+    Items are written in the order they were queued; compression jobs run
+    on the thread pool meanwhile. Deferred records are callables run at
+    write time, so they can use the offset of what precedes them.
+    """
+
+    def __init__(self, path: Path, max_workers: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.file = open(path, "wb")
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="archive")
+        self.max_pending = max_workers * 4  # bounds memory held by finished jobs
+        self.pending: Deque[Any] = deque()
+        self.sha256 = hashlib.sha256()
+        self.offset = 0
+
+    def write(self, data: bytes) -> None:
+        self._queue(data)
+
+    def submit(self, fn: Callable[..., bytes], *args) -> None:
+        self._queue(self.executor.submit(fn, *args))
+
+    def defer(self, fn: Callable[[], bytes]) -> None:
+        self._queue(fn)
+
+    def _queue(self, item: Any) -> None:
+        self.pending.append(item)
+        while len(self.pending) > self.max_pending:
+            self._write_next()
+
+    def _write_next(self) -> None:
+        item = self.pending.popleft()
+        if isinstance(item, Future):
+            data = item.result()
+        elif callable(item):
+            data = item()
+        else:
+            data = item
+
+        if data:
+            self.file.write(data)
+            self.sha256.update(data)
+            self.offset += len(data)
+
+    def flush(self) -> None:
+        while self.pending:
+            self._write_next()
+
+    def close(self) -> None:
+        self.flush()
+        self.file.close()
+        self.executor.shutdown()
+
+    def abort(self) -> None:
+        """Drop queued work and remove the incomplete output"""
+        for item in self.pending:
+            if isinstance(item, Future):
+                item.cancel()
+        self.pending.clear()
+        self.executor.shutdown()
+        self.file.close()
+        self.path.unlink(missing_ok=True)
+
+
+class _ArchiveWriter:
+    """Shared bookkeeping: stats, context management"""
+
+    def __init__(self, path: PathLike, max_workers: Optional[int], level: int):
+        self.path = Path(path)
+        self.level = level
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.out = _OrderedWriter(self.path, self.max_workers)
+        self.stats: Dict[str, Any] = {"files": 0, "stored_files": 0, "bytes_in": 0}
+        self._started = time.monotonic()
+        self._closed = False
+
+    def _finish(self) -> None:
+        """Subclasses write their trailer here"""
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Finish the archive
+
+        Returns:
+            Stats including the archive's sha256 and throughput_mbps
+        """
+        if not self._closed:
+            self._closed = True
+            self._finish()
+            self.out.close()
+
+            seconds = time.monotonic() - self._started
+            self.stats.update(
+                bytes_out=self.out.offset,
+                sha256=self.out.sha256.hexdigest(),
+                seconds=seconds,
+                throughput_mbps=self.stats["bytes_in"] / (1024 * 1024) / seconds if seconds else 0.0
+            )
+        return self.stats
+
+    def abort(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self.out.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class _ZipEntry:
+    __slots__ = ("name", "method", "mode", "dos_time", "dos_date", "zip64",
+                 "offset", "data_start", "crc", "size", "compressed_size")
+
+
+class ParallelZipWriter(_ArchiveWriter):
+    """
+    ZIP archive writer with parallel deflate
+
+    Usage:
+        with ParallelZipWriter(output_path) as zipf:
+            zipf.add_file(build_dir / "models" / "model.gguf", "models/model.gguf")
+        print(zipf.stats["sha256"], zipf.stats["throughput_mbps"])
+    """
+
+    FLAGS = 0x0808  # sizes in data descriptors, UTF-8 names
+    CREATE_SYSTEM = 3  # Unix, so external attributes carry file modes
+
+    def __init__(self, path: PathLike, max_workers: Optional[int] = None,
+                 level: int = COMPRESSION_LEVEL):
+        """
+        Args:
+            path: Archive to create
+            max_workers: Compression threads (one per CPU if None)
+            level: zlib compression level
+        """
+        super().__init__(path, max_workers, level)
+        self.entries: List[_ZipEntry] = []
+
+    def add_file(self, path: PathLike, arcname: str, compress: Optional[bool] = None) -> None:
+        """
+        Add one file
+
+        Args:
+            path: File to add
+            arcname: Name inside the archive
+            compress: Deflate (True), store (False) or decide from the contents (None)
+        """
+        path = Path(path)
+        stat = path.stat()
+        if compress is None:
+            compress = should_compress(path)
+
+        year, month, day, hour, minute, second = time.localtime(stat.st_mtime)[:6]
+        if year < 1980:
+            year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+
+        entry = _ZipEntry()
+        entry.name = arcname.replace(os.sep, "/").encode("utf-8")
+        entry.method = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        entry.mode = stat.st_mode & 0xFFFF
+        entry.dos_time = (hour << 11) | (minute << 5) | (second // 2)
+        entry.dos_date = ((year - 1980) << 9) | (month << 5) | day
+        # Deflate can grow incompressible data slightly, so leave headroom
+        entry.zip64 = stat.st_size + stat.st_size // 100 + 1024 >= ZIP64_LIMIT
+        self.entries.append(entry)
+
+        self.out.defer(lambda: self._local_header(entry))
+
+        crc = 0
+        size = 0
+        with open(path, "rb") as f:
+            chunk = f.read(CHUNK_SIZE)
+            while True:
+                next_chunk = f.read(CHUNK_SIZE) if chunk else b""
+                last = not next_chunk
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+
+                if compress:
+                    self.out.submit(_deflate_chunk, chunk, self.level, last)
+                else:
+                    self.out.write(chunk)
+
+                if last:
+                    break
+                chunk = next_chunk
+
+        entry.crc = crc
+        entry.size = size
+        self.out.defer(lambda: self._data_descriptor(entry))
+
+        self.stats["files"] += 1
+        self.stats["bytes_in"] += size
+        if not compress:
+            self.stats["stored_files"] += 1
+
+    def _local_header(self, entry: _ZipEntry) -> bytes:
+        entry.offset = self.out.offset
+        if entry.zip64:
+            extra = struct.pack("<HHQQ", 1, 16, 0, 0)
+            sizes = ZIP64_LIMIT
+        else:
+            extra = b""
+            sizes = 0
+
+        header = struct.pack(
+            "<4sBBHHHHLLLHH", b"PK\x03\x04", 45 if entry.zip64 else 20, 0,
+            self.FLAGS, entry.method, entry.dos_time, entry.dos_date,
+            0, sizes, sizes, len(entry.name), len(extra)
+        ) + entry.name + extra
+        entry.data_start = entry.offset + len(header)
+        return header
+
+    def _data_descriptor(self, entry: _ZipEntry) -> bytes:
+        entry.compressed_size = self.out.offset - entry.data_start
+        if entry.zip64:
+            return struct.pack("<4sLQQ", b"PK\x07\x08", entry.crc, entry.compressed_size, entry.size)
+        return struct.pack("<4sLLL", b"PK\x07\x08", entry.crc, entry.compressed_size, entry.size)
+
+    def _central_header(self, entry: _ZipEntry) -> bytes:
+        size, compressed_size, offset = entry.size, entry.compressed_size, entry.offset
+        zip64_fields = []
+        if entry.zip64 or size >= ZIP64_LIMIT or compressed_size >= ZIP64_LIMIT:
+            zip64_fields += [size, compressed_size]
+            size = compressed_size = ZIP64_LIMIT
+        if offset >= ZIP64_LIMIT:
+            zip64_fields.append(offset)
+            offset = ZIP64_LIMIT
+
+        extra = b""
+        if zip64_fields:
+            extra = struct.pack(f"<HH{len(zip64_fields)}Q", 1, 8 * len(zip64_fields), *zip64_fields)
+        version = 45 if zip64_fields else 20
+
+        return struct.pack(
+            "<4sBBBBHHHHLLLHHHHHLL", b"PK\x01\x02", version, self.CREATE_SYSTEM,
+            version, 0, self.FLAGS, entry.method, entry.dos_time, entry.dos_date,
+            entry.crc, compressed_size, size, len(entry.name), len(extra), 0,
+            0, 0, entry.mode << 16, offset
+        ) + entry.name + extra
+
+    def _finish(self) -> None:
+        self.out.flush()
+        directory_offset = self.out.offset
+        for entry in self.entries:
+            self.out.write(self._central_header(entry))
+        self.out.flush()
+        directory_size = self.out.offset - directory_offset
+
+        count = len(self.entries)
+        if count >= 0xFFFF or directory_offset >= ZIP64_LIMIT or directory_size >= ZIP64_LIMIT:
+            zip64_offset = self.out.offset
+            self.out.write(struct.pack(
+                "<4sQHHLLQQQQ", b"PK\x06\x06", 44, 45, 45, 0, 0,
+                count, count, directory_size, directory_offset
+            ))
+            self.out.write(struct.pack("<4sLQL", b"PK\x06\x07", 0, zip64_offset, 1))
+            count = min(count, 0xFFFF)
+            directory_size = min(directory_size, ZIP64_LIMIT)
+            directory_offset = min(directory_offset, ZIP64_LIMIT)
+
+        self.out.write(struct.pack(
+            "<4sHHHHLLH", b"PK\x05\x06", 0, 0, count, count,
+            directory_size, directory_offset, 0
+        ))
+
+
+class _GzipBlockSink:
+    """File object for tarfile that cuts the tar stream into parallel gzip members"""
+
+    def __init__(self, out: _OrderedWriter, level: int):
+        self.out = out
+        self.level = level
+        self.buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.buffer += data
+        while len(self.buffer) >= CHUNK_SIZE:
+            self.out.submit(_gzip_member, bytes(self.buffer[:CHUNK_SIZE]), self.level)
+            del self.buffer[:CHUNK_SIZE]
+        return len(data)
+
+    def set_level(self, level: int) -> None:
+        """Compress what follows at another level (0 stores it)"""
+        if level != self.level:
+            self.flush()
+            self.level = level
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.out.submit(_gzip_member, bytes(self.buffer), self.level)
+            self.buffer = bytearray()
+
+
+class ParallelTarGzWriter(_ArchiveWriter):
+    """
+    tar.gz archive writer with parallel gzip
+
+    Usage:
+        with ParallelTarGzWriter(output_path) as tarf:
+            tarf.add(build_dir, "SunflowerAI")
+    """
+
+    def __init__(self, path: PathLike, max_workers: Optional[int] = None,
+                 level: int = COMPRESSION_LEVEL):
+        """
+        Args:
+            path: Archive to create
+            max_workers: Compression threads (one per CPU if None)
+            level: gzip compression level
+        """
+        super().__init__(path, max_workers, level)
+        self.sink = _GzipBlockSink(self.out, level)
+        self.tar = tarfile.open(fileobj=self.sink, mode="w|")
+
+    def add(self, path: PathLike, arcname: str) -> None:
+        """Add a file, or a directory recursively in sorted order"""
+        path = Path(path)
+        tarinfo = self.tar.gettarinfo(str(path), arcname)
+
+        if tarinfo.isreg():
+            compress = should_compress(path)
+            self.sink.set_level(self.level if compress else 0)
+            with open(path, "rb") as f:
+                self.tar.addfile(tarinfo, f)
+
+            self.stats["files"] += 1
+            self.stats["bytes_in"] += tarinfo.size
+            if not compress:
+                self.stats["stored_files"] += 1
+        elif tarinfo.isdir():
+            self.tar.addfile(tarinfo)
+            for child in sorted(os.listdir(path)):
+                self.add(path / child, f"{arcname}/{child}")
+        else:
+            self.tar.addfile(tarinfo)
+
+    def _finish(self) -> None:
+        self.tar.close()
+        self.sink.flush()
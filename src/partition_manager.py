@@ -9,12 +9,12 @@ import os
 import sys
 import platform
 import shutil
-import hashlib
 import json
 import logging
 import threading
 import time
 import string
+import select
 import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any, Union
@@ -24,6 +24,11 @@ from enum import Enum
 from contextlib import contextmanager
 import concurrent.futures
 
+try:
+    from src.file_hashing import get_verifying_hasher
+except ImportError:
+    from file_hashing import get_verifying_hasher
+
 logger = logging.getLogger(__name__)
 
 # Configuration constants
@@ -32,7 +37,9 @@ MAX_RETRY_ATTEMPTS = 3
 RETRY_DELAY = 1  # seconds
 MOUNT_CHECK_INTERVAL = 2  # seconds
 MOUNT_WAIT_TIMEOUT = 60  # seconds
+MOUNT_RESCAN_INTERVAL = 15  # seconds, full rescan even without a mount event
 DISK_USAGE_TIMEOUT = 5  # seconds
+MOUNTINFO_PATH = Path("/proc/self/mountinfo")
 
 
 class PartitionType(Enum):
@@ -56,6 +63,102 @@ class PartitionInfo:
     last_checked: Optional[datetime] = None
 
 
+class MountWatcher:
+    """
+    Waits for changes to the system mount table
+    
+    On Linux the kernel flags /proc/self/mountinfo with POLLPRI whenever
+    anything is mounted or unmounted, so waiting costs nothing. Elsewhere
+    (or if polling the file is not possible) a cheap signature of the
+    mount roots is compared every MOUNT_CHECK_INTERVAL instead of running
+    a full partition scan.
+    """
+    
+    def __init__(self, platform_name: Optional[str] = None):
+        self.platform_name = platform_name or platform.system()
+        self._mountinfo = None
+        self._poller = None
+        
+        if self.platform_name == "Linux":
+            try:
+                # Change tracking starts when the file is opened
+                self._mountinfo = open(MOUNTINFO_PATH, "rb")
+                self._poller = select.poll()
+                self._poller.register(self._mountinfo, select.POLLPRI | select.POLLERR)
+            except (OSError, AttributeError) as e:
+                logger.debug(f"Mount table events unavailable, polling instead: {e}")
+                self.close()
+        
+        self._signature = None if self.event_driven else self._mount_signature()
+    
+    @property
+    def event_driven(self) -> bool:
+        return self._poller is not None
+    
+    def _mount_signature(self) -> Tuple:
+        """Cheap summary of what is currently mounted"""
+        if self.platform_name == "Windows":
+            return tuple(
+                letter for letter in string.ascii_uppercase
+                if os.path.exists(f"{letter}:\\")
+            )
+        
+        if self.platform_name == "Linux":
+            try:
+                return (MOUNTINFO_PATH.read_bytes(),)
+            except OSError:
+                pass
+        
+        roots = [Path("/Volumes")] if self.platform_name == "Darwin" else [
+            Path("/media"), Path("/mnt"), Path("/run/media")
+        ]
+        entries = []
+        for root in roots:
+            try:
+                entries.extend(sorted(str(entry) for entry in root.iterdir()))
+            except OSError:
+                continue
+        return tuple(entries)
+    
+    def wait_for_change(self, timeout: float) -> bool:
+        """
+        Block until the mount table changes
+        Returns False if nothing changed within timeout
+        """
+        if self._poller is not None:
+            try:
+                return bool(self._poller.poll(max(0.0, timeout) * 1000))
+            except (OSError, ValueError) as e:
+                logger.debug(f"Mount table poll failed, polling instead: {e}")
+                self.close()
+                self._signature = self._mount_signature()
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            signature = self._mount_signature()
+            if signature != self._signature:
+                self._signature = signature
+                return True
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(MOUNT_CHECK_INTERVAL, remaining))
+    
+    def close(self):
+        """Release the mount table handle"""
+        self._poller = None
+        if self._mountinfo is not None:
+            self._mountinfo.close()
+            self._mountinfo = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
 class PartitionManager:
     """
     Thread-safe partition manager for dual-partition device architecture
@@ -97,6 +200,12 @@ class PartitionManager:
         self._usb_path: Optional[Path] = None
         self._partition_info: Dict[str, PartitionInfo] = {}
         
+        # Per-mount PartitionInfo, reused until that mount changes
+        # (keyed by mount point, tagged with the mount's identity)
+        self._info_cache: Dict[Tuple[str, str], Tuple[Any, PartitionInfo]] = {}
+        self._mount_table: Dict[str, str] = {}
+        self._info_cache_hits = 0
+        
         # Mount state tracking
         self._mount_in_progress: Dict[str, bool] = {}
         self._mount_events: Dict[str, threading.Event] = {
@@ -135,6 +244,8 @@ class PartitionManager:
                 self._usb_path = None
                 self._partition_info.clear()
             
+            self._mount_table = self._read_mount_table()
+            
             if self.platform_name == "Windows":
                 self._scan_windows_partitions()
             elif self.platform_name == "Darwin":  # macOS
@@ -146,6 +257,7 @@ class PartitionManager:
             
             # Signal mount events if partitions found
             with self._lock:
+                self._prune_info_cache()
                 if self._cdrom_path:
                     self._mount_events["cdrom"].set()
                 if self._usb_path:
@@ -213,7 +325,7 @@ class PartitionManager:
             if cdrom_marker.exists():
                 with self._lock:
                     self._cdrom_path = mount_point
-                    self._partition_info["cdrom"] = self._get_partition_info(
+                    self._partition_info["cdrom"] = self._get_cached_partition_info(
                         mount_point, PartitionType.CDROM
                     )
                 logger.info(f"Found CD-ROM partition at {mount_point}")
@@ -221,7 +333,7 @@ class PartitionManager:
             elif usb_marker.exists():
                 with self._lock:
                     self._usb_path = mount_point
-                    self._partition_info["usb"] = self._get_partition_info(
+                    self._partition_info["usb"] = self._get_cached_partition_info(
                         mount_point, PartitionType.USB
                     )
                 logger.info(f"Found USB partition at {mount_point}")
@@ -229,6 +341,68 @@ class PartitionManager:
         except Exception as e:
             logger.debug(f"Error checking mount point {mount_point}: {e}")
     
+    def _read_mount_table(self) -> Dict[str, str]:
+        """Map mount points to their kernel mount ID and device (Linux only)"""
+        if self.platform_name != "Linux":
+            return {}
+        
+        table = {}
+        try:
+            with open(MOUNTINFO_PATH, "r") as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 4:
+                        # Mount point escapes spaces as \040
+                        mount_point = fields[4].replace("\\040", " ")
+                        table[mount_point] = f"{fields[0]} {fields[2]}"
+        except OSError:
+            pass
+        return table
+    
+    def _mount_identity(self, mount_point: Path) -> Any:
+        """
+        Value that changes whenever a different filesystem is mounted here
+        The kernel mount ID increments on every mount, so a re-plug is new
+        """
+        identity = self._mount_table.get(str(mount_point))
+        if identity:
+            return identity
+        try:
+            stat = os.stat(mount_point)
+            return f"{stat.st_dev} {stat.st_ino}"
+        except OSError:
+            return None
+    
+    def _get_cached_partition_info(self, mount_point: Path, partition_type: PartitionType) -> PartitionInfo:
+        """
+        PartitionInfo for a mount, probing filesystem type and label only once
+        per mount; disk usage is cheap and always refreshed
+        """
+        key = (str(mount_point), partition_type.value)
+        identity = self._mount_identity(mount_point)
+        cached = self._info_cache.get(key)
+        
+        if identity is not None and cached and cached[0] == identity:
+            self._info_cache_hits += 1
+            info = cached[1]
+            disk_usage = self._get_disk_usage_with_timeout(mount_point)
+            info.size_gb = disk_usage.total / (1024**3) if disk_usage.total else 0
+            info.used_gb = disk_usage.used / (1024**3) if disk_usage.used else 0
+            info.available_gb = disk_usage.free / (1024**3) if disk_usage.free else 0
+            info.last_checked = datetime.now()
+            return info
+        
+        info = self._get_partition_info(mount_point, partition_type)
+        if identity is not None:
+            self._info_cache[key] = (identity, info)
+        return info
+    
+    def _prune_info_cache(self):
+        """Drop cached info for mounts that are gone or were replaced"""
+        for key, (identity, _) in list(self._info_cache.items()):
+            if self._mount_identity(Path(key[0])) != identity:
+                del self._info_cache[key]
+    
     def _get_partition_info(self, mount_point: Path, partition_type: PartitionType) -> PartitionInfo:
         """Get detailed partition information with proper error handling"""
         try:
@@ -486,11 +660,10 @@ class PartitionManager:
                     self._cdrom_path / "system" / "openwebui_integration.py"
                 ]
                 
-                for file_path in critical_files:
-                    if file_path.exists():
-                        checksum = self._calculate_checksum(file_path)
-                        if checksum:
-                            results["checksums"][file_path.name] = checksum
+                existing = [file_path for file_path in critical_files if file_path.exists()]
+                for file_path, checksum in get_verifying_hasher().hash_files(existing).items():
+                    if checksum:
+                        results["checksums"][file_path.name] = checksum
             
             # Overall success
             success = results["cdrom_valid"] and results["usb_valid"]
@@ -502,16 +675,9 @@ class PartitionManager:
             return False, results
     
     def _calculate_checksum(self, file_path: Path) -> Optional[str]:
-        """Calculate SHA256 checksum with proper resource management"""
-        sha256_hash = hashlib.sha256()
-        
+        """Calculate SHA256 checksum"""
         try:
-            with open(file_path, "rb") as f:
-                # Read in chunks to handle large files
-                for chunk in iter(lambda: f.read(8192), b""):
-                    sha256_hash.update(chunk)
-            
-            return sha256_hash.hexdigest()
+            return get_verifying_hasher().hash_file(file_path)
             
         except IOError as e:
             logger.error(f"Failed to calculate checksum for {file_path}: {e}")
@@ -535,7 +701,9 @@ class PartitionManager:
                 "usb_detected": self._usb_path is not None,
                 "cdrom_path": str(self._cdrom_path) if self._cdrom_path else None,
                 "usb_path": str(self._usb_path) if self._usb_path else None,
-                "partition_info": {k: asdict(v) for k, v in self._partition_info.items()}
+                "partition_info": {k: asdict(v) for k, v in self._partition_info.items()},
+                "info_cache_entries": len(self._info_cache),
+                "info_cache_hits": self._info_cache_hits
             }
     
     @contextmanager
@@ -564,7 +732,8 @@ class PartitionManager:
     def wait_for_mount(self, partition_type: PartitionType, timeout: int = MOUNT_WAIT_TIMEOUT) -> bool:
         """
         BUG-008 FIX: Wait for a partition to be mounted with proper thread synchronization
-        The entire wait operation is now atomic and thread-safe
+        Rescans are triggered by mount table changes (see MountWatcher)
+        rather than a fixed polling loop
         """
         partition_key = partition_type.value
         
@@ -577,13 +746,15 @@ class PartitionManager:
             
             self._mount_in_progress[partition_key] = True
         
+        # Open the watcher before scanning so no mount event is missed
+        watcher = MountWatcher(self.platform_name)
+        
         try:
-            start_time = time.time()
+            deadline = time.monotonic() + timeout
             
-            # BUG-008 FIX: Entire wait loop is now properly synchronized
-            while time.time() - start_time < timeout:
+            while True:
+                # Lock only covers the scan, not the wait for the next event
                 with self._mount_lock:
-                    # Rescan partitions
                     self.scan_partitions()
                     
                     # Check if partition is now available
@@ -597,13 +768,20 @@ class PartitionManager:
                             self._mount_events["usb"].set()
                             return True
                 
-                # Wait before next check
-                time.sleep(MOUNT_CHECK_INTERVAL)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                # Rescan on the next mount event, or periodically in case the
+                # marker file appears on an already mounted filesystem
+                watcher.wait_for_change(min(remaining, MOUNT_RESCAN_INTERVAL))
             
             logger.warning(f"Timeout waiting for {partition_key} mount")
             return False
             
         finally:
+            watcher.close()
+            
             # Clear mount in progress flag
             with self._mount_lock:
                 self._mount_in_progress[partition_key] = False
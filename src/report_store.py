@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Production Report Store
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Indexed SQLite store for manufacturing build reports, validation
+reports, batch records and the validation summary CSV. Report files are
+ingested incrementally: each file is parsed once and remembered by path,
+size and mtime, report directories whose mtime has not changed are not
+listed again, and the append-only summary CSV is read from the offset
+reached last time. Statistics, trends and dashboards query the indexed
+columns instead of reparsing every report on each refresh.
+
+Uses only the standard library so the manufacturing and production
+tools can load it without the rest of the package.
+"""
+
+import os
+import csv
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+DEFAULT_DB_NAME = "production_reports.db"
+DIRECTORY_SETTLE_SECONDS = 2.0  # FAT timestamps have two second resolution
+
+PathLike = Union[str, Path]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    offset INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS build_reports (
+    path TEXT PRIMARY KEY,
+    build_id TEXT,
+    build_date TEXT NOT NULL,
+    status TEXT,
+    platform TEXT,
+    build_time REAL,
+    report TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_build_date ON build_reports (build_date);
+CREATE TABLE IF NOT EXISTS validation_reports (
+    path TEXT PRIMARY KEY,
+    validation_date TEXT NOT NULL,
+    device_uuid TEXT,
+    overall_result TEXT,
+    validation_time REAL,
+    report TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_validation_date ON validation_reports (validation_date);
+CREATE TABLE IF NOT EXISTS validation_tests (
+    path TEXT NOT NULL,
+    validation_date TEXT NOT NULL,
+    overall_result TEXT,
+    name TEXT,
+    passed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_validation_tests_path ON validation_tests (path);
+CREATE INDEX IF NOT EXISTS idx_validation_tests_date ON validation_tests (validation_date);
+CREATE TABLE IF NOT EXISTS batch_records (
+    path TEXT PRIMARY KEY,
+    batch_id TEXT NOT NULL,
+    created TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS validation_runs (
+    source TEXT NOT NULL,
+    serial TEXT,
+    batch_id TEXT,
+    date TEXT,
+    status TEXT,
+    row TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_validation_runs_batch ON validation_runs (batch_id, status);
+"""
+
+
+def _normalize_date(value: Any) -> str:
+    """ISO date string that sorts correctly; raises ValueError if unparseable"""
+    return datetime.fromisoformat(value or "").isoformat()
+
+
+class ProductionReportStore:
+    """
+    Incrementally ingested, indexed production reports
+
+    Usage:
+        store = ProductionReportStore(reports_dir / "production_reports.db")
+        store.ingest_build_reports(reports_dir / "manufacturing_reports")
+        store.ingest_validation_reports(reports_dir / "validation_reports")
+        stats = store.validation_statistics(start_date, end_date)
+    """
+
+    def __init__(self, db_path: PathLike):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            # Rebuildable from the report files, so start over
+            self.conn.close()
+            self.db_path.unlink()
+            self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # Ingest bookkeeping
+
+    def _known(self, kind: str) -> Dict[str, Tuple[int, int, int]]:
+        rows = self.conn.execute(
+            "SELECT path, size, mtime_ns, offset FROM ingested_files WHERE kind = ?", (kind,)
+        )
+        return {row["path"]: (row["size"], row["mtime_ns"], row["offset"]) for row in rows}
+
+    def _mark(self, path: str, kind: str, stat: os.stat_result, offset: int = 0) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO ingested_files (path, kind, size, mtime_ns, offset) VALUES (?, ?, ?, ?, ?)",
+            (path, kind, stat.st_size, stat.st_mtime_ns, offset)
+        )
+
+    def _ingest_directory(self, directory: PathLike, pattern: str, kind: str, table: str, load) -> int:
+        """
+        Parse new and changed files matching pattern; forget removed ones
+
+        The directory listing itself is skipped while the directory's
+        mtime is unchanged, since report files are only ever added.
+        """
+        directory = Path(directory)
+        if not directory.exists():
+            return 0
+
+        dir_key = f"{directory.resolve()}::{pattern}"
+        dir_stat = directory.stat()
+        known_dir = self._known(f"{kind}_dir").get(dir_key)
+        if known_dir and known_dir[1] == dir_stat.st_mtime_ns and kind != "batch":
+            return 0
+
+        with self._lock:
+            known = self._known(kind)
+            seen = set()
+            ingested = 0
+            unsettled = time.time() - dir_stat.st_mtime <= DIRECTORY_SETTLE_SECONDS
+
+            for path in directory.glob(pattern):
+                key = str(path.resolve())
+                seen.add(key)
+                stat = path.stat()
+                if known.get(key, (None, None))[:2] == (stat.st_size, stat.st_mtime_ns):
+                    continue
+
+                self.conn.execute(f"DELETE FROM {table} WHERE path = ?", (key,))
+                if table == "validation_reports":
+                    self.conn.execute("DELETE FROM validation_tests WHERE path = ?", (key,))
+                try:
+                    with open(path, "r") as f:
+                        load(key, json.load(f))
+                    ingested += 1
+                except Exception as e:
+                    # A file still being written is retried once it changes
+                    unsettled = unsettled or time.time() - stat.st_mtime <= DIRECTORY_SETTLE_SECONDS
+                    logger.warning(f"Failed to load {kind} report {path}: {e}")
+                # Unreadable files are remembered too, until they change
+                self._mark(key, kind, stat)
+
+            for key in set(known) - seen:
+                if str(Path(key).parent) == str(directory.resolve()):
+                    self.conn.execute(f"DELETE FROM {table} WHERE path = ?", (key,))
+                    self.conn.execute("DELETE FROM validation_tests WHERE path = ?", (key,))
+                    self.conn.execute("DELETE FROM ingested_files WHERE path = ?", (key,))
+
+            # Files added within the same mtime tick would otherwise be missed
+            if not unsettled:
+                self._mark(dir_key, f"{kind}_dir", dir_stat)
+            self.conn.commit()
+
+        if ingested:
+            logger.info(f"Ingested {ingested} new {kind} reports from {directory}")
+        return ingested
+
+    # Ingest
+
+    def ingest_build_reports(self, directory: PathLike, pattern: str = "build_*.json") -> int:
+        """Load new build reports; returns how many were parsed"""
+        def load(path: str, report: Dict[str, Any]) -> None:
+            self.conn.execute(
+                "INSERT INTO build_reports (path, build_id, build_date, status, platform, build_time, report) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, report.get("build_id"), _normalize_date(report.get("build_date")),
+                 report.get("status"), report.get("platform", "Unknown"),
+                 report.get("build_time", 0), json.dumps(report))
+            )
+        return self._ingest_directory(directory, pattern, "build", "build_reports", load)
+
+    def ingest_validation_reports(self, directory: PathLike, pattern: str = "validation_*.json") -> int:
+        """Load new validation reports; returns how many were parsed"""
+        def load(path: str, report: Dict[str, Any]) -> None:
+            date = _normalize_date(report.get("validation_date"))
+            result = report.get("overall_result")
+            self.conn.execute(
+                "INSERT INTO validation_reports (path, validation_date, device_uuid, overall_result, "
+                "validation_time, report) VALUES (?, ?, ?, ?, ?, ?)",
+                (path, date, report.get("device_uuid"), result,
+                 report.get("validation_time", 0), json.dumps(report))
+            )
+            self.conn.executemany(
+                "INSERT INTO validation_tests (path, validation_date, overall_result, name, passed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(path, date, result, test.get("name"), 1 if test.get("passed") else 0)
+                 for test in report.get("test_results", [])]
+            )
+        return self._ingest_directory(directory, pattern, "validation", "validation_reports", load)
+
+    def ingest_batch_records(self, directory: PathLike, pattern: str = "batch_*.json") -> int:
+        """Load new and updated batch records (these are rewritten in place)"""
+        def load(path: str, data: Dict[str, Any]) -> None:
+            self.conn.execute(
+                "INSERT INTO batch_records (path, batch_id, created, data) VALUES (?, ?, ?, ?)",
+                (path, data.get("batch_id", "unknown"), data.get("created"), json.dumps(data))
+            )
+        return self._ingest_directory(directory, pattern, "batch", "batch_records", load)
+
+    def ingest_validation_summary(self, csv_path: PathLike) -> int:
+        """Append rows added to the summary CSV since the last ingest"""
+        csv_path = Path(csv_path)
+        if not csv_path.exists():
+            return 0
+
+        key = str(csv_path.resolve())
+        stat = csv_path.stat()
+        size, mtime_ns, offset = self._known("summary_csv").get(key, (0, 0, 0))
+        if (stat.st_size, stat.st_mtime_ns) == (size, mtime_ns):
+            return 0
+
+        with self._lock:
+            if stat.st_size < offset:
+                # Rewritten rather than appended to
+                self.conn.execute("DELETE FROM validation_runs WHERE source = ?", (key,))
+                offset = 0
+
+            with open(csv_path, "rb") as f:
+                header = next(csv.reader([f.readline().decode("utf-8")]), [])
+                start = max(offset, f.tell())
+                f.seek(start)
+                data = f.read()
+
+            # Only complete lines; a row being written is picked up next time
+            complete = data[:data.rfind(b"\n") + 1]
+            rows = [dict(zip(header, values))
+                    for values in csv.reader(complete.decode("utf-8").splitlines()) if values]
+            self.conn.executemany(
+                "INSERT INTO validation_runs (source, serial, batch_id, date, status, row) VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, row.get("Serial"), row.get("Batch", "unknown"), row.get("Date"),
+                  row.get("Status"), json.dumps(row)) for row in rows]
+            )
+            self._mark(key, "summary_csv", stat, start + len(complete))
+            self.conn.commit()
+        return len(rows)
+
+    # Queries
+
+    @staticmethod
+    def _range(column: str, start: Optional[datetime], end: Optional[datetime]) -> Tuple[str, list]:
+        clauses, params = [], []
+        if start:
+            clauses.append(f"{column} >= ?")
+            params.append(start.isoformat())
+        if end:
+            clauses.append(f"{column} <= ?")
+            params.append(end.isoformat())
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def build_reports(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict]:
+        where, params = self._range("build_date", start, end)
+        rows = self.conn.execute(f"SELECT report FROM build_reports{where} ORDER BY build_date", params)
+        return [json.loads(row["report"]) for row in rows]
+
+    def validation_reports(self, start: Optional[datetime] = None,
+                           end: Optional[datetime] = None) -> List[Dict]:
+        where, params = self._range("validation_date", start, end)
+        rows = self.conn.execute(
+            f"SELECT report FROM validation_reports{where} ORDER BY validation_date", params
+        )
+        return [json.loads(row["report"]) for row in rows]
+
+    def build_times(self, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> List[Tuple[str, float]]:
+        """(build_date, build_time) pairs in date order"""
+        where, params = self._range("build_date", start, end)
+        rows = self.conn.execute(
+            f"SELECT build_date, build_time FROM build_reports{where} ORDER BY build_date", params
+        )
+        return [(row["build_date"], row["build_time"] or 0) for row in rows]
+
+    def build_statistics(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict:
+        where, params = self._range("build_date", start, end)
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS total, SUM(status = 'SUCCESS') AS successful, "
+            "COUNT(DISTINCT build_id) + MAX(build_id IS NULL) AS unique_builds "
+            f"FROM build_reports{where}", params
+        ).fetchone()
+        platforms = self.conn.execute(
+            f"SELECT platform, COUNT(*) AS count FROM build_reports{where} GROUP BY platform", params
+        )
+        return {
+            "total": row["total"],
+            "successful": row["successful"] or 0,
+            "unique_builds": row["unique_builds"] or 0,
+            "platforms": {r["platform"]: r["count"] for r in platforms}
+        }
+
+    def validation_statistics(self, start: Optional[datetime] = None,
+                              end: Optional[datetime] = None) -> Dict:
+        where, params = self._range("validation_date", start, end)
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS total, SUM(overall_result = 'PASS') AS passed, "
+            "SUM(overall_result = 'FAIL') AS failed, AVG(validation_time) AS average_time, "
+            "COUNT(DISTINCT CASE WHEN overall_result = 'PASS' AND device_uuid <> '' THEN device_uuid END) "
+            "AS passed_devices "
+            f"FROM validation_reports{where}", params
+        ).fetchone()
+
+        test_where, test_params = self._range("validation_date", start, end)
+        test_where = (test_where + " AND" if test_where else " WHERE") + " overall_result = 'FAIL' AND passed = 0"
+        failures = self.conn.execute(
+            f"SELECT name, COUNT(*) AS count FROM validation_tests{test_where} GROUP BY name", test_params
+        )
+        return {
+            "total": row["total"],
+            "passed": row["passed"] or 0,
+            "failed": row["failed"] or 0,
+            "average_time": row["average_time"] or 0,
+            "passed_devices": row["passed_devices"],
+            "common_failures": {r["name"]: r["count"] for r in failures}
+        }
+
+    def daily_counts(self, kind: str, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+        """Reports per day, with failures for validations"""
+        table, column, failed = {
+            "build": ("build_reports", "build_date", "status <> 'SUCCESS'"),
+            "validation": ("validation_reports", "validation_date", "overall_result = 'FAIL'")
+        }[kind]
+        where, params = self._range(column, start, end)
+        rows = self.conn.execute(
+            f"SELECT substr({column}, 1, 10) AS day, COUNT(*) AS total, SUM({failed}) AS failures "
+            f"FROM {table}{where} GROUP BY day ORDER BY day", params
+        )
+        return {row["day"]: {"total": row["total"], "failures": row["failures"] or 0} for row in rows}
+
+    def batch_records(self) -> Dict[str, Dict[str, Any]]:
+        """Latest record of every batch, by batch ID"""
+        rows = self.conn.execute("SELECT path, batch_id, data FROM batch_records ORDER BY path")
+        return {row["batch_id"]: {"file": Path(row["path"]), "data": json.loads(row["data"])} for row in rows}
+
+    def batch_validation_counts(self) -> Dict[str, Dict[str, int]]:
+        """Validated, passed and failed units per batch from the summary CSV"""
+        rows = self.conn.execute(
+            "SELECT batch_id, COUNT(*) AS validated, SUM(status = 'PASS') AS passed, "
+            "SUM(status = 'FAIL') AS failed FROM validation_runs GROUP BY batch_id"
+        )
+        return {row["batch_id"]: {"validated": row["validated"], "passed": row["passed"] or 0,
+                                  "failed": row["failed"] or 0} for row in rows}
+
+    def validation_runs(self, batch_id: str) -> List[Dict[str, str]]:
+        """Summary CSV rows for one batch"""
+        rows = self.conn.execute("SELECT row FROM validation_runs WHERE batch_id = ? ORDER BY rowid", (batch_id,))
+        return [json.loads(row["row"]) for row in rows]
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Storage Benchmark
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Measures the USB device itself rather than the operating system's page
+cache. Reads use O_DIRECT where the filesystem allows it (F_NOCACHE on
+macOS), otherwise the file's cached pages are dropped with
+posix_fadvise(DONTNEED) before every pass. The benchmark records
+sequential throughput at several block sizes, random 4K read IOPS (the
+access pattern of the SQLite databases on the USB partition) and fsync
+latency percentiles, and grades the results against tier thresholds.
+
+Uses only the standard library so the manufacturing and production
+validators can load it without the rest of the package.
+"""
+
+import os
+import sys
+import math
+import mmap
+import time
+import random
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ALIGNMENT = 4096
+BLOCK_SIZES = (4 * 1024, 64 * 1024, 1024 * 1024)
+RANDOM_READ_SIZE = 4096
+WRITE_BLOCK_SIZE = 1024 * 1024
+
+# Cache modes, best first
+CACHE_DIRECT = "O_DIRECT"
+CACHE_NOCACHE = "F_NOCACHE"
+CACHE_FADVISE = "fadvise"
+CACHE_NONE = "none"  # results may include cached reads
+
+PathLike = Union[str, Path]
+
+
+def percentiles(samples_ms: Sequence[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99 and max of latency samples"""
+    if not samples_ms:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples_ms)
+
+    def rank(p: float) -> float:
+        index = max(0, math.ceil(p * len(ordered) / 100) - 1)
+        return round(ordered[index], 3)
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99), "max": round(ordered[-1], 3)}
+
+
+class _UncachedReader:
+    """Reads a file with the strongest cache bypass the platform offers"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.mode = CACHE_NONE
+        self.fd = None
+
+        if hasattr(os, "O_DIRECT"):
+            try:
+                self.fd = os.open(path, os.O_RDONLY | os.O_DIRECT)
+                self.mode = CACHE_DIRECT
+            except OSError:
+                self.fd = None  # e.g. filesystems without direct I/O
+
+        if self.fd is None:
+            self.fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            if sys.platform == "darwin":
+                import fcntl
+                try:
+                    fcntl.fcntl(self.fd, getattr(fcntl, "F_NOCACHE", 48), 1)
+                    self.mode = CACHE_NOCACHE
+                except OSError:
+                    pass
+            elif hasattr(os, "posix_fadvise"):
+                self.mode = CACHE_FADVISE
+
+        self.size = os.fstat(self.fd).st_size
+
+    def drop_cache(self) -> None:
+        """Evict the file's pages so the next pass reads the device"""
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(self.fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+
+    def read_at(self, buffer: mmap.mmap, offset: int) -> int:
+        """Fill the (page aligned) buffer from offset; returns bytes read"""
+        if hasattr(os, "preadv"):
+            return os.preadv(self.fd, [buffer], offset)
+        os.lseek(self.fd, offset, os.SEEK_SET)
+        data = os.read(self.fd, len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StorageBenchmark:
+    """
+    Cache-bypassing storage measurements
+
+    Usage:
+        bench = StorageBenchmark()
+        usb = bench.run_writable(usb_mount)         # write, read back, IOPS, fsync
+        cdrom = bench.run_read_only(largest_file)   # read throughput and IOPS
+    """
+
+    def __init__(self, block_sizes: Sequence[int] = BLOCK_SIZES, sequential_mb: int = 64,
+                 random_reads: int = 2000, random_seconds: float = 3.0, fsync_samples: int = 50):
+        """
+        Args:
+            block_sizes: Sequential read block sizes in bytes
+            sequential_mb: Data read per block size (and written by run_writable)
+            random_reads: Upper bound on random 4K reads
+            random_seconds: Time limit for the random read test
+            fsync_samples: Synchronous 4K writes timed for fsync latency
+        """
+        self.block_sizes = tuple(block_sizes)
+        self.sequential_mb = sequential_mb
+        self.random_reads = random_reads
+        self.random_seconds = random_seconds
+        self.fsync_samples = fsync_samples
+
+    # Reads
+
+    def sequential_read(self, path: PathLike, block_size: int,
+                        max_bytes: Optional[int] = None) -> Tuple[float, str]:
+        """Uncached sequential read throughput in MB/s, and the cache mode used"""
+        max_bytes = max_bytes or self.sequential_mb * 1024 * 1024
+        buffer = mmap.mmap(-1, max(block_size, ALIGNMENT))
+        try:
+            with _UncachedReader(Path(path)) as reader:
+                reader.drop_cache()
+                limit = min(reader.size, max_bytes)
+                offset = 0
+                start = time.perf_counter()
+                while offset < limit:
+                    read = reader.read_at(buffer, offset)
+                    if read <= 0:
+                        break
+                    offset += read
+                elapsed = time.perf_counter() - start
+                return (offset / (1024 * 1024)) / max(elapsed, 1e-9), reader.mode
+        finally:
+            buffer.close()
+
+    def random_read(self, path: PathLike) -> Dict[str, Any]:
+        """Uncached random 4K read IOPS and latency percentiles"""
+        buffer = mmap.mmap(-1, RANDOM_READ_SIZE)
+        latencies: List[float] = []
+        try:
+            with _UncachedReader(Path(path)) as reader:
+                reader.drop_cache()
+                blocks = max(1, reader.size // RANDOM_READ_SIZE)
+                rng = random.Random(blocks)
+                start = time.perf_counter()
+                deadline = start + self.random_seconds
+                while len(latencies) < self.random_reads and time.perf_counter() < deadline:
+                    offset = rng.randrange(blocks) * RANDOM_READ_SIZE
+                    began = time.perf_counter()
+                    reader.read_at(buffer, offset)
+                    latencies.append((time.perf_counter() - began) * 1000)
+                elapsed = time.perf_counter() - start
+                return {
+                    "iops": round(len(latencies) / max(elapsed, 1e-9), 1),
+                    "reads": len(latencies),
+                    "latency_ms": percentiles(latencies),
+                    "cache_mode": reader.mode
+                }
+        finally:
+            buffer.close()
+
+    def run_read_only(self, path: PathLike) -> Dict[str, Any]:
+        """Sequential and random read results for an existing file"""
+        sequential = {}
+        mode = CACHE_NONE
+        for block_size in self.block_sizes:
+            mbps, mode = self.sequential_read(path, block_size)
+            sequential[str(block_size)] = round(mbps, 1)
+
+        return {
+            "file": str(path),
+            "file_mb": round(Path(path).stat().st_size / (1024 * 1024), 1),
+            "cache_mode": mode,
+            "sequential_read_mbps": sequential,
+            "random_read": self.random_read(path)
+        }
+
+    # Writes
+
+    def sequential_write(self, path: PathLike, size_mb: Optional[int] = None) -> float:
+        """Write throughput in MB/s, including the final fsync"""
+        size_mb = size_mb or self.sequential_mb
+        block = os.urandom(WRITE_BLOCK_SIZE)
+        start = time.perf_counter()
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0))
+        try:
+            for _ in range(size_mb * 1024 * 1024 // WRITE_BLOCK_SIZE):
+                os.write(fd, block)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return size_mb / max(time.perf_counter() - start, 1e-9)
+
+    def fsync_latency(self, directory: PathLike) -> Dict[str, float]:
+        """Latency percentiles of 4K write + fsync, as SQLite commits do"""
+        path = Path(directory) / f".fsync_probe_{os.getpid()}"
+        block = os.urandom(ALIGNMENT)
+        latencies = []
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0))
+        try:
+            for i in range(self.fsync_samples):
+                began = time.perf_counter()
+                os.write(fd, block)
+                os.fsync(fd)
+                latencies.append((time.perf_counter() - began) * 1000)
+        finally:
+            os.close(fd)
+            path.unlink(missing_ok=True)
+        return percentiles(latencies)
+
+    def run_writable(self, directory: PathLike, name: str = "storage_benchmark") -> Dict[str, Any]:
+        """Write a test file, read it back uncached, then time fsyncs"""
+        path = Path(directory) / f".{name}_{os.getpid()}.dat"
+        try:
+            write_mbps = self.sequential_write(path)
+            results = self.run_read_only(path)
+            results.pop("file")
+            results["write_mbps"] = round(write_mbps, 1)
+            results["fsync_latency_ms"] = self.fsync_latency(directory)
+            return results
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def grade(metrics: Dict[str, float],
+          tiers: Dict[str, Dict[str, float]]) -> Tuple[Optional[str], Dict[str, List[str]]]:
+    """
+    Highest tier whose thresholds the metrics meet
+
+    Thresholds named *_ms are upper bounds, all others lower bounds.
+    Tiers are checked in the order given, best first.
+
+    Returns:
+        (tier name or None, shortfalls for every tier)
+    """
+    shortfalls = {}
+    achieved = None
+    for tier, thresholds in tiers.items():
+        misses = []
+        for metric, limit in thresholds.items():
+            value = metrics.get(metric)
+            if value is None:
+                misses.append(f"{metric} not measured")
+            elif metric.endswith("_ms") and value > limit:
+                misses.append(f"{metric} {value} > {limit}")
+            elif not metric.endswith("_ms") and value < limit:
+                misses.append(f"{metric} {value} < {limit}")
+        shortfalls[tier] = misses
+        if not misses and achieved is None:
+            achieved = tier
+    return achieved, shortfalls
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Tier Calibration
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Measures actual inference speed of each candidate model variant against the
+local Ollama server and selects the largest variant that answers within the
+response time budget. Results are cached on the USB partition per machine
+(the hardware snapshot's machine key) so the benchmark only runs once.
+"""
+
+import json
+import time
+import logging
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional, Any, List
+from dataclasses import dataclass, asdict
+from datetime import datetime
+
+try:
+    from src.hardware_snapshot import get_machine_key
+except ImportError:
+    from hardware_snapshot import get_machine_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+DEFAULT_MAX_RESPONSE_TIME = 3.0
+PERFORMANCE_CONFIG = Path(__file__).parent.parent / "config" / "performance.json"
+CALIBRATION_PROMPT = "Explain in one sentence why the sky is blue."
+
+
+@dataclass
+class ModelBenchmark:
+    """Measured inference speed of one model variant"""
+    model: str
+    tokens_per_second: float
+    first_token_seconds: float
+    response_seconds: float
+    meets_budget: bool
+    error: Optional[str] = None
+
+
+def model_size_rank(model: str) -> tuple:
+    """Order model variants from smallest to largest (quantized before full)"""
+    name = model.lower()
+    params = 0.0
+    for part in name.replace(":", "-").split("-"):
+        if part.endswith("b"):
+            try:
+                params = float(part[:-1])
+                break
+            except ValueError:
+                continue
+    return (params, 0 if "q4" in name or "q8" in name else 1)
+
+
+class TierCalibrator:
+    """
+    One-time throughput calibration of model variants.
+    Picks the largest variant whose estimated response time fits the budget.
+    """
+
+    def __init__(
+        self,
+        usb_path: Path,
+        base_url: str = DEFAULT_OLLAMA_URL,
+        max_response_time: Optional[float] = None,
+        benchmark_tokens: int = 32,
+        budget_tokens: int = 48,
+        timeout: float = 300.0
+    ):
+        """
+        Args:
+            usb_path: USB partition where calibration results are cached
+            base_url: Ollama server URL
+            max_response_time: Response budget in seconds (performance.json if None)
+            benchmark_tokens: Tokens generated per benchmark run
+            budget_tokens: Response length the budget must cover
+            timeout: Per-request timeout, includes loading the model
+        """
+        self.usb_path = Path(usb_path)
+        self.cache_file = self.usb_path / "cache" / "tier_calibration.json"
+        self.base_url = base_url.rstrip("/")
+        self.max_response_time = max_response_time or self._load_max_response_time()
+        self.benchmark_tokens = benchmark_tokens
+        self.budget_tokens = budget_tokens
+        self.timeout = timeout
+        self.fingerprint = get_machine_key()
+
+        self._lock = threading.Lock()
+
+    def _load_max_response_time(self) -> float:
+        """Read the response time budget from the performance configuration"""
+        try:
+            with open(PERFORMANCE_CONFIG, "r") as f:
+                return float(json.load(f).get("max_response_time", DEFAULT_MAX_RESPONSE_TIME))
+        except Exception:
+            return DEFAULT_MAX_RESPONSE_TIME
+
+    def _post(self, payload: Dict[str, Any]):
+        """POST to Ollama's generate endpoint"""
+        request = urllib.request.Request(
+            f"{self.base_url}/api/generate",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def benchmark_model(self, model: str) -> ModelBenchmark:
+        """Measure time to first token and generation throughput for one model"""
+        try:
+            # Load the model first so load time does not count against it
+            with self._post({"model": model, "prompt": "", "stream": False}) as response:
+                response.read()
+
+            start = time.perf_counter()
+            first_token_seconds = None
+            tokens = 0
+            final: Dict[str, Any] = {}
+
+            with self._post({
+                "model": model,
+                "prompt": CALIBRATION_PROMPT,
+                "stream": True,
+                "options": {"num_predict": self.benchmark_tokens, "temperature": 0}
+            }) as response:
+                for line in response:
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("done"):
+                        final = chunk
+                        break
+                    if first_token_seconds is None:
+                        first_token_seconds = time.perf_counter() - start
+                    tokens += 1
+
+            elapsed = time.perf_counter() - start
+            first_token_seconds = first_token_seconds if first_token_seconds is not None else elapsed
+
+            # Prefer Ollama's own eval timings over wall-clock chunk counting
+            if final.get("eval_count") and final.get("eval_duration"):
+                tokens_per_second = final["eval_count"] / (final["eval_duration"] / 1e9)
+            else:
+                generation_time = max(elapsed - first_token_seconds, 1e-6)
+                tokens_per_second = max(tokens - 1, 1) / generation_time
+
+            response_seconds = first_token_seconds + self.budget_tokens / tokens_per_second
+
+            return ModelBenchmark(
+                model=model,
+                tokens_per_second=round(tokens_per_second, 2),
+                first_token_seconds=round(first_token_seconds, 3),
+                response_seconds=round(response_seconds, 3),
+                meets_budget=response_seconds <= self.max_response_time
+            )
+
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            logger.warning(f"Calibration of {model} failed: {e}")
+            return ModelBenchmark(
+                model=model,
+                tokens_per_second=0.0,
+                first_token_seconds=0.0,
+                response_seconds=float("inf"),
+                meets_budget=False,
+                error=str(e)
+            )
+
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load cached calibration results for all machines"""
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, "r") as f:
+                    return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable calibration cache: {e}")
+        return {}
+
+    def _save_cache(self, cache: Dict[str, Any]) -> None:
+        """Atomically write calibration results to the USB partition"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file.with_suffix(".tmp")
+            with open(temp_file, "w") as f:
+                json.dump(cache, f, indent=2)
+            temp_file.replace(self.cache_file)
+        except OSError as e:
+            logger.warning(f"Could not save calibration results: {e}")
+
+    def calibrate(self, candidates: List[str], force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Benchmark candidate variants, reusing cached results for this machine.
+
+        Variants are measured smallest first; once one misses the budget the
+        larger ones are not run since they can only be slower.
+
+        Returns:
+            Benchmark results by model name
+        """
+        with self._lock:
+            cache = self._load_cache()
+            entry = cache.get(self.fingerprint, {})
+            results = {} if force else dict(entry.get("results", {}))
+
+            # Cached measurements stay valid; the budget may have changed
+            for result in results.values():
+                result["meets_budget"] = result["response_seconds"] <= self.max_response_time
+
+            budget_missed = any(
+                not r["meets_budget"] and r.get("error") is None for r in results.values()
+            )
+
+            measured = False
+            for model in sorted(candidates, key=model_size_rank):
+                if model in results:
+                    continue
+                if budget_missed:
+                    # Skip larger variants; they will not meet the budget either
+                    continue
+
+                logger.info(f"Calibrating {model}...")
+                benchmark = self.benchmark_model(model)
+
+                if benchmark.error is None:
+                    measured = True
+                    results[model] = asdict(benchmark)
+                    logger.info(
+                        f"{model}: {benchmark.tokens_per_second} tok/s, "
+                        f"first token {benchmark.first_token_seconds}s, "
+                        f"est. response {benchmark.response_seconds}s"
+                    )
+                    if not benchmark.meets_budget:
+                        budget_missed = True
+
+            if measured:
+                cache[self.fingerprint] = {
+                    "calibrated_at": datetime.now().isoformat(),
+                    "max_response_time": self.max_response_time,
+                    "results": results
+                }
+                self._save_cache(cache)
+
+            return results
+
+    def select_model(self, candidates: List[str], force: bool = False) -> Optional[str]:
+        """
+        Pick the largest candidate that meets the response time budget.
+        Falls back to the smallest measured candidate, or None when nothing
+        could be measured (e.g. Ollama is not running).
+        """
+        results = self.calibrate(candidates, force=force)
+        measured = [m for m in sorted(candidates, key=model_size_rank) if m in results]
+        if not measured:
+            return None
+
+        within_budget = [m for m in measured if results[m]["meets_budget"]]
+        selected = within_budget[-1] if within_budget else measured[0]
+
+        logger.info(f"Calibrated model selection: {selected} "
+                    f"(budget {self.max_response_time}s)")
+        return selected
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Sunflower AI Professional System - Concurrent Validation Runner
+Version: 6.2
+Copyright (c) 2025 Sunflower AI
+
+Runs validation tests side by side instead of one after another. Most
+device and release checks spend their time waiting on storage (hashing
+models, walking partitions, reading documentation), so independent
+tests overlap well on threads. Each test declares the tests it depends
+on, an optional timeout and whether it is critical; a failed critical
+test stops everything that has not started yet. Timing-sensitive tests
+are marked exclusive and run with nothing else in flight.
+
+Uses only the standard library so the manufacturing and release
+validators can load it without the rest of the package.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PASS = "PASS"
+FAIL = "FAIL"
+ERROR = "ERROR"
+TIMEOUT = "TIMEOUT"
+SKIPPED = "SKIPPED"
+
+MAX_WORKERS = 8
+TIMEOUT_GRACE = 30.0  # seconds an exclusive test waits for timed-out tests to stop
+
+
+@dataclass
+class ValidationTask:
+    """One schedulable validation test"""
+    name: str
+    run: Callable[[], Any]
+    depends_on: Sequence[str] = ()
+    timeout: Optional[float] = None  # seconds
+    critical: bool = False
+    exclusive: bool = False  # runs with no other test in flight (benchmarks)
+    check: Callable[[Any], bool] = bool  # whether run()'s return value is a pass
+
+
+@dataclass
+class TaskResult:
+    """Outcome and timing of one task"""
+    name: str
+    status: str
+    started_seconds: float = 0.0  # offset from the start of the run
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+    value: Any = field(default=None, repr=False)
+
+    @property
+    def passed(self) -> bool:
+        return self.status == PASS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "started_seconds": round(self.started_seconds, 3),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "error": self.error
+        }
+
+
+class ValidationRunner:
+    """
+    Schedules validation tasks on threads in dependency order
+
+    Usage:
+        runner = ValidationRunner()
+        results = runner.run([
+            ValidationTask("detect", detect, critical=True),
+            ValidationTask("checksums", verify, depends_on=["detect"], timeout=600),
+            ValidationTask("performance", benchmark, depends_on=["detect"], exclusive=True)
+        ])
+        report["timing"] = runner.timing(results)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, fail_fast: bool = True,
+                 callback: Optional[Callable[[ValidationTask, TaskResult], None]] = None,
+                 timeout_grace: float = TIMEOUT_GRACE):
+        """
+        Args:
+            max_workers: Tests in flight at once (I/O bound, so more than the CPU count)
+            fail_fast: Skip tests not yet started once a critical test fails
+            callback: Called on the scheduling thread as each result is known
+            timeout_grace: How long exclusive tests wait for the threads of
+                timed-out tests to finish before they are skipped
+        """
+        self.max_workers = max_workers or min(MAX_WORKERS, (os.cpu_count() or 1) + 4)
+        self.fail_fast = fail_fast
+        self.timeout_grace = timeout_grace
+        self.callback = callback
+        self.wall_seconds = 0.0
+
+    @staticmethod
+    def _check_graph(tasks: List[ValidationTask]) -> None:
+        """Reject duplicate names, unknown dependencies and cycles"""
+        names = [task.name for task in tasks]
+        if len(set(names)) != len(names):
+            raise ValueError("Validation task names must be unique")
+
+        graph = {task.name: list(task.depends_on) for task in tasks}
+        for task in tasks:
+            unknown = [dep for dep in task.depends_on if dep not in graph]
+            if unknown:
+                raise ValueError(f"{task.name} depends on unknown tasks: {', '.join(unknown)}")
+
+        visiting, done = set(), set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through {name}")
+            visiting.add(name)
+            for dep in graph[name]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in names:
+            visit(name)
+
+    def _start(self, task: ValidationTask, finished: "queue.Queue") -> None:
+        def target() -> None:
+            try:
+                finished.put((task.name, task.run(), None))
+            except Exception as e:
+                logger.exception(f"Validation test crashed: {task.name}")
+                finished.put((task.name, None, e))
+
+        # Daemon threads, so a test that hangs past its timeout cannot block exit
+        threading.Thread(target=target, name=f"validate-{task.name}", daemon=True).start()
+
+    def run(self, tasks: Iterable[ValidationTask]) -> Dict[str, TaskResult]:
+        """
+        Run every task once its dependencies have passed
+
+        Returns:
+            Results by task name, in declaration order
+        """
+        tasks = list(tasks)
+        self._check_graph(tasks)
+
+        start = time.perf_counter()
+        finished: "queue.Queue" = queue.Queue()
+        pending = list(tasks)
+        running: Dict[str, tuple] = {}  # name -> (task, started, deadline)
+        # Timed-out tests whose threads cannot be stopped: name -> (task, timed_out)
+        stragglers: Dict[str, tuple] = {}
+        results: Dict[str, TaskResult] = {}
+        abort_reason: Optional[str] = None
+
+        def record(task: ValidationTask, result: TaskResult) -> None:
+            nonlocal abort_reason
+            results[task.name] = result
+            if result.status != SKIPPED:
+                logger.info(f"Validation test {task.name}: {result.status} in {result.duration_seconds:.2f}s")
+            if task.critical and not result.passed and result.status != SKIPPED \
+                    and self.fail_fast and abort_reason is None:
+                abort_reason = f"Skipped after critical failure: {task.name}"
+            if self.callback:
+                self.callback(task, result)
+
+        while pending or running:
+            now = time.perf_counter()
+            # Stragglers stay behind the exclusive barrier until they finish;
+            # an exclusive one stops holding up other tests after the grace period
+            in_flight = [task for task, _, _ in running.values()] + [
+                task for task, timed_out in stragglers.values()
+                if not task.exclusive or now - timed_out < self.timeout_grace
+            ]
+
+            # Start everything whose dependencies are settled
+            progress = True
+            while progress and pending:
+                progress = False
+                for task in list(pending):
+                    if abort_reason:
+                        pending.remove(task)
+                        record(task, TaskResult(task.name, SKIPPED, error=abort_reason))
+                        progress = True
+                        continue
+
+                    if any(dep not in results for dep in task.depends_on):
+                        continue
+
+                    failed = next((dep for dep in task.depends_on if not results[dep].passed), None)
+                    if failed:
+                        pending.remove(task)
+                        record(task, TaskResult(task.name, SKIPPED, error=f"Dependency did not pass: {failed}"))
+                        progress = True
+                        continue
+
+                    # Exclusive tasks are barriers: nothing overlaps them in either direction
+                    if any(running_task.exclusive for running_task in in_flight):
+                        break
+                    if task.exclusive and not running and stragglers and all(
+                            now - timed_out >= self.timeout_grace
+                            for _, timed_out in stragglers.values()):
+                        pending.remove(task)
+                        record(task, TaskResult(task.name, SKIPPED, error=(
+                            "Timed-out tests still running: " + ", ".join(stragglers))))
+                        progress = True
+                        continue
+                    if task.exclusive and in_flight:
+                        break
+                    if len(running) >= self.max_workers:
+                        break
+
+                    pending.remove(task)
+                    deadline = now + task.timeout if task.timeout else None
+                    running[task.name] = (task, now, deadline)
+                    in_flight.append(task)
+                    self._start(task, finished)
+                    progress = True
+                    if task.exclusive:
+                        break
+
+            if not running and not (pending and stragglers):
+                continue
+
+            deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+            deadlines += [timed_out + self.timeout_grace for _, timed_out in stragglers.values()
+                          if now - timed_out < self.timeout_grace]
+            wait = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+
+            try:
+                name, value, error = finished.get(timeout=wait)
+            except queue.Empty:
+                now = time.perf_counter()
+                for name, (task, started, deadline) in list(running.items()):
+                    if deadline is not None and now >= deadline:
+                        del running[name]
+                        stragglers[name] = (task, now)
+                        record(task, TaskResult(
+                            task.name, TIMEOUT,
+                            started_seconds=started - start,
+                            duration_seconds=now - started,
+                            error=f"Timed out after {task.timeout:.0f}s"
+                        ))
+                continue
+
+            if name not in running:
+                stragglers.pop(name, None)
+                continue  # finished after its timeout was already reported
+
+            task, started, _ = running.pop(name)
+            duration = time.perf_counter() - started
+            if error is not None:
+                result = TaskResult(name, ERROR, started - start, duration, error=str(error))
+            else:
+                try:
+                    passed = task.check(value)
+                except Exception as e:
+                    result = TaskResult(name, ERROR, started - start, duration, error=str(e), value=value)
+                else:
+                    result = TaskResult(name, PASS if passed else FAIL, started - start, duration, value=value)
+            record(task, result)
+
+        self.wall_seconds = time.perf_counter() - start
+        return {task.name: results[task.name] for task in tasks}
+
+    def timing(self, results: Dict[str, TaskResult]) -> Dict[str, Any]:
+        """Wall time against summed test time for the report"""
+        test_seconds = sum(r.duration_seconds for r in results.values())
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "test_seconds": round(test_seconds, 3),
+            "parallel_speedup": round(test_seconds / self.wall_seconds, 2) if self.wall_seconds else 1.0,
+            "workers": self.max_workers,
+            "tests": {name: result.to_dict() for name, result in results.items()}
+        }
@@ -8,8 +8,18 @@ import platform
 import subprocess
 import os
 import multiprocessing
+from pathlib import Path
 from typing import Dict, Optional, List
 
+try:
+    from config.path_config import get_usb_path
+    from src.hardware_snapshot import get_snapshot_service
+except ImportError:
+    get_snapshot_service = None
+
+    def get_usb_path(subpath: str = '') -> Optional[Path]:
+        return None
+
 
 class HardwareDetector:
     """
@@ -18,11 +28,19 @@ class HardwareDetector:
     and uses cross-platform methods where possible.
     """
 
-    def __init__(self):
-        """Initialize hardware detector."""
+    def __init__(self, usb_path: Optional[Path] = None):
+        """
+        Initialize hardware detector.
+
+        Args:
+            usb_path: USB partition root for the hardware snapshot
+                (the detected SUNFLOWER_DATA partition if None)
+        """
+        self.usb_path = Path(usb_path) if usb_path else get_usb_path()
         self.system = platform.system()
         self.cpu_cores = multiprocessing.cpu_count() or 1
         self.total_ram_gb = self._get_total_ram()
+        self._snapshot: Optional[Dict] = None
 
     def get_system_info(self) -> Dict:
         """
@@ -94,66 +112,35 @@ class HardwareDetector:
             return 4.0
         return 4.0
 
+    def _get_snapshot(self) -> Dict:
+        """
+        Results of the slow GPU probes, shared with the other detectors
+        through the hardware snapshot on the USB partition, since these
+        commands are otherwise run on every start.
+        """
+        if self._snapshot is None:
+            if get_snapshot_service is None:
+                self._snapshot = {"gpu": None}
+            else:
+                self._snapshot = get_snapshot_service(self.usb_path).get_system()
+        return self._snapshot
+
     def get_gpu_info(self) -> Dict:
         """
         Detects GPU information, prioritizing NVIDIA for CUDA support,
         then checking for AMD/Intel on Windows, and Apple Silicon on macOS.
         """
-        if self.system == "Windows":
-            return self._get_gpu_windows()
-        elif self.system == "Darwin":
-            return self._get_gpu_macos()
-        elif self.system == "Linux":
-            return self._get_gpu_linux()
-        return {"detected": False, "model": "Unknown"}
-
-    def _get_gpu_windows(self) -> Dict:
-        try:
-            # WMIC is reliable for getting GPU names on Windows
-            command = "wmic path win32_VideoController get name"
-            result = subprocess.run(command, capture_output=True, text=True, shell=True)
-            if result.returncode == 0 and result.stdout.strip():
-                gpus = [line.strip() for line in result.stdout.split('\n') if line.strip() and "Name" not in line]
-                if gpus:
-                    # Prioritize known high-performance brands
-                    for gpu in gpus:
-                        if "NVIDIA" in gpu or "AMD" in gpu:
-                            return {"detected": True, "model": gpu}
-                    return {"detected": True, "model": gpus[0]}
-        except Exception:
-            pass
-        return {"detected": False, "model": "Unknown"}
-
-    def _get_gpu_macos(self) -> Dict:
-        try:
-            # On macOS, check for Apple Silicon first, which implies a powerful integrated GPU
-            if "arm" in platform.machine().lower():
-                return {"detected": True, "model": "Apple Silicon (M-series)"}
-
-            # For Intel Macs, check system_profiler
-            command = "system_profiler SPDisplaysDataType | grep Chipset"
-            result = subprocess.run(command, capture_output=True, text=True, shell=True)
-            if result.returncode == 0 and result.stdout.strip():
-                gpu_model = result.stdout.split(":")[1].strip()
-                return {"detected": True, "model": gpu_model}
-        except Exception:
-            pass
-        return {"detected": False, "model": "Unknown"}
-
-    def _get_gpu_linux(self) -> Dict:
-        try:
-            # `lspci` is standard on Linux for listing hardware
-            command = "lspci | grep -i 'vga\\|3d\\|display'"
-            result = subprocess.run(command, capture_output=True, text=True, shell=True)
-            if result.returncode == 0 and result.stdout.strip():
-                gpu_model = result.stdout.split(":")[-1].strip()
-                # Clean up model name
-                if '[' in gpu_model and ']' in gpu_model:
-                    gpu_model = gpu_model.split('[')[1].split(']')[0]
-                return {"detected": True, "model": gpu_model}
-        except Exception:
-            pass
-        return {"detected": False, "model": "Unknown"}
+        gpu = self._get_snapshot()["gpu"]
+        if not gpu or not gpu["available"]:
+            return {"detected": False, "model": "Unknown"}
+        return {"detected": True, "model": gpu["name"]}
+
+    def get_nvidia_vram_gb(self) -> Optional[float]:
+        """Total VRAM of an NVIDIA GPU as reported by nvidia-smi, or None."""
+        gpu = self._get_snapshot()["gpu"]
+        if gpu and gpu["vendor"] == "nvidia" and gpu["memory_gb"]:
+            return round(gpu["memory_gb"], 1)
+        return None
 
     def has_sufficient_hardware(self, min_ram_gb: int = 4) -> bool:
         """
@@ -183,11 +170,11 @@ class HardwareDetector:
 
 _hardware_detector_instance = None
 
-def get_hardware_detector():
+def get_hardware_detector(usb_path: Optional[Path] = None):
     """Singleton accessor for the HardwareDetector object"""
     global _hardware_detector_instance
     if _hardware_detector_instance is None:
-        _hardware_detector_instance = HardwareDetector()
+        _hardware_detector_instance = HardwareDetector(usb_path)
     return _hardware_detector_instance
 
 def get_total_vram_gb() -> float:
@@ -211,21 +198,9 @@ def get_total_vram_gb() -> float:
         return min(detector.total_ram_gb * 0.5, 16.0)
 
     # For dedicated GPUs, try to query via command line
-    try:
-        if system == "Windows":
-            # Try to get VRAM from nvidia-smi first
-            command = "nvidia-smi --query-gpu=memory.total --format=csv,noheader,nounits"
-            result = subprocess.run(command, capture_output=True, text=True, shell=True)
-            if result.returncode == 0:
-                return round(int(result.stdout.strip()) / 1024, 1)
-        elif system == "Linux":
-            command = "nvidia-smi --query-gpu=memory.total --format=csv,noheader,nounits"
-            result = subprocess.run(command, capture_output=True, text=True, shell=True)
-            if result.returncode == 0:
-                return round(int(result.stdout.strip()) / 1024, 1)
-    except (FileNotFoundError, ValueError, subprocess.CalledProcessError):
-        # nvidia-smi might not be present or fail
-        pass
+    nvidia_vram_gb = detector.get_nvidia_vram_gb()
+    if nvidia_vram_gb is not None:
+        return nvidia_vram_gb
 
     # Fallback for non-NVIDIA or when nvidia-smi fails
     # This is a very rough estimate.
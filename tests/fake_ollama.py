@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Fake Ollama endpoint for tests
+Serves the subset of the Ollama HTTP API used by Sunflower AI from a thread
+"""
+
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class FakeOllama:
+    """
+    Minimal in-process Ollama server
+    Tracks loaded models and records every request it receives
+    """
+
+    def __init__(self, models: Optional[List[str]] = None,
+                 load_delay: float = 0.0, token_delay: float = 0.0,
+                 tokens_per_second: Optional[Dict[str, float]] = None,
+                 model_sizes: Optional[Dict[str, int]] = None):
+        self.models = list(models or [])
+        self.load_delay = load_delay
+        self.token_delay = token_delay
+        self.tokens_per_second = tokens_per_second or {}
+        self.model_sizes = model_sizes or {}
+        self.loaded: Dict[str, float] = {}
+        self.requests: List[Dict] = []
+        self._lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, payload: Dict, status: int = 200) -> None:
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == '/api/tags':
+                    self._send_json({'models': [{'name': m} for m in fake.models]})
+                elif self.path == '/api/ps':
+                    self._send_json({'models': [
+                        {'name': m, 'size': fake.model_sizes.get(m, 0)} for m in fake.loaded
+                    ]})
+                else:
+                    self._send_json({'error': 'not found'}, 404)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                with fake._lock:
+                    fake.requests.append({'path': self.path, **payload})
+
+                if self.path != '/api/generate':
+                    self._send_json({'error': 'not found'}, 404)
+                    return
+
+                model = payload.get('model')
+                if model not in fake.models:
+                    self._send_json({'error': f"model '{model}' not found"}, 404)
+                    return
+
+                if payload.get('keep_alive') == 0:
+                    fake.loaded.pop(model, None)
+                    self._send_json({'model': model, 'done': True, 'done_reason': 'unload'})
+                    return
+
+                if model not in fake.loaded:
+                    time.sleep(fake.load_delay)
+                    fake.loaded[model] = time.time()
+
+                if not payload.get('prompt'):
+                    self._send_json({'model': model, 'response': '', 'done': True})
+                    return
+
+                num_predict = payload.get('options', {}).get('num_predict', 8)
+                delay = fake.token_delay
+                if model in fake.tokens_per_second:
+                    delay = 1.0 / fake.tokens_per_second[model]
+
+                if payload.get('stream', True):
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/x-ndjson')
+                    self.end_headers()
+                    for _ in range(num_predict):
+                        time.sleep(delay)
+                        self.wfile.write(json.dumps(
+                            {'model': model, 'response': 'ok ', 'done': False}
+                        ).encode('utf-8') + b'\n')
+                        self.wfile.flush()
+                    self.wfile.write(json.dumps({
+                        'model': model, 'response': '', 'done': True,
+                        'eval_count': num_predict,
+                        'eval_duration': int(num_predict * delay * 1e9)
+                    }).encode('utf-8') + b'\n')
+                else:
+                    time.sleep(delay * num_predict)
+                    self._send_json({
+                        'model': model, 'response': 'ok ' * num_predict, 'done': True,
+                        'eval_count': num_predict,
+                        'eval_duration': int(num_predict * delay * 1e9)
+                    })
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> 'FakeOllama':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def requests_for(self, path: str) -> List[Dict]:
+        """Get recorded requests for an API path"""
+        with self._lock:
+            return [r for r in self.requests if r['path'] == path]
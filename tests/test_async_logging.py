@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the queue-based asynchronous logging backend
+"""
+
+import sys
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.async_logging import AsyncLogBackend, setup_async_logging
+
+
+class BlockingHandler(logging.Handler):
+    """Handler that waits until released and remembers what it saw"""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.gate.wait(5)
+        self.threads.add(threading.current_thread().name)
+        self.messages.append(record.getMessage())
+
+
+class TestAsyncLogBackend(unittest.TestCase):
+    """Test AsyncLogBackend"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.logger = logging.getLogger(f"sunflower.test.{self.id()}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_stop_flushes_queued_records(self):
+        """Everything logged before stop() reaches the rotated log file"""
+        log_file = self.work_dir / "logs" / "manufacturing.log"
+        backend = setup_async_logging(self.logger, log_file=log_file)
+
+        for i in range(500):
+            self.logger.info("device %d produced", i)
+        backend.stop()
+
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 500)
+        self.assertTrue(lines[-1].endswith("device 499 produced"))
+        self.assertFalse(self.logger.handlers)
+
+    def test_formatting_happens_on_listener_thread(self):
+        """Handlers run off the calling thread"""
+        handler = BlockingHandler()
+        handler.gate.set()
+        backend = AsyncLogBackend([handler])
+        backend.attach(self.logger)
+
+        self.logger.info("hello %s", "world")
+        backend.stop()
+
+        self.assertEqual(handler.messages, ["hello world"])
+        self.assertNotIn(threading.current_thread().name, handler.threads)
+
+    def test_full_queue_drops_and_counts(self):
+        """Routine records are dropped, counted and reported when the queue is full"""
+        handler = BlockingHandler()
+        backend = AsyncLogBackend([handler], queue_size=5)
+        backend.attach(self.logger)
+
+        for i in range(50):
+            self.logger.info("line %d", i)
+        dropped = backend.stats["dropped"]
+        self.assertGreater(dropped, 0)
+        self.assertEqual(backend.stats["dropped_by_level"], {"INFO": dropped})
+
+        handler.gate.set()
+        backend.stop()
+        self.assertEqual(len(handler.messages), 50 - dropped + 1)
+        summaries = [m for m in handler.messages if m.startswith("Dropped")]
+        self.assertEqual(summaries, [f"Dropped {dropped} log records because the log queue was full"])
+
+    def test_log_file_rotates(self):
+        """The log file is rotated by size"""
+        log_file = self.work_dir / "pipeline.log"
+        backend = setup_async_logging(self.logger, log_file=log_file,
+                                      max_bytes=2048, backup_count=2)
+        for i in range(200):
+            self.logger.info("rotation line %d", i)
+        backend.stop()
+
+        self.assertTrue((self.work_dir / "pipeline.log.1").exists())
+        self.assertLessEqual(log_file.stat().st_size, 2048)
+
+
+if __name__ == '__main__':
+    unittest.main()
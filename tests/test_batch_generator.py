@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Test concurrent device production, checkpointing and resume in the batch generator
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from production.batch_generator import BatchManufacturingGenerator, DeviceResult, DeviceStatus
+from production.create_iso import read_identity_block, decode_identity_block, USB_IDENTITY_OFFSET
+from production.prepare_usb_partition import USBPartitionPreparer
+
+BATCH_ID = 'BATCH-20250101-001'
+
+
+class TestBatchGenerator(unittest.TestCase):
+    """Test BatchManufacturingGenerator device production"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_batch_"))
+
+        # Sparse master images just above the per-device validation minimums
+        self.iso_path = self.work_dir / "master.iso"
+        self.usb_path = self.work_dir / "master_usb.img"
+        with open(self.iso_path, "wb") as f:
+            f.truncate(100 * 1024 * 1024)
+        with open(self.usb_path, "wb") as f:
+            f.truncate(10 * 1024 * 1024)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def make_generator(self, batch_size: int = 6, **kwargs) -> BatchManufacturingGenerator:
+        generator = BatchManufacturingGenerator(
+            batch_size=batch_size, batch_id=BATCH_ID, continue_on_error=True, **kwargs
+        )
+        generator.manufacturing_dir = self.work_dir
+        generator.batch_dir = self.work_dir / "batches" / BATCH_ID
+        generator.recovery_dir = generator.batch_dir / "recovery"
+        generator.retry_backoff_initial = 0.01
+        generator.iso_path = self.iso_path
+        generator.usb_image_path = self.usb_path
+        generator.batch_manifest["components"]["master_iso"] = {"checksum": "0" * 64}
+
+        for i in range(batch_size):
+            device_id = f"{BATCH_ID}-{i + 1:04d}"
+            generator.device_results[device_id] = DeviceResult(device_id, DeviceStatus.PENDING)
+        return generator
+
+    def read_checkpoint(self, generator: BatchManufacturingGenerator) -> dict:
+        return json.loads((generator.recovery_dir / "batch_recovery.json").read_text())
+
+    def test_devices_produced_concurrently(self):
+        """Several devices are in production at once, bounded by the worker count"""
+        generator = self.make_generator(workers=3)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+        release = threading.Barrier(3, timeout=5)
+        original = generator._process_single_device
+
+        def tracked(device):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                release.wait()
+            except threading.BrokenBarrierError:
+                pass
+            try:
+                return original(device)
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        with patch.object(generator, '_process_single_device', side_effect=tracked):
+            generator._process_devices_with_recovery()
+
+        self.assertEqual(peak[0], 3)
+        self.assertEqual(len(generator.successful_devices), 6)
+        for device in generator.device_results.values():
+            self.assertEqual(device.status, DeviceStatus.SUCCESS)
+            self.assertTrue(device.identity_path.exists())
+
+    def test_every_device_is_checkpointed(self):
+        generator = self.make_generator()
+        generator._process_devices_with_recovery()
+
+        checkpoint = self.read_checkpoint(generator)
+        self.assertEqual(len(checkpoint["successful_devices"]), 6)
+        self.assertTrue(all(d["status"] == "success"
+                            for d in checkpoint["device_results"].values()))
+        self.assertIn("units_per_hour", checkpoint["batch_manifest"]["statistics"])
+
+    def test_resume_skips_finished_devices(self):
+        """A rerun of the batch only produces devices that did not finish"""
+        first = self.make_generator()
+        finished = list(first.device_results.values())[:4]
+        for device in finished:
+            first._produce_device(device)
+
+        resumed = self.make_generator()
+        self.assertEqual(resumed._load_recovery_state(), 4)
+
+        with patch.object(resumed, '_process_single_device',
+                          wraps=resumed._process_single_device) as process:
+            resumed._process_devices_with_recovery()
+
+        produced = {call.args[0].device_id for call in process.call_args_list}
+        self.assertEqual(produced, {f"{BATCH_ID}-0005", f"{BATCH_ID}-0006"})
+        self.assertEqual(len(resumed.successful_devices), 6)
+
+    def test_resume_redoes_devices_whose_outputs_are_gone(self):
+        first = self.make_generator(batch_size=2)
+        first._process_devices_with_recovery()
+        first.device_results[f"{BATCH_ID}-0001"].identity_path.unlink()
+
+        self.assertEqual(self.make_generator(batch_size=2)._load_recovery_state(), 1)
+
+    def test_false_result_marks_device_failed(self):
+        """A device whose production reports failure ends FAILED, not IN_PROGRESS"""
+        generator = self.make_generator(batch_size=2, max_retries=2)
+
+        with patch.object(generator, '_process_single_device', return_value=False):
+            generator._process_devices_with_recovery()
+
+        for device in generator.device_results.values():
+            self.assertEqual(device.status, DeviceStatus.FAILED)
+            self.assertEqual(device.attempts, 2)
+        self.assertEqual(sorted(generator.failed_devices), sorted(generator.device_results))
+        self.assertEqual(generator.batch_manifest["statistics"]["failed"], 2)
+        self.assertTrue(all(d["status"] == "failed"
+                            for d in self.read_checkpoint(generator)["device_results"].values()))
+
+    def test_retry_recovers_transient_failure(self):
+        generator = self.make_generator(batch_size=1)
+        original = generator._process_single_device
+        outcomes = iter([RuntimeError("disk busy")])
+
+        def flaky(device):
+            for error in outcomes:
+                raise error
+            return original(device)
+
+        with patch.object(generator, '_process_single_device', side_effect=flaky):
+            generator._process_devices_with_recovery()
+
+        device = generator.device_results[f"{BATCH_ID}-0001"]
+        self.assertEqual(device.status, DeviceStatus.SUCCESS)
+        self.assertEqual(device.attempts, 2)
+        self.assertEqual(generator.batch_manifest["statistics"]["retried"], 1)
+
+    def test_write_device_stamps_its_identity(self):
+        """Both partitions are written from the masters with this device's identity"""
+        generator = self.make_generator(batch_size=2)
+        generator._process_devices_with_recovery()
+
+        cdrom, usb = self.work_dir / "cdrom.img", self.work_dir / "usb.img"
+        written = generator.write_device(f"{BATCH_ID}-0002", cdrom, usb)
+
+        self.assertEqual(written, self.iso_path.stat().st_size + self.usb_path.stat().st_size)
+        self.assertEqual(read_identity_block(cdrom)["device_id"], f"{BATCH_ID}-0002")
+        usb_identity = read_identity_block(usb, USB_IDENTITY_OFFSET)
+        self.assertEqual(usb_identity["device_id"], f"{BATCH_ID}-0002")
+        self.assertEqual(len(usb_identity["device_token"]), 64)
+        self.assertNotIn("device_token", read_identity_block(cdrom))
+
+    def test_usb_tokens_differ_per_device(self):
+        generator = self.make_generator(batch_size=3)
+        generator._process_devices_with_recovery()
+
+        tokens = set()
+        for device in generator.device_results.values():
+            block = generator._usb_identity_path(device.identity_path).read_bytes()
+            tokens.add(decode_identity_block(block)["device_token"])
+        self.assertEqual(len(tokens), 3)
+
+    def test_write_device_requires_produced_device(self):
+        generator = self.make_generator(batch_size=1)
+
+        with self.assertRaises(ValueError):
+            generator.write_device(f"{BATCH_ID}-0001", self.work_dir / "cdrom.img", self.work_dir / "usb.img")
+        self.assertFalse((self.work_dir / "cdrom.img").exists())
+
+    def test_master_usb_keyed_on_inputs_and_batch(self):
+        """The master USB image is reused only for the same inputs and batch"""
+        builds = []
+
+        def prepare(preparer, output_format):
+            image = self.work_dir / f"usb_{len(builds)}.img"
+            image.write_bytes(preparer.batch_id.encode("utf-8"))
+            builds.append(preparer.batch_id)
+            return image
+
+        with patch.object(USBPartitionPreparer, 'prepare', autospec=True, side_effect=prepare):
+            generator = self.make_generator(batch_size=1)
+            generator.master_dir = self.work_dir / "master_files"
+            generator.master_dir.mkdir()
+            first = generator.create_master_usb()
+            self.assertEqual(generator.create_master_usb(), first)
+            self.assertEqual(len(builds), 1)
+
+            other = BatchManufacturingGenerator(batch_size=1, batch_id='BATCH-20250101-002')
+            other.master_dir = generator.master_dir
+            other_master = other.create_master_usb()
+            self.assertNotEqual(other_master, first)
+            self.assertEqual(other_master.read_text(), 'BATCH-20250101-002')
+
+            with patch.object(USBPartitionPreparer, 'input_digest', return_value='f' * 64):
+                self.assertNotEqual(generator.create_master_usb(), first)
+            self.assertEqual(len(builds), 3)
+        self.assertEqual(generator.batch_manifest["components"]["master_usb"]["identity_offset"],
+                         USB_IDENTITY_OFFSET)
+
+if __name__ == '__main__':
+    unittest.main()
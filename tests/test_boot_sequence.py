@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the launcher boot sequence dependency graph
+"""
+
+import sys
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'launchers'))
+
+from launcher_common import BootSequence
+
+
+class TestBootSequence(unittest.TestCase):
+    """Test BootSequence"""
+
+    def setUp(self):
+        self.log_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def test_independent_steps_run_concurrently(self):
+        """Three 0.2s independent steps should take about 0.2s, not 0.6s"""
+        boot = BootSequence()
+        for name in ('a', 'b', 'c'):
+            boot.add_task(name, lambda: time.sleep(0.2))
+
+        start = time.perf_counter()
+        self.assertTrue(boot.run())
+        self.assertLess(time.perf_counter() - start, 0.45)
+
+    def test_dependencies_and_critical_path(self):
+        """Steps wait for dependencies; the critical path follows the slow chain"""
+        order = []
+        boot = BootSequence()
+        boot.add_task('install', lambda: (time.sleep(0.1), order.append('install')))
+        boot.add_task('hardware', lambda: order.append('hardware'))
+        boot.add_task('serve', lambda: (time.sleep(0.1), order.append('serve')),
+                      depends_on=['install'])
+        boot.add_task('models', lambda: order.append('models'),
+                      depends_on=['serve', 'hardware'])
+
+        self.assertTrue(boot.run())
+        self.assertLess(order.index('serve'), order.index('models'))
+        self.assertEqual(boot.critical_path(), ['install', 'serve', 'models'])
+
+    def test_failure_skips_dependents(self):
+        """A failed step skips its dependents; optional failures do not fail boot"""
+        boot = BootSequence()
+        boot.add_task('serve', lambda: False)
+        boot.add_task('models', lambda: True, depends_on=['serve'])
+        boot.add_task('profiles', lambda: 1 / 0, required=False)
+
+        self.assertFalse(boot.run())
+        self.assertEqual(boot.tasks['models'].status, 'skipped')
+        self.assertEqual(boot.tasks['profiles'].status, 'failed')
+        self.assertFalse(boot.wait_for('models', timeout=0))
+
+    def test_cycle_rejected(self):
+        """Cyclic dependencies are a configuration error"""
+        boot = BootSequence()
+        boot.add_task('a', lambda: True, depends_on=['b'])
+        boot.add_task('b', lambda: True, depends_on=['a'])
+        with self.assertRaises(ValueError):
+            boot.run()
+
+    def test_trace_written_to_logs(self):
+        """The trace records per-step timings and the critical path"""
+        boot = BootSequence('startup')
+        boot.add_task('a', lambda: True)
+        boot.add_task('b', lambda: True, depends_on=['a'])
+        boot.run()
+
+        trace_file = boot.write_trace(self.log_dir)
+        trace = json.loads(trace_file.read_text())
+        self.assertEqual(trace['critical_path'], ['a', 'b'])
+        self.assertEqual([s['name'] for s in trace['steps']], ['a', 'b'])
+        self.assertTrue(all(s['duration'] is not None for s in trace['steps']))
+        self.assertTrue((self.log_dir / 'startup_history.jsonl').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
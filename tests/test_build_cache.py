@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the incremental build step cache
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.build_cache import BuildCache, BuildStep
+from src.file_hashing import FileHasher
+
+
+class TestBuildCache(unittest.TestCase):
+    """Test BuildCache"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.sources = self.work_dir / "modelfiles"
+        self.sources.mkdir()
+        (self.sources / "kids.modelfile").write_text("FROM llama3.2:1b")
+        (self.sources / "__pycache__").mkdir()
+        self.output = self.work_dir / "build_output" / "models.json"
+        self.runs = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def cache(self):
+        return BuildCache(self.work_dir / ".build_cache", base=self.work_dir,
+                          hasher=FileHasher(cache_path=None))
+
+    def step(self, **params):
+        def run():
+            self.runs += 1
+            self.output.parent.mkdir(exist_ok=True)
+            self.output.write_text(str(sorted(p.name for p in self.sources.iterdir())))
+            return True
+        return BuildStep("models", run=run, inputs=[self.sources],
+                         outputs=[self.output], params=params)
+
+    def test_unchanged_inputs_are_cached(self):
+        """The second build skips the step and reports it as a hit"""
+        self.assertTrue(self.cache().run(self.step()))
+        cache = self.cache()
+        self.assertTrue(cache.run(self.step()))
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(cache.summary()["cache_hits"], 1)
+        self.assertIn("1 of 1 steps cached", cache.report())
+
+    def test_changes_rebuild(self):
+        """Changed inputs, settings or outputs rebuild the step; ignored files do not"""
+        self.cache().run(self.step())
+
+        (self.sources / "__pycache__" / "x.pyc").write_bytes(b"\0")
+        self.cache().run(self.step())
+        self.assertEqual(self.runs, 1)
+
+        (self.sources / "kids.modelfile").write_text("FROM llama3.2:3b")
+        self.cache().run(self.step())
+        self.assertEqual(self.runs, 2)
+
+        self.cache().run(self.step(version="6.3.0"))
+        self.assertEqual(self.runs, 3)
+
+        self.output.write_text("tampered")
+        self.cache().run(self.step(version="6.3.0"))
+        self.assertEqual(self.runs, 4)
+
+    def test_failed_step_is_not_cached(self):
+        """A failing step runs again next time"""
+        failing = BuildStep("pyinstaller", run=lambda: False, inputs=[self.sources])
+        cache = self.cache()
+        self.assertFalse(cache.run(failing))
+        self.assertFalse(cache.run(failing))
+        self.assertEqual(cache.summary()["cache_hits"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test incremental model variant builds and compile worker limits
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch, Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'build'))
+
+from src.file_hashing import FileHasher
+import create_models
+from create_models import ModelCompiler
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+
+class TestModelCompilerCache(unittest.TestCase):
+    """Test ModelCompiler variant caching and worker sizing"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_models_"))
+        self.build_dir = self.work_dir / "build"
+        (self.build_dir / "modelfiles").mkdir(parents=True)
+        self.kids_modelfile = self.build_dir / "modelfiles" / "Sunflower_AI_Kids.modelfile"
+        self.kids_modelfile.write_text("FROM llama3.2\nSYSTEM You help kids learn science.\n")
+        (self.build_dir / "modelfiles" / "Sunflower_AI_Educator.modelfile").write_text(
+            "FROM llama3.2\nSYSTEM You help educators plan lessons.\n"
+        )
+        self.output_dir = self.work_dir / "output"
+
+        self.digests = {v['name']: f"digest-{v['size']}" for v in ModelCompiler.MODEL_VARIANTS.values()}
+        self.compiled = []
+
+        for patcher in [
+            patch.object(ModelCompiler, '_check_ollama', return_value=True),
+            patch('create_models.shutil.disk_usage', return_value=Mock(free=100 * GB)),
+            patch('create_models.get_file_hasher', side_effect=lambda: FileHasher(cache_path=None)),
+            patch.object(ModelCompiler, '_base_model_digests', side_effect=lambda: dict(self.digests)),
+            patch.object(ModelCompiler, '_compile_workers', return_value=1),
+            patch.object(ModelCompiler, 'compile_model_variant', autospec=True,
+                         side_effect=self.fake_compile),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def fake_compile(self, compiler, variant_name, modelfile_path, model_suffix, modelfile_content=None):
+        """Stand-in for ollama create + export that writes the real output layout"""
+        model_name = f"sunflower_{model_suffix}_{variant_name}"
+        self.compiled.append(model_name)
+
+        export_path = compiler.models_dir / f"{model_name}.gguf"
+        export_path.write_bytes(modelfile_content.encode("utf-8"))
+        (compiler.models_dir / model_name).mkdir(exist_ok=True)
+        (compiler.models_dir / model_name / "blob").write_text(modelfile_content)
+        manifest_path = compiler.manifests_dir / f"{model_name}.json"
+        manifest_path.write_text(json.dumps({'checksum': model_name}))
+
+        return {
+            'name': model_name,
+            'variant': variant_name,
+            'path': str(export_path),
+            'manifest': str(manifest_path),
+            'checksum': model_name,
+            'size_mb': export_path.stat().st_size / MB,
+            'success': True
+        }
+
+    def build(self):
+        self.compiled = []
+        compiler = ModelCompiler(self.build_dir, self.output_dir)
+        try:
+            return compiler.compile_all_models()
+        finally:
+            compiler.cleanup()
+
+    def test_unchanged_variants_are_reused(self):
+        """A second build with identical inputs compiles nothing"""
+        first = self.build()
+        self.assertEqual(len(self.compiled), 8)
+        self.assertEqual(first['summary']['rebuilt'], 8)
+
+        second = self.build()
+        self.assertEqual(self.compiled, [])
+        self.assertEqual(second['summary']['reused'], 8)
+        self.assertEqual(second['summary']['successful'], 8)
+        self.assertTrue(all(r['cached'] for r in second['kids'] + second['educator']))
+
+        deployment = json.loads((self.output_dir / 'deployment_manifest.json').read_text())
+        self.assertEqual(len(deployment['build_cache']['reused']), 8)
+
+    def test_modelfile_change_rebuilds_its_variants(self):
+        """Editing the kids modelfile rebuilds only the kids variants"""
+        self.build()
+        self.kids_modelfile.write_text("FROM llama3.2\nSYSTEM You help kids learn math.\n")
+
+        results = self.build()
+        self.assertEqual(sorted(self.compiled),
+                         sorted(f"sunflower_kids_{name}" for name in ModelCompiler.MODEL_VARIANTS))
+        self.assertEqual(results['summary']['rebuilt'], 4)
+        self.assertEqual(results['summary']['reused'], 4)
+
+    def test_base_model_update_rebuilds_its_variants(self):
+        self.build()
+        self.digests['llama3.2:7b'] = 'digest-new'
+
+        self.build()
+        self.assertEqual(sorted(self.compiled),
+                         ['sunflower_educator_high_end', 'sunflower_kids_high_end'])
+
+    def test_missing_output_rebuilds_variant(self):
+        self.build()
+        (self.output_dir / 'models' / 'sunflower_kids_low_end.gguf').unlink()
+
+        self.build()
+        self.assertEqual(self.compiled, ['sunflower_kids_low_end'])
+
+
+class TestCompileWorkers(unittest.TestCase):
+    """Test ModelCompiler._compile_workers limits"""
+
+    def setUp(self):
+        self.compiler = ModelCompiler.__new__(ModelCompiler)
+        self.all_variants = list(ModelCompiler.MODEL_VARIANTS) * 2
+
+    def workers(self, variant_names, available_mb, disk_mbps, cpus=8):
+        with patch('psutil.virtual_memory', return_value=Mock(available=available_mb * MB)), \
+                patch.object(self.compiler, '_probe_disk_mbps', return_value=disk_mbps), \
+                patch('create_models.os.cpu_count', return_value=cpus):
+            return self.compiler._compile_workers(variant_names)
+
+    def test_memory_limits_workers(self):
+        """Each job needs 1.5x the largest model in RAM"""
+        self.assertEqual(self.workers(self.all_variants, 8 * 1024, 2000), 1)
+        self.assertEqual(self.workers(self.all_variants, 14 * 1024, 2000), 2)
+        self.assertEqual(self.workers(['low_end', 'minimum'] * 2, 4 * 1024, 2000), 3)
+
+    def test_disk_speed_limits_workers(self):
+        self.assertEqual(self.workers(self.all_variants, 64 * 1024, 150), 1)
+        self.assertEqual(self.workers(self.all_variants, 64 * 1024, 650), 3)
+
+    def test_fixed_caps(self):
+        """Never more than the jobs, the CPUs or MAX_COMPILE_WORKERS"""
+        self.assertEqual(self.workers(self.all_variants, 256 * 1024, 5000), ModelCompiler.MAX_COMPILE_WORKERS)
+        self.assertEqual(self.workers(['minimum', 'low_end'], 256 * 1024, 5000), 2)
+        self.assertEqual(self.workers(self.all_variants, 256 * 1024, 5000, cpus=2), 2)
+
+    def test_unmeasured_disk_is_not_a_limit(self):
+        self.assertEqual(self.workers(self.all_variants, 256 * 1024, None), ModelCompiler.MAX_COMPILE_WORKERS)
+        self.assertEqual(self.workers([], 256 * 1024, None), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test the resumable, verified family data transfer
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import data_transfer
+from src.data_transfer import TransferEngine, JOURNAL_NAME, PARTIAL_SUFFIX
+
+DIRECTORIES = ["family_profiles", "conversation_logs"]
+
+
+class TestTransferEngine(unittest.TestCase):
+    """Test TransferEngine"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.source = self.work_dir / "old_usb"
+        self.target = self.work_dir / "new_usb"
+        self.target.mkdir()
+
+        (self.source / "family_profiles").mkdir(parents=True)
+        (self.source / "conversation_logs" / "2025").mkdir(parents=True)
+        (self.source / "family_profiles" / "alex.json").write_text(json.dumps({"name": "Alex"}))
+        (self.source / "conversation_logs" / "2025" / "march.log").write_bytes(os.urandom(300000))
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def engine(self, **kwargs):
+        return TransferEngine(self.source, self.target, DIRECTORIES, buffer_size=4096, **kwargs)
+
+    def test_copy_and_verify(self):
+        """Files arrive intact and the progress reaches 100%"""
+        updates = []
+        engine = self.engine(progress_callback=updates.append)
+        stats = engine.run()
+
+        self.assertEqual(stats["copied"], 2)
+        for relative in ("family_profiles/alex.json", "conversation_logs/2025/march.log"):
+            self.assertEqual((self.target / relative).read_bytes(), (self.source / relative).read_bytes())
+        self.assertEqual(updates[-1].percent, 100.0)
+        self.assertEqual(engine.verify(), (True, []))
+
+    def test_resume_after_interruption(self):
+        """A rerun continues the interrupted file from its last checkpoint"""
+        log = "conversation_logs/2025/march.log"
+        source_bytes = (self.source / log).read_bytes()
+
+        real_save = TransferEngine._save_journal
+
+        def yank_after_checkpoint(engine):
+            real_save(engine)
+            if engine.journal["files"].get(log, {}).get("offset"):
+                raise OSError("device removed")
+
+        with mock.patch.object(data_transfer, "CHECKPOINT_BYTES", 100000), \
+                mock.patch.object(TransferEngine, "_save_journal", yank_after_checkpoint):
+            with self.assertRaises(OSError):
+                self.engine().run()
+
+        partial = self.target / (log + PARTIAL_SUFFIX)
+        self.assertTrue(partial.exists())
+        journal = json.loads((self.target / JOURNAL_NAME).read_text())
+        self.assertEqual(journal["files"][log]["offset"], 102400)
+        self.assertIn("digest", journal["files"]["family_profiles/alex.json"])
+
+        engine = self.engine()
+        stats = engine.run()
+        self.assertEqual(stats, {"copied": 1, "resumed": 1, "skipped": 1})
+        self.assertEqual(engine.progress.bytes_copied, len(source_bytes) - 102400)
+        self.assertFalse(partial.exists())
+        self.assertEqual((self.target / log).read_bytes(), source_bytes)
+        self.assertEqual(engine.verify(), (True, []))
+
+    def test_skips_matching_files(self):
+        """Files already on the target with the same contents are not copied"""
+        shutil.copytree(self.source / "family_profiles", self.target / "family_profiles")
+        stats = self.engine().run()
+        self.assertEqual(stats, {"copied": 1, "resumed": 0, "skipped": 1})
+
+    def test_verify_detects_corruption(self):
+        """A target file that no longer matches the source digest fails verification"""
+        engine = self.engine()
+        engine.run()
+
+        corrupted = self.target / "conversation_logs" / "2025" / "march.log"
+        data = bytearray(corrupted.read_bytes())
+        data[1000] ^= 0xFF
+        corrupted.write_bytes(bytes(data))
+        (self.target / "family_profiles" / "alex.json").unlink()
+
+        verified, problems = engine.verify()
+        self.assertFalse(verified)
+        self.assertEqual(sorted(problems), [
+            "Checksum mismatch: conversation_logs/2025/march.log",
+            "Missing on target: family_profiles/alex.json"
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test per-device identity blocks stamped into the master ISO
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from production.create_iso import (
+    build_identity_block, decode_identity_block, read_identity_block, write_device_image,
+    IDENTITY_MAGIC, IDENTITY_OFFSET, IDENTITY_REGION_SIZE, USB_IDENTITY_OFFSET, DEVICE_WRITE_CHUNK
+)
+
+IDENTITY = {
+    "device_id": "BATCH-20250101-001-0007",
+    "serial": "SAI1010010007",
+    "batch_id": "BATCH-20250101-001",
+    "master_iso_checksum": "0" * 64
+}
+
+
+class TestDeviceIdentity(unittest.TestCase):
+    """Test identity block encoding and device image writing"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_identity_"))
+
+        # Master larger than one write chunk, with an empty identity region
+        self.master = self.work_dir / "master.iso"
+        content = bytearray(os.urandom(DEVICE_WRITE_CHUNK + 100 * 1024))
+        content[IDENTITY_OFFSET:IDENTITY_OFFSET + IDENTITY_REGION_SIZE] = bytes(IDENTITY_REGION_SIZE)
+        self.master_bytes = bytes(content)
+        self.master.write_bytes(self.master_bytes)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_block_round_trip(self):
+        block = build_identity_block(IDENTITY)
+
+        self.assertEqual(len(block), IDENTITY_REGION_SIZE)
+        self.assertTrue(block.startswith(IDENTITY_MAGIC))
+        self.assertEqual(decode_identity_block(block), IDENTITY)
+
+    def test_unstamped_region_decodes_to_none(self):
+        self.assertIsNone(decode_identity_block(bytes(IDENTITY_REGION_SIZE)))
+
+    def test_oversized_identity_rejected(self):
+        with self.assertRaises(ValueError):
+            build_identity_block({"device_id": "x" * IDENTITY_REGION_SIZE})
+
+    def test_written_image_differs_only_in_identity_region(self):
+        """The device image is the master with the identity stamped in place"""
+        target = self.work_dir / "device.img"
+        written = write_device_image(self.master, build_identity_block(IDENTITY), target)
+
+        image = target.read_bytes()
+        self.assertEqual(written, len(self.master_bytes))
+        self.assertEqual(len(image), len(self.master_bytes))
+        self.assertEqual(image[:IDENTITY_OFFSET], self.master_bytes[:IDENTITY_OFFSET])
+        end = IDENTITY_OFFSET + IDENTITY_REGION_SIZE
+        self.assertEqual(image[end:], self.master_bytes[end:])
+        self.assertEqual(read_identity_block(target), IDENTITY)
+
+    def test_usb_offset_round_trip(self):
+        """A USB image is stamped at its own offset and the ISO region is untouched"""
+        usb_master = self.work_dir / "usb_master.img"
+        usb_master.write_bytes(bytes(64 * 1024))
+        target = self.work_dir / "usb.img"
+
+        write_device_image(usb_master, build_identity_block(IDENTITY), target, USB_IDENTITY_OFFSET)
+
+        self.assertEqual(read_identity_block(target, USB_IDENTITY_OFFSET), IDENTITY)
+        self.assertIsNone(read_identity_block(target))
+
+    def test_existing_larger_image_is_truncated(self):
+        """Rewriting a previously larger image leaves no stale tail"""
+        target = self.work_dir / "device.img"
+        target.write_bytes(b"\xff" * (len(self.master_bytes) * 2))
+
+        write_device_image(self.master, build_identity_block(IDENTITY), target)
+
+        self.assertEqual(target.stat().st_size, len(self.master_bytes))
+        self.assertEqual(read_identity_block(target), IDENTITY)
+
+    def test_restamping_replaces_previous_identity(self):
+        stamped = self.work_dir / "stamped.iso"
+        write_device_image(self.master, build_identity_block(IDENTITY), stamped)
+
+        other = dict(IDENTITY, device_id="BATCH-20250101-001-0008")
+        target = self.work_dir / "device.img"
+        write_device_image(stamped, build_identity_block(other), target)
+
+        self.assertEqual(read_identity_block(target), other)
+
+    def test_master_using_identity_region_is_refused(self):
+        self.master.write_bytes(os.urandom(64 * 1024))
+
+        with self.assertRaises(RuntimeError):
+            write_device_image(self.master, build_identity_block(IDENTITY), self.work_dir / "device.img")
+
+    @unittest.skipUnless(os.path.exists("/dev/null"), "needs a character device")
+    def test_device_too_small_is_refused(self):
+        """A device node smaller than the master is rejected before writing"""
+        with self.assertRaises(RuntimeError):
+            write_device_image(self.master, build_identity_block(IDENTITY), "/dev/null")
+
+    def test_wrong_block_size_rejected(self):
+        with self.assertRaises(ValueError):
+            write_device_image(self.master, b"short", self.work_dir / "device.img")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test the on-disk embedding cache used by Open WebUI retrieval
+"""
+
+import sys
+import types
+import shutil
+import logging
+import tempfile
+import unittest
+import importlib.util
+from pathlib import Path
+
+MODULE_PATH = (Path(__file__).parent.parent / 'open-webui-main' / 'backend' /
+               'open_webui' / 'retrieval' / 'embedding_cache.py')
+
+
+def load_embedding_cache():
+    """Load the module on its own; the rest of the Open WebUI backend is not needed"""
+    env = types.ModuleType('open_webui.env')
+    env.SRC_LOG_LEVELS = {'RAG': logging.WARNING}
+    spec = importlib.util.spec_from_file_location('embedding_cache', MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # Only the stand-in modules are removed again; numpy stays imported
+    stand_ins = {'open_webui': types.ModuleType('open_webui'), 'open_webui.env': env}
+    stand_ins = {name: stub for name, stub in stand_ins.items() if name not in sys.modules}
+    sys.modules.update(stand_ins)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        for name in stand_ins:
+            del sys.modules[name]
+    return module
+
+
+embedding_cache = load_embedding_cache()
+EmbeddingCache = embedding_cache.EmbeddingCache
+EmbeddingStore = embedding_cache.EmbeddingStore
+content_key = embedding_cache.content_key
+
+NAMESPACE = {'engine': 'ollama', 'model': 'nomic-embed-text', 'prefix': None}
+
+
+def vector(text: str) -> list:
+    """Deterministic 4-dimensional embedding"""
+    return [float(len(text)), float(ord(text[0])), float(sum(map(ord, text)) % 97), 1.0]
+
+
+class FakeBackend:
+    """Embedding backend that records the texts it was asked for"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, texts):
+        self.requests.append(list(texts))
+        return [vector(text) for text in texts]
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test EmbeddingCache and EmbeddingStore"""
+
+    def setUp(self):
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="sunflower_embeddings_"))
+        self.backend = FakeBackend()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def store_dir(self) -> Path:
+        return self.cache_dir / embedding_cache.namespace_id(NAMESPACE)
+
+    def test_only_missing_texts_reach_the_backend(self):
+        cache = EmbeddingCache(self.cache_dir)
+        texts = ['photosynthesis', 'gravity', 'photosynthesis']
+
+        self.assertEqual(cache.embed(NAMESPACE, texts, self.backend), [vector(t) for t in texts])
+        self.assertEqual(self.backend.requests, [['photosynthesis', 'gravity']])
+
+        result = cache.embed(NAMESPACE, ['gravity', 'magnets'], self.backend, batch_size=1)
+        self.assertEqual(result, [vector('gravity'), vector('magnets')])
+        self.assertEqual(self.backend.requests[1:], [['magnets']])
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_cache_survives_restart(self):
+        EmbeddingCache(self.cache_dir).embed(NAMESPACE, ['volcano'], self.backend)
+
+        result = EmbeddingCache(self.cache_dir).embed(NAMESPACE, ['volcano'], self.backend)
+        self.assertEqual(result, [vector('volcano')])
+        self.assertEqual(len(self.backend.requests), 1)
+
+    def test_short_backend_response_returns_none(self):
+        """Fewer vectors than texts fails like the uncached path and caches nothing"""
+        cache = EmbeddingCache(self.cache_dir)
+        short = lambda texts: [vector(text) for text in texts[:-1]]
+
+        self.assertIsNone(cache.embed(NAMESPACE, ['atoms', 'cells'], short))
+        self.assertEqual(len(cache.store(NAMESPACE)), 0)
+
+    def test_failed_backend_returns_none(self):
+        self.assertIsNone(EmbeddingCache(self.cache_dir).embed(NAMESPACE, ['atoms'], lambda texts: None))
+
+    def test_store_opened_before_first_write_sees_other_workers_rows(self):
+        """A store that started with no dimension re-reads meta.json"""
+        reader = EmbeddingStore(self.store_dir(), NAMESPACE)
+        writer = EmbeddingStore(self.store_dir(), NAMESPACE)
+        writer.put_many([content_key('comets')], [vector('comets')], 0.1)
+
+        self.assertIsNone(reader.dim)
+        self.assertEqual(reader.get_many([content_key('comets')]),
+                         {content_key('comets'): vector('comets')})
+        self.assertEqual(reader.dim, 4)
+
+    def test_wrong_dimension_is_not_cached(self):
+        store = EmbeddingStore(self.store_dir(), NAMESPACE)
+        store.put_many([content_key('a')], [[1.0, 2.0]], 0.1)
+        store.put_many([content_key('b')], [[1.0, 2.0, 3.0]], 0.1)
+
+        self.assertEqual(store.get_many([content_key('b')]), {})
+        self.assertEqual(len(store), 1)
+
+    def test_full_store_compacts_keeping_recently_used(self):
+        """Past max_entries the least recently used rows are evicted"""
+        cache = EmbeddingCache(self.cache_dir, max_entries=4)
+        cache.embed(NAMESPACE, ['a1', 'b2', 'c3', 'd4'], self.backend)
+        cache.embed(NAMESPACE, ['a1'], self.backend)
+        cache.embed(NAMESPACE, ['e5'], self.backend)
+
+        store = cache.store(NAMESPACE)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.evicted, 2)
+        self.assertEqual(store.get_many([content_key(t) for t in ['a1', 'e5', 'd4']]),
+                         {content_key(t): vector(t) for t in ['a1', 'e5', 'd4']})
+        self.assertEqual(store.get_many([content_key('b2'), content_key('c3')]), {})
+        self.assertEqual(cache.stats()['stores'][self.store_dir().name]['evicted'], 2)
+
+        # Only the current generation's files remain
+        self.assertEqual(sorted(p.name for p in self.store_dir().glob('*.f32')), ['vectors.1.f32'])
+        self.assertEqual(sorted(p.name for p in self.store_dir().glob('*.bin')), ['index.1.bin'])
+
+        reopened = EmbeddingCache(self.cache_dir, max_entries=4)
+        self.assertEqual(reopened.embed(NAMESPACE, ['a1', 'e5'], self.backend),
+                         [vector('a1'), vector('e5')])
+        self.assertEqual(len(self.backend.requests), 2)
+
+    def test_other_worker_follows_compaction(self):
+        """A worker indexed before another compacted reads and appends to the new files"""
+        other = EmbeddingStore(self.store_dir(), NAMESPACE, max_entries=4)
+        compacting = EmbeddingStore(self.store_dir(), NAMESPACE, max_entries=4)
+        texts = ['a1', 'b2', 'c3', 'd4']
+        compacting.put_many([content_key(t) for t in texts], [vector(t) for t in texts], 0.1)
+        self.assertEqual(other.get_many([content_key('a1')]), {content_key('a1'): vector('a1')})
+
+        compacting.put_many([content_key('e5')], [vector('e5')], 0.1)
+        self.assertEqual(compacting.generation, 1)
+
+        # Still correct from the old mapping, then the new generation on a miss
+        self.assertEqual(other.get_many([content_key('d4')]), {content_key('d4'): vector('d4')})
+        self.assertEqual(other.get_many([content_key('e5')]), {content_key('e5'): vector('e5')})
+        self.assertEqual(other.generation, 1)
+        self.assertNotIn(content_key('a1'), other.index)
+
+        other.put_many([content_key('f6')], [vector('f6')], 0.1)
+        self.assertEqual(compacting.get_many([content_key('f6'), content_key('c3')]),
+                         {content_key('f6'): vector('f6'), content_key('c3'): vector('c3')})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the shared file hasher and its persistent digest cache
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import file_hashing
+from src.file_hashing import FileHasher, hash_file, get_verifying_hasher
+
+
+class TestFileHasher(unittest.TestCase):
+    """Test FileHasher"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.cache_path = self.work_dir / "cache" / "digests.json"
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _write(self, name: str, data: bytes) -> Path:
+        path = self.work_dir / name
+        path.write_bytes(data)
+        return path
+
+    def test_matches_hashlib(self):
+        """Buffered and memory-mapped reads give the standard SHA-256"""
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        path = self._write("model.gguf", data)
+        expected = hashlib.sha256(data).hexdigest()
+
+        self.assertEqual(hash_file(path), expected)
+        with patch.object(file_hashing, 'MMAP_THRESHOLD', 1024):
+            self.assertEqual(hash_file(path, chunk_size=4096), expected)
+        self.assertEqual(hash_file(self._write("empty", b"")), hashlib.sha256(b"").hexdigest())
+
+    def test_unchanged_files_not_rehashed(self):
+        """A second hasher reuses digests from the persistent cache"""
+        files = [self._write(f"f{i}.bin", os.urandom(1024)) for i in range(5)]
+        first = FileHasher(self.cache_path).hash_files(files)
+        self.assertTrue(self.cache_path.exists())
+
+        hasher = FileHasher(self.cache_path)
+        self.assertEqual(hasher.hash_files(files), first)
+        self.assertEqual(hasher.stats['cached_files'], 5)
+        self.assertEqual(hasher.stats['hashed_files'], 0)
+
+    def test_changed_file_rehashed(self):
+        """Rewriting a file invalidates its cached digest"""
+        path = self._write("model.gguf", b"a" * 1000)
+        FileHasher(self.cache_path).hash_file(path)
+
+        path.write_bytes(b"b" * 2000)
+        hasher = FileHasher(self.cache_path)
+        self.assertEqual(hasher.hash_file(path), hashlib.sha256(b"b" * 2000).hexdigest())
+        self.assertEqual(hasher.stats['hashed_files'], 1)
+
+    def test_unreadable_file_reported_as_none(self):
+        """hash_files keeps going when one file is missing"""
+        good = self._write("good.bin", b"data")
+        results = FileHasher(cache_path=None).hash_files([good, self.work_dir / "missing.bin"])
+        self.assertEqual(results[good], hashlib.sha256(b"data").hexdigest())
+        self.assertIsNone(results[self.work_dir / "missing.bin"])
+
+    def test_verifying_hasher_sees_in_place_rewrites(self):
+        """Bytes flipped in place with the mtime restored fool the cache, not verification"""
+        path = self._write("model.gguf", b"a" * 1000)
+        cached = FileHasher(self.cache_path)
+        cached.hash_file(path)
+        stat = path.stat()
+
+        with open(path, "r+b") as f:
+            f.write(b"b")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        tampered = hashlib.sha256(b"b" + b"a" * 999).hexdigest()
+        self.assertNotEqual(cached.hash_file(path), tampered)
+        self.assertEqual(get_verifying_hasher().hash_file(path), tampered)
+        self.assertIsNone(get_verifying_hasher().cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test incremental reflink/hardlink staging of manufacturing images
+"""
+
+import os
+import sys
+import errno
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production"))
+
+from src.file_hashing import FileHasher
+import file_staging
+from file_staging import StagingArea
+
+
+class TestStagingArea(unittest.TestCase):
+    """Test StagingArea"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.source = self.work_dir / "source"
+        self.source.mkdir()
+        self.root = self.work_dir / "staging"
+
+        self.model = self.source / "model.gguf"
+        self.model.write_bytes(os.urandom(64 * 1024))
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _staging(self) -> StagingArea:
+        staging = StagingArea(self.root)
+        staging.hasher = FileHasher(cache_path=None)
+        return staging
+
+    def test_second_run_skips_unchanged_files(self):
+        """Files staged by a previous run are neither copied nor linked again"""
+        first = self._staging()
+        self.assertIn(first.stage_file(self.model, "models/model.gguf"),
+                      ("reflink", "hardlink", "copy"))
+        first.save_manifest()
+
+        second = self._staging()
+        self.assertEqual(second.stage_file(self.model, "models/model.gguf"), "unchanged")
+        self.assertEqual(second.stats["bytes_staged"], 64 * 1024)
+        self.assertEqual(second.stats["bytes_copied"] + second.stats["bytes_linked"], 0)
+
+    def test_touched_but_identical_file_is_skipped(self):
+        """A new mtime with the same content is detected by digest"""
+        first = self._staging()
+        first.stage_file(self.model, "model.gguf")
+        first.save_manifest()
+
+        os.utime(self.model, ns=(0, 0))
+        self.assertEqual(self._staging().stage_file(self.model, "model.gguf"), "unchanged")
+
+    def test_falls_back_to_copy(self):
+        """Without reflinks or hardlinks the file is copied"""
+        staging = self._staging()
+        with patch.object(file_staging, "reflink", return_value=False), \
+                patch("os.link", side_effect=OSError(18, "Invalid cross-device link")):
+            self.assertEqual(staging.stage_file(self.model, "model.gguf"), "copy")
+
+        self.assertEqual((self.root / "model.gguf").read_bytes(), self.model.read_bytes())
+        self.assertEqual(staging.stats["bytes_copied"], 64 * 1024)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "FICLONE is Linux only")
+    def test_failed_reflink_leaves_no_empty_file(self):
+        """An unexpected clone error removes dst, so the fallback can link or copy"""
+        staging = self._staging()
+        with patch("fcntl.ioctl", side_effect=OSError(errno.EIO, "I/O error")):
+            with self.assertRaises(OSError):
+                file_staging.reflink(self.model, self.root / "direct.gguf")
+            self.assertFalse((self.root / "direct.gguf").exists())
+
+            self.assertIn(staging.stage_file(self.model, "model.gguf"), ("hardlink", "copy"))
+
+        self.assertEqual((self.root / "model.gguf").read_bytes(), self.model.read_bytes())
+
+    def test_writes_never_modify_linked_sources(self):
+        """Replacing a hardlinked staged file leaves the source untouched"""
+        staging = self._staging()
+        with patch.object(file_staging, "reflink", return_value=False):
+            staging.stage_file(self.model, "model.gguf")
+        original = self.model.read_bytes()
+
+        staging.write_bytes("model.gguf", b"generated")
+        self.assertEqual(self.model.read_bytes(), original)
+        self.assertEqual((self.root / "model.gguf").read_bytes(), b"generated")
+
+    def test_prune_removes_files_not_staged(self):
+        """Files from a previous run that were not staged again are removed"""
+        first = self._staging()
+        first.stage_file(self.model, "models/old.gguf")
+        first.write_text("docs/README.txt", "hello")
+        first.save_manifest()
+
+        second = self._staging()
+        second.write_text("docs/README.txt", "hello")
+        self.assertEqual(second.prune(), 1)
+        self.assertFalse((self.root / "models").exists())
+        self.assertEqual(second.stats["methods"]["unchanged"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test the persistent hardware snapshot shared by the hardware detectors
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.hardware_snapshot import HardwareSnapshotService, get_snapshot_service
+from src.hardware_detector import HardwareDetector
+
+
+class TestHardwareSnapshot(unittest.TestCase):
+    """Test HardwareSnapshotService"""
+
+    def setUp(self):
+        self.usb_path = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def _probes(self):
+        def gpu():
+            self.calls.append('gpu')
+            return {'name': 'Test GPU', 'vram_gb': 8.0}
+
+        def cpu():
+            self.calls.append('cpu')
+            return 'Test CPU'
+
+        return {'gpu': gpu, 'cpu': cpu}
+
+    def test_probes_run_in_parallel_with_timeouts(self):
+        """Slow probes overlap, and a hung probe is cut off at its timeout"""
+        service = HardwareSnapshotService(self.usb_path)
+        probes = {
+            'a': lambda: time.sleep(0.2) or 'a',
+            'b': lambda: time.sleep(0.2) or 'b',
+            'hung': lambda: time.sleep(2) or 'hung'
+        }
+
+        start = time.perf_counter()
+        results = service.run_probes(probes, timeouts={'hung': 0.3})
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(results, {'a': 'a', 'b': 'b', 'hung': None})
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(service.stats['probe_timeouts'], 1)
+
+    def test_snapshot_reused_across_launches(self):
+        """A later launch in the same boot does not probe again"""
+        first = HardwareSnapshotService(self.usb_path).get('detector', self._probes())
+        self.assertEqual(sorted(self.calls), ['cpu', 'gpu'])
+
+        self.calls.clear()
+        service = HardwareSnapshotService(self.usb_path)
+        second = service.get('detector', self._probes())
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(service.stats['hits'], 1)
+
+    def test_reboot_reuses_snapshot_and_refreshes_in_background(self):
+        """After a reboot the old snapshot is returned while probes re-run"""
+        HardwareSnapshotService(self.usb_path).get('detector', self._probes())
+        self.calls.clear()
+
+        with patch('src.hardware_snapshot.get_boot_id', return_value='another-boot'):
+            service = HardwareSnapshotService(self.usb_path)
+            data = service.get('detector', self._probes())
+            service.wait_for_refresh(timeout=5)
+
+        self.assertEqual(data['cpu'], 'Test CPU')
+        self.assertEqual(service.stats['stale_hits'], 1)
+        self.assertEqual(sorted(self.calls), ['cpu', 'gpu'])
+
+    def test_different_machine_probes_synchronously(self):
+        """A snapshot from a different machine is not used"""
+        HardwareSnapshotService(self.usb_path).get('detector', self._probes())
+        self.calls.clear()
+
+        with patch('src.hardware_snapshot.platform.processor', return_value='Other CPU'):
+            service = HardwareSnapshotService(self.usb_path)
+            service.get('detector', self._probes())
+
+        self.assertEqual(service.stats['misses'], 1)
+        self.assertEqual(sorted(self.calls), ['cpu', 'gpu'])
+
+    def test_namespaces_are_independent(self):
+        """Each detector keeps its own probe results in the shared file"""
+        service = HardwareSnapshotService(self.usb_path)
+        service.get('first', {'x': lambda: 1})
+        service.get('second', {'y': lambda: 2})
+
+        reloaded = HardwareSnapshotService(self.usb_path)
+        self.assertEqual(reloaded.get('first', {'x': lambda: 0}), {'x': 1})
+        self.assertEqual(reloaded.get('second', {'y': lambda: 0}), {'y': 2})
+
+    def test_service_per_usb_path(self):
+        """Each device gets its own service and snapshot file"""
+        other = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.addCleanup(shutil.rmtree, other, True)
+
+        first = get_snapshot_service(self.usb_path)
+        second = get_snapshot_service(other)
+        self.assertIs(get_snapshot_service(self.usb_path), first)
+        self.assertIsNot(first, second)
+
+        second.get('detector', self._probes())
+        self.assertTrue((other / 'cache' / 'hardware_snapshot.json').exists())
+        self.assertFalse((self.usb_path / 'cache' / 'hardware_snapshot.json').exists())
+
+    def test_without_usb_path_nothing_is_written(self):
+        """With no USB partition the snapshot stays in memory"""
+        with patch.dict(os.environ, {'SUNFLOWER_USB_PATH': ''}), \
+                patch('pathlib.Path.home', return_value=self.usb_path):
+            service = HardwareSnapshotService()
+            service.get('detector', self._probes())
+            service.get('detector', self._probes())
+
+        self.assertIsNone(service.snapshot_file)
+        self.assertEqual(service.stats['hits'], 1)
+        self.assertEqual(list(self.usb_path.iterdir()), [])
+
+    def test_detectors_share_system_probes(self):
+        """A detector reads the shared system namespace instead of probing again"""
+        probes = {
+            'cpu': lambda: self.calls.append('cpu') or {
+                'name': 'Test CPU', 'vendor': 'Intel', 'features': ['avx2']
+            },
+            'gpu': lambda: self.calls.append('gpu') or {
+                'available': True, 'vendor': 'nvidia', 'name': 'Test GPU', 'memory_gb': 8.0,
+                'cuda_available': True, 'metal_available': False, 'driver_version': '550'
+            },
+            'is_ssd': lambda: self.calls.append('is_ssd') or True
+        }
+        with patch.dict('src.hardware_snapshot.SYSTEM_PROBES', probes):
+            get_snapshot_service(self.usb_path).get_system()
+            self.calls.clear()
+
+            info = HardwareDetector(self.usb_path).get_system_info()
+
+        self.assertEqual(self.calls, [])
+        self.assertEqual(info['cpu']['name'], 'Test CPU')
+        self.assertEqual(info['gpu']['memory_gb'], 8.0)
+        self.assertTrue(info['storage']['is_ssd'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the streaming top-k merge of Open WebUI retrieval results against
+the implementation it replaced
+"""
+
+import ast
+import heapq
+import random
+import hashlib
+import unittest
+from pathlib import Path
+
+MODULE_PATH = (Path(__file__).parent.parent / 'open-webui-main' / 'backend' /
+               'open_webui' / 'retrieval' / 'utils.py')
+
+
+def load_merge_function():
+    """Compile just merge_and_sort_query_results; the rest of utils.py needs the full backend"""
+    tree = ast.parse(MODULE_PATH.read_text(encoding='utf-8'))
+    node = next(n for n in tree.body
+                if isinstance(n, ast.FunctionDef) and n.name == 'merge_and_sort_query_results')
+    namespace = {'heapq': heapq}
+    exec(compile(ast.Module(body=[node], type_ignores=[]), str(MODULE_PATH), 'exec'), namespace)
+    return namespace['merge_and_sort_query_results']
+
+
+merge_and_sort_query_results = load_merge_function()
+
+
+def reference_merge(query_results: list, k: int) -> dict:
+    """The previous implementation: hash every document, sort everything"""
+    combined = dict()
+
+    for data in query_results:
+        distances = data["distances"][0]
+        documents = data["documents"][0]
+        metadatas = data["metadatas"][0]
+
+        for distance, document, metadata in zip(distances, documents, metadatas):
+            if isinstance(document, str):
+                doc_hash = hashlib.sha256(document.encode()).hexdigest()
+
+                if doc_hash not in combined.keys():
+                    combined[doc_hash] = (distance, document, metadata)
+                    continue
+
+                if distance > combined[doc_hash][0]:
+                    combined[doc_hash] = (distance, document, metadata)
+
+    combined = list(combined.values())
+    combined.sort(key=lambda x: x[0], reverse=True)
+
+    sorted_distances, sorted_documents, sorted_metadatas = (
+        zip(*combined[:k]) if combined else ([], [], [])
+    )
+
+    return {
+        "distances": [list(sorted_distances)],
+        "documents": [list(sorted_documents)],
+        "metadatas": [list(sorted_metadatas)],
+    }
+
+
+def result(*hits) -> dict:
+    """One collection's query result from (distance, document) pairs"""
+    return {
+        "distances": [[distance for distance, _ in hits]],
+        "documents": [[document for _, document in hits]],
+        "metadatas": [[{"source": f"{document}@{distance}"} for distance, document in hits]],
+    }
+
+
+class TestMergeQueryResults(unittest.TestCase):
+    """Test merge_and_sort_query_results"""
+
+    def assertMatchesReference(self, query_results, k):
+        self.assertEqual(merge_and_sort_query_results(query_results, k),
+                         reference_merge(query_results, k))
+
+    def test_ties_keep_first_seen_order(self):
+        query_results = [result((0.5, "b"), (0.5, "a")), result((0.5, "c"), (0.9, "d"))]
+        merged = merge_and_sort_query_results(query_results, 3)
+        self.assertEqual(merged["documents"], [["d", "b", "a"]])
+        self.assertMatchesReference(query_results, 3)
+
+    def test_evicted_duplicate_returns_with_better_distance(self):
+        query_results = [
+            result((0.1, "a"), (0.5, "b")),
+            result((0.6, "c")),  # evicts "a" with k=2
+            result((0.9, "a")),
+        ]
+        merged = merge_and_sort_query_results(query_results, 2)
+        self.assertEqual(merged["documents"], [["a", "c"]])
+        self.assertEqual(merged["metadatas"][0][0], {"source": "a@0.9"})
+        self.assertMatchesReference(query_results, 2)
+
+    def test_non_str_documents_are_skipped(self):
+        query_results = [result((0.9, None), (0.8, b"bytes"), (0.7, "a")), result((0.95, 42))]
+        merged = merge_and_sort_query_results(query_results, 2)
+        self.assertEqual(merged["documents"], [["a"]])
+        self.assertMatchesReference(query_results, 2)
+
+    def test_k_larger_than_candidates(self):
+        query_results = [result((0.2, "a"), (0.4, "b")), result((0.3, "a"))]
+        merged = merge_and_sort_query_results(query_results, 10)
+        self.assertEqual(merged["distances"], [[0.4, 0.3]])
+        self.assertMatchesReference(query_results, 10)
+        self.assertMatchesReference([], 10)
+
+    def test_random_results_match_reference(self):
+        rng = random.Random(1234)
+        vocabulary = [f"doc {i}" for i in range(12)] + [None]
+        for _ in range(500):
+            query_results = [
+                result(*[(rng.randint(0, 6) / 6, rng.choice(vocabulary))
+                         for _ in range(rng.randint(0, 8))])
+                for _ in range(rng.randint(1, 4))
+            ]
+            self.assertMatchesReference(query_results, rng.randint(1, 15))
+
+
+if __name__ == '__main__':
+    unittest.main()
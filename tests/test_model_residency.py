@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test model warm-up and keep-alive against a fake Ollama endpoint
+"""
+
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch, Mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'launchers'))
+
+from fake_ollama import FakeOllama
+from launcher_common import ModelResidencyManager, HardwareDetector, LauncherBase, TIER_MODELS
+
+MODEL = 'sunflower-kids-3b'
+GB = 1024 ** 3
+
+
+def memory(percent: float, total: int = 16 * GB) -> Mock:
+    """psutil.virtual_memory() result at the given usage"""
+    return Mock(percent=percent, total=total, available=int(total * (100 - percent) / 100))
+
+
+class TestModelResidency(unittest.TestCase):
+    """Test ModelResidencyManager"""
+
+    def test_warm_up_loads_model_and_records_timings(self):
+        """Warm-up should load the model and report load and first-token times"""
+        with FakeOllama([MODEL], load_delay=0.2) as ollama:
+            manager = ModelResidencyManager(MODEL, base_url=ollama.url, keep_alive='15m')
+            self.assertTrue(manager.warm_up())
+
+            self.assertIn(MODEL, ollama.loaded)
+            status = manager.get_status()
+            self.assertTrue(status['resident'])
+            self.assertGreaterEqual(status['load_seconds'], 0.2)
+            self.assertIsNotNone(status['first_token_seconds'])
+            self.assertLess(status['first_token_seconds'], status['load_seconds'])
+
+            for request in ollama.requests_for('/api/generate'):
+                self.assertEqual(request['keep_alive'], '15m')
+
+    def test_background_keep_alive_pings(self):
+        """The background thread should keep pinging while running"""
+        with FakeOllama([MODEL]) as ollama:
+            manager = ModelResidencyManager(MODEL, base_url=ollama.url, ping_interval=0.05)
+            with patch('launcher_common.psutil.virtual_memory',
+                       return_value=memory(50.0)):
+                manager.start()
+                time.sleep(0.4)
+                manager.stop()
+
+            self.assertTrue(manager.get_status()['resident'])
+            self.assertGreater(manager.get_status()['keep_alive_pings'], 0)
+
+    def test_unloads_under_memory_pressure_and_reloads(self):
+        """Memory pressure should unload the model; relief should reload it"""
+        with FakeOllama([MODEL], model_sizes={MODEL: 2 * GB}) as ollama:
+            manager = ModelResidencyManager(MODEL, base_url=ollama.url)
+            manager.warm_up()
+
+            with patch('launcher_common.psutil.virtual_memory',
+                       return_value=memory(95.0)):
+                manager.check_memory()
+            self.assertFalse(manager.resident)
+            self.assertNotIn(MODEL, ollama.loaded)
+            self.assertEqual(manager.model_bytes, 2 * GB)
+
+            # Between the thresholds nothing changes
+            with patch('launcher_common.psutil.virtual_memory',
+                       return_value=memory(85.0)):
+                manager.check_memory()
+            self.assertFalse(manager.resident)
+
+            with patch('launcher_common.psutil.virtual_memory',
+                       return_value=memory(60.0)):
+                manager.check_memory()
+            self.assertTrue(manager.resident)
+            self.assertIn(MODEL, ollama.loaded)
+
+            status = manager.get_status()
+            self.assertEqual(status['unloads'], 1)
+            self.assertEqual(status['reloads'], 1)
+
+    def test_no_reload_without_room_for_the_model(self):
+        """Below the recovery threshold but without room for the model, stay unloaded"""
+        with FakeOllama([MODEL], model_sizes={MODEL: 2 * GB}) as ollama:
+            manager = ModelResidencyManager(MODEL, base_url=ollama.url)
+            manager.warm_up()
+
+            with patch('launcher_common.psutil.virtual_memory',
+                       return_value=memory(95.0)):
+                manager.check_memory()
+
+            # 78% + 12.5% for the model would land above the 80% recovery mark
+            with patch('launcher_common.psutil.virtual_memory',
+                       return_value=memory(78.0)):
+                for _ in range(3):
+                    manager.check_memory()
+            self.assertFalse(manager.resident)
+            self.assertEqual(manager.get_status()['reloads'], 0)
+
+    def test_model_size_falls_back_to_freed_memory(self):
+        """Without a size from Ollama the memory freed by the unload is used"""
+        with FakeOllama([MODEL]) as ollama:
+            manager = ModelResidencyManager(MODEL, base_url=ollama.url)
+            manager.warm_up()
+
+            with patch('launcher_common.psutil.virtual_memory',
+                       side_effect=[memory(95.0), memory(95.0), memory(75.0)]):
+                manager.check_memory()
+            self.assertEqual(manager.model_bytes, int(16 * GB * 0.25) - int(16 * GB * 0.05))
+
+    def test_warm_up_fails_cleanly_without_ollama(self):
+        """An unreachable endpoint should not raise"""
+        with FakeOllama([]) as ollama:
+            url = ollama.url
+        manager = ModelResidencyManager(MODEL, base_url=url, request_timeout=1.0)
+        self.assertFalse(manager.warm_up())
+        self.assertFalse(manager.resident)
+
+    def test_optimal_model_follows_hardware_tier(self):
+        """The launcher picks the tier's model variant"""
+        detector = HardwareDetector()
+        with patch.object(detector, 'determine_hardware_tier', return_value='medium'):
+            self.assertEqual(detector.get_optimal_model(), TIER_MODELS['medium'])
+
+    def test_switch_model_releases_previous_variant(self):
+        with FakeOllama([MODEL, 'sunflower-kids-1b']) as ollama:
+            manager = ModelResidencyManager(MODEL, base_url=ollama.url)
+            self.assertTrue(manager.warm_up())
+            self.assertTrue(manager.switch_model('sunflower-kids-1b'))
+
+            self.assertEqual(list(ollama.loaded), ['sunflower-kids-1b'])
+            self.assertEqual(manager.get_status()['model'], 'sunflower-kids-1b')
+            self.assertTrue(manager.resident)
+
+
+class TestLauncherResidency(unittest.TestCase):
+    """Test that calibration does not hold up startup"""
+
+    def setUp(self):
+        self.cdrom_path = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.usb_path = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.launcher = LauncherBase(self.cdrom_path, self.usb_path)
+
+    def tearDown(self):
+        if self.launcher.residency:
+            self.launcher.residency.stop()
+        shutil.rmtree(self.cdrom_path, ignore_errors=True)
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def test_static_model_first_then_calibrated_model(self):
+        calibrated = threading.Event()
+
+        def get_calibrated_model(base_url):
+            calibrated.wait(10)
+            return 'sunflower-kids-1b'
+
+        with FakeOllama([MODEL, 'sunflower-kids-1b']) as ollama, \
+                patch('launcher_common.psutil.virtual_memory', return_value=memory(50.0)), \
+                patch.object(self.launcher.hardware, 'get_optimal_model', return_value=MODEL), \
+                patch.object(self.launcher.hardware, 'get_calibrated_model',
+                             side_effect=get_calibrated_model):
+            self.launcher.residency = ModelResidencyManager(MODEL, base_url=ollama.url)
+            residency = self.launcher.start_model_residency()
+            self.assertEqual(residency.get_status()['model'], MODEL)
+
+            calibrated.set()
+            self.launcher.calibration_thread.join(timeout=10)
+            self.assertEqual(residency.get_status()['model'], 'sunflower-kids-1b')
+            self.assertTrue(residency.resident)
+            self.assertIn('sunflower-kids-1b', ollama.loaded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test per-prompt model routing against a fake Ollama endpoint
+"""
+
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_ollama import FakeOllama
+from pipelines import PipelineOrchestrator, PipelineContext
+from pipelines.model_router import ModelRouterPipeline, canonical_model_name
+from pipelines.education.stem_tutor import STEMTutorPipeline
+from pipelines.response_cache import ResponseCachePipeline
+
+TIER_MODEL = 'sunflower-kids-7b'
+INSTALLED = ['sunflower-kids-1b:latest', 'sunflower-kids-3b:latest',
+             'sunflower-kids-7b:latest', 'sunflower-kids-13b:latest', 'llama3:latest']
+
+
+def make_context(prompt: str) -> PipelineContext:
+    return PipelineContext(
+        session_id='session', profile_id='profile', child_name='Alice',
+        child_age=9, grade_level='4', input_text=prompt
+    )
+
+
+class TestModelRouter(unittest.TestCase):
+    """Test ModelRouterPipeline"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.usb_path = Path(tempfile.mkdtemp(prefix='sunflower_router_'))
+        cls.stem_tutor = STEMTutorPipeline(cls.usb_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.usb_path, ignore_errors=True)
+
+    def setUp(self):
+        self.ollama = FakeOllama(INSTALLED).__enter__()
+        self.addCleanup(self.ollama.__exit__, None, None, None)
+        self.router = ModelRouterPipeline(
+            self.usb_path, tier_model=TIER_MODEL, stem_tutor=self.stem_tutor,
+            latency_budget=3.0, base_url=self.ollama.url
+        )
+
+    def test_installed_models_are_deduplicated_and_capped(self):
+        """Tagged and untagged names collapse; larger variants and other families are dropped"""
+        self.assertEqual(self.router.get_installed_models(),
+                         ['sunflower-kids-1b', 'sunflower-kids-3b', 'sunflower-kids-7b'])
+        self.assertEqual(canonical_model_name('sunflower-kids-3b:q4'), 'sunflower-kids-3b:q4')
+
+    def test_classify(self):
+        self.assertEqual(self.router.classify(make_context('what is a cell')), 'easy')
+        self.assertEqual(self.router.classify(make_context('how do magnets work')), 'moderate')
+        self.assertEqual(self.router.classify(make_context('why does ice float')), 'hard')
+
+        self.router.stem_tutor = None
+        self.assertEqual(self.router.classify(make_context('what is a cell')), 'hard')
+
+    def test_route_by_difficulty(self):
+        """Easy prompts get the smallest variant, hard prompts the tier model"""
+        context = make_context('what is a cell')
+        self.assertEqual(self.router.route(context), 'sunflower-kids-1b')
+        self.assertEqual(context.metadata['model'], 'sunflower-kids-1b')
+        self.assertEqual(context.metadata['model_routing']['tier_model'], TIER_MODEL)
+
+        self.assertEqual(self.router.route(make_context('how do magnets work')), 'sunflower-kids-3b')
+        self.assertEqual(self.router.route(make_context('why does ice float')), TIER_MODEL)
+
+    def test_latency_budget_steps_down(self):
+        """A model slower than the budget hands hard prompts to the next size down"""
+        self.router.record_latency(TIER_MODEL, 5.0)
+        context = make_context('why does ice float')
+
+        self.assertEqual(self.router.route(context), 'sunflower-kids-3b')
+        self.assertTrue(context.metadata['model_routing']['budget_fallback'])
+        # The skipped model's estimate decays so it is eventually retried
+        self.assertLess(self.router.latency_estimates[TIER_MODEL], 5.0)
+
+    def test_stats_record_decisions_and_savings(self):
+        self.router.record_latency(TIER_MODEL, 2.5)
+        context = make_context('what is a cell')
+        self.router.route(context)
+        context.metadata['inference_seconds'] = 0.5
+        self.router.process(context)
+
+        cached = make_context('what is a cell')
+        self.router.route(cached)
+        cached.metadata.update(inference_seconds=0.1, response_cache='hit')
+        self.router.process(cached)
+
+        stats = self.router.get_stats()
+        self.assertEqual(stats['decisions'], {'easy': {'sunflower-kids-1b': 2}})
+        self.assertEqual(stats['inferences'], 1)
+        self.assertEqual(stats['latency_saved_seconds'], {'easy': 2.0})
+        self.assertEqual(context.metadata['model_routing']['latency_saved_seconds'], 2.0)
+
+    def test_unreachable_ollama_falls_back_to_tier_model(self):
+        with FakeOllama([]) as ollama:
+            url = ollama.url
+        router = ModelRouterPipeline(self.usb_path, tier_model=TIER_MODEL, base_url=url)
+        self.assertEqual(router.route(make_context('what is a cell')), TIER_MODEL)
+
+
+class TestOrchestratorRouting(unittest.TestCase):
+    """Test that the orchestrator's inference path uses the routed model"""
+
+    def setUp(self):
+        self.usb_path = Path(tempfile.mkdtemp(prefix='sunflower_router_'))
+        self.addCleanup(shutil.rmtree, self.usb_path, ignore_errors=True)
+        self.ollama = FakeOllama(['sunflower-kids-1b', 'sunflower-kids-3b', TIER_MODEL]).__enter__()
+        self.addCleanup(self.ollama.__exit__, None, None, None)
+
+        self.orchestrator = PipelineOrchestrator.__new__(PipelineOrchestrator)
+        self.orchestrator.usb_path = self.usb_path
+        self.orchestrator.lock = threading.RLock()
+        self.orchestrator.active_sessions = {}
+        self.orchestrator._tier_model = None
+        self.orchestrator.pipelines = {
+            'stem_tutor': STEMTutorPipeline(self.usb_path),
+            'response_cache': ResponseCachePipeline(self.usb_path),
+        }
+        self.orchestrator.config = {
+            'tier_model': TIER_MODEL,
+            'model_latency_budget': 3.0,
+            'ollama_url': self.ollama.url,
+            'pipeline_order': ['response_cache']
+        }
+
+    def test_respond_generates_with_routed_model(self):
+        self.orchestrator._initialize_model_router()
+        self.assertEqual(self.orchestrator.config['pipeline_order'],
+                         ['model_router', 'response_cache'])
+
+        _, results = self.orchestrator.respond(make_context('what is a cell'))
+
+        generated = self.ollama.requests_for('/api/generate')
+        self.assertEqual([r['model'] for r in generated], ['sunflower-kids-1b'])
+        self.assertEqual(results['model_router']['model'], 'sunflower-kids-1b')
+        self.assertEqual(self.orchestrator.pipelines['model_router'].get_stats()['inferences'], 1)
+
+    def test_without_router_uses_tier_model(self):
+        self.orchestrator.respond(make_context('what is a cell'))
+        generated = self.ollama.requests_for('/api/generate')
+        self.assertEqual([r['model'] for r in generated], [TIER_MODEL])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test the parallel ZIP and tar.gz package writers
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import tarfile
+import zipfile
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import parallel_archive
+from src.parallel_archive import ParallelZipWriter, ParallelTarGzWriter, should_compress
+
+
+class TestParallelArchive(unittest.TestCase):
+    """Test ParallelZipWriter and ParallelTarGzWriter"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.build_dir = self.work_dir / "build"
+        (self.build_dir / "models").mkdir(parents=True)
+        (self.build_dir / "documentation").mkdir()
+
+        (self.build_dir / "models" / "tiny.gguf").write_bytes(os.urandom(200000))
+        (self.build_dir / "documentation" / "guide.md").write_text("Safe learning for kids.\n" * 20000)
+        (self.build_dir / "documentation" / "empty.txt").write_text("")
+
+        # Several compression jobs per file
+        patcher = mock.patch.object(parallel_archive, "CHUNK_SIZE", 64 * 1024)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def files(self):
+        return sorted(p for p in self.build_dir.rglob("*") if p.is_file())
+
+    def test_zip_round_trip(self):
+        """zipfile reads every entry back; models are stored, text deflated"""
+        output = self.work_dir / "package.zip"
+        with ParallelZipWriter(output, max_workers=3) as zipf:
+            for path in self.files():
+                zipf.add_file(path, path.relative_to(self.build_dir).as_posix())
+
+        self.assertEqual(zipf.stats["sha256"], hashlib.sha256(output.read_bytes()).hexdigest())
+        self.assertEqual(zipf.stats["files"], 3)
+        self.assertEqual(zipf.stats["stored_files"], 1)
+
+        with zipfile.ZipFile(output) as archive:
+            self.assertIsNone(archive.testzip())
+            for path in self.files():
+                name = path.relative_to(self.build_dir).as_posix()
+                self.assertEqual(archive.read(name), path.read_bytes())
+            self.assertEqual(archive.getinfo("models/tiny.gguf").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(archive.getinfo("documentation/guide.md").compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_tar_gz_round_trip(self):
+        """tarfile reads the concatenated gzip members as one archive"""
+        output = self.work_dir / "package.tar.gz"
+        with ParallelTarGzWriter(output, max_workers=3) as tarf:
+            tarf.add(self.build_dir, "SunflowerAI")
+
+        self.assertEqual(tarf.stats["sha256"], hashlib.sha256(output.read_bytes()).hexdigest())
+        with tarfile.open(output, "r:gz") as archive:
+            self.assertIn("SunflowerAI/documentation", archive.getnames())
+            for path in self.files():
+                name = "SunflowerAI/" + path.relative_to(self.build_dir).as_posix()
+                self.assertEqual(archive.extractfile(name).read(), path.read_bytes())
+
+    def test_incompressible_detection(self):
+        """Random data is stored even without a known extension"""
+        random_file = self.work_dir / "weights.bin"
+        random_file.write_bytes(os.urandom(100000))
+        self.assertFalse(should_compress(random_file))
+        self.assertTrue(should_compress(self.build_dir / "documentation" / "guide.md"))
+
+    def test_failure_removes_partial_archive(self):
+        """An error while packaging leaves no half-written archive"""
+        output = self.work_dir / "package.zip"
+        with self.assertRaises(FileNotFoundError):
+            with ParallelZipWriter(output) as zipf:
+                zipf.add_file(self.build_dir / "missing.txt", "missing.txt")
+        self.assertFalse(output.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test mount change detection and per-mount partition info caching
+"""
+
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.partition_manager import PartitionManager, PartitionType, MountWatcher
+
+
+class TestMountWatcher(unittest.TestCase):
+    """Test MountWatcher"""
+
+    def test_times_out_without_changes(self):
+        """No mount activity means wait_for_change returns False after the timeout"""
+        with MountWatcher() as watcher:
+            start = time.perf_counter()
+            self.assertFalse(watcher.wait_for_change(0.2))
+            self.assertLess(time.perf_counter() - start, 1.0)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "mountinfo events are Linux-only")
+    def test_linux_uses_mount_table_events(self):
+        """On Linux the watcher waits on /proc/self/mountinfo instead of polling"""
+        with MountWatcher('Linux') as watcher:
+            self.assertTrue(watcher.event_driven)
+
+    def test_polling_fallback_detects_change(self):
+        """Without mount events, a changed mount signature wakes the watcher"""
+        signatures = iter([('a',), ('a',), ('a', 'b')])
+        with patch.object(MountWatcher, '_mount_signature', lambda self: next(signatures)):
+            watcher = MountWatcher('Darwin')
+            self.assertFalse(watcher.event_driven)
+            with patch('src.partition_manager.MOUNT_CHECK_INTERVAL', 0.01):
+                self.assertTrue(watcher.wait_for_change(5))
+
+
+class TestPartitionInfoCache(unittest.TestCase):
+    """Test per-mount PartitionInfo caching"""
+
+    def setUp(self):
+        self.mount_point = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        (self.mount_point / PartitionManager.USB_MARKER).write_text("usb")
+        self.manager = PartitionManager()
+
+    def tearDown(self):
+        shutil.rmtree(self.mount_point, ignore_errors=True)
+
+    def test_info_reused_until_mount_changes(self):
+        """Filesystem type and label are probed once per mount"""
+        with patch.object(self.manager, '_get_filesystem_type', return_value='vfat') as fs_type, \
+                patch.object(self.manager, '_get_volume_label', return_value='SUNFLOWER'):
+            self.manager._check_partition(self.mount_point)
+            self.manager._check_partition(self.mount_point)
+            self.assertEqual(fs_type.call_count, 1)
+
+            info = self.manager.get_partition_info(PartitionType.USB)
+            self.assertEqual(info.filesystem, 'vfat')
+            self.assertEqual(self.manager.get_usb_path(), self.mount_point)
+
+            # Simulate the device being re-plugged at the same mount point
+            with patch.object(self.manager, '_mount_identity', return_value='999 8:17'):
+                self.manager._prune_info_cache()
+                self.manager._check_partition(self.mount_point)
+            self.assertEqual(fs_type.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
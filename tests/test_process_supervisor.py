@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test supervised child processes: output draining, readiness and restarts
+"""
+
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'launchers'))
+
+from launcher_common import LauncherBase, SupervisedProcess
+
+
+def python_command(code: str) -> list:
+    return [sys.executable, '-c', code]
+
+
+class TestSupervisedProcess(unittest.TestCase):
+    """Test SupervisedProcess"""
+
+    def setUp(self):
+        self.log_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def test_large_output_does_not_block(self):
+        """A child writing far more than a pipe buffer still runs to completion"""
+        code = "import sys\nfor i in range(20000): print('x' * 40, i)\nsys.stderr.write('done\\n')"
+        process = SupervisedProcess('chatty', python_command(code), log_dir=self.log_dir).start()
+
+        self.assertEqual(process.wait(timeout=10), 0)
+        process.stop()
+        self.assertEqual(process.lines_captured, 20001)
+        self.assertEqual(process.last_lines[-1], 'done')
+        self.assertTrue((self.log_dir / 'chatty.log').exists())
+
+    def test_readiness_line_detected(self):
+        """wait_ready returns once the readiness line is printed"""
+        code = "import time\nprint('booting', flush=True)\nprint('Listening on 127.0.0.1', flush=True)\ntime.sleep(30)"
+        process = SupervisedProcess('server', python_command(code), log_dir=self.log_dir,
+                                    ready_pattern=r'Listening on').start()
+        try:
+            self.assertTrue(process.wait_ready(timeout=10))
+            self.assertIsNone(process.poll())
+        finally:
+            process.stop(timeout=5)
+        self.assertIsNotNone(process.poll())
+
+    def test_exit_before_ready_reported(self):
+        """A child that exits without the readiness line is not ready"""
+        process = SupervisedProcess('broken', python_command("raise SystemExit(3)"),
+                                    log_dir=self.log_dir, ready_pattern=r'Listening on').start()
+        self.assertFalse(process.wait_ready(timeout=10))
+        self.assertEqual(process.poll(), 3)
+
+    def test_crash_restarts_with_backoff(self):
+        """A crashing child is restarted up to max_restarts times"""
+        process = SupervisedProcess('crashy', python_command("raise SystemExit(1)"),
+                                    log_dir=self.log_dir, restart=True, max_restarts=2,
+                                    backoff_initial=0.05).start()
+        process._watcher.join(timeout=10)
+        self.assertEqual(process.restarts, 2)
+        self.assertEqual(process.poll(), 1)
+
+    def test_stop_prevents_restart(self):
+        """Stopping a restartable child does not bring it back"""
+        process = SupervisedProcess('service', python_command("import time; time.sleep(30)"),
+                                    log_dir=self.log_dir, restart=True,
+                                    backoff_initial=0.05).start()
+        process.stop(timeout=5)
+        time.sleep(0.2)
+        self.assertEqual(process.restarts, 0)
+        self.assertIsNotNone(process.poll())
+
+
+class TestLaunchApplication(unittest.TestCase):
+    """Test that the main application is started as a supervised process"""
+
+    def setUp(self):
+        self.cdrom_path = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.usb_path = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        (self.cdrom_path / 'system').mkdir()
+        self.launcher = LauncherBase(self.cdrom_path, self.usb_path)
+
+    def tearDown(self):
+        self.launcher.runner.stop_all_processes(timeout=5)
+        shutil.rmtree(self.cdrom_path, ignore_errors=True)
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def write_main(self, code: str) -> None:
+        (self.cdrom_path / 'system' / 'main.py').write_text(code)
+
+    def test_ready_line_skips_port_polling(self):
+        self.write_main("import time\nprint('Uvicorn running on http://0.0.0.0:8080', flush=True)\ntime.sleep(30)")
+        with patch.object(self.launcher, 'check_port') as check_port:
+            self.assertTrue(self.launcher.launch_application())
+        check_port.assert_not_called()
+        self.assertIn('sunflower_main', self.launcher.runner.active_processes)
+
+    def test_port_fallback_for_silent_application(self):
+        self.write_main("import time\ntime.sleep(30)")
+        with patch.object(SupervisedProcess, 'wait_ready', return_value=False), \
+                patch.object(self.launcher, 'check_port', return_value=True) as check_port:
+            self.assertTrue(self.launcher.launch_application())
+        check_port.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test the incremental production report store
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import report_store
+from src.report_store import ProductionReportStore
+
+
+class TestReportStore(unittest.TestCase):
+    """Test ProductionReportStore ingest and queries"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.reports = self.work_dir / "validation_reports"
+        self.reports.mkdir()
+        self.store = ProductionReportStore(self.work_dir / "reports.db")
+
+        # Directories written moments ago are normally listed again
+        patcher = mock.patch.object(report_store, "DIRECTORY_SETTLE_SECONDS", -1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def write_report(self, index, result):
+        report = {
+            "device_uuid": f"DEV-{index}",
+            "validation_date": f"2025-03-{index + 1:02d}T10:00:00",
+            "overall_result": result,
+            "validation_time": 30,
+            "test_results": [{"name": "Model Files", "passed": result == "PASS"}]
+        }
+        (self.reports / f"validation_{index}.json").write_text(json.dumps(report))
+
+    def test_only_new_reports_are_parsed(self):
+        """A second ingest parses nothing; new files are picked up alone"""
+        for i in range(5):
+            self.write_report(i, "PASS" if i % 2 else "FAIL")
+        self.assertEqual(self.store.ingest_validation_reports(self.reports), 5)
+        self.assertEqual(self.store.ingest_validation_reports(self.reports), 0)
+
+        self.write_report(5, "FAIL")
+        with mock.patch.object(report_store.json, "load", wraps=json.load) as loads:
+            self.assertEqual(self.store.ingest_validation_reports(self.reports), 1)
+        self.assertEqual(loads.call_count, 1)
+
+        stats = self.store.validation_statistics(start=datetime(2025, 3, 3))
+        self.assertEqual((stats["total"], stats["passed"], stats["failed"]), (4, 1, 3))
+        self.assertEqual(stats["common_failures"], {"Model Files": 3})
+
+    def test_summary_csv_is_read_incrementally(self):
+        """Appended rows are added once; a half-written row waits"""
+        summary = self.reports / "validation_summary.csv"
+        summary.write_text("Serial,Batch,Date,Status,Errors,Warnings,Duration\n"
+                           "S1,BATCH-A,2025,PASS,0,0,1\nS2,BATCH-A,2025,FAIL,1,0,1\n")
+        self.assertEqual(self.store.ingest_validation_summary(summary), 2)
+
+        with open(summary, "a") as f:
+            f.write("S3,BATCH-B,2025,PASS,0,0,1\nS4,BATCH-B,20")
+        self.assertEqual(self.store.ingest_validation_summary(summary), 1)
+
+        with open(summary, "a") as f:
+            f.write("25,PASS,0,0,1\n")
+        self.assertEqual(self.store.ingest_validation_summary(summary), 1)
+
+        counts = self.store.batch_validation_counts()
+        self.assertEqual(counts["BATCH-A"], {"validated": 2, "passed": 1, "failed": 1})
+        self.assertEqual(counts["BATCH-B"], {"validated": 2, "passed": 2, "failed": 0})
+        self.assertEqual(self.store.validation_runs("BATCH-B")[1]["Serial"], "S4")
+
+
+if __name__ == '__main__':
+    unittest.main()
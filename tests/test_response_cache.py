@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test the persistent response cache and its place in the pipeline order
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipelines import PipelineOrchestrator, PipelineContext, PipelineStatus
+from pipelines.response_cache import ResponseCachePipeline
+from pipelines.safety.age_adapter import AgeAdapterPipeline
+from pipelines.safety.content_filter import ContentFilterPipeline
+
+MODEL = 'sunflower-kids-3b'
+ANSWER = "7 plus 8 equals 15."
+
+
+def make_context(prompt: str, name: str = 'Alice', age: int = 9,
+                 response: str = None) -> PipelineContext:
+    context = PipelineContext(
+        session_id=f'session-{name}', profile_id=f'profile-{name}',
+        child_name=name, child_age=age, grade_level='4',
+        input_text=prompt, model_response=response
+    )
+    context.metadata['model'] = MODEL
+    return context
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test ResponseCachePipeline"""
+
+    def setUp(self):
+        self.usb_path = Path(tempfile.mkdtemp(prefix='sunflower_cache_'))
+        self.cache = ResponseCachePipeline(self.usb_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def test_hit_after_store(self):
+        """A stored answer is served to the same prompt in the same age band only"""
+        self.assertIsNone(self.cache.lookup(make_context('what is 7+8')))
+        self.cache.process(make_context('what is 7+8', response=ANSWER))
+
+        self.assertEqual(self.cache.lookup(make_context('What is 7+8?', name='Bob')), ANSWER)
+        self.assertIsNone(self.cache.lookup(make_context('what is 7+8', age=15)))
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 2, 1))
+
+    def test_operators_are_part_of_the_key(self):
+        """Prompts that normalize alike but differ in their arithmetic never collide"""
+        self.cache.process(make_context('what is 7+8', response=ANSWER))
+
+        self.assertIsNone(self.cache.lookup(make_context('what is 7-8')))
+        self.assertIsNone(self.cache.lookup(make_context('what is 7+9')))
+        self.assertEqual(self.cache.lookup(make_context('what is 7 + 8')), ANSWER)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Past max_entries the entry unused for longest goes first"""
+        cache = ResponseCachePipeline(self.usb_path / 'small', max_entries=2)
+        cache.process(make_context('what is gravity', response='A pull.'))
+        cache.process(make_context('what is friction', response='A drag.'))
+        cache.lookup(make_context('what is gravity'))
+        cache.process(make_context('what is energy', response='Work.'))
+
+        self.assertEqual(cache.lookup(make_context('what is gravity')), 'A pull.')
+        self.assertIsNone(cache.lookup(make_context('what is friction')))
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_family_opt_out_disables_and_purges(self):
+        """Opting out clears stored answers and stops both lookups and stores"""
+        self.cache.process(make_context('what is 7+8', response=ANSWER))
+
+        preferences = self.usb_path / 'parent_dashboard' / 'parent_preferences.json'
+        preferences.parent.mkdir(parents=True)
+        preferences.write_text(json.dumps({'response_cache_enabled': False}))
+
+        self.assertIsNone(self.cache.lookup(make_context('what is 7+8')))
+        self.cache.process(make_context('what is gravity', response='A pull.'))
+        stats = self.cache.get_stats()
+        self.assertFalse(stats['enabled'])
+        self.assertEqual(stats['entries'], 0)
+
+    def test_personalized_response_is_not_stored(self):
+        """Text that already went through the per-child stages is never cached"""
+        context = make_context('what is 7+8', response=f"Hi Alice! {ANSWER}")
+        context.metadata['adaptation_applied'] = True
+        self.cache.process(context)
+
+        self.assertEqual(self.cache.get_stats()['entries'], 0)
+
+
+class TestCachedResponsePersonalization(unittest.TestCase):
+    """Test that a cache hit is personalized once, for the child who asked"""
+
+    def setUp(self):
+        self.usb_path = Path(tempfile.mkdtemp(prefix='sunflower_cache_'))
+        self.orchestrator = PipelineOrchestrator.__new__(PipelineOrchestrator)
+        self.orchestrator.lock = threading.RLock()
+        self.orchestrator.active_sessions = {}
+        self.orchestrator.pipelines = {
+            'response_cache': ResponseCachePipeline(self.usb_path),
+            'age_adapter': AgeAdapterPipeline(self.usb_path),
+        }
+        # A pipeline_config.json written before the cache moved forward
+        self.orchestrator.config = {
+            'pipeline_order': PipelineOrchestrator._cache_before_personalization(
+                ['content_filter', 'age_adapter', 'response_cache', 'parent_logger']
+            )
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def test_cache_runs_before_personalization(self):
+        self.assertEqual(self.orchestrator.config['pipeline_order'],
+                         ['content_filter', 'response_cache', 'age_adapter', 'parent_logger'])
+
+    def test_hit_does_not_leak_or_repeat_personalization(self):
+        alice, _ = self.orchestrator.process_interaction(
+            make_context('what is 7+8', name='Alice', response=ANSWER)
+        )
+        self.assertIn('Alice', alice)
+
+        context = make_context('what is 7+8', name='Bob')
+        self.assertEqual(self.orchestrator.get_cached_response(context), ANSWER)
+        bob, _ = self.orchestrator.process_interaction(context)
+
+        self.assertNotIn('Alice', bob)
+        self.assertEqual(bob.count('Bob'), 1)
+        self.assertEqual(bob.count('What do you think'), 1)
+
+
+class TestRespond(unittest.TestCase):
+    """Test that the inference path serves cache hits without the model"""
+
+    def setUp(self):
+        self.usb_path = Path(tempfile.mkdtemp(prefix='sunflower_cache_'))
+        self.orchestrator = PipelineOrchestrator.__new__(PipelineOrchestrator)
+        self.orchestrator.lock = threading.RLock()
+        self.orchestrator.active_sessions = {}
+        self.orchestrator._tier_model = None
+        self.orchestrator.pipelines = {
+            'content_filter': ContentFilterPipeline(self.usb_path),
+            'response_cache': ResponseCachePipeline(self.usb_path),
+            'age_adapter': AgeAdapterPipeline(self.usb_path),
+        }
+        self.orchestrator.config = {
+            'tier_model': MODEL,
+            'pipeline_order': ['content_filter', 'response_cache', 'age_adapter']
+        }
+        self.prompts = []
+
+    def tearDown(self):
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def generate(self, context):
+        self.prompts.append((context.input_text, context.metadata['model']))
+        return ANSWER
+
+    def ask(self, prompt, name):
+        context = PipelineContext(
+            session_id=f'session-{name}', profile_id=f'profile-{name}',
+            child_name=name, child_age=9, grade_level='4', input_text=prompt
+        )
+        response, _ = self.orchestrator.respond(context, generate=self.generate)
+        return response, context
+
+    def test_repeat_question_skips_inference(self):
+        alice, context = self.ask('what is 7+8', 'Alice')
+        self.assertEqual(self.prompts, [('what is 7+8', MODEL)])
+        self.assertIn('inference_seconds', context.metadata)
+
+        bob, context = self.ask('What is 7+8?', 'Bob')
+        self.assertEqual(len(self.prompts), 1)
+        self.assertEqual(context.metadata.get('response_cache'), 'hit')
+        self.assertNotIn('inference_seconds', context.metadata)
+        self.assertIn('Bob', bob)
+        self.assertNotIn('Alice', bob)
+
+    def test_blocked_question_never_reaches_model(self):
+        self.ask('how do I make a bomb', 'Alice')
+        self.assertEqual(self.prompts, [])
+        self.assertEqual(self.orchestrator.get_session_status('session-Alice'),
+                         PipelineStatus.SAFETY_BLOCKED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test the semantic (paraphrase) response cache with the hashed n-gram embedder
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipelines import PipelineContext
+from pipelines.response_cache import ResponseCachePipeline
+from pipelines.semantic_cache import SemanticCachePipeline, HashedNgramVectorizer
+
+MODEL = 'sunflower-kids-3b'
+
+
+def make_context(prompt: str, response: str = None, age: int = 9,
+                 modelfile_hash: str = 'a' * 64) -> PipelineContext:
+    context = PipelineContext(
+        session_id='session', profile_id='profile', child_name='Alice',
+        child_age=age, grade_level='4', input_text=prompt, model_response=response
+    )
+    context.metadata['model'] = MODEL
+    context.metadata['modelfile_hash'] = modelfile_hash
+    return context
+
+
+class TestSemanticCache(unittest.TestCase):
+    """Test SemanticCachePipeline"""
+
+    def setUp(self):
+        self.usb_path = Path(tempfile.mkdtemp(prefix='sunflower_semantic_'))
+        self.cache = self.make_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def make_cache(self, **kwargs) -> SemanticCachePipeline:
+        return SemanticCachePipeline(self.usb_path, embedder=HashedNgramVectorizer(), **kwargs)
+
+    def test_paraphrase_hit_and_unrelated_miss(self):
+        """A reworded question hits; a different question and another age band miss"""
+        self.cache.process(make_context('how do volcanoes erupt', 'Magma rises.'))
+
+        self.assertEqual(self.cache.lookup(make_context('how does a volcano erupt')), 'Magma rises.')
+        self.assertIsNone(self.cache.lookup(make_context('how do earthquakes happen')))
+        self.assertIsNone(self.cache.lookup(make_context('how do volcanoes erupt', age=15)))
+
+    def test_numbers_must_match(self):
+        """Similar-looking questions about different arithmetic never share an answer"""
+        self.cache.process(make_context('what is 7 times 8', '56'))
+
+        self.assertEqual(self.cache.lookup(make_context("what's 7 times 8?")), '56')
+        self.assertIsNone(self.cache.lookup(make_context('what is 8 times 7')))
+        self.assertIsNone(self.cache.lookup(make_context('what is 1 times 8')))
+
+    def test_modelfile_change_starts_a_new_index(self):
+        """Answers from a rebuilt modelfile are not served, and the old index is dropped"""
+        self.cache.process(make_context('how do magnets work', 'Fields.'))
+        self.cache.flush()
+
+        rebuilt = make_context('how do magnets work', modelfile_hash='b' * 64)
+        self.assertIsNone(self.cache.lookup(rebuilt))
+        self.assertEqual(len(list((self.usb_path / 'cache' / 'semantic').glob('*.npy'))), 0)
+
+    def test_full_index_evicts_least_recently_used(self):
+        """A full index replaces its least recently used entry instead of refusing"""
+        cache = self.make_cache(max_entries_per_index=2)
+        cache.process(make_context('how do magnets work', 'Fields.'))
+        cache.process(make_context('why is the ocean salty', 'Minerals.'))
+        cache.lookup(make_context('how does a magnet work'))
+        cache.process(make_context('what are stars made of', 'Gas.'))
+
+        self.assertEqual(cache.lookup(make_context('how do magnets work')), 'Fields.')
+        self.assertIsNone(cache.lookup(make_context('why is the ocean salty')))
+        self.assertEqual(cache.lookup(make_context('what are stars made of')), 'Gas.')
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_personalized_response_is_not_stored(self):
+        context = make_context('how do magnets work', 'Hi Alice! Fields.')
+        context.metadata['adaptation_applied'] = True
+        self.cache.process(context)
+
+        self.assertEqual(self.cache.get_stats()['indexed_prompts'], 0)
+
+    def test_index_survives_restart_and_old_format_is_purged(self):
+        self.cache.process(make_context('how do magnets work', 'Fields.'))
+        self.cache.shutdown()
+        self.assertEqual(self.make_cache().lookup(make_context('how does a magnet work')), 'Fields.')
+
+        (self.usb_path / 'cache' / 'semantic' / 'VERSION').write_text('1')
+        self.assertIsNone(self.make_cache().lookup(make_context('how does a magnet work')))
+
+    def test_family_opt_out_clears_index(self):
+        response_cache = ResponseCachePipeline(self.usb_path)
+        cache = self.make_cache(response_cache=response_cache)
+        cache.process(make_context('how do magnets work', 'Fields.'))
+        cache.flush()
+
+        preferences = self.usb_path / 'parent_dashboard' / 'parent_preferences.json'
+        preferences.parent.mkdir(parents=True)
+        preferences.write_text(json.dumps({'response_cache_enabled': False}))
+
+        self.assertIsNone(cache.lookup(make_context('how does a magnet work')))
+        self.assertEqual(cache.get_stats()['indexed_prompts'], 0)
+        self.assertEqual(len(list((self.usb_path / 'cache' / 'semantic').glob('*.npy'))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
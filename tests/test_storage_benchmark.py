@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the cache-bypassing storage benchmark
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production"))
+
+from src.storage_benchmark import StorageBenchmark, grade, percentiles
+from validate_usb import USBValidator
+
+
+class TestStorageBenchmark(unittest.TestCase):
+    """Test StorageBenchmark and tier grading"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_writable_benchmark(self):
+        """Every metric is reported and no probe files are left behind"""
+        bench = StorageBenchmark(sequential_mb=4, random_reads=200, random_seconds=1, fsync_samples=5)
+        results = bench.run_writable(self.work_dir)
+
+        self.assertEqual(set(results["sequential_read_mbps"]), {"4096", "65536", "1048576"})
+        self.assertGreater(results["write_mbps"], 0)
+        self.assertGreater(results["random_read"]["iops"], 0)
+        self.assertIn("p95", results["fsync_latency_ms"])
+        self.assertEqual(list(self.work_dir.iterdir()), [])
+
+    def test_grading(self):
+        """The best tier met wins; latency limits are upper bounds"""
+        tiers = {
+            "premium": {"usb_read_mbps": 150, "usb_fsync_p95_ms": 20},
+            "minimum": {"usb_read_mbps": 80, "usb_fsync_p95_ms": 100}
+        }
+        self.assertEqual(grade({"usb_read_mbps": 200, "usb_fsync_p95_ms": 5}, tiers)[0], "premium")
+
+        tier, shortfalls = grade({"usb_read_mbps": 200, "usb_fsync_p95_ms": 60}, tiers)
+        self.assertEqual(tier, "minimum")
+        self.assertEqual(shortfalls["premium"], ["usb_fsync_p95_ms 60 > 20"])
+
+        self.assertIsNone(grade({"usb_read_mbps": 50}, tiers)[0])
+        self.assertEqual(percentiles(list(range(1, 101)))["p95"], 95)
+
+
+class TestValidatorStorageTiers(unittest.TestCase):
+    """Test the USB validator's pass criteria"""
+
+    # Meets the sequential 80/40 MB/s criteria but nothing else
+    SLOW_RANDOM = {
+        "cdrom_read_mbps": 90, "usb_read_mbps": 90, "usb_write_mbps": 45,
+        "usb_random_read_iops": 50, "usb_fsync_p95_ms": 300
+    }
+
+    def test_minimum_tier_matches_sequential_criteria(self):
+        validator = USBValidator("SF100-20240115-0001")
+        self.assertEqual(grade(self.SLOW_RANDOM, validator.storage_tiers)[0], "minimum")
+
+    def test_random_read_and_fsync_gates_are_opt_in(self):
+        validator = USBValidator("SF100-20240115-0001",
+                                 min_random_read_iops=200, max_fsync_p95_ms=100)
+        tier, shortfalls = grade(self.SLOW_RANDOM, validator.storage_tiers)
+        self.assertIsNone(tier)
+        self.assertEqual(shortfalls["minimum"], ["usb_random_read_iops 50 < 200",
+                                                 "usb_fsync_p95_ms 300 > 100"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test measured-throughput tier calibration against a fake Ollama endpoint
+"""
+
+import sys
+import json
+import subprocess
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'launchers'))
+
+from fake_ollama import FakeOllama
+from src.hardware_snapshot import get_machine_key
+from src.tier_calibration import TierCalibrator, model_size_rank
+from launcher_common import HardwareDetector, LauncherBase, TIER_MODELS
+
+CANDIDATES = ['llama3.2:7b', 'llama3.2:3b', 'llama3.2:1b', 'llama3.2:1b-q4_0']
+
+
+class TestTierCalibration(unittest.TestCase):
+    """Test TierCalibrator"""
+
+    def setUp(self):
+        self.usb_path = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+
+    def tearDown(self):
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def _fake(self):
+        # 48-token budget in 3s needs roughly 16+ tok/s
+        return FakeOllama(CANDIDATES, tokens_per_second={
+            'llama3.2:1b-q4_0': 400.0,
+            'llama3.2:1b': 200.0,
+            'llama3.2:3b': 100.0,
+            'llama3.2:7b': 10.0
+        })
+
+    def test_selects_largest_model_within_budget(self):
+        """The 7b variant is too slow, so the 3b variant should be selected"""
+        with self._fake() as ollama:
+            calibrator = TierCalibrator(self.usb_path, base_url=ollama.url,
+                                        max_response_time=3.0, benchmark_tokens=8)
+            self.assertEqual(calibrator.select_model(CANDIDATES), 'llama3.2:3b')
+
+            results = calibrator.calibrate(CANDIDATES)
+            self.assertGreater(results['llama3.2:3b']['tokens_per_second'], 50)
+            self.assertFalse(results['llama3.2:7b']['meets_budget'])
+            self.assertGreater(results['llama3.2:1b']['first_token_seconds'], 0)
+
+    def test_results_cached_per_machine(self):
+        """A second calibration on the same machine should not benchmark again"""
+        with self._fake() as ollama:
+            TierCalibrator(self.usb_path, base_url=ollama.url,
+                           benchmark_tokens=8).select_model(CANDIDATES)
+            requests_after_first = len(ollama.requests)
+
+            calibrator = TierCalibrator(self.usb_path, base_url=ollama.url, benchmark_tokens=8)
+            self.assertEqual(calibrator.select_model(CANDIDATES), 'llama3.2:3b')
+            self.assertEqual(len(ollama.requests), requests_after_first)
+
+        cache = json.loads((self.usb_path / 'cache' / 'tier_calibration.json').read_text())
+        self.assertIn(calibrator.fingerprint, cache)
+        self.assertEqual(calibrator.fingerprint, get_machine_key())
+
+    def test_cached_results_follow_budget_changes(self):
+        """A looser budget reuses measurements but can select a larger model"""
+        with self._fake() as ollama:
+            TierCalibrator(self.usb_path, base_url=ollama.url,
+                           benchmark_tokens=8).select_model(CANDIDATES)
+            loose = TierCalibrator(self.usb_path, base_url=ollama.url,
+                                   max_response_time=10.0, benchmark_tokens=8)
+            self.assertEqual(loose.select_model(CANDIDATES), 'llama3.2:7b')
+
+    def test_unreachable_ollama_returns_none(self):
+        """Without Ollama nothing is measured and nothing is cached"""
+        with FakeOllama([]) as ollama:
+            url = ollama.url
+        calibrator = TierCalibrator(self.usb_path, base_url=url, timeout=1.0)
+        self.assertIsNone(calibrator.select_model(CANDIDATES))
+        self.assertFalse((self.usb_path / 'cache' / 'tier_calibration.json').exists())
+
+    def test_size_ordering(self):
+        """Variants sort from smallest to largest"""
+        self.assertEqual(
+            sorted(CANDIDATES, key=model_size_rank),
+            ['llama3.2:1b-q4_0', 'llama3.2:1b', 'llama3.2:3b', 'llama3.2:7b']
+        )
+
+
+class TestLauncherModelSelection(unittest.TestCase):
+    """Test calibrated model selection at launcher startup"""
+
+    def setUp(self):
+        self.usb_path = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.detector = HardwareDetector(self.usb_path)
+        patcher = patch.object(self.detector, 'determine_hardware_tier', return_value='medium')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def test_calibration_can_step_below_the_tier_model(self):
+        """A tier model too slow for the budget is replaced by a smaller variant"""
+        with FakeOllama(list(TIER_MODELS.values()), tokens_per_second={
+            'sunflower-kids-1b-q4': 400.0,
+            'sunflower-kids-1b': 200.0,
+            'sunflower-kids-3b': 10.0,
+            'sunflower-kids-7b': 100.0
+        }) as ollama:
+            self.assertEqual(self.detector.get_calibrated_model(ollama.url), 'sunflower-kids-1b')
+            # Variants above the tier's memory ceiling are never tried
+            self.assertNotIn('sunflower-kids-7b',
+                             {r['model'] for r in ollama.requests_for('/api/generate')})
+
+    def test_static_tier_model_without_ollama(self):
+        with FakeOllama([]) as ollama:
+            url = ollama.url
+        self.assertEqual(self.detector.get_calibrated_model(url), TIER_MODELS['medium'])
+
+
+class TestLauncherModelInstall(unittest.TestCase):
+    """Test that the variants calibration may choose are installed"""
+
+    def setUp(self):
+        self.cdrom_path = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        self.usb_path = Path(tempfile.mkdtemp(prefix="sunflower_test_"))
+        (self.cdrom_path / 'models').mkdir()
+        for model in TIER_MODELS.values():
+            (self.cdrom_path / 'models' / f'{model}.gguf').write_bytes(b'GGUF')
+
+        self.launcher = LauncherBase(self.cdrom_path, self.usb_path)
+        patcher = patch.object(self.launcher.hardware, 'determine_hardware_tier',
+                               return_value='medium')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.installed = []
+        patcher = patch.object(self.launcher.runner, 'run_command', side_effect=self.run_command)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.cdrom_path, ignore_errors=True)
+        shutil.rmtree(self.usb_path, ignore_errors=True)
+
+    def run_command(self, command, **kwargs):
+        if command[1] == 'create':
+            self.installed.append(command[2])
+            stdout = ''
+        else:
+            stdout = 'NAME    ID    SIZE    MODIFIED\n' + ''.join(
+                f'{model}:latest    abc123    2.0 GB    now\n' for model in self.installed
+            )
+        return subprocess.CompletedProcess(command, 0, stdout, '')
+
+    def test_smaller_variants_installed_with_tier_model(self):
+        self.assertFalse(self.launcher.check_models())
+        self.assertTrue(self.launcher.load_models())
+        self.assertEqual(self.installed,
+                         ['sunflower-kids-3b', 'sunflower-kids-1b', 'sunflower-kids-1b-q4'])
+        self.assertTrue(self.launcher.check_models())
+
+    def test_tier_model_alone_is_not_enough(self):
+        self.installed.append('sunflower-kids-3b')
+        self.assertFalse(self.launcher.check_models())
+
+    def test_missing_smaller_variant_is_not_fatal(self):
+        (self.cdrom_path / 'models' / 'sunflower-kids-1b-q4.gguf').unlink()
+        self.assertTrue(self.launcher.load_models())
+        self.assertEqual(self.installed, ['sunflower-kids-3b', 'sunflower-kids-1b'])
+
+        (self.cdrom_path / 'models' / 'sunflower-kids-3b.gguf').unlink()
+        self.assertFalse(self.launcher.load_models())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test the concurrent validation runner
+"""
+
+import sys
+import time
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.validation_runner import ValidationRunner, ValidationTask
+
+
+def sleeper(seconds, result=True):
+    def run():
+        time.sleep(seconds)
+        return result
+    return run
+
+
+class TestValidationRunner(unittest.TestCase):
+    """Test ValidationRunner scheduling"""
+
+    def test_independent_tests_overlap(self):
+        """I/O-bound tests run side by side and durations are recorded"""
+        runner = ValidationRunner(max_workers=4)
+        results = runner.run(ValidationTask(f"check_{i}", sleeper(0.2)) for i in range(4))
+
+        self.assertTrue(all(r.passed for r in results.values()))
+        self.assertLess(runner.wall_seconds, 0.6)
+        timing = runner.timing(results)
+        self.assertGreater(timing["parallel_speedup"], 1.5)
+        self.assertGreaterEqual(timing["tests"]["check_0"]["duration_seconds"], 0.2)
+
+    def test_dependencies_order_and_skip(self):
+        """Dependents wait for their dependencies and are skipped if they fail"""
+        order = []
+
+        def step(name, result=True):
+            def run():
+                order.append(name)
+                return result
+            return run
+
+        results = ValidationRunner(fail_fast=False).run([
+            ValidationTask("content", step("content"), depends_on=["detect"]),
+            ValidationTask("detect", step("detect")),
+            ValidationTask("filesystem", step("filesystem", False), depends_on=["detect"]),
+            ValidationTask("application", step("application"), depends_on=["filesystem"])
+        ])
+
+        self.assertEqual(order[0], "detect")
+        self.assertEqual(results["filesystem"].status, "FAIL")
+        self.assertEqual(results["application"].status, "SKIPPED")
+        self.assertEqual(list(results), ["content", "detect", "filesystem", "application"])
+
+        with self.assertRaises(ValueError):
+            ValidationRunner().run([ValidationTask("a", step("a"), depends_on=["b"]),
+                                    ValidationTask("b", step("b"), depends_on=["a"])])
+
+    def test_timeout_and_fail_fast(self):
+        """A hung critical test times out and stops tests not yet started"""
+        release = threading.Event()
+        results = ValidationRunner(max_workers=1).run([
+            ValidationTask("hangs", release.wait, timeout=0.2, critical=True),
+            ValidationTask("later", sleeper(0))
+        ])
+        release.set()
+
+        self.assertEqual(results["hangs"].status, "TIMEOUT")
+        self.assertEqual(results["later"].status, "SKIPPED")
+
+    def test_exclusive_test_runs_alone(self):
+        """Benchmarks marked exclusive never overlap other tests"""
+        active = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def tracked(name):
+            def run():
+                with lock:
+                    active.append(name)
+                    overlaps.append(list(active))
+                time.sleep(0.05)
+                with lock:
+                    active.remove(name)
+                return True
+            return run
+
+        ValidationRunner(max_workers=4).run([
+            ValidationTask("checksums", tracked("checksums")),
+            ValidationTask("performance", tracked("performance"), exclusive=True),
+            ValidationTask("documentation", tracked("documentation"))
+        ])
+
+        self.assertIn(["performance"], overlaps)
+        self.assertFalse(any("performance" in seen and len(seen) > 1 for seen in overlaps))
+
+    def test_exclusive_test_waits_for_timed_out_threads(self):
+        """A test that timed out but is still running keeps the benchmark waiting"""
+        events = []
+
+        def slow():
+            time.sleep(0.3)
+            events.append("slow done")
+            return True
+
+        def benchmark():
+            events.append("benchmark")
+            return True
+
+        results = ValidationRunner(max_workers=4).run([
+            ValidationTask("slow", slow, timeout=0.1),
+            ValidationTask("performance", benchmark, exclusive=True)
+        ])
+
+        self.assertEqual(results["slow"].status, "TIMEOUT")
+        self.assertEqual(results["performance"].status, "PASS")
+        self.assertEqual(events, ["slow done", "benchmark"])
+
+    def test_exclusive_test_skipped_when_timed_out_thread_hangs(self):
+        """After the grace period a still-running straggler skips the benchmark"""
+        release = threading.Event()
+        results = ValidationRunner(max_workers=4, timeout_grace=0.2).run([
+            ValidationTask("hangs", release.wait, timeout=0.1),
+            ValidationTask("performance", sleeper(0), exclusive=True),
+            ValidationTask("documentation", sleeper(0), depends_on=["performance"])
+        ])
+        release.set()
+
+        self.assertEqual(results["hangs"].status, "TIMEOUT")
+        self.assertEqual(results["performance"].status, "SKIPPED")
+        self.assertIn("hangs", results["performance"].error)
+        self.assertEqual(results["documentation"].status, "SKIPPED")
+
+
+if __name__ == '__main__':
+    unittest.main()